@@ -6,6 +6,7 @@ to interact with the MetaMindIQTrain server. It handles WebSocket communication
 and state management.
 """
 
+import json
 import logging
 import time
 from typing import Dict, Any, Callable, Optional
@@ -19,6 +20,12 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _decode_payload(data: Any) -> Any:
+    """Decode a payload the server broadcast as serialized JSON bytes."""
+    if isinstance(data, (bytes, bytearray)):
+        return json.loads(data)
+    return data
+
 class ConnectionState(Enum):
     """Connection state enum."""
     DISCONNECTED = auto()
@@ -96,6 +103,7 @@ class ClientAdapter:
         @self._sio.event
         def session_joined(data):
             """Handle session joined event."""
+            data = _decode_payload(data)
             logger.info(f"Joined session: {data.get('session_id')}")
             self._session_id = data.get('session_id')
             self._module_id = data.get('module_id')
@@ -110,6 +118,7 @@ class ClientAdapter:
         @self._sio.event
         def session_ended(data):
             """Handle session ended event."""
+            data = _decode_payload(data)
             logger.info(f"Session ended: {data.get('session_id')}")
             self._session_id = None
             self._module_id = None
@@ -119,6 +128,7 @@ class ClientAdapter:
         @self._sio.event
         def state_update(data):
             """Handle state update event."""
+            data = _decode_payload(data)
             if 'state' in data:
                 self._current_state = data['state']
                 self._trigger_event('state_update', data)
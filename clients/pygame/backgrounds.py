@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Background Service for MetaMindIQTrain Pygame Client
+
+Gradient backgrounds shared by all renderers:
+- render_gradient: builds a gradient surface with one numpy fill of the
+  surface's pixel array instead of one draw call per scanline
+- BackgroundCache: caches gradient surfaces by (size, theme id, gradient
+  spec) and, while the window is being resized, builds the next likely
+  sizes on a worker thread so the resize does not stall on them
+
+Cached surfaces are shared between callers and must only be blitted, never
+drawn on.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# Resizes closer together than this (seconds) are treated as one drag
+RESIZE_DRAG_INTERVAL = 0.5
+
+
+def render_gradient(size: Tuple[int, int], start_color: Sequence[float], end_color: Sequence[float],
+                    direction: str = 'vertical', flags: int = 0) -> pygame.Surface:
+    """Build a linear gradient surface.
+
+    Colors match the per-scanline interpolation used by the renderers
+    before: channel = int(start + (end - start) * i / length).
+
+    Args:
+        size: (width, height) of the surface
+        start_color: RGB or RGBA color at the top (or left)
+        end_color: RGB or RGBA color at the bottom (or right)
+        direction: 'vertical' or 'horizontal'
+        flags: pygame surface flags (SRCALPHA is added for RGBA colors)
+
+    Returns:
+        New surface filled with the gradient
+    """
+    width, height = max(1, int(size[0])), max(1, int(size[1]))
+    has_alpha = len(start_color) > 3 and len(end_color) > 3
+    if has_alpha:
+        flags |= pygame.SRCALPHA
+
+    length = width if direction == 'horizontal' else height
+    channels = 4 if has_alpha else 3
+    start = np.asarray(start_color[:channels], dtype=np.float64)
+    end = np.asarray(end_color[:channels], dtype=np.float64)
+    progress = np.arange(length, dtype=np.float64) / length
+    ramp = np.clip(start + (end - start) * progress[:, None], 0, 255).astype(np.uint32)
+
+    surface = pygame.Surface((width, height), flags)
+    if surface.get_bytesize() == 4:
+        # Pack the ramp into pixel values once, then broadcast it in one fill
+        masks = surface.get_masks()
+        shifts = surface.get_shifts()
+        losses = surface.get_losses()
+        packed = np.zeros(length, dtype=np.uint32)
+        for channel in range(4):
+            if not masks[channel]:
+                continue
+            values = ramp[:, channel] if channel < channels else np.full(length, 255, dtype=np.uint32)
+            packed |= (values >> losses[channel]) << shifts[channel]
+
+        pixels = pygame.surfarray.pixels2d(surface)
+        pixels[...] = packed[:, None] if direction == 'horizontal' else packed[None, :]
+        del pixels  # Unlock the surface
+    else:
+        rgb = ramp[:, None, :3] if direction == 'horizontal' else ramp[None, :, :3]
+        pygame.surfarray.blit_array(surface, np.broadcast_to(rgb, (width, height, 3)).copy())
+        if has_alpha:
+            alpha = ramp[:, None, 3] if direction == 'horizontal' else ramp[None, :, 3]
+            pixels = pygame.surfarray.pixels_alpha(surface)
+            pixels[...] = alpha
+            del pixels
+
+    return surface
+
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    """Get the pixel memory of a surface."""
+    return surface.get_pitch() * surface.get_height()
+
+
+class BackgroundCache:
+    """LRU cache of gradient surfaces keyed by size, theme and gradient spec."""
+
+    def __init__(self, max_entries: int = 16, max_memory_mb: float = 48, prefetch_steps: int = 2,
+                 prefetch: bool = True):
+        """Initialize the background cache.
+
+        Args:
+            max_entries: Maximum number of cached surfaces
+            max_memory_mb: Maximum pixel memory of the cached surfaces in MB
+            prefetch_steps: Sizes ahead of a resize drag to build in advance
+            prefetch: Whether to build predicted sizes on a worker thread
+        """
+        self.max_entries = max_entries
+        self.max_memory = max_memory_mb * 1024 * 1024
+        self.current_memory = 0
+        self.prefetch_steps = prefetch_steps
+        self.prefetch = prefetch
+
+        self.surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.pending: Dict[tuple, Any] = {}
+        self._built_ahead = set()
+        self.lock = threading.RLock()
+        self._executor = None
+
+        # (flags, theme_id, spec) -> (last size, time of the request)
+        self._last_sizes: Dict[tuple, Tuple[Tuple[int, int], float]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.prefetch_hits = 0
+        self.build_time = 0.0
+
+    @staticmethod
+    def make_spec(start_color: Sequence[float], end_color: Sequence[float],
+                  direction: str = 'vertical') -> tuple:
+        """Build the hashable description of a gradient.
+
+        Args:
+            start_color: Start color
+            end_color: End color
+            direction: 'vertical' or 'horizontal'
+
+        Returns:
+            Gradient spec tuple
+        """
+        return (tuple(start_color), tuple(end_color), direction)
+
+    def get_gradient(self, size: Tuple[int, int], start_color: Sequence[float], end_color: Sequence[float],
+                     direction: str = 'vertical', theme_id: Optional[str] = None,
+                     flags: int = 0) -> pygame.Surface:
+        """Get a gradient surface, building it if it is not cached.
+
+        Args:
+            size: (width, height) of the surface
+            start_color: Start color
+            end_color: End color
+            direction: 'vertical' or 'horizontal'
+            theme_id: ID of the theme the gradient comes from
+            flags: pygame surface flags
+
+        Returns:
+            Shared gradient surface (blit it, do not draw on it)
+        """
+        size = (int(size[0]), int(size[1]))
+        spec = self.make_spec(start_color, end_color, direction)
+        key = (size, theme_id, spec, flags)
+
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is not None:
+                self.surfaces.move_to_end(key)
+                if key in self._built_ahead:
+                    self._built_ahead.discard(key)
+                    self.prefetch_hits += 1
+                else:
+                    self.hits += 1
+            else:
+                future = self.pending.get(key)
+            self._predict(size, theme_id, spec, flags)
+
+        if surface is not None:
+            return surface
+
+        if future is not None:
+            # Being built ahead of a resize drag; wait for it
+            surface = future.result()
+            with self.lock:
+                self._built_ahead.discard(key)
+                self.prefetch_hits += 1
+            return surface
+
+        start = time.perf_counter()
+        surface = render_gradient(size, start_color, end_color, direction, flags)
+        with self.lock:
+            self.misses += 1
+            self.build_time += time.perf_counter() - start
+            self._store(key, surface)
+        return surface
+
+    def _store(self, key: tuple, surface: pygame.Surface) -> None:
+        """Add a surface, evicting the least recently used ones."""
+        if key in self.surfaces:
+            self.current_memory -= _surface_bytes(self.surfaces[key])
+        self.surfaces[key] = surface
+        self.surfaces.move_to_end(key)
+        self.current_memory += _surface_bytes(surface)
+        while len(self.surfaces) > 1 and (len(self.surfaces) > self.max_entries
+                                          or self.current_memory > self.max_memory):
+            evicted, evicted_surface = self.surfaces.popitem(last=False)
+            self.current_memory -= _surface_bytes(evicted_surface)
+            self._built_ahead.discard(evicted)
+
+    def _predict(self, size: Tuple[int, int], theme_id: Optional[str], spec: tuple, flags: int) -> None:
+        """Schedule the sizes a resize drag is heading for.
+
+        Called with the lock held.
+        """
+        now = time.time()
+        group = (flags, theme_id, spec)
+        last = self._last_sizes.get(group)
+        self._last_sizes[group] = (size, now)
+        if not self.prefetch or last is None:
+            return
+
+        last_size, last_time = last
+        dx, dy = size[0] - last_size[0], size[1] - last_size[1]
+        if (dx, dy) == (0, 0) or now - last_time > RESIZE_DRAG_INTERVAL:
+            return
+
+        for step in range(1, self.prefetch_steps + 1):
+            predicted = (size[0] + dx * step, size[1] + dy * step)
+            if predicted[0] <= 0 or predicted[1] <= 0:
+                break
+            key = (predicted, theme_id, spec, flags)
+            if key in self.surfaces or key in self.pending:
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background-prefetch")
+            self.pending[key] = self._executor.submit(self._build_ahead, key)
+
+    def _build_ahead(self, key: tuple) -> pygame.Surface:
+        """Build a predicted surface on the worker thread."""
+        size, _, (start_color, end_color, direction), flags = key
+        try:
+            start = time.perf_counter()
+            surface = render_gradient(size, start_color, end_color, direction, flags)
+            with self.lock:
+                self.prefetched += 1
+                self.build_time += time.perf_counter() - start
+                self._built_ahead.add(key)
+                self._store(key, surface)
+            return surface
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def clear(self, theme_id: Optional[str] = None) -> None:
+        """Drop cached surfaces.
+
+        Args:
+            theme_id: Only drop the surfaces of this theme (all if None)
+        """
+        with self.lock:
+            if theme_id is None:
+                self.surfaces.clear()
+                self.current_memory = 0
+                self._built_ahead.clear()
+                self._last_sizes.clear()
+            else:
+                for key in [key for key in self.surfaces if key[1] == theme_id]:
+                    self.current_memory -= _surface_bytes(self.surfaces.pop(key))
+                    self._built_ahead.discard(key)
+
+    def shutdown(self) -> None:
+        """Stop the prefetch worker."""
+        with self.lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self.lock:
+            total = self.hits + self.misses + self.prefetch_hits
+            return {
+                'size': len(self.surfaces),
+                'max_entries': self.max_entries,
+                'memory_used_mb': self.current_memory / (1024 * 1024),
+                'max_memory_mb': self.max_memory / (1024 * 1024),
+                'hits': self.hits,
+                'misses': self.misses,
+                'prefetched': self.prefetched,
+                'prefetch_hits': self.prefetch_hits,
+                'pending': len(self.pending),
+                'hit_rate': (self.hits + self.prefetch_hits) / total if total > 0 else 0,
+                'build_time_ms': self.build_time * 1000
+            }
+
+
+# Shared by all renderers
+_background_cache = BackgroundCache()
+
+
+def get_background_cache() -> BackgroundCache:
+    """Get the background cache shared by all renderers."""
+    return _background_cache
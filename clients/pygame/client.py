@@ -17,6 +17,7 @@ from typing import Dict, Any, Optional, List, Tuple
 try:
     from MetaMindIQTrain.core.theme import Theme, get_theme, set_theme
     from MetaMindIQTrain.core.config import load_config
+    from MetaMindIQTrain.core.input_timing import dispatching, get_frame_clock, now_ns, stamp_event
     from MetaMindIQTrain.clients.pygame.renderer_manager import (
         RendererManager, get_renderer, get_adapter, 
         update_performance_metrics, render_debug_overlay
@@ -28,6 +29,7 @@ except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from core.theme import Theme, get_theme, set_theme
     from core.config import load_config
+    from core.input_timing import dispatching, get_frame_clock, now_ns, stamp_event
     from clients.pygame.renderer_manager import (
         RendererManager, get_renderer, get_adapter, 
         update_performance_metrics, render_debug_overlay
@@ -142,7 +144,11 @@ class PyGameClient:
         Returns:
             True if should continue running, False if should exit
         """
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        arrival = now_ns()
+        for event in events:
+            stamp_event(event, arrival)
+
             # Handle quit event
             if event.type == pygame.QUIT:
                 return False
@@ -175,7 +181,8 @@ class PyGameClient:
             
             # Pass event to active module
             if self.active_adapter:
-                result = self.active_adapter.handle_event(event)
+                with dispatching(event):
+                    result = self.active_adapter.handle_event(event)
                 if result and isinstance(result, dict) and 'action' in result:
                     # Handle module actions
                     action = result['action']
@@ -241,6 +248,7 @@ class PyGameClient:
         
         # Update display
         pygame.display.flip()
+        get_frame_clock().frame_presented()
     
     def run(self):
         """Run the main loop."""
@@ -24,6 +24,7 @@ try:
     from MetaMindIQTrain.core.theme import Theme, get_theme, set_theme
     from MetaMindIQTrain.core.unified_component_system import Component, ComponentFactory, UI
     from MetaMindIQTrain.clients.pygame.renderers.base_component_renderer import BaseComponentRenderer
+    from MetaMindIQTrain.clients.pygame.backgrounds import get_background_cache
 except ImportError:
     # For direct execution during development
     import sys
@@ -32,6 +33,7 @@ except ImportError:
     from core.theme import Theme, get_theme, set_theme
     from core.unified_component_system import Component, ComponentFactory, UI
     from clients.pygame.renderers.base_component_renderer import BaseComponentRenderer
+    from clients.pygame.backgrounds import get_background_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -78,19 +80,24 @@ class OptimizedRenderer(BaseComponentRenderer):
         self._create_background()
     
     def _create_background(self):
-        """Create a static background for the renderer."""
-        # Create background surface
-        self.background_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Draw base background
-        background_color = self.colors.get('background', (30, 30, 30))
-        self.background_surface.fill(background_color)
+        """Create a static background for the renderer.
         
-        # Draw gradient if available in theme
+        Gradient backgrounds come from the shared background cache, so a
+        resize or theme switch back to a known size does not rebuild them.
+        The surface is shared and only ever blitted.
+        """
         theme = get_theme()
         if theme and theme.has_gradient('background'):
             start_color, end_color = theme.get_gradient('background')
-            self._draw_gradient_background(self.background_surface, start_color, end_color)
+            self.background_surface = get_background_cache().get_gradient(
+                (self.width, self.height), start_color, end_color,
+                theme_id=theme.id, flags=pygame.SRCALPHA
+            )
+            return
+        
+        # Plain background color
+        self.background_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.background_surface.fill(self.colors.get('background', (30, 30, 30)))
     
     def _draw_gradient_background(self, surface, start_color, end_color, direction='vertical'):
         """Draw a gradient background.
@@ -101,39 +108,10 @@ class OptimizedRenderer(BaseComponentRenderer):
             end_color: End color of gradient
             direction: 'vertical' or 'horizontal'
         """
-        width, height = surface.get_width(), surface.get_height()
-        
-        if direction == 'horizontal':
-            for x in range(width):
-                progress = x / width
-                color = self._interpolate_color(start_color, end_color, progress)
-                pygame.draw.line(surface, color, (x, 0), (x, height))
-        else:  # vertical
-            for y in range(height):
-                progress = y / height
-                color = self._interpolate_color(start_color, end_color, progress)
-                pygame.draw.line(surface, color, (0, y), (width, y))
-    
-    def _interpolate_color(self, start_color, end_color, progress):
-        """Interpolate between two colors.
-        
-        Args:
-            start_color: Start color
-            end_color: End color
-            progress: Progress from 0.0 to 1.0
-            
-        Returns:
-            Interpolated color
-        """
-        r = int(start_color[0] + (end_color[0] - start_color[0]) * progress)
-        g = int(start_color[1] + (end_color[1] - start_color[1]) * progress)
-        b = int(start_color[2] + (end_color[2] - start_color[2]) * progress)
-        
-        if len(start_color) > 3 and len(end_color) > 3:
-            a = int(start_color[3] + (end_color[3] - start_color[3]) * progress)
-            return (r, g, b, a)
-        
-        return (r, g, b)
+        gradient = get_background_cache().get_gradient(
+            surface.get_size(), start_color, end_color, direction, flags=surface.get_flags() & pygame.SRCALPHA
+        )
+        surface.blit(gradient, (0, 0))
     
     def register_dirty_region(self, region):
         """Register a region that needs to be redrawn.
@@ -16,6 +16,7 @@ from functools import lru_cache
 # Try to import from the package first
 try:
     from MetaMindIQTrain.core.theme import Theme, get_theme, set_theme, register_theme
+    from MetaMindIQTrain.core.streaming_stats import StreamingStats
     from MetaMindIQTrain.clients.pygame.renderers.registry import RendererRegistry
     from MetaMindIQTrain.clients.pygame.renderers.base_component_renderer import BaseComponentRenderer
     from MetaMindIQTrain.clients.pygame.renderers.optimized_renderer import OptimizedRenderer
@@ -26,6 +27,7 @@ except ImportError:
     from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from core.theme import Theme, get_theme, set_theme, register_theme
+    from core.streaming_stats import StreamingStats
     from clients.pygame.renderers.registry import RendererRegistry
     from clients.pygame.renderers.base_component_renderer import BaseComponentRenderer
     from clients.pygame.renderers.optimized_renderer import OptimizedRenderer
@@ -106,8 +108,8 @@ class RendererManager:
         self.adapter_cache = {}
         
         # Initialize performance metrics
-        self.frame_times = []
-        self.render_times = []
+        self.frame_times = StreamingStats(PERFORMANCE_WINDOW_SIZE)
+        self.render_times = StreamingStats(PERFORMANCE_WINDOW_SIZE)
         self.last_frame_time = time.time()
         self.current_fps = 0
         self.average_render_time = 0
@@ -360,19 +362,15 @@ class RendererManager:
         self.last_frame_time = current_time
         
         # Add frame time to history
-        self.frame_times.append(frame_time)
-        
-        # Keep only the most recent frames
-        if len(self.frame_times) > PERFORMANCE_WINDOW_SIZE:
-            self.frame_times.pop(0)
+        self.frame_times.add(frame_time)
         
         # Calculate current FPS (avoid division by zero)
         if frame_time > 0:
             self.current_fps = 1.0 / frame_time
         
         # Calculate average render time
-        if self.render_times:
-            self.average_render_time = sum(self.render_times) / len(self.render_times)
+        if self.render_times.count:
+            self.average_render_time = self.render_times.mean
     
     def record_render_time(self, start_time: float):
         """Record the time taken to render a frame.
@@ -383,11 +381,7 @@ class RendererManager:
         render_time = time.time() - start_time
         
         # Add render time to history
-        self.render_times.append(render_time)
-        
-        # Keep only the most recent render times
-        if len(self.render_times) > PERFORMANCE_WINDOW_SIZE:
-            self.render_times.pop(0)
+        self.render_times.add(render_time)
     
     def render_debug_overlay(self, show_fps: bool = True, show_render_time: bool = True):
         """Render debug information as an overlay.
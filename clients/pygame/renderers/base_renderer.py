@@ -12,6 +12,7 @@ from MetaMindIQTrain.config import (
     HEADER_BG_COLOR, FOOTER_BG_COLOR, CONTENT_BG_COLOR,
     calculate_sizes, DEFAULT_SIZES
 )
+from MetaMindIQTrain.clients.pygame.backgrounds import get_background_cache
 
 
 class BaseRenderer:
@@ -142,39 +143,17 @@ class BaseRenderer:
             is_vertical: Whether gradient should be vertical (True) or horizontal (False)
             darken_bottom: If True, gradient darkens toward bottom/right, otherwise top/left
         """
-        gradient_surface = pygame.Surface((rect.width, rect.height))
-        
-        # Unpack the base color
-        r, g, b = base_color
-        
-        # Determine gradient direction and size
-        if is_vertical:
-            size = rect.height
+        # Create a subtle gradient (-15%) from the shared background cache
+        shaded_color = tuple(channel * 0.85 for channel in base_color[:3])
+        if darken_bottom:
+            start_color, end_color = base_color[:3], shaded_color
         else:
-            size = rect.width
+            start_color, end_color = shaded_color, base_color[:3]
         
-        # Draw the gradient
-        for i in range(size):
-            # Calculate position in gradient (0.0 to 1.0)
-            pos = i / size
-            
-            # Adjust direction if needed
-            if not darken_bottom:
-                pos = 1.0 - pos
-                
-            # Create a subtle gradient (±15%)
-            intensity = 1.0 - (pos * 0.15)
-            
-            # Calculate color with proper intensity
-            color = (min(255, int(r * intensity)), 
-                    min(255, int(g * intensity)), 
-                    min(255, int(b * intensity)))
-            
-            # Draw the line
-            if is_vertical:
-                pygame.draw.line(gradient_surface, color, (0, i), (rect.width, i))
-            else:
-                pygame.draw.line(gradient_surface, color, (i, 0), (i, rect.height))
+        gradient_surface = get_background_cache().get_gradient(
+            (rect.width, rect.height), start_color, end_color,
+            'vertical' if is_vertical else 'horizontal'
+        )
         
         # Draw the surface to the screen
         self.screen.blit(gradient_surface, rect)
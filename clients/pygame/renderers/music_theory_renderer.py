@@ -11,7 +11,7 @@ import pygame
 import math
 import time
 import random
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
 
 # Import base renderer
@@ -26,6 +26,8 @@ except ImportError:
         sys.path.insert(0, str(project_root))
     from MetaMindIQTrain.clients.pygame.renderers.music_components_renderer import MusicComponentsRenderer
 
+from MetaMindIQTrain.core.input_timing import event_timestamp_ns, get_frame_clock
+
 
 class MusicTheoryRenderer(MusicComponentsRenderer):
     """Specialized renderer for the Music Theory module."""
@@ -63,6 +65,10 @@ class MusicTheoryRenderer(MusicComponentsRenderer):
         # Animation settings
         self.animation_time = 0
         self.feedback_animation = 0
+        
+        # Onset of the challenge on screen, for reaction times
+        self.challenge_key = None
+        self.challenge_stimulus = None
     
     def register_module_specific_achievements(self):
         """Register music theory specific achievements."""
@@ -108,6 +114,7 @@ class MusicTheoryRenderer(MusicComponentsRenderer):
         
         # Draw challenge options
         self._draw_options(width, height)
+        self._track_challenge_onset()
         
         # Draw message
         self._draw_message(width, height)
@@ -132,6 +139,17 @@ class MusicTheoryRenderer(MusicComponentsRenderer):
         self.render_feedback()
         self.render_achievement_notification()
     
+    def _track_challenge_onset(self):
+        """Start timing a challenge when it is first drawn."""
+        if self.state.get('state') != 'challenge':
+            self.challenge_key = None
+            return
+        key = (self.state.get('current_level_challenges'), self.state.get('challenge_type'),
+               self.state.get('correct_answer'), tuple(self.state.get('options', ())))
+        if key != self.challenge_key:
+            self.challenge_key = key
+            self.challenge_stimulus = get_frame_clock().stimulus()
+    
     def _draw_audio_section(self, width, height):
         """Draw the audio playback control and visualization.
         
@@ -418,7 +436,7 @@ class MusicTheoryRenderer(MusicComponentsRenderer):
             
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left mouse button
-                result = self._handle_click(event.pos)
+                result = self._handle_click(event.pos, event_timestamp_ns(event))
                 if result:
                     # Forward the input to the module
                     self.module.process_input(result)
@@ -426,11 +444,12 @@ class MusicTheoryRenderer(MusicComponentsRenderer):
                 
         return super().handle_event(event)
     
-    def _handle_click(self, pos: Tuple[int, int]) -> Dict[str, Any]:
+    def _handle_click(self, pos: Tuple[int, int], timestamp_ns: Optional[int] = None) -> Dict[str, Any]:
         """Handle mouse click events, generating module input.
         
         Args:
             pos: Mouse position (x, y)
+            timestamp_ns: Arrival stamp of the click (see core.input_timing)
             
         Returns:
             Dict with module input or None if no input to send
@@ -490,11 +509,18 @@ class MusicTheoryRenderer(MusicComponentsRenderer):
                     self.selected_option = i
                     
                     # Update the feedback message based on correctness
-                    if option == self.state.get('correct_answer', ''):
+                    correct = option == self.state.get('correct_answer', '')
+                    if correct:
                         self.show_feedback("Correct!", True)
                     else:
                         self.show_feedback(f"Incorrect. The answer was: {self.state.get('correct_answer', '')}", False)
                     
+                    # Record the answer with the time taken from the challenge's onset
+                    self.achievement_system.performance.record_answer(
+                        'music_theory', self.state.get('challenge_type', ''),
+                        self.state.get('correct_answer', ''), correct,
+                        stimulus=self.challenge_stimulus, timestamp_ns=timestamp_ns)
+                    
                     # Return the answer
                     return {"answer": option}
         
@@ -23,6 +23,7 @@ except ImportError:
 # Import base renderer
 try:
     from .music_components_renderer import MusicComponentsRenderer
+    from ..backgrounds import get_background_cache
 except ImportError:
     # When running directly
     import sys
@@ -31,6 +32,7 @@ except ImportError:
     if str(project_root) not in sys.path:
         sys.path.insert(0, str(project_root))
     from MetaMindIQTrain.clients.pygame.renderers.music_components_renderer import MusicComponentsRenderer
+    from MetaMindIQTrain.clients.pygame.backgrounds import get_background_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -137,22 +139,9 @@ class PsychoacousticWizardRenderer(MusicComponentsRenderer):
                 min(255, int(80 + (energy_factor - 0.5) * 2 * 100))   # More blue
             )
         
-        # Draw gradient
-        rect = pygame.Rect(0, 0, self.width, self.height)
-        pygame.draw.rect(self.screen, color1, rect)
-        
-        # Create gradient by drawing lines with gradually changing color
-        for i in range(self.height):
-            # Calculate interpolation factor
-            f = i / self.height
-            
-            # Interpolate colors
-            r = int(color1[0] * (1-f) + color2[0] * f)
-            g = int(color1[1] * (1-f) + color2[1] * f)
-            b = int(color1[2] * (1-f) + color2[2] * f)
-            
-            # Draw line
-            pygame.draw.line(self.screen, (r,g,b), (0, i), (self.width, i))
+        # Draw gradient (cached per size and energy color)
+        gradient = get_background_cache().get_gradient((self.width, self.height), color1, color2)
+        self.screen.blit(gradient, (0, 0))
     
     def draw_stats(self):
         """Draw score, combo, and other stats."""
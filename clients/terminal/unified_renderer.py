@@ -10,12 +10,14 @@ Key features:
 2. Support for colors using ANSI escape codes
 3. Keyboard input handling
 4. Compatible with the unified component system
+5. Double-buffered differential output (only changed cell runs are written)
 """
 
 import os
 import sys
 import time
 import json
+import hashlib
 import logging
 import curses
 import threading
@@ -31,13 +33,16 @@ if __name__ == "__main__":
 # Try to import the unified component system
 try:
     from MetaMindIQTrain.core.unified_component_system import (
-        Component, UI, ComponentFactory, get_stats, reset_stats
+        Component, UI, ComponentFactory, get_stats, reset_stats,
+        create_component_tree
     )
 except ImportError:
     # For direct execution or during development
+    from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from core.unified_component_system import (
-        Component, UI, ComponentFactory, get_stats, reset_stats
+        Component, UI, ComponentFactory, get_stats, reset_stats,
+        create_component_tree
     )
 
 # Configure logging
@@ -79,6 +84,44 @@ SYMBOLS = {
     "arrow_right": "→",
 }
 
+# Curses color pairs initialized in TerminalRenderer.initialize()
+DEFAULT_PAIR = 1
+INVERSE_PAIR = 2
+
+# Map of curses color numbers (red=1, green=2, blue=4 bit layout) to color pairs
+_CURSES_COLOR_TO_PAIR = {
+    0: DEFAULT_PAIR,  # black text would be invisible on black, use default
+    1: 3,             # red
+    2: 4,             # green
+    3: 6,             # yellow
+    4: 5,             # blue
+    5: 8,             # magenta
+    6: 7,             # cyan
+    7: DEFAULT_PAIR,  # white
+}
+
+# Named colors (matching the ANSI names above) to color pairs
+_NAMED_COLOR_TO_PAIR = {
+    "black": DEFAULT_PAIR,
+    "white": DEFAULT_PAIR,
+    "red": 3,
+    "green": 4,
+    "blue": 5,
+    "yellow": 6,
+    "cyan": 7,
+    "magenta": 8,
+}
+
+# Unchanged cells between two changed runs that are cheaper to rewrite
+# than to emit a new cursor position for
+RUN_MERGE_GAP = 4
+
+# Approximate size of a cursor positioning escape sequence (ESC [ row ; col H)
+CURSOR_MOVE_BYTES = 8
+
+# Approximate size of a color attribute switch (ESC [ 3x m)
+ATTR_SWITCH_BYTES = 5
+
 class TerminalRenderer:
     """Terminal renderer for the MetaMindIQTrain platform."""
     
@@ -91,17 +134,29 @@ class TerminalRenderer:
         """
         self.width = width
         self.height = height
-        self.ui = None
+        self.ui = UI(width, height)
         self.screen = None
         self.running = False
-        self.buffer = []
+        self.buffer = []  # Back buffer characters
+        self.attr_buffer = []  # Back buffer color pairs
+        self.front_buffer = []  # Characters currently on screen
+        self.front_attrs = []  # Color pairs currently on screen
         self.fps = 15  # Lower FPS for terminal
         self.last_render_time = 0
         self.frame_count = 0
         self.start_time = 0
         
+        # Differential output state
+        self._pair_attrs = {}  # Color pair -> curses attribute
+        self._ui_signature = None
+        self._screen_size = None
+        
         # Stats
         self.render_time = 0
+        self.frames_skipped = 0
+        self.last_frame_bytes = 0
+        self.total_bytes = 0
+        self.last_frame_runs = 0
     
     def initialize(self) -> bool:
         """Initialize the terminal renderer.
@@ -134,9 +189,10 @@ class TerminalRenderer:
             curses.init_pair(6, curses.COLOR_YELLOW, curses.COLOR_BLACK)
             curses.init_pair(7, curses.COLOR_CYAN, curses.COLOR_BLACK)
             curses.init_pair(8, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
+            self._pair_attrs = {pair: curses.color_pair(pair) for pair in range(1, 9)}
             
-            # Initialize buffer
-            self.buffer = [[" " for _ in range(width)] for _ in range(height)]
+            # Initialize buffers
+            self._reset_buffers()
             
             # Create UI
             self.ui = UI(width, height)
@@ -228,30 +284,54 @@ class TerminalRenderer:
         self.last_render_time = start_time
         
         try:
-            # Clear buffer
-            self.buffer = [[" " for _ in range(self.width)] for _ in range(self.height)]
-            
-            # Update UI from state if needed
-            if "ui" in state:
-                self.update_ui_from_state(state["ui"])
-            
-            # Calculate layout if needed
-            if not self.ui.layout_calculated:
-                self.ui.calculate_layout()
-            
-            # Render components
-            self.render_component_tree(self.ui.root)
-            
-            # Draw buffer to screen
-            self._draw_buffer()
-            
-            # Update stats
-            self.frame_count += 1
-            self.render_time = time.time() - start_time
-            
+            self.render_frame(state.get("ui"))
         except Exception as e:
             logger.error(f"Error rendering: {e}")
     
+    def render_frame(self, ui_state: Optional[Dict[str, Any]] = None) -> int:
+        """Render one frame, writing only the cells that changed.
+        
+        The frame is skipped entirely when the UI state and the component
+        tree are unchanged since the last frame.
+        
+        Args:
+            ui_state: Optional UI state dictionary to render
+            
+        Returns:
+            Number of bytes written to the terminal for this frame
+        """
+        start_time = time.time()
+        
+        self._check_screen_size()
+        
+        # Update UI from state only if it changed
+        if ui_state is not None:
+            signature = self._signature(ui_state)
+            if signature != self._ui_signature:
+                self._ui_signature = signature
+                self.update_ui_from_state(ui_state)
+        
+        if not self.ui.root.needs_render():
+            self.frames_skipped += 1
+            self.last_frame_bytes = 0
+            self.last_frame_runs = 0
+            return 0
+        
+        # Calculate layout if needed
+        if not self.ui.layout_calculated:
+            self.ui.calculate_layout()
+        
+        # Rasterize the whole tree into the back buffer
+        self._clear_back_buffer()
+        self.render_component_tree(self.ui.root)
+        
+        # Update stats
+        self.frame_count += 1
+        self.render_time = time.time() - start_time
+        
+        # Write the changed runs to the screen
+        return self._draw_buffer()
+    
     def update_ui_from_state(self, ui_state: Dict[str, Any]) -> None:
         """Update the UI from a state dictionary.
         
@@ -265,6 +345,13 @@ class TerminalRenderer:
             for component_data in ui_state["components"]:
                 component = create_component_tree(component_data)
                 self.ui.add(component)
+        elif "type" in ui_state:
+            # Pixel-space component tree from an MVC view
+            scale_x = self.width / max(1, ui_state.get("width") or self.width)
+            scale_y = self.height / max(1, ui_state.get("height") or self.height)
+            self.ui.add(component_from_view_tree(ui_state, scale_x, scale_y))
+        
+        self.ui.root.mark_dirty()
     
     def render_component_tree(self, component: Component) -> None:
         """Render a component and its children.
@@ -272,10 +359,8 @@ class TerminalRenderer:
         Args:
             component: Root component to render
         """
-        if not component.needs_render():
-            return
-            
-        # Render the component
+        # The back buffer is rebuilt from scratch, so every component is drawn;
+        # only the diff against the front buffer reaches the terminal
         self.render_component(component)
         
         # Render children
@@ -320,11 +405,12 @@ class TerminalRenderer:
         width, height = layout["width"], layout["height"]
         
         symbol = SYMBOLS["rect"]
+        pair = self._color_pair(component.style, "backgroundColor", "color")
         
         # Draw rectangle
         for row in range(max(0, y), min(y + height, self.height)):
             for col in range(max(0, x), min(x + width, self.width)):
-                self.buffer[row][col] = symbol
+                self._set_cell(row, col, symbol, pair)
     
     def _render_circle(self, component: Component) -> None:
         """Render a circle component.
@@ -340,10 +426,11 @@ class TerminalRenderer:
         # Approximate circle with terminal characters
         # Using a simpler approach for terminal renderer
         symbol = SYMBOLS["circle"]
+        pair = self._color_pair(component.style, "color", "backgroundColor")
         
         # Set the center point
         if 0 <= center_y < self.height and 0 <= center_x < self.width:
-            self.buffer[center_y][center_x] = symbol
+            self._set_cell(center_y, center_x, symbol, pair)
     
     def _render_text(self, component: Component) -> None:
         """Render a text component.
@@ -354,8 +441,9 @@ class TerminalRenderer:
         layout = component.layout
         x, y = layout["x"], layout["y"]
         width = layout["width"]
-        text = component.props.get("text", "")
+        text = str(component.props.get("text", ""))
         align = component.style.get("textAlign", "left")
+        pair = self._color_pair(component.style, "color")
         
         # Skip if outside bounds
         if y < 0 or y >= self.height:
@@ -363,7 +451,7 @@ class TerminalRenderer:
         
         # Truncate text if needed
         if len(text) > width:
-            text = text[:width-3] + "..."
+            text = text[:width-3] + "..." if width > 3 else text[:max(0, width)]
         
         # Handle alignment
         if align == "center":
@@ -377,7 +465,7 @@ class TerminalRenderer:
         for i, char in enumerate(text):
             col = x + x_offset + i
             if 0 <= col < self.width:
-                self.buffer[y][col] = char
+                self._set_cell(y, col, char, pair)
     
     def _render_button(self, component: Component) -> None:
         """Render a button component.
@@ -388,7 +476,8 @@ class TerminalRenderer:
         layout = component.layout
         x, y = layout["x"], layout["y"]
         width, height = layout["width"], layout["height"]
-        text = component.props.get("text", "")
+        text = str(component.props.get("text", ""))
+        pair = self._color_pair(component.style, "backgroundColor", "color")
         
         # Draw button frame
         for row in range(max(0, y), min(y + height, self.height)):
@@ -396,9 +485,9 @@ class TerminalRenderer:
                 # Use different symbols for border vs. interior
                 if (row == y or row == y + height - 1 or 
                     col == x or col == x + width - 1):
-                    self.buffer[row][col] = "+"
+                    self._set_cell(row, col, "+", pair)
                 else:
-                    self.buffer[row][col] = SYMBOLS["button"]
+                    self._set_cell(row, col, SYMBOLS["button"], pair)
         
         # Draw button text
         text_y = y + height // 2
@@ -408,7 +497,7 @@ class TerminalRenderer:
             for i, char in enumerate(text):
                 col = text_x + i
                 if 0 <= col < self.width:
-                    self.buffer[text_y][col] = char
+                    self._set_cell(text_y, col, char, INVERSE_PAIR)
     
     def _render_grid(self, component: Component) -> None:
         """Render a grid component.
@@ -422,6 +511,8 @@ class TerminalRenderer:
         rows = component.props.get("rows", 1)
         cols = component.props.get("cols", 1)
         
+        pair = self._color_pair(component.style, "borderColor", "color")
+        
         # Calculate cell size
         cell_width = width / cols
         cell_height = height / rows
@@ -431,14 +522,14 @@ class TerminalRenderer:
             row = y + int(i * cell_height)
             if 0 <= row < self.height:
                 for col in range(max(0, x), min(x + width, self.width)):
-                    self.buffer[row][col] = SYMBOLS["grid_h"]
+                    self._set_cell(row, col, SYMBOLS["grid_h"], pair)
         
         # Draw vertical lines
         for i in range(cols + 1):
             col = x + int(i * cell_width)
             if 0 <= col < self.width:
                 for row in range(max(0, y), min(y + height, self.height)):
-                    self.buffer[row][col] = SYMBOLS["grid_v"]
+                    self._set_cell(row, col, SYMBOLS["grid_v"], pair)
         
         # Draw intersections
         for i in range(rows + 1):
@@ -447,7 +538,7 @@ class TerminalRenderer:
                 for j in range(cols + 1):
                     col = x + int(j * cell_width)
                     if 0 <= col < self.width:
-                        self.buffer[row][col] = SYMBOLS["grid_cross"]
+                        self._set_cell(row, col, SYMBOLS["grid_cross"], pair)
     
     def _render_container(self, component: Component) -> None:
         """Render a container component.
@@ -458,36 +549,197 @@ class TerminalRenderer:
         layout = component.layout
         x, y = layout["x"], layout["y"]
         width, height = layout["width"], layout["height"]
+        pair = self._color_pair(component.style, "borderColor", "backgroundColor")
         
         # Draw container border
         for row in range(max(0, y), min(y + height, self.height)):
             for col in range(max(0, x), min(x + width, self.width)):
                 if (row == y or row == y + height - 1 or 
                     col == x or col == x + width - 1):
-                    self.buffer[row][col] = "."
+                    self._set_cell(row, col, ".", pair)
     
-    def _draw_buffer(self) -> None:
-        """Draw the buffer to the screen."""
-        self.screen.clear()
+    def _set_cell(self, row: int, col: int, char: str, pair: int) -> None:
+        """Write a character and its color pair into the back buffer.
         
-        for y in range(min(self.height, self.screen.getmaxyx()[0] - 1)):
-            line = "".join(self.buffer[y][:self.width])
-            try:
-                self.screen.addstr(y, 0, line)
-            except curses.error:
-                # This can happen when writing to the bottom-right corner
-                pass
+        Args:
+            row: Buffer row
+            col: Buffer column
+            char: Character to draw
+            pair: Curses color pair number
+        """
+        self.buffer[row][col] = char
+        self.attr_buffer[row][col] = pair
+    
+    def _color_pair(self, style: Dict[str, Any], *keys: str) -> int:
+        """Pick the color pair for the first color found in a style.
+        
+        Args:
+            style: Component style dictionary
+            *keys: Style keys to try in order
+            
+        Returns:
+            Curses color pair number
+        """
+        for key in keys:
+            color = style.get(key)
+            if color is None:
+                continue
+            if isinstance(color, str):
+                return _NAMED_COLOR_TO_PAIR.get(color.lower(), DEFAULT_PAIR)
+            if isinstance(color, (list, tuple)) and len(color) >= 3:
+                r, g, b = color[0] >= 128, color[1] >= 128, color[2] >= 128
+                return _CURSES_COLOR_TO_PAIR[r | (g << 1) | (b << 2)]
+        return DEFAULT_PAIR
+    
+    def _reset_buffers(self) -> None:
+        """Reset the back and front buffers to the current size."""
+        self.buffer = [[" "] * self.width for _ in range(self.height)]
+        self.attr_buffer = [[DEFAULT_PAIR] * self.width for _ in range(self.height)]
+        # The physical screen is blank after a clear
+        self.front_buffer = [[" "] * self.width for _ in range(self.height)]
+        self.front_attrs = [[DEFAULT_PAIR] * self.width for _ in range(self.height)]
+        self._screen_size = (self.height, self.width)
+    
+    def _clear_back_buffer(self) -> None:
+        """Blank the back buffer before rasterizing a frame."""
+        blank_chars = [" "] * self.width
+        blank_attrs = [DEFAULT_PAIR] * self.width
+        for row in range(self.height):
+            self.buffer[row][:] = blank_chars
+            self.attr_buffer[row][:] = blank_attrs
+    
+    def _check_screen_size(self) -> None:
+        """Resize the buffers and force a full redraw if the terminal changed size."""
+        if self.screen is not None:
+            height, width = self.screen.getmaxyx()
+            self.width = width
+            self.height = height
+        
+        if self._screen_size != (self.height, self.width):
+            if self.screen is not None and self._screen_size is not None:
+                # One full clear is unavoidable after a resize
+                self.screen.clear()
+            self._reset_buffers()
+            self.ui.screen_width = self.width
+            self.ui.screen_height = self.height
+            self._ui_signature = None
+            self.ui.root.mark_dirty()
+    
+    @staticmethod
+    def _signature(ui_state: Dict[str, Any]) -> str:
+        """Get a signature of a UI state for change detection.
+        
+        Args:
+            ui_state: UI state dictionary
+            
+        Returns:
+            Hash string
+        """
+        data = json.dumps(ui_state, sort_keys=True, default=str)
+        return hashlib.md5(data.encode()).hexdigest()
+    
+    def _changed_runs(self, row: int) -> List[Tuple[int, int, int]]:
+        """Find the runs of changed cells in a row.
+        
+        Consecutive changed cells with the same color pair form a run. Runs
+        separated by only a few unchanged cells are merged, since rewriting
+        those cells is cheaper than moving the cursor.
+        
+        Args:
+            row: Buffer row
+            
+        Returns:
+            List of (start, end, pair) tuples, end exclusive
+        """
+        chars, attrs = self.buffer[row], self.attr_buffer[row]
+        front_chars, front_attrs = self.front_buffer[row], self.front_attrs[row]
+        
+        if chars == front_chars and attrs == front_attrs:
+            return []
+        
+        runs = []
+        start = None
+        pair = None
+        last_changed = None
+        
+        for col in range(self.width):
+            changed = chars[col] != front_chars[col] or attrs[col] != front_attrs[col]
+            if start is not None:
+                if attrs[col] != pair or col - last_changed > RUN_MERGE_GAP:
+                    runs.append((start, last_changed + 1, pair))
+                    start = None
+                elif changed:
+                    last_changed = col
+                    continue
+                else:
+                    continue
+            if changed:
+                start = col
+                pair = attrs[col]
+                last_changed = col
+        
+        if start is not None:
+            runs.append((start, last_changed + 1, pair))
+        
+        return runs
+    
+    def _draw_buffer(self) -> int:
+        """Write the changed cell runs of the back buffer to the screen.
+        
+        Runs are grouped by color pair so each attribute is switched once per
+        frame rather than once per run.
+        
+        Returns:
+            Number of bytes written (estimated, including escape sequences)
+        """
+        max_rows = self.height
+        if self.screen is not None:
+            max_rows = min(self.height, self.screen.getmaxyx()[0])
         
         # Add stats at the bottom if there's space
-        if self.screen.getmaxyx()[0] > 2:
-            try:
-                fps = self.frame_count / (time.time() - self.start_time) if time.time() > self.start_time else 0
-                stats = f"FPS: {fps:.1f} | Render: {self.render_time*1000:.1f}ms"
-                self.screen.addstr(self.screen.getmaxyx()[0]-1, 0, stats[:self.width])
-            except curses.error:
-                pass
+        if max_rows > 2:
+            elapsed = time.time() - self.start_time
+            fps = self.frame_count / elapsed if elapsed > 0 else 0
+            stats = f"FPS: {fps:.1f} | Render: {self.render_time*1000:.1f}ms"
+            last_row = max_rows - 1
+            self.buffer[last_row][:] = list(stats[:self.width].ljust(self.width))
+            self.attr_buffer[last_row][:] = [DEFAULT_PAIR] * self.width
+        
+        # Collect changed runs per color pair
+        runs_by_pair: Dict[int, List[Tuple[int, int, int]]] = {}
+        for row in range(max_rows):
+            for start, end, pair in self._changed_runs(row):
+                runs_by_pair.setdefault(pair, []).append((row, start, end))
+        
+        bytes_written = 0
+        run_count = 0
+        
+        for pair, runs in runs_by_pair.items():
+            attr = self._pair_attrs.get(pair, 0)
+            bytes_written += ATTR_SWITCH_BYTES
+            
+            for row, start, end in runs:
+                text = "".join(self.buffer[row][start:end])
+                if self.screen is not None:
+                    try:
+                        self.screen.addstr(row, start, text, attr)
+                    except curses.error:
+                        # This can happen when writing to the bottom-right corner
+                        pass
+                
+                self.front_buffer[row][start:end] = self.buffer[row][start:end]
+                self.front_attrs[row][start:end] = self.attr_buffer[row][start:end]
+                bytes_written += CURSOR_MOVE_BYTES + len(text.encode("utf-8"))
+                run_count += 1
+        
+        if self.screen is not None and run_count:
+            self.screen.refresh()
         
-        self.screen.refresh()
+        self.last_frame_bytes = bytes_written
+        self.last_frame_runs = run_count
+        self.total_bytes += bytes_written
+        
+        return bytes_written
     
     def get_stats(self) -> Dict[str, Any]:
         """Get renderer statistics.
@@ -503,12 +755,61 @@ class TerminalRenderer:
             'fps': fps,
             'frame_count': self.frame_count,
             'render_time': self.render_time,
+            'frames_skipped': self.frames_skipped,
+            'last_frame_bytes': self.last_frame_bytes,
+            'last_frame_runs': self.last_frame_runs,
+            'total_bytes': self.total_bytes,
             'uptime': elapsed,
             'terminal_size': (self.width, self.height),
             'component_stats': get_stats()
         }
 
 
+def component_from_view_tree(node: Dict[str, Any], scale_x: float, scale_y: float) -> Component:
+    """Convert a pixel-space MVC view tree into terminal-cell components.
+    
+    MVC views return nested dictionaries with absolute pixel coordinates
+    (``x``, ``y``, ``width``, ``height``) and styles under
+    ``properties.style``. This maps them onto the unified component system
+    scaled to the terminal grid.
+    
+    Args:
+        node: View component dictionary
+        scale_x: Columns per pixel
+        scale_y: Rows per pixel
+        
+    Returns:
+        Component tree
+    """
+    component_type = node.get("type", "container")
+    if component_type == "rectangle":
+        component_type = "rect"
+    
+    x = int(node.get("x", 0) * scale_x)
+    y = int(node.get("y", 0) * scale_y)
+    width = max(1, int(round(node.get("width", 0) * scale_x)))
+    height = max(1, int(round(node.get("height", 0) * scale_y)))
+    
+    component = Component(
+        component_type=component_type,
+        id=node.get("id"),
+        x=x, y=y, width=width, height=height
+    )
+    
+    if "text" in node:
+        component.props["text"] = node["text"]
+    if "radius" in node:
+        component.props["radius"] = max(0, int(node["radius"] * scale_x))
+    
+    for key, value in node.get("properties", {}).get("style", {}).items():
+        component.style[key] = value
+    
+    for child in node.get("children", []):
+        component.add_child(component_from_view_tree(child, scale_x, scale_y))
+    
+    return component
+
+
 # Helper function for easy initialization
 def create_renderer(width=80, height=24) -> TerminalRenderer:
     """Create and initialize a terminal renderer.
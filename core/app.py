@@ -9,7 +9,9 @@ application framework.
 
 import logging
 import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 
@@ -45,6 +47,16 @@ except ImportError:
     except ImportError:
         class TrainingModule: pass
 
+try:
+    from core.pipeline import FrameRecorder, FrameSnapshot, PipelineTimings, SnapshotBuffer, replay
+except ImportError:
+    from MetaMindIQTrain.core.pipeline import FrameRecorder, FrameSnapshot, PipelineTimings, SnapshotBuffer, replay
+
+try:
+    from core.input_timing import dispatching, get_frame_clock, now_ns, stamp_event
+except ImportError:
+    from MetaMindIQTrain.core.input_timing import dispatching, get_frame_clock, now_ns, stamp_event
+
 # Import module registry - prefer module_registry.py for actual module loading
 try:
     import module_registry as mod_reg
@@ -94,6 +106,14 @@ class Application:
         self.show_fps = False
         self.background_color = (20, 20, 40, 255)
 
+        # Pipelined mode: the module is updated and its frame built on a
+        # simulation thread at tick_rate while this thread renders
+        self.pipelined = False
+        self.tick_rate = 60
+        self.timings = PipelineTimings()
+        self.snapshots = SnapshotBuffer()
+        self._input_queue = deque()
+
         # Event handlers
         self.event_handlers = {
             'quit': [],
@@ -343,14 +363,27 @@ class Application:
         logger.info(f"Reset module: {module_id}")
         return True
         
-    def run(self):
-        """Run the application main loop."""
+    def run(self, pipelined: Optional[bool] = None):
+        """Run the application main loop.
+
+        Args:
+            pipelined: Update and render on separate threads (defaults to
+                self.pipelined)
+        """
         if not self.renderer:
             logger.error("Renderer not initialized")
             return
 
+        if pipelined is None:
+            pipelined = self.pipelined
+
         self.running = True
         self.last_frame_time = time.time()
+        self.timings.reset()
+
+        if pipelined:
+            self._run_pipelined()
+            return
 
         logger.info("Starting main loop")
 
@@ -368,24 +401,17 @@ class Application:
                 delta_time = min(delta_time, 0.1)
 
                 # Process events
-                self._process_events()
+                with self.timings.stage('main', 'events'):
+                    self._process_events()
 
                 # Update active module
-                if self.active_module_id:
-                    try:
-                        module = self.module_registry.loaded_modules.get(self.active_module_id)
-                        if module:
-                            if hasattr(module, 'update') and callable(module.update):
-                                module.update(delta_time)
-                            else:
-                                self.module_registry.update_module(self.active_module_id, delta_time)
-                    except Exception as e:
-                        logger.error(f"Error updating module {self.active_module_id}: {e}")
-                        # Don't crash - continue to render
+                with self.timings.stage('main', 'update'):
+                    self._update_module(delta_time)
 
                 # Render
                 try:
-                    self._render()
+                    with self.timings.stage('main', 'render'):
+                        self._render()
                 except Exception as e:
                     logger.error(f"Error rendering: {e}")
                     # Try to at least clear and present to avoid frozen screen
@@ -420,53 +446,222 @@ class Application:
                 time.sleep(0.1)
 
         logger.info(f"Main loop ended after {self.frame_count} frames")
-        
+
+    def _run_pipelined(self):
+        """Run the render loop while a simulation thread updates the module.
+
+        This thread pumps renderer events into the input queue, replays the
+        latest frame snapshot and presents it. Event handlers, module updates
+        and module rendering (recorded into a FrameRecorder) run on the
+        simulation thread.
+        """
+        self.snapshots = SnapshotBuffer()
+        self._input_queue.clear()
+
+        simulation = threading.Thread(target=self._simulation_loop, name="simulation", daemon=True)
+        simulation.start()
+        logger.info(f"Starting pipelined main loop ({self.tick_rate} ticks/s)")
+
+        version = 0
+        error_count = 0
+        max_consecutive_errors = 10
+
+        while self.running and self.renderer.is_running():
+            try:
+                current_time = time.time()
+
+                # Queue events for the next tick
+                with self.timings.stage('render', 'events'):
+                    self._input_queue.extend(self._collect_events())
+
+                # Present the newest snapshot; skip the frame if nothing changed
+                version, snapshot = self.snapshots.latest(version, timeout=self.frame_time)
+                if snapshot is not None:
+                    try:
+                        with self.timings.stage('render', 'render'):
+                            self._render_snapshot(snapshot)
+                    except Exception as e:
+                        logger.error(f"Error rendering snapshot {snapshot.tick}: {e}")
+
+                    self.last_frame_time = current_time
+                    self.frame_count += 1
+
+                # Cap frame rate
+                elapsed = time.time() - current_time
+                if elapsed < self.frame_time:
+                    time.sleep(self.frame_time - elapsed)
+
+                error_count = 0
+
+            except Exception as e:
+                error_count += 1
+                logger.error(f"Error in render loop (frame {self.frame_count}): {e}")
+
+                if error_count >= max_consecutive_errors:
+                    logger.critical(f"Too many consecutive errors ({error_count}), stopping main loop")
+                    self.running = False
+                    break
+
+                time.sleep(0.1)
+
+        self.running = False
+        simulation.join(timeout=1.0)
+        logger.info(f"Pipelined main loop ended after {self.frame_count} frames "
+                    f"({self.snapshots.get_stats()['dropped']} snapshots dropped)")
+
+    def _simulation_loop(self):
+        """Process input, update the module and build frames at tick_rate."""
+        tick_time = 1.0 / max(1, self.tick_rate)
+        width, height = self.renderer.get_size()
+        recorder = FrameRecorder(width, height, self.renderer)
+        last_tick = time.time()
+        tick = 0
+
+        error_count = 0
+        max_consecutive_errors = 10
+
+        while self.running:
+            tick_start = time.time()
+            delta_time = min(tick_start - last_tick, 0.1)
+            last_tick = tick_start
+
+            try:
+                # Take the events that arrived since the last tick
+                events = []
+                while self._input_queue:
+                    events.append(self._input_queue.popleft())
+
+                now = now_ns()
+                latency = (now - events[0]['timestamp_ns']) / 1e9 if events else 0.0
+                for event in events:
+                    self.timings.add_input_latency((now - event['timestamp_ns']) / 1e9)
+
+                with self.timings.stage('simulation', 'events'):
+                    self._dispatch_events(events)
+
+                with self.timings.stage('simulation', 'update'):
+                    self._update_module(delta_time)
+
+                with self.timings.stage('simulation', 'build'):
+                    recorder.clear(self.background_color)
+                    self._render_module(recorder)
+                    commands = recorder.take()
+                    frame = get_frame_clock().frame_built()
+
+                self.snapshots.publish(FrameSnapshot(tick, frame, tick_start, commands, len(events), latency))
+                tick += 1
+                error_count = 0
+
+            except Exception as e:
+                recorder.take()
+                error_count += 1
+                logger.error(f"Error in simulation loop (tick {tick}): {e}")
+
+                if error_count >= max_consecutive_errors:
+                    logger.critical(f"Too many consecutive errors ({error_count}), stopping main loop")
+                    self.running = False
+                    break
+
+            elapsed = time.time() - tick_start
+            if elapsed < tick_time:
+                time.sleep(tick_time - elapsed)
+
     def _process_events(self):
         """Process events from the renderer."""
+        self._dispatch_events(self._collect_events())
+
+    def _collect_events(self) -> List[Dict[str, Any]]:
+        """Get pending events from the renderer, stamped with their arrival time.
+
+        Returns:
+            List of event dictionaries with a 'timestamp_ns' (time.perf_counter_ns())
+        """
         events = self.renderer.process_events()
+        now = now_ns()
+        for event in events:
+            stamp_event(event, now)
+        return events
+
+    def _dispatch_events(self, events: List[Dict[str, Any]]):
+        """Dispatch events to the event handlers and the active module.
 
+        Args:
+            events: Event dictionaries
+        """
         for event in events:
-            event_type = event.get('type')
-
-            # Dispatch to handlers
-            if event_type in self.event_handlers:
-                for handler in self.event_handlers[event_type]:
-                    handler(event)
-
-            # Handle module events
-            if self.active_module_id:
-                module = self.module_registry.loaded_modules.get(self.active_module_id)
-                if module:
-                    # Handle mouse click events - prefer handle_click over trigger_event
-                    if event_type == 'mouse_down':
-                        pos = event.get('pos', (0, 0))
-                        if hasattr(module, 'handle_click') and callable(module.handle_click):
-                            module.handle_click(pos)
-                        elif hasattr(module, 'trigger_event') and callable(module.trigger_event):
-                            module.trigger_event(event_type, event)
-                    elif event_type in ['mouse_up', 'key_down', 'key_up']:
-                        # Other events still use trigger_event if available
-                        if hasattr(module, 'trigger_event') and callable(module.trigger_event):
-                            module.trigger_event(event_type, event)
-                    
-    def _render(self):
-        """Render the current frame."""
-        # Clear screen
-        self.renderer.clear(self.background_color)
+            with dispatching(event):
+                self._dispatch_event(event)
 
-        # Render active module
+    def _dispatch_event(self, event: Dict[str, Any]):
+        """Dispatch one event to the event handlers and the active module.
+
+        Args:
+            event: Event dictionary
+        """
+        event_type = event.get('type')
+
+        # Dispatch to handlers
+        if event_type in self.event_handlers:
+            for handler in self.event_handlers[event_type]:
+                handler(event)
+
+        # Handle module events
         if self.active_module_id:
-            # Try to get the module and call render() directly
             module = self.module_registry.loaded_modules.get(self.active_module_id)
             if module:
-                # Call render() directly if the module has it
-                if hasattr(module, 'render') and callable(module.render):
-                    module.render(self.renderer)
+                # Handle mouse click events - prefer handle_click over trigger_event
+                if event_type == 'mouse_down':
+                    pos = event.get('pos', (0, 0))
+                    if hasattr(module, 'handle_click') and callable(module.handle_click):
+                        module.handle_click(pos)
+                    elif hasattr(module, 'trigger_event') and callable(module.trigger_event):
+                        module.trigger_event(event_type, event)
+                elif event_type in ['mouse_up', 'key_down', 'key_up']:
+                    # Other events still use trigger_event if available
+                    if hasattr(module, 'trigger_event') and callable(module.trigger_event):
+                        module.trigger_event(event_type, event)
+
+    def _update_module(self, delta_time: float):
+        """Update the active module.
+
+        Args:
+            delta_time: Seconds since the last update
+        """
+        if not self.active_module_id:
+            return
+
+        try:
+            module = self.module_registry.loaded_modules.get(self.active_module_id)
+            if module:
+                if hasattr(module, 'update') and callable(module.update):
+                    module.update(delta_time)
                 else:
-                    # Fallback to trigger_event for legacy modules
-                    self.module_registry.render_module(self.active_module_id, self.renderer)
+                    self.module_registry.update_module(self.active_module_id, delta_time)
+        except Exception as e:
+            logger.error(f"Error updating module {self.active_module_id}: {e}")
+            # Don't crash - continue to render
 
-        # Render FPS if enabled
+    def _render_module(self, renderer):
+        """Draw the active module.
+
+        Args:
+            renderer: Renderer (or FrameRecorder) to draw with
+        """
+        if not self.active_module_id:
+            return
+
+        # Try to get the module and call render() directly
+        module = self.module_registry.loaded_modules.get(self.active_module_id)
+        if module:
+            # Call render() directly if the module has it
+            if hasattr(module, 'render') and callable(module.render):
+                module.render(renderer)
+            else:
+                # Fallback to trigger_event for legacy modules
+                self.module_registry.render_module(self.active_module_id, renderer)
+
+    def _render_fps(self):
+        """Draw the FPS counter if enabled."""
         if self.show_fps:
             fps = 1.0 / max(0.001, time.time() - self.last_frame_time)
             self.renderer.draw_text(
@@ -476,8 +671,31 @@ class Application:
                 "left"
             )
 
+    def _render_snapshot(self, snapshot: FrameSnapshot):
+        """Replay a frame snapshot and present it.
+
+        Args:
+            snapshot: Snapshot published by the simulation thread
+        """
+        replay(snapshot.commands, self.renderer)
+        self._render_fps()
+        self.renderer.present()
+        get_frame_clock().frame_presented(self.renderer.get_last_present_ns(), build=snapshot.frame)
+
+    def _render(self):
+        """Render the current frame."""
+        # Clear screen
+        self.renderer.clear(self.background_color)
+
+        # Render active module
+        self._render_module(self.renderer)
+
+        # Render FPS if enabled
+        self._render_fps()
+
         # Present the frame
         self.renderer.present()
+        get_frame_clock().frame_presented(self.renderer.get_last_present_ns())
         
     def shutdown(self):
         """Shut down the application."""
@@ -509,6 +727,24 @@ class Application:
         """
         self.background_color = color
         
+    def set_tick_rate(self, tick_rate: int):
+        """Set the simulation ticks per second used in pipelined mode.
+
+        Args:
+            tick_rate: Target ticks per second
+        """
+        self.tick_rate = max(1, tick_rate)
+
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Get per-stage timings and how much the update and render threads overlap.
+
+        Returns:
+            Dictionary of PipelineTimings statistics plus snapshot counts
+        """
+        stats = self.timings.get_stats()
+        stats['snapshots'] = self.snapshots.get_stats()
+        return stats
+
     def toggle_fps_display(self):
         """Toggle FPS display."""
         self.show_fps = not self.show_fps
@@ -10,16 +10,96 @@ import socketio
 import time
 import logging
 import json
+import zlib
+import base64
 import threading
-import queue
+from collections import deque
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Callable, List, Tuple
-from . import MESSAGE_TYPES, PROTOCOL_VERSION, apply_delta
+from . import MESSAGE_TYPES, PROTOCOL_VERSION
+from .state_patch import PatchEngine
+from .input_timing import SENT_KEY, input_timestamp_ns, now_ns, stamp_event
+from .stream_codec import StreamCodec, StreamDesyncError
+from .compression_dictionary import get_dictionary_registry
 
 # Setup logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# Upper bounds (in milliseconds) of the round-trip latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of round-trip latencies."""
+    
+    def __init__(self, buckets_ms: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        """Initialize the histogram.
+        
+        Args:
+            buckets_ms: Sorted upper bounds of the buckets in milliseconds
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # Last bucket is overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def record(self, latency_ms: float) -> None:
+        """Record a latency sample.
+        
+        Args:
+            latency_ms: Latency in milliseconds
+        """
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if latency_ms <= bound:
+                index = i
+                break
+        
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+    
+    def percentile(self, percent: float) -> float:
+        """Estimate a percentile from the bucket counts.
+        
+        Args:
+            percent: Percentile between 0 and 100
+            
+        Returns:
+            Upper bound of the bucket containing the percentile, in milliseconds
+        """
+        if self.count == 0:
+            return 0.0
+        
+        target = self.count * percent / 100.0
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the histogram as a serializable dictionary.
+        
+        Returns:
+            Dictionary with bucket counts and summary values
+        """
+        labels = [f"<={bound}ms" for bound in self.buckets_ms]
+        labels.append(f">{self.buckets_ms[-1]}ms")
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+        }
+
 
 class BaseClient(ABC):
     """Base class for all MetaMindIQTrain clients.
@@ -40,14 +120,25 @@ class BaseClient(ABC):
         self.sio = socketio.Client(reconnection=True, reconnection_attempts=10, 
                                    reconnection_delay=1, reconnection_delay_max=5)
         self.state = {}
+        self.patch_engine = PatchEngine(self.state)
         self.session_id = None
         self.user_id = None
         self.connected = False
         self.callbacks = {}
         self.last_state_version = 0
-        self.pending_state_updates = queue.Queue()
-        self.message_queue = queue.Queue()
-        self.outbound_queue = queue.Queue()
+        
+        # Compression agreed with the server for state updates
+        self.compression_dictionary = None
+        self.stream_codec = None
+        
+        # Inbound and outbound queues, each guarded by a condition so the
+        # processor threads sleep until there is work and drain it in one go
+        self.pending_state_updates = deque()
+        self.message_queue = deque()
+        self.outbound_queue = deque()
+        self._inbound_condition = threading.Condition()
+        self._outbound_condition = threading.Condition()
+        
         self.last_server_communication = 0
         self.connection_timeout = 10  # seconds
         self.message_processor_active = False
@@ -59,8 +150,13 @@ class BaseClient(ABC):
             "state_deltas": 0,
             "last_ping": 0,
             "avg_latency": 0,
-            "reconnections": 0
+            "reconnections": 0,
+            "inbound_wakeups": 0,
+            "outbound_wakeups": 0,
+            "coalesced_messages": 0,
+            "resyncs_requested": 0
         }
+        self.latency_histogram = LatencyHistogram()
         
         # Register socket.io event handlers
         self._register_event_handlers()
@@ -80,6 +176,7 @@ class BaseClient(ABC):
         self.sio.on('state_delta', self._on_state_delta)
         self.sio.on('round_completed', self._on_round_completed)
         self.sio.on('input_processed', self._on_input_processed)
+        self.sio.on('input_result', self._on_input_processed)
         self.sio.on('sequence', self._on_sequence)
         self.sio.on('session_ended', self._on_session_ended)
     
@@ -122,24 +219,69 @@ class BaseClient(ABC):
         except Exception as e:
             self.logger.error(f"Disconnect error: {str(e)}")
     
-    def join_session(self, session_id: str, user_id: str) -> None:
+    def stop_processing(self) -> None:
+        """Stop the inbound and outbound processor threads."""
+        with self._inbound_condition:
+            self.message_processor_active = False
+            self._inbound_condition.notify_all()
+        with self._outbound_condition:
+            self.outbound_processor_active = False
+            self._outbound_condition.notify_all()
+    
+    def create_session(self, module_id: str, user_id: str,
+                       parameters: Optional[Dict[str, Any]] = None) -> None:
+        """Create a training session and join it.
+        
+        Args:
+            module_id: ID of the module to train with
+            user_id: ID of the user
+            parameters: Module parameters
+        """
+        self.user_id = user_id
+        self._queue_outbound_message('create_session', {
+            'module_id': module_id,
+            'user_id': user_id,
+            'parameters': parameters or {},
+            'compression': self._compression_offer()
+        })
+    
+    def join_session(self, session_id: str, user_id: str, resume: bool = False) -> None:
         """Join a training session.
         
         Args:
             session_id: ID of the session to join
             user_id: ID of the user joining
+            resume: Rejoin after a reconnect; the server sends a delta from
+                the last state version we hold instead of a full state
         """
         self.session_id = session_id
         self.user_id = user_id
         
-        # Queue message for reliable delivery
-        self._queue_outbound_message('join_session', {
+        message = {
             'session_id': session_id,
             'user_id': user_id,
             'client_info': {
                 'type': self.__class__.__name__,
                 'protocol_version': PROTOCOL_VERSION
-            }
+            },
+            'compression': self._compression_offer()
+        }
+        if resume and self.last_state_version and not self.patch_engine.needs_resync:
+            message['last_version'] = self.last_state_version
+        
+        # Queue message for reliable delivery
+        self._queue_outbound_message('join_session', message)
+    
+    def request_resync(self) -> None:
+        """Ask the server for a full state, e.g. after a checksum mismatch."""
+        if not self.session_id:
+            return
+        
+        self.stats["resyncs_requested"] += 1
+        self.patch_engine.needs_resync = False
+        self._queue_outbound_message('get_state', {
+            'session_id': self.session_id,
+            'full_state': True
         })
     
     def end_session(self) -> None:
@@ -183,9 +325,11 @@ class BaseClient(ABC):
             self.logger.warning("Cannot process input: No active session")
             return
             
-        # Add timestamp for response time calculation
+        # Add timestamps for response time calculation; timestamp_ns is the
+        # arrival stamp of the input event being dispatched, if any
         if 'timestamp' not in input_data:
             input_data['timestamp'] = time.time()
+        stamp_event(input_data, input_timestamp_ns())
             
         self._queue_outbound_message('process_input', {
             'session_id': self.session_id,
@@ -235,9 +379,13 @@ class BaseClient(ABC):
         self.last_server_communication = time.time()
         self.logger.info("Connected to server")
         
-        # If reconnecting, rejoin the session
+        # Wake the outbound processor for messages queued while offline
+        with self._outbound_condition:
+            self._outbound_condition.notify()
+        
+        # If reconnecting, rejoin the session where we left off
         if self.session_id and self.user_id:
-            self.join_session(self.session_id, self.user_id)
+            self.join_session(self.session_id, self.user_id, resume=True)
             
         self.on_connect()
     
@@ -252,9 +400,9 @@ class BaseClient(ABC):
         self.stats["reconnections"] += 1
         self.logger.info("Reconnected to server")
         
-        # If we had an active session, rejoin it
+        # If we had an active session, rejoin it from our last version
         if self.session_id and self.user_id:
-            self.join_session(self.session_id, self.user_id)
+            self.join_session(self.session_id, self.user_id, resume=True)
     
     def _on_connected(self, data: Dict[str, Any]) -> None:
         """Handle successful connection confirmation from server."""
@@ -267,12 +415,14 @@ class BaseClient(ABC):
         Args:
             data: Session data
         """
+        data = self._decode_payload(data)
         self.logger.info(f"Joined session: {data.get('session_id')}")
         self.session_id = data.get('session_id')
         self.last_server_communication = time.time()
+        self._set_compression(data.get('compression_dictionary'), data.get('stream', False))
         
         # Queue for processing
-        self.message_queue.put(('session_joined', data))
+        self._queue_inbound_message('session_joined', data)
         
         self.on_session_joined(data)
     
@@ -282,14 +432,21 @@ class BaseClient(ABC):
         Args:
             data: State data
         """
+        data = self._decode_payload(data)
         self.last_server_communication = time.time()
+        
+        # Updates from the server's state manager carry a full state or a delta
+        if 'is_compressed' in data:
+            self._on_synchronized_update(data)
+            return
+        
         self.stats["state_updates"] += 1
         
         # Track state version
         new_version = data.get('state_version', 0)
         if new_version > self.last_state_version:
             # Queue for processing
-            self.pending_state_updates.put(('full', new_version, data))
+            self._queue_state_update('full', new_version, data)
             self.last_state_version = new_version
         
         self.on_state_update(data)
@@ -300,6 +457,7 @@ class BaseClient(ABC):
         Args:
             data: Delta state data
         """
+        data = self._decode_payload(data)
         self.last_server_communication = time.time()
         self.stats["state_deltas"] += 1
         
@@ -307,7 +465,7 @@ class BaseClient(ABC):
         new_version = data.get('state_version', 0)
         if new_version > self.last_state_version:
             # Queue for processing
-            self.pending_state_updates.put(('delta', new_version, data))
+            self._queue_state_update('delta', new_version, data)
             self.last_state_version = new_version
         
         self.on_state_delta(data)
@@ -321,13 +479,10 @@ class BaseClient(ABC):
         self.last_server_communication = time.time()
         
         # Calculate latency
-        if 'timestamp' in data:
-            latency = time.time() - data['timestamp']
-            # Update exponential moving average
-            self.stats["avg_latency"] = 0.9 * self.stats["avg_latency"] + 0.1 * latency
+        self._record_latency(data)
         
         # Queue for processing
-        self.message_queue.put(('round_completed', data))
+        self._queue_inbound_message('round_completed', data)
         
         self.on_round_completed(data)
     
@@ -340,13 +495,10 @@ class BaseClient(ABC):
         self.last_server_communication = time.time()
         
         # Calculate latency
-        if 'request_timestamp' in data:
-            latency = time.time() - data['request_timestamp']
-            # Update exponential moving average
-            self.stats["avg_latency"] = 0.9 * self.stats["avg_latency"] + 0.1 * latency
+        self._record_latency(data)
         
         # Queue for processing
-        self.message_queue.put(('input_processed', data))
+        self._queue_inbound_message('input_processed', data)
         
         self.on_input_processed(data)
     
@@ -359,7 +511,7 @@ class BaseClient(ABC):
         self.last_server_communication = time.time()
         
         # Queue for processing
-        self.message_queue.put(('sequence', data))
+        self._queue_inbound_message('sequence', data)
         
         self.on_sequence(data)
     
@@ -369,13 +521,14 @@ class BaseClient(ABC):
         Args:
             data: Session end data
         """
+        data = self._decode_payload(data)
         self.last_server_communication = time.time()
         
         # Reset session
         self.session_id = None
         
         # Queue for processing
-        self.message_queue.put(('session_ended', data))
+        self._queue_inbound_message('session_ended', data)
         
         self.on_session_ended(data)
     
@@ -389,78 +542,302 @@ class BaseClient(ABC):
         self.logger.error(f"Server error: {data.get('message', 'Unknown error')}")
         
         # Queue for processing
-        self.message_queue.put(('error', data))
+        self._queue_inbound_message('error', data)
         
         self.on_error(data)
     
+    @staticmethod
+    def _decode_payload(data: Any) -> Any:
+        """Decode a payload broadcast as serialized JSON bytes.
+        
+        Args:
+            data: Event data as received
+            
+        Returns:
+            The decoded payload
+        """
+        if isinstance(data, (bytes, bytearray)):
+            return json.loads(data)
+        return data
+    
+    def _on_synchronized_update(self, message: Dict[str, Any]) -> None:
+        """Handle a state update sent by the server's state manager.
+        
+        Args:
+            message: Message with data, is_delta and is_compressed
+        """
+        data = self._decode_state_message(message)
+        if data is None:
+            return
+        
+        is_delta = bool(message.get('is_delta'))
+        self.stats["state_deltas" if is_delta else "state_updates"] += 1
+        
+        # A full state always applies, e.g. a resync at an unchanged version
+        version = data.get('_meta', {}).get('version', 0)
+        if not is_delta or version > self.last_state_version:
+            self._queue_state_update('delta' if is_delta else 'full', version, data)
+            self.last_state_version = version
+        
+        if is_delta:
+            self.on_state_delta(data)
+        else:
+            self.on_state_update(data)
+    
+    def _compression_offer(self) -> Dict[str, Any]:
+        """Describe the compression this client can decode.
+        
+        Returns:
+            Streaming support and the preset dictionaries held (module id
+            -> versions)
+        """
+        return {
+            'stream': True,
+            'dictionaries': get_dictionary_registry().available()
+        }
+    
+    def _set_compression(self, dictionary: Optional[Dict[str, Any]], stream: bool) -> None:
+        """Prepare to decode updates compressed as agreed with the server.
+        
+        Args:
+            dictionary: Agreed preset dictionary ({key, module_id, version}),
+                or None
+            stream: Whether the server streams compressed updates
+        """
+        key = dictionary.get('key') if dictionary else None
+        self.compression_dictionary = get_dictionary_registry().get_by_key(key) if key else None
+        self.stream_codec = StreamCodec(dictionary=self.compression_dictionary) if stream else None
+    
+    def _decode_state_message(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Decode the data of a state manager update.
+        
+        A message that cannot be decoded (e.g. a missed stream message)
+        triggers a resync, which also restarts the stream.
+        
+        Args:
+            message: Message with data, is_compressed and, for compressed
+                data, dictionary or stream_seq
+            
+        Returns:
+            The full state or delta including its _meta, or None
+        """
+        data = message.get('data')
+        try:
+            if not message.get('is_compressed'):
+                return json.loads(data) if isinstance(data, str) else data
+            
+            payload = base64.b64decode(data)
+            if 'stream_seq' in message:
+                if self.stream_codec is None:
+                    raise StreamDesyncError("No compression stream was agreed")
+                payload = self.stream_codec.decompress(payload, message['stream_seq'])
+            elif message.get('dictionary'):
+                dictionary = self.compression_dictionary
+                if dictionary is None or dictionary.key != message['dictionary']:
+                    dictionary = get_dictionary_registry().get_by_key(message['dictionary'])
+                if dictionary is None:
+                    raise ValueError(f"Compression dictionary {message['dictionary']} is not available")
+                payload = dictionary.decompress(payload)
+            else:
+                payload = zlib.decompress(payload)
+            return json.loads(payload)
+        except (ValueError, zlib.error) as e:
+            self.logger.warning(f"Cannot decode state update: {str(e)}")
+            self.request_resync()
+            return None
+    
+    def _record_latency(self, data: Dict[str, Any]) -> None:
+        """Record the round-trip latency of a message we sent.
+        
+        The server echoes the client_time we stamped on the request, so the
+        round trip is measured on this client's clock alone.
+        
+        Args:
+            data: Response data from the server
+        """
+        sent_time = data.get('client_time')
+        if not isinstance(sent_time, (int, float)):
+            return
+        latency = time.perf_counter() - sent_time
+        if latency < 0:
+            return
+        
+        # Update exponential moving average
+        self.stats["avg_latency"] = 0.9 * self.stats["avg_latency"] + 0.1 * latency
+        self.latency_histogram.record(latency * 1000)
+    
+    def _queue_state_update(self, update_type: str, version: int, data: Dict[str, Any]) -> None:
+        """Queue a state update and wake the message processor.
+        
+        Args:
+            update_type: 'full' or 'delta'
+            version: State version
+            data: State data
+        """
+        with self._inbound_condition:
+            self.pending_state_updates.append((update_type, version, data))
+            self._inbound_condition.notify()
+    
+    def _queue_inbound_message(self, message_type: str, data: Dict[str, Any]) -> None:
+        """Queue an inbound message and wake the message processor.
+        
+        Args:
+            message_type: Message type
+            data: Message data
+        """
+        with self._inbound_condition:
+            self.message_queue.append((message_type, data))
+            self._inbound_condition.notify()
+    
+    def _has_inbound_work(self) -> bool:
+        """Check whether the message processor should wake up."""
+        return (bool(self.pending_state_updates) or bool(self.message_queue)
+                or not self.message_processor_active)
+    
     def _process_incoming_messages(self) -> None:
-        """Process incoming messages in a separate thread."""
+        """Process incoming messages in a separate thread.
+        
+        The thread blocks until a message arrives and then drains everything
+        that is pending, applying state updates before other messages to
+        maintain state integrity.
+        """
         self.logger.info("Starting message processor thread")
         while self.message_processor_active:
+            with self._inbound_condition:
+                self._inbound_condition.wait_for(self._has_inbound_work)
+                state_updates = list(self.pending_state_updates)
+                self.pending_state_updates.clear()
+                messages = list(self.message_queue)
+                self.message_queue.clear()
+            
+            self.stats["inbound_wakeups"] += 1
+            
             try:
-                # Process pending state updates first to maintain state integrity
-                if not self.pending_state_updates.empty():
-                    update_type, version, data = self.pending_state_updates.get(block=False)
-                    
-                    if update_type == 'full':
-                        # Replace entire state
-                        self.state = data
-                    elif update_type == 'delta':
-                        # Apply delta to existing state
-                        self.state = apply_delta(self.state, data)
-                    
-                    self.logger.debug(f"Applied state update, version: {version}")
-                    self.pending_state_updates.task_done()
-                
-                # Process other messages
-                if not self.message_queue.empty():
-                    message_type, data = self.message_queue.get(block=False)
-                    self.stats["messages_received"] += 1
-                    
-                    # Custom processing for each message type
-                    if message_type == 'round_completed':
-                        # Update round counter in local state
-                        if 'round' in data and self.state:
-                            self.state['round'] = data['round']
-                    
-                    self.message_queue.task_done()
-                    
-                # Small sleep to prevent CPU hogging
-                time.sleep(0.01)
-            except queue.Empty:
-                # Queue is empty, just wait
-                time.sleep(0.05)
+                self._apply_state_updates(state_updates)
             except Exception as e:
-                self.logger.error(f"Error processing messages: {str(e)}")
-                time.sleep(0.1)
+                self.logger.error(f"Error applying state updates: {str(e)}")
+            
+            for message_type, data in messages:
+                try:
+                    self._handle_inbound_message(message_type, data)
+                except Exception as e:
+                    self.logger.error(f"Error processing messages: {str(e)}")
+    
+    def _apply_state_updates(self, updates: List[Tuple[str, int, Dict[str, Any]]]) -> None:
+        """Apply queued state updates.
+        
+        Updates older than the newest queued full state are dropped and the
+        remaining deltas are merged into one copy-on-write patch, so a client
+        that falls behind catches up in a single step.
+        
+        Args:
+            updates: List of (update_type, version, data) tuples
+        """
+        if not updates:
+            return
+        
+        # Keep the engine in sync with direct assignments to self.state
+        self.patch_engine.state = self.state
+        self.state = self.patch_engine.apply(updates)
+        
+        # The server's checksum did not match our state
+        if self.patch_engine.needs_resync:
+            self.request_resync()
+        
+        self.logger.debug(f"Applied {len(updates)} state updates, version: {self.patch_engine.version}")
+    
+    def _handle_inbound_message(self, message_type: str, data: Dict[str, Any]) -> None:
+        """Handle a queued non-state message.
+        
+        Args:
+            message_type: Message type
+            data: Message data
+        """
+        self.stats["messages_received"] += 1
+        
+        # Custom processing for each message type
+        if message_type == 'round_completed':
+            # Update round counter in local state
+            if 'round' in data and self.state:
+                self.state['round'] = data['round']
+    
+    def _has_outbound_work(self) -> bool:
+        """Check whether the outbound processor should wake up."""
+        return (bool(self.outbound_queue) and self.connected) or not self.outbound_processor_active
     
     def _process_outbound_messages(self) -> None:
-        """Process outbound messages in a separate thread for reliable delivery."""
+        """Process outbound messages in a separate thread for reliable delivery.
+        
+        The thread blocks until there are messages and the client is
+        connected, then sends everything pending with bursts coalesced.
+        """
         self.logger.info("Starting outbound message processor thread")
         while self.outbound_processor_active:
-            try:
-                if not self.outbound_queue.empty() and self.connected:
-                    event, data = self.outbound_queue.get(block=False)
-                    
-                    # Add timestamp for latency tracking
-                    if 'timestamp' not in data:
-                        data['timestamp'] = time.time()
-                    
+            with self._outbound_condition:
+                self._outbound_condition.wait_for(self._has_outbound_work)
+                messages = list(self.outbound_queue)
+                self.outbound_queue.clear()
+            
+            if not messages:
+                continue
+            
+            self.stats["outbound_wakeups"] += 1
+            batch = self._coalesce_outbound(messages)
+            self.stats["coalesced_messages"] += len(messages) - len(batch)
+            
+            for index, (event, data) in enumerate(batch):
+                # Add timestamp; client_time is echoed back for latency tracking
+                if 'timestamp' not in data:
+                    data['timestamp'] = time.time()
+                data['client_time'] = time.perf_counter()
+                if event == 'process_input':
+                    # Lets the server rebase the inputs' timestamp_ns onto its clock
+                    data[SENT_KEY] = now_ns()
+                
+                try:
                     # Send the message
                     self.sio.emit(event, data)
-                    self.stats["messages_sent"] += 1
-                    self.last_server_communication = time.time()
-                    
-                    self.outbound_queue.task_done()
-                    
-                # Small sleep to prevent CPU hogging
-                time.sleep(0.01)
-            except queue.Empty:
-                # Queue is empty, just wait
-                time.sleep(0.05)
-            except Exception as e:
-                self.logger.error(f"Error sending messages: {str(e)}")
-                time.sleep(0.1)
+                except Exception as e:
+                    self.logger.error(f"Error sending messages: {str(e)}")
+                    # Put unsent messages back at the front for retry
+                    with self._outbound_condition:
+                        self.outbound_queue.extendleft(reversed(batch[index:]))
+                    time.sleep(0.1)
+                    break
+                
+                self.stats["messages_sent"] += 1
+                self.last_server_communication = time.time()
+    
+    @staticmethod
+    def _coalesce_outbound(messages: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Coalesce a burst of outbound messages.
+        
+        Consecutive process_input messages for the same session are merged
+        into one emit carrying all inputs in order under 'inputs' ('input'
+        holds the latest for servers that only read a single input).
+        Identical consecutive get_state requests are sent once.
+        
+        Args:
+            messages: List of (event, data) tuples in queue order
+            
+        Returns:
+            Coalesced list of (event, data) tuples
+        """
+        batch = []
+        for event, data in messages:
+            if batch:
+                last_event, last_data = batch[-1]
+                if (event == last_event == 'process_input' and
+                        data.get('session_id') == last_data.get('session_id')):
+                    if 'inputs' not in last_data:
+                        last_data['inputs'] = [last_data['input']]
+                    last_data['inputs'].append(data['input'])
+                    last_data['input'] = data['input']
+                    continue
+                if event == last_event == 'get_state' and data == last_data:
+                    continue
+            batch.append((event, dict(data)))
+        return batch
     
     def _queue_outbound_message(self, event: str, data: Dict[str, Any]) -> None:
         """Queue a message for reliable delivery.
@@ -469,7 +846,9 @@ class BaseClient(ABC):
             event: Event name
             data: Event data
         """
-        self.outbound_queue.put((event, data))
+        with self._outbound_condition:
+            self.outbound_queue.append((event, data))
+            self._outbound_condition.notify()
     
     def _ping_server(self) -> None:
         """Send periodic pings to keep connection alive."""
@@ -509,8 +888,15 @@ class BaseClient(ABC):
             "state_updates": self.stats["state_updates"],
             "state_deltas": self.stats["state_deltas"],
             "avg_latency_ms": self.stats["avg_latency"] * 1000,
+            "latency_histogram": self.latency_histogram.to_dict(),
             "last_server_communication_s": time.time() - self.last_server_communication,
-            "reconnections": self.stats["reconnections"]
+            "reconnections": self.stats["reconnections"],
+            "inbound_wakeups": self.stats["inbound_wakeups"],
+            "outbound_wakeups": self.stats["outbound_wakeups"],
+            "coalesced_messages": self.stats["coalesced_messages"],
+            "resyncs_requested": self.stats["resyncs_requested"],
+            "pending_outbound": len(self.outbound_queue),
+            "state_patches": self.patch_engine.get_stats()
         }
     
     @abstractmethod
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Compact Components for MetaMindIQTrain
+
+A memory-lean component representation for views that build hundreds of
+components per frame (grid cells, piano keys, fretboard positions).
+
+Key features:
+1. __slots__ components with integer ids instead of UUID strings
+2. Interned styles: identical style dicts are stored once in a StyleTable
+   and components reference them by index
+3. Struct-of-arrays layout: x/y/width/height live in numpy arrays owned by
+   a LayoutStore, so hit-testing, translation and batch rendering are
+   vectorized
+4. to_dict output in the unified_component_system format
+
+A CompactTree is meant to be cleared and rebuilt every frame: clearing keeps
+the arrays and the style table, so a steady-state rebuild allocates only
+the component objects themselves.
+"""
+
+import sys
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Initial number of layout slots
+DEFAULT_CAPACITY = 256
+
+# Node keys that are not props when converting dictionary trees
+_LAYOUT_KEYS = ('x', 'y', 'width', 'height')
+_NODE_KEYS = frozenset(('type', 'id', 'props', 'style', 'layout', 'children', 'properties') + _LAYOUT_KEYS)
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a style value to a hashable key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class StyleTable:
+    """Interned style dictionaries.
+
+    Style 0 is always the empty style. The stored dictionaries are shared
+    between components and must not be modified.
+    """
+
+    def __init__(self):
+        """Initialize the table."""
+        self._styles: List[Dict[str, Any]] = [{}]
+        self._ids: Dict[tuple, int] = {(): 0}
+
+    def intern(self, style: Optional[Dict[str, Any]]) -> int:
+        """Get the id of a style, adding it if it is new.
+
+        Args:
+            style: Style dictionary
+
+        Returns:
+            Style id
+        """
+        if not style:
+            return 0
+
+        # Views build their styles in a fixed key order, so the items tuple
+        # usually finds the style without canonicalizing it
+        try:
+            fast_key = tuple(style.items())
+            style_id = self._ids.get(fast_key)
+        except TypeError:
+            fast_key = style_id = None
+        if style_id is not None:
+            return style_id
+
+        key = tuple(sorted((k, _freeze(v)) for k, v in style.items()))
+        style_id = self._ids.get(key)
+        if style_id is None:
+            style_id = len(self._styles)
+            self._styles.append({sys.intern(k): v for k, v in style.items()})
+            self._ids[key] = style_id
+        if fast_key is not None:
+            self._ids[fast_key] = style_id
+        return style_id
+
+    def get(self, style_id: int) -> Dict[str, Any]:
+        """Get a style by id.
+
+        Args:
+            style_id: Style id
+
+        Returns:
+            Shared style dictionary
+        """
+        return self._styles[style_id]
+
+    def __len__(self) -> int:
+        return len(self._styles)
+
+
+class LayoutStore:
+    """Struct-of-arrays storage of component bounds."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Initialize the store.
+
+        Args:
+            capacity: Initial number of slots (grown by doubling)
+        """
+        self.size = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.width = np.zeros(capacity, dtype=np.float32)
+        self.height = np.zeros(capacity, dtype=np.float32)
+
+    @property
+    def capacity(self) -> int:
+        """Number of allocated slots."""
+        return len(self.x)
+
+    def allocate(self, x: float, y: float, width: float, height: float) -> int:
+        """Store the bounds of a new component.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            width: Width
+            height: Height
+
+        Returns:
+            Slot index
+        """
+        slot = self.size
+        if slot == self.capacity:
+            self._grow(self.capacity * 2)
+        self.x[slot] = x
+        self.y[slot] = y
+        self.width[slot] = width
+        self.height[slot] = height
+        self.size = slot + 1
+        return slot
+
+    def _grow(self, capacity: int) -> None:
+        """Enlarge every array to a new capacity."""
+        for name in _LAYOUT_KEYS:
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def contains(self, x: float, y: float) -> np.ndarray:
+        """Test a point against every stored rectangle.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+
+        Returns:
+            Boolean mask over the used slots
+        """
+        n = self.size
+        left = self.x[:n]
+        top = self.y[:n]
+        return (x >= left) & (x < left + self.width[:n]) & (y >= top) & (y < top + self.height[:n])
+
+    def columns(self) -> Tuple[list, list, list, list]:
+        """Get the used part of every array as Python lists.
+
+        Returns:
+            Tuple of (x, y, width, height) lists
+        """
+        n = self.size
+        return (self.x[:n].tolist(), self.y[:n].tolist(),
+                self.width[:n].tolist(), self.height[:n].tolist())
+
+    def translate(self, slots, dx: float, dy: float) -> None:
+        """Move several components at once.
+
+        Args:
+            slots: Slot indices (array, list or slice)
+            dx: X offset
+            dy: Y offset
+        """
+        self.x[slots] += dx
+        self.y[slots] += dy
+
+    def clear(self) -> None:
+        """Forget every slot, keeping the arrays."""
+        self.size = 0
+
+
+class CompactComponent:
+    """A UI component whose layout lives in its tree's LayoutStore."""
+
+    __slots__ = ('tree', 'id', 'key', 'type', 'props', 'style_id', 'children', 'parent')
+
+    def __init__(self, tree: 'CompactTree', slot: int, component_type: str,
+                 key: Optional[str], props: Dict[str, Any], style_id: int):
+        """Initialize the component (use CompactTree.create).
+
+        Args:
+            tree: Owning tree
+            slot: Layout slot, also the component id
+            component_type: Interned component type
+            key: Optional external id
+            props: Component properties
+            style_id: Interned style id
+        """
+        self.tree = tree
+        self.id = slot
+        self.key = key
+        self.type = component_type
+        self.props = props
+        self.style_id = style_id
+        self.children = None
+        self.parent = None
+
+    @property
+    def x(self) -> float:
+        return float(self.tree.layout.x[self.id])
+
+    @property
+    def y(self) -> float:
+        return float(self.tree.layout.y[self.id])
+
+    @property
+    def width(self) -> float:
+        return float(self.tree.layout.width[self.id])
+
+    @property
+    def height(self) -> float:
+        return float(self.tree.layout.height[self.id])
+
+    @property
+    def layout(self) -> Dict[str, float]:
+        """Bounds as a dictionary (a copy)."""
+        return {'x': self.x, 'y': self.y, 'width': self.width, 'height': self.height}
+
+    @property
+    def style(self) -> Dict[str, Any]:
+        """Shared style dictionary (read-only)."""
+        return self.tree.styles.get(self.style_id)
+
+    def set_layout(self, **layout):
+        """Set component bounds.
+
+        Args:
+            **layout: Any of x, y, width and height
+        """
+        store = self.tree.layout
+        for name, value in layout.items():
+            getattr(store, name)[self.id] = value
+        return self
+
+    def set_style(self, **styles):
+        """Merge styles into the component's style.
+
+        Args:
+            **styles: Styles to set
+        """
+        merged = dict(self.style)
+        merged.update(styles)
+        self.style_id = self.tree.styles.intern(merged)
+        return self
+
+    def set_props(self, **props):
+        """Set component properties.
+
+        Args:
+            **props: Properties to set
+        """
+        self.props.update(props)
+        return self
+
+    def add_child(self, child: 'CompactComponent'):
+        """Add a child component.
+
+        Args:
+            child: Child created after this component in the same tree
+        """
+        if self.children is None:
+            self.children = []
+        self.children.append(child)
+        child.parent = self
+        return self
+
+    def to_dict(self, columns: Optional[Tuple[list, list, list, list]] = None) -> Dict[str, Any]:
+        """Convert the component to the unified component dictionary format.
+
+        Args:
+            columns: The tree's layout arrays as lists (converted on demand)
+
+        Returns:
+            Dictionary representation of the component
+        """
+        if columns is None:
+            columns = self.tree.layout.columns()
+        xs, ys, widths, heights = columns
+        slot = self.id
+
+        result = {
+            "id": self.key if self.key is not None else slot,
+            "type": self.type,
+            "props": self.props,
+            "style": self.tree.styles.get(self.style_id),
+            "layout": {"x": xs[slot], "y": ys[slot], "width": widths[slot], "height": heights[slot]}
+        }
+
+        if self.children:
+            result["children"] = [child.to_dict(columns) for child in self.children]
+
+        return result
+
+
+class CompactTree:
+    """A component tree with struct-of-arrays layout.
+
+    Components are drawn in creation order, so a later component is on top
+    of an earlier one it overlaps.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, styles: Optional[StyleTable] = None):
+        """Initialize the tree.
+
+        Args:
+            capacity: Initial number of layout slots
+            styles: Style table to share with other trees
+        """
+        self.layout = LayoutStore(capacity)
+        self.styles = styles if styles is not None else StyleTable()
+        self.components: List[CompactComponent] = []
+        self.roots: List[CompactComponent] = []
+
+        # Per-slot type code, for selecting batches and circles
+        self.type_codes = np.zeros(capacity, dtype=np.int16)
+        self._type_ids: Dict[str, int] = {}
+
+    def create(self, component_type: str, x: float = 0, y: float = 0, width: float = 0,
+               height: float = 0, style: Optional[Dict[str, Any]] = None,
+               parent: Optional[CompactComponent] = None, key: Optional[str] = None,
+               **props) -> CompactComponent:
+        """Create a component.
+
+        Args:
+            component_type: Type of component
+            x: X coordinate
+            y: Y coordinate
+            width: Width
+            height: Height
+            style: Style dictionary (interned, not copied)
+            parent: Parent component, or None for a root
+            key: Optional external id
+            **props: Component properties
+
+        Returns:
+            The new component
+        """
+        slot = self.layout.allocate(x, y, width, height)
+        if slot >= len(self.type_codes):
+            grown = np.zeros(self.layout.capacity, dtype=np.int16)
+            grown[:len(self.type_codes)] = self.type_codes
+            self.type_codes = grown
+
+        type_id = self._type_ids.get(component_type)
+        if type_id is None:
+            component_type = sys.intern(component_type)
+            type_id = self._type_ids[component_type] = len(self._type_ids)
+        self.type_codes[slot] = type_id
+
+        component = CompactComponent(self, slot, component_type, key, props, self.styles.intern(style))
+        self.components.append(component)
+        if parent is None:
+            self.roots.append(component)
+        else:
+            parent.add_child(component)
+        return component
+
+    def clear(self) -> None:
+        """Remove every component, keeping the arrays and the style table."""
+        self.layout.clear()
+        self.components = []
+        self.roots = []
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def hit_test(self, x: float, y: float) -> Optional[CompactComponent]:
+        """Find the top-most component at a point.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+
+        Returns:
+            The last-drawn component containing the point, or None
+        """
+        n = self.layout.size
+        if not n:
+            return None
+
+        mask = self.layout.contains(x, y)
+
+        circle = self._type_ids.get("circle")
+        if circle is not None:
+            circles = self.type_codes[:n] == circle
+            if circles.any():
+                radius = np.minimum(self.layout.width[:n], self.layout.height[:n]) / 2
+                dx = x - (self.layout.x[:n] + self.layout.width[:n] / 2)
+                dy = y - (self.layout.y[:n] + self.layout.height[:n] / 2)
+                inside = dx * dx + dy * dy <= radius * radius
+                mask = np.where(circles, inside, mask)
+
+        hits = np.flatnonzero(mask)
+        return self.components[hits[-1]] if len(hits) else None
+
+    def hit_test_many(self, points) -> List[Optional[CompactComponent]]:
+        """Find the top-most rectangle at each of several points at once.
+
+        Circles are tested by their bounding box here.
+
+        Args:
+            points: Sequence of (x, y) points
+
+        Returns:
+            The component at each point, or None
+        """
+        n = self.layout.size
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if not n:
+            return [None] * len(points)
+
+        store = self.layout
+        px = points[:, 0:1]
+        py = points[:, 1:2]
+        left = store.x[:n]
+        top = store.y[:n]
+        mask = (px >= left) & (px < left + store.width[:n]) & (py >= top) & (py < top + store.height[:n])
+
+        # Index of the last match per point: argmax over the reversed rows
+        last = n - 1 - np.argmax(mask[:, ::-1], axis=1)
+        found = mask.any(axis=1)
+        return [self.components[slot] if hit else None for slot, hit in zip(last.tolist(), found.tolist())]
+
+    def batch(self, component_type: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get the bounds of every component of one type.
+
+        Args:
+            component_type: Type of component
+
+        Returns:
+            Tuple of (slots, x, y, width, height) arrays in draw order
+        """
+        type_id = self._type_ids.get(component_type)
+        if type_id is None:
+            empty = np.zeros(0, dtype=np.float32)
+            return np.zeros(0, dtype=np.intp), empty, empty, empty, empty
+
+        slots = np.flatnonzero(self.type_codes[:self.layout.size] == type_id)
+        store = self.layout
+        return slots, store.x[slots], store.y[slots], store.width[slots], store.height[slots]
+
+    def add_tree(self, node: Dict[str, Any], parent: Optional[CompactComponent] = None) -> CompactComponent:
+        """Add a dictionary component tree.
+
+        Accepts the unified format (layout/props/style) and the view format
+        used by module views (x/y/width/height at the top level and style
+        under properties).
+
+        Args:
+            node: Dictionary representation of a component
+            parent: Parent component, or None for a root
+
+        Returns:
+            The component created for the node
+        """
+        layout = node.get("layout") or node
+        properties = node.get("properties") or {}
+        style = node.get("style") or properties.get("style")
+
+        props = dict(node["props"]) if "props" in node else {}
+        for key, value in node.items():
+            if key not in _NODE_KEYS:
+                props[key] = value
+        for key, value in properties.items():
+            if key != "style":
+                props[key] = value
+
+        component = self.create(
+            node.get("type", "container"),
+            layout.get("x", 0), layout.get("y", 0), layout.get("width", 0), layout.get("height", 0),
+            style=style, parent=parent, key=node.get("id"), **props
+        )
+
+        for child in node.get("children") or ():
+            self.add_tree(child, component)
+
+        return component
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the tree to a dictionary representation.
+
+        Returns:
+            Dictionary with the root components
+        """
+        columns = self.layout.columns()
+        return {"components": [root.to_dict(columns) for root in self.roots]}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tree statistics.
+
+        Returns:
+            Dictionary with component, style and capacity counts
+        """
+        return {
+            'components': len(self.components),
+            'styles': len(self.styles),
+            'types': len(self._type_ids),
+            'capacity': self.layout.capacity,
+            'layout_bytes': self.layout.capacity * 4 * 4 + self.type_codes.nbytes
+        }
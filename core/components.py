@@ -6,36 +6,116 @@ This module provides a unified component system for building UIs across differen
 client implementations (pygame, web, terminal, etc).
 
 Optimizations:
-- Component pooling to reduce object creation/destruction overhead
+- Component pooling: factory methods take components from a per-type free
+  list and UI.clear() returns whole trees to it, resetting them in place
 - Automatic type conversion for consistent serialization
 - Serialization/deserialization caching for frequently used components
 - Factory methods for common UI elements
 """
 
+import gc
 import time
 import logging
+import itertools
 import json
-import uuid
+import threading
 from typing import Dict, List, Any, Tuple, Optional, Union, Set
 
 logger = logging.getLogger(__name__)
 
+# Component ids are unique per process; a counter is much cheaper than a UUID
+_component_ids = itertools.count(1)
+
+
+def _next_component_id():
+    """Get a new component id."""
+    return f"c{next(_component_ids)}"
+
+
+class GCMonitor:
+    """Counts garbage collector runs and their pause times."""
+    
+    def __init__(self):
+        """Initialize the monitor."""
+        self._start = None
+        self.installed = False
+        self.reset()
+    
+    def install(self):
+        """Start receiving collection callbacks."""
+        if not self.installed:
+            gc.callbacks.append(self._on_gc)
+            self.installed = True
+    
+    def uninstall(self):
+        """Stop receiving collection callbacks."""
+        if self.installed:
+            gc.callbacks.remove(self._on_gc)
+            self.installed = False
+    
+    def reset(self):
+        """Reset the counters."""
+        self.collections = [0, 0, 0]
+        self.collected = 0
+        self.pause_time = 0.0
+        self.max_pause = 0.0
+    
+    def _on_gc(self, phase, info):
+        """gc.callbacks hook."""
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            pause = time.perf_counter() - self._start
+            self._start = None
+            self.collections[info.get('generation', 0)] += 1
+            self.collected += info.get('collected', 0)
+            self.pause_time += pause
+            self.max_pause = max(self.max_pause, pause)
+    
+    def get_stats(self):
+        """Get collection statistics.
+        
+        Returns:
+            Dictionary with collection counts per generation and pause times
+        """
+        return {
+            'collections': list(self.collections),
+            'collected': self.collected,
+            'pause_time': self.pause_time,
+            'max_pause': self.max_pause
+        }
+
+
 class ComponentPool:
-    """Object pool for efficient component reuse."""
+    """Free-list allocator for components.
+    
+    Components handed out by get() are owned by the pool until they are
+    released; release() resets them in place and keeps them for reuse.
+    The pool is shared by every thread building UIs (e.g. server request
+    handlers), so its free lists and counters are guarded by a lock.
+    """
     
     def __init__(self, max_size=1000):
         """Initialize the component pool.
         
         Args:
-            max_size: Maximum number of pooled components
+            max_size: Maximum number of pooled components per type
         """
         self.pool = {}
         self.max_size = max_size
-        self.stats = {
-            'created': 0,
-            'reused': 0,
-            'returned': 0
-        }
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Reset pool statistics."""
+        with self._lock:
+            self.stats = {
+                'created': 0,
+                'reused': 0,
+                'returned': 0,
+                'discarded': 0
+            }
     
     def get(self, component_type):
         """Get a component from the pool.
@@ -46,43 +126,74 @@ class ComponentPool:
         Returns:
             Component of the requested type
         """
-        if component_type not in self.pool or not self.pool[component_type]:
+        with self._lock:
+            free = self.pool.get(component_type)
+            if free:
+                # Reuse existing component
+                component = free.pop()
+                self.stats['reused'] += 1
+            else:
+                component = None
+                self.stats['created'] += 1
+        
+        if component is None:
             # Create new component
-            self.stats['created'] += 1
-            return Component(component_type)
+            component = Component(component_type)
         
-        # Reuse existing component
-        self.stats['reused'] += 1
-        return self.pool[component_type].pop()
+        component._pooled = True
+        return component
     
     def release(self, component):
         """Return a component to the pool.
         
+        Components that did not come from the pool, or were already
+        released, are ignored. Children are not released; see release_tree.
+        
         Args:
             component: Component to return to pool
+            
+        Returns:
+            True if the component was taken back
         """
-        component_type = component.type
+        with self._lock:
+            if not component._pooled:
+                return False
+            component._pooled = False
         
-        # Reset the component for reuse
+        # Reset the component for reuse; nobody else holds it now
         component.reset()
         
-        # Initialize pool for this type if needed
-        if component_type not in self.pool:
-            self.pool[component_type] = []
-            
-        # Add to pool if not full
-        if len(self.pool[component_type]) < self.max_size:
-            self.pool[component_type].append(component)
-            self.stats['returned'] += 1
+        with self._lock:
+            free = self.pool.get(component.type)
+            if free is None:
+                free = self.pool[component.type] = []
+                
+            # Add to pool if not full
+            if len(free) < self.max_size:
+                free.append(component)
+                self.stats['returned'] += 1
+            else:
+                self.stats['discarded'] += 1
+        return True
+    
+    def release_tree(self, component):
+        """Return a component and all of its descendants to the pool.
+        
+        Args:
+            component: Root of the tree to return
+        """
+        stack = [component]
+        while stack:
+            current = stack.pop()
+            if current.children:
+                stack.extend(current.children)
+            self.release(current)
     
     def clear(self):
         """Clear the pool."""
-        self.pool.clear()
-        self.stats = {
-            'created': 0,
-            'reused': 0,
-            'returned': 0
-        }
+        with self._lock:
+            self.pool.clear()
+        self.reset_stats()
     
     def get_stats(self):
         """Get pool statistics.
@@ -90,33 +201,39 @@ class ComponentPool:
         Returns:
             Dictionary with pool statistics
         """
-        total = self.stats['created']
-        reuse_rate = self.stats['reused'] / total if total > 0 else 0
+        with self._lock:
+            stats = dict(self.stats)
+            size = sum(len(items) for items in self.pool.values())
+        requests = stats['created'] + stats['reused']
+        hit_rate = stats['reused'] / requests if requests > 0 else 0
         return {
-            'size': sum(len(items) for items in self.pool.values()),
+            'size': size,
             'max_size': self.max_size,
-            'created': self.stats['created'],
-            'reused': self.stats['reused'],
-            'returned': self.stats['returned'],
-            'reuse_rate': reuse_rate
+            'created': stats['created'],
+            'reused': stats['reused'],
+            'returned': stats['returned'],
+            'discarded': stats['discarded'],
+            'hit_rate': hit_rate,
+            'reuse_rate': hit_rate,
+            'gc': _gc_monitor.get_stats()
         }
 
-# Create global component pool
+# Create global component pool and collector monitor
 _component_pool = ComponentPool()
+_gc_monitor = GCMonitor()
+_gc_monitor.install()
 
 def reset_component_stats():
-    """Reset component pool statistics."""
-    _component_pool.stats = {
-        'created': 0,
-        'reused': 0,
-        'returned': 0
-    }
+    """Reset component pool and garbage collector statistics."""
+    _component_pool.reset_stats()
+    _gc_monitor.reset()
 
 def get_component_stats():
     """Get component pool statistics.
     
     Returns:
-        Dictionary with pool statistics
+        Dictionary with pool statistics, including garbage collector
+        counts and pause times under 'gc'
     """
     return _component_pool.get_stats()
 
@@ -128,13 +245,16 @@ class Component:
     _cache_hits = 0
     _cache_misses = 0
     
+    __slots__ = ('id', 'type', 'properties', 'position', 'created_at', 'parent',
+                 'children', '_has_changed', '_cached_dict', '_pooled')
+    
     def __init__(self, component_type):
         """Initialize the component.
         
         Args:
             component_type: Type of component
         """
-        self.id = str(uuid.uuid4())
+        self.id = _next_component_id()
         self.type = component_type
         self.properties = {}
         self.position = (0, 0)
@@ -145,22 +265,18 @@ class Component:
         # Track whether component has changed since last serialization
         self._has_changed = True
         self._cached_dict = None
-    
-    def __del__(self):
-        """Return component to pool when deleted."""
-        try:
-            _component_pool.release(self)
-        except:
-            pass
+        
+        # Whether the component pool owns this component
+        self._pooled = False
     
     def reset(self):
-        """Reset the component for reuse."""
-        self.id = str(uuid.uuid4())
-        self.properties = {}
+        """Reset the component in place for reuse."""
+        self.id = _next_component_id()
+        self.properties.clear()
         self.position = (0, 0)
         self.created_at = time.time()
         self.parent = None
-        self.children = []
+        self.children.clear()
         self._has_changed = True
         self._cached_dict = None
     
@@ -310,11 +426,11 @@ class Component:
         
         cls._cache_misses += 1
         
-        # Get component from pool
-        component = _component_pool.get(data.get('type', 'unknown'))
+        # Cached components stay alive in the cache, so they are not pooled
+        component = Component(data.get('type', 'unknown'))
         
         # Set properties
-        component.id = data.get('id', str(uuid.uuid4()))
+        component.id = data.get('id', component.id)
         component.type = data.get('type', 'unknown')
         
         # Set position
@@ -325,7 +441,7 @@ class Component:
         component.created_at = data.get('created_at', time.time())
         
         # Set properties
-        component.properties = data.get('properties', {})
+        component.properties = dict(data.get('properties', {}))
         
         # Add children if any
         if 'children' in data:
@@ -366,8 +482,13 @@ class UI:
         return self
     
     def clear(self):
-        """Clear all components."""
-        self.components = []
+        """Clear all components, returning them to the component pool.
+        
+        Components must not be used after the UI that holds them is cleared.
+        """
+        for component in self.components:
+            _component_pool.release_tree(component)
+        self.components.clear()
     
     def to_dict(self):
         """Convert UI to dictionary.
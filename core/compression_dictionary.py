@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Compression Dictionaries for MetaMindIQTrain
+
+Per-tick state messages are a few hundred bytes of JSON that repeat the same
+keys (``_meta``, ``game_state``, ``layout``, ...) every time. Plain zlib has
+no history to match them against, so small messages barely compress. This
+module builds preset dictionaries (zlib ``zdict``) from recorded messages,
+versions them per module and lets both ends compress with them.
+
+Key features:
+1. Offline builder: records module states/deltas and keeps the most valuable
+   recurring JSON fragments
+2. Versioned registry with negotiation of a version both ends hold
+3. Dictionary-primed compress/decompress helpers
+
+Usage:
+    python -m MetaMindIQTrain.core.compression_dictionary --all --record 600
+    python -m MetaMindIQTrain.core.compression_dictionary --module expand_vision --input states.jsonl
+"""
+
+import argparse
+import copy
+import json
+import logging
+import re
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Any, Iterable, List, Optional
+
+try:
+    from core.state_patch import compute_delta
+except ImportError:
+    from .state_patch import compute_delta
+
+logger = logging.getLogger(__name__)
+
+# Get project root (parent of core/ directory)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DICTIONARY_DIR = PROJECT_ROOT / "data" / "compression_dicts"
+DICTIONARY_SUFFIX = ".zdict"
+
+# Dictionary shared by all modules, used when no module-specific one matches
+COMMON_DICTIONARY_ID = "common"
+
+# zlib only looks back 32 KB, a dictionary larger than that is never used
+MAX_DICTIONARY_SIZE = 32 * 1024
+DEFAULT_DICTIONARY_SIZE = 16 * 1024
+
+# Builder settings
+MAX_FRAGMENT_TOKENS = 6   # Longest run of JSON tokens considered as a fragment
+MIN_FRAGMENT_LENGTH = 4   # Shorter fragments cost as much as a literal
+MAX_CANDIDATES = 20000    # Candidates examined after scoring
+FULL_STATE_INTERVAL = 20  # Matches StateSynchronizer.send_full_state_interval
+
+# JSON tokens as produced by json.dumps with the default separators
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|-?[0-9][0-9.eE+-]*|true|false|null|, |: |[{}\[\],:]')
+
+_FILENAME_RE = re.compile(r"^(?P<module>.+)\.v(?P<version>\d+)" + re.escape(DICTIONARY_SUFFIX) + "$")
+
+
+class CompressionDictionary:
+    """A versioned zlib preset dictionary for one module."""
+
+    def __init__(self, module_id: str, version: int, data: bytes):
+        """Initialize the dictionary.
+
+        Args:
+            module_id: Module the dictionary was trained for
+            version: Dictionary version
+            data: Raw dictionary bytes
+        """
+        if len(data) > MAX_DICTIONARY_SIZE:
+            data = data[-MAX_DICTIONARY_SIZE:]
+
+        self.module_id = module_id
+        self.version = version
+        self.data = data
+        # zlib stores the Adler-32 of the dictionary in the stream header,
+        # so a mismatched dictionary fails loudly on decompression
+        self.dict_id = zlib.adler32(data)
+
+    @property
+    def key(self) -> str:
+        """Identifier used in message metadata."""
+        return f"{self.module_id}@{self.version}"
+
+    @property
+    def filename(self) -> str:
+        """File name used when saving the dictionary."""
+        return f"{self.module_id}.v{self.version}{DICTIONARY_SUFFIX}"
+
+    def compressor(self, level: int = 6):
+        """Create a zlib compressor primed with the dictionary.
+
+        Args:
+            level: zlib compression level (1-9)
+
+        Returns:
+            zlib compression object
+        """
+        return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS,
+                                zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, self.data)
+
+    def decompressor(self):
+        """Create a zlib decompressor primed with the dictionary.
+
+        Returns:
+            zlib decompression object
+        """
+        return zlib.decompressobj(zlib.MAX_WBITS, self.data)
+
+    def compress(self, payload: bytes, level: int = 6) -> bytes:
+        """Compress a payload with the dictionary.
+
+        Args:
+            payload: Bytes to compress
+            level: zlib compression level (1-9)
+
+        Returns:
+            Compressed bytes
+        """
+        compressor = self.compressor(level)
+        return compressor.compress(payload) + compressor.flush()
+
+    def decompress(self, payload: bytes) -> bytes:
+        """Decompress a payload compressed with the dictionary.
+
+        Args:
+            payload: Compressed bytes
+
+        Returns:
+            Decompressed bytes
+        """
+        decompressor = self.decompressor()
+        return decompressor.decompress(payload) + decompressor.flush()
+
+    def save(self, directory: Optional[Path] = None) -> Path:
+        """Save the dictionary to a directory.
+
+        Args:
+            directory: Target directory (defaults to DICTIONARY_DIR)
+
+        Returns:
+            Path of the written file
+        """
+        directory = Path(directory or DICTIONARY_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.filename
+        path.write_bytes(self.data)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "CompressionDictionary":
+        """Load a dictionary saved with save().
+
+        Args:
+            path: Path of the dictionary file
+
+        Returns:
+            Loaded dictionary
+        """
+        path = Path(path)
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            raise ValueError(f"Not a compression dictionary file: {path.name}")
+        return cls(match.group("module"), int(match.group("version")), path.read_bytes())
+
+
+class DictionaryRegistry:
+    """Holds the dictionary versions available on this side of a connection."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._dictionaries: Dict[str, Dict[int, CompressionDictionary]] = {}
+        self._lock = Lock()
+
+    def register(self, dictionary: CompressionDictionary) -> None:
+        """Add a dictionary, replacing an existing one with the same version.
+
+        Args:
+            dictionary: Dictionary to add
+        """
+        with self._lock:
+            self._dictionaries.setdefault(dictionary.module_id, {})[dictionary.version] = dictionary
+
+    def load_directory(self, directory: Optional[Path] = None) -> int:
+        """Register every dictionary file in a directory.
+
+        Args:
+            directory: Directory to scan (defaults to DICTIONARY_DIR)
+
+        Returns:
+            Number of dictionaries loaded
+        """
+        directory = Path(directory or DICTIONARY_DIR)
+        if not directory.is_dir():
+            return 0
+
+        loaded = 0
+        for path in sorted(directory.glob(f"*{DICTIONARY_SUFFIX}")):
+            try:
+                self.register(CompressionDictionary.load(path))
+                loaded += 1
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping compression dictionary {path.name}: {e}")
+        return loaded
+
+    def get(self, module_id: str, version: int) -> Optional[CompressionDictionary]:
+        """Get a specific dictionary version.
+
+        Args:
+            module_id: Module identifier
+            version: Dictionary version
+
+        Returns:
+            The dictionary or None
+        """
+        return self._dictionaries.get(module_id, {}).get(version)
+
+    def get_by_key(self, key: str) -> Optional[CompressionDictionary]:
+        """Get a dictionary by its metadata key (``module@version``).
+
+        Args:
+            key: Dictionary key
+
+        Returns:
+            The dictionary or None
+        """
+        module_id, _, version = key.rpartition("@")
+        if not module_id or not version.isdigit():
+            return None
+        return self.get(module_id, int(version))
+
+    def versions(self, module_id: str) -> List[int]:
+        """Get the available versions for a module, oldest first.
+
+        Args:
+            module_id: Module identifier
+
+        Returns:
+            Sorted list of versions
+        """
+        return sorted(self._dictionaries.get(module_id, {}))
+
+    def latest(self, module_id: str) -> Optional[CompressionDictionary]:
+        """Get the newest dictionary for a module.
+
+        Args:
+            module_id: Module identifier
+
+        Returns:
+            The dictionary or None
+        """
+        versions = self.versions(module_id)
+        return self.get(module_id, versions[-1]) if versions else None
+
+    def available(self) -> Dict[str, List[int]]:
+        """Describe the registry for a connection handshake.
+
+        Returns:
+            Mapping of module id to available versions
+        """
+        return {module_id: self.versions(module_id) for module_id in self._dictionaries}
+
+    def negotiate(self, module_id: Optional[str],
+                  offered: Dict[str, List[int]]) -> Optional[CompressionDictionary]:
+        """Pick the newest dictionary version both ends hold.
+
+        The module-specific dictionary is preferred; the common dictionary is
+        used when the module has no version in common.
+
+        Args:
+            module_id: Module the connection is running
+            offered: Versions held by the peer, as returned by available()
+
+        Returns:
+            The agreed dictionary or None to compress without one
+        """
+        for candidate in (module_id, COMMON_DICTIONARY_ID):
+            if not candidate:
+                continue
+            common = set(self.versions(candidate)) & set(offered.get(candidate, ()))
+            if common:
+                return self.get(candidate, max(common))
+        return None
+
+
+_registry: Optional[DictionaryRegistry] = None
+_registry_lock = Lock()
+
+
+def get_dictionary_registry() -> DictionaryRegistry:
+    """Get the process-wide registry, loading DICTIONARY_DIR on first use.
+
+    Returns:
+        The shared DictionaryRegistry
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = DictionaryRegistry()
+            loaded = _registry.load_directory()
+            logger.debug(f"Loaded {loaded} compression dictionaries")
+        return _registry
+
+
+def build_dictionary(samples: Iterable[bytes], size: int = DEFAULT_DICTIONARY_SIZE,
+                     min_count: int = 2) -> bytes:
+    """Build a preset dictionary from sample messages.
+
+    Every run of up to MAX_FRAGMENT_TOKENS JSON tokens is scored by the
+    number of samples containing it times its length. The best fragments
+    are kept until the size budget is spent and are laid out with the most
+    valuable last, where zlib reaches them with the shortest distances.
+
+    Args:
+        samples: Serialized JSON messages
+        size: Dictionary size budget in bytes
+        min_count: Minimum number of samples a fragment must appear in
+
+    Returns:
+        Dictionary bytes
+    """
+    size = min(size, MAX_DICTIONARY_SIZE)
+    counts: Counter = Counter()
+
+    for sample in samples:
+        text = sample.decode("utf-8", errors="ignore") if isinstance(sample, bytes) else sample
+        tokens = _TOKEN_RE.findall(text)
+        fragments = set()
+        for start in range(len(tokens)):
+            fragment = ""
+            for token in tokens[start:start + MAX_FRAGMENT_TOKENS]:
+                fragment += token
+                if len(fragment) >= MIN_FRAGMENT_LENGTH:
+                    fragments.add(fragment)
+        counts.update(fragments)
+
+    scored = [(count * (len(fragment) - 3), fragment)
+              for fragment, count in counts.items() if count >= min_count]
+    scored.sort(reverse=True)
+
+    chosen: List[str] = []
+    text = ""
+    used = 0
+    for _, fragment in scored[:MAX_CANDIDATES]:
+        if fragment in text:
+            continue
+        encoded_length = len(fragment.encode("utf-8"))
+        if used + encoded_length > size:
+            continue
+        chosen.append(fragment)
+        text += fragment
+        used += encoded_length
+        if used >= size:
+            break
+
+    # Most valuable fragments go last
+    return "".join(reversed(chosen)).encode("utf-8")
+
+
+def record_module_messages(module_id: str, frames: int = 600, dt: float = 0.1,
+                           full_state_interval: int = FULL_STATE_INTERVAL) -> List[bytes]:
+    """Run a module headlessly and record the state messages it would send.
+
+    Args:
+        module_id: Module identifier from the module registry
+        frames: Number of updates to record
+        dt: Simulated time step per update in seconds
+        full_state_interval: Record a full state every N updates
+
+    Returns:
+        Serialized messages in send order
+    """
+    from MetaMindIQTrain.module_registry import create_module_instance
+
+    module = create_module_instance(module_id)
+    if module is None:
+        raise ValueError(f"Unknown module: {module_id}")
+
+    messages = []
+    previous = {}
+    for frame in range(frames):
+        try:
+            module.update(dt)
+        except TypeError:
+            # Some modules advance on their own clock
+            module.update()
+
+        state = copy.deepcopy(module.get_state())
+        is_full = frame % full_state_interval == 0
+        message = dict(state) if is_full else compute_delta(previous, state)
+        message['_meta'] = {
+            'version': frame + 1,
+            'is_delta': not is_full,
+            'timestamp': time.time()
+        }
+        if not is_full:
+            message['_meta']['base_version'] = frame
+
+        messages.append(json.dumps(message, default=str).encode("utf-8"))
+        previous = state
+
+    return messages
+
+
+def load_recording(path: Path) -> List[bytes]:
+    """Load recorded messages from a JSON-lines file.
+
+    Args:
+        path: File with one JSON message per line
+
+    Returns:
+        Messages re-serialized the way they are sent
+    """
+    messages = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                messages.append(json.dumps(json.loads(line)).encode("utf-8"))
+    return messages
+
+
+def main():
+    """Build compression dictionaries from recorded or freshly recorded states."""
+    parser = argparse.ArgumentParser(description="Build zlib preset dictionaries for state messages")
+    parser.add_argument("--module", action="append", default=[], help="Module id (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Build for every registered module and the common dictionary")
+    parser.add_argument("--input", action="append", default=[], help="JSON-lines recording to train on (repeatable)")
+    parser.add_argument("--record", type=int, default=600, help="Frames to record per module when no input is given")
+    parser.add_argument("--size", type=int, default=DEFAULT_DICTIONARY_SIZE, help="Dictionary size in bytes")
+    parser.add_argument("--version", type=int, help="Version to write (defaults to the next free version)")
+    parser.add_argument("--output", default=str(DICTIONARY_DIR), help="Output directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)-8s | %(message)s')
+
+    module_ids = list(args.module)
+    if args.all:
+        from MetaMindIQTrain.module_registry import AVAILABLE_MODULES
+        module_ids = [info['id'] for info in AVAILABLE_MODULES]
+    if not module_ids:
+        parser.error("give --module or --all")
+    if args.input and len(module_ids) != 1:
+        parser.error("--input trains a single --module")
+
+    existing = DictionaryRegistry()
+    existing.load_directory(args.output)
+
+    def write(module_id: str, samples: List[bytes]) -> None:
+        versions = existing.versions(module_id)
+        version = args.version or ((versions[-1] + 1) if versions else 1)
+        dictionary = CompressionDictionary(module_id, version, build_dictionary(samples, args.size))
+        path = dictionary.save(args.output)
+        logger.info(f"{module_id}: {len(samples)} samples -> {len(dictionary.data)} bytes at {path}")
+
+    all_samples: List[bytes] = []
+    for module_id in module_ids:
+        try:
+            if args.input:
+                samples = [m for path in args.input for m in load_recording(path)]
+            else:
+                samples = record_module_messages(module_id, args.record)
+        except Exception as e:
+            logger.error(f"{module_id}: could not record states: {e}")
+            continue
+        write(module_id, samples)
+        all_samples.extend(samples)
+
+    if args.all and all_samples:
+        write(COMMON_DICTIONARY_ID, all_samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,28 @@ FPS Counter for MetaMindIQTrain application.
 Provides a way to track frames per second for performance monitoring.
 """
 
+from typing import Dict, Any
+
+try:
+    from core.streaming_stats import StreamingStats
+except ImportError:
+    from .streaming_stats import StreamingStats
+
 class FPSCounter:
     """Tracks frame rate for performance monitoring."""
     
-    def __init__(self, update_interval: float = 1.0):
+    def __init__(self, update_interval: float = 1.0, window_size: int = 120):
         """Initialize the FPS counter.
         
         Args:
             update_interval: Interval in seconds to update the FPS value
+            window_size: Number of recent frame times kept for statistics
         """
         self.frame_count = 0
         self.fps = 0.0
         self.accumulated_time = 0.0
         self.update_interval = update_interval
+        self.frame_times = StreamingStats(window_size)
         
     def update(self, delta_time: float) -> None:
         """Update the FPS counter.
@@ -25,6 +34,7 @@ class FPSCounter:
         """
         self.frame_count += 1
         self.accumulated_time += delta_time
+        self.frame_times.add(delta_time)
         
         # Update FPS value at the specified interval
         if self.accumulated_time >= self.update_interval:
@@ -39,9 +49,18 @@ class FPSCounter:
             Current frames per second
         """
         return self.fps
+    
+    def get_frame_time_stats(self) -> Dict[str, Any]:
+        """Get statistics over the recent frame times.
+        
+        Returns:
+            Dictionary with mean, min, max and percentile frame times in seconds
+        """
+        return self.frame_times.to_dict()
         
     def reset(self) -> None:
         """Reset the FPS counter."""
         self.frame_count = 0
         self.fps = 0.0
-        self.accumulated_time = 0.0 
\ No newline at end of file
+        self.accumulated_time = 0.0
+        self.frame_times.reset() 
\ No newline at end of file
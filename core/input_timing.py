@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Input Timing for MetaMindIQTrain
+
+High-resolution timing for reaction-time measurement:
+
+1. Input events are stamped with time.perf_counter_ns() when they arrive
+   (stamp_event), so queueing and frame pacing are not counted
+2. FrameClock records when each frame is presented; a Stimulus takes its
+   onset from the first frame presented after it was created, which is the
+   frame that showed it. Stimuli are only held for resolving while frames
+   are being presented; in a process that never presents (the server),
+   onsets are the creation time
+3. While an event is being dispatched (dispatching), models can read its
+   stamp with input_timestamp_ns() without it being passed through every
+   layer in between
+
+Timestamps are perf_counter_ns values and only comparable within a process.
+Inputs sent to a server carry their stamp and the time they were sent
+(SENT_KEY); the server rebases the stamp onto its own clock with
+received_timestamp_ns, so the time an input waited on the client counts
+and the unknown network transit does not.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Key (or attribute) holding the arrival stamp of an input event
+TIMESTAMP_KEY = 'timestamp_ns'
+
+# Key of the time a message carrying stamped inputs was sent
+SENT_KEY = 'sent_ns'
+
+# Most stimuli waiting for a frame present; the oldest are dropped beyond it
+MAX_PENDING_STIMULI = 64
+
+_local = threading.local()
+
+
+def now_ns() -> int:
+    """Get the current high-resolution time in nanoseconds."""
+    return time.perf_counter_ns()
+
+
+def stamp_event(event: Any, timestamp_ns: Optional[int] = None) -> Any:
+    """Stamp an input event with its arrival time, keeping an existing stamp.
+
+    Args:
+        event: Event dictionary or pygame event
+        timestamp_ns: Arrival time (defaults to now)
+
+    Returns:
+        The event
+    """
+    if event_timestamp_ns(event) is None:
+        stamp = now_ns() if timestamp_ns is None else timestamp_ns
+        if isinstance(event, dict):
+            event[TIMESTAMP_KEY] = stamp
+        else:
+            setattr(event, TIMESTAMP_KEY, stamp)
+    return event
+
+
+def event_timestamp_ns(event: Any, default: Optional[int] = None) -> Optional[int]:
+    """Get the arrival stamp of an input event.
+
+    Args:
+        event: Event dictionary or pygame event
+        default: Value if the event is not stamped
+
+    Returns:
+        Arrival time in nanoseconds, or default
+    """
+    if isinstance(event, dict):
+        return event.get(TIMESTAMP_KEY, default)
+    return getattr(event, TIMESTAMP_KEY, default)
+
+
+def received_timestamp_ns(event: Any, sent_ns: Optional[int],
+                          received_ns: Optional[int] = None) -> Optional[int]:
+    """Rebase the stamp of an input from another process onto this one's clock.
+
+    Args:
+        event: Input dictionary stamped by the sender
+        sent_ns: Sender's time when the message was sent
+        received_ns: This process's time when it arrived (defaults to now)
+
+    Returns:
+        The arrival time on this process's clock, earlier than received_ns by
+        the time the input waited on the sender, or None if either stamp is
+        missing
+    """
+    timestamp_ns = event_timestamp_ns(event)
+    if not isinstance(timestamp_ns, int) or not isinstance(sent_ns, int):
+        return None
+    received_ns = now_ns() if received_ns is None else received_ns
+    return received_ns - max(0, sent_ns - timestamp_ns)
+
+
+@contextmanager
+def dispatching(event: Any):
+    """Make an event's stamp the current input time while it is handled.
+
+    Args:
+        event: Stamped event being dispatched
+    """
+    previous = getattr(_local, 'timestamp_ns', None)
+    _local.timestamp_ns = event_timestamp_ns(event)
+    try:
+        yield event
+    finally:
+        _local.timestamp_ns = previous
+
+
+def input_timestamp_ns(timestamp_ns: Optional[int] = None) -> int:
+    """Get the arrival time of the input being handled.
+
+    Args:
+        timestamp_ns: Explicit stamp, used if given
+
+    Returns:
+        The explicit stamp, else the stamp of the event being dispatched on
+        this thread, else the current time
+    """
+    if timestamp_ns is not None:
+        return timestamp_ns
+    current = getattr(_local, 'timestamp_ns', None)
+    return current if current is not None else now_ns()
+
+
+class Stimulus:
+    """Something shown to the user whose reaction time is measured."""
+
+    __slots__ = ('created_ns', 'onset_ns', 'frame', 'build')
+
+    def __init__(self, created_ns: int, build: int = 0):
+        """Initialize the stimulus.
+
+        Args:
+            created_ns: When the stimulus was created
+            build: Number of the frame being built when it was created
+        """
+        self.created_ns = created_ns
+        self.onset_ns = None
+        self.frame = None
+        self.build = build
+
+    @property
+    def presented(self) -> bool:
+        """Whether a frame showing the stimulus has been presented."""
+        return self.onset_ns is not None
+
+    def onset(self) -> int:
+        """Get the onset time (creation time until a frame is presented)."""
+        return self.onset_ns if self.onset_ns is not None else self.created_ns
+
+    def reaction_time_ns(self, timestamp_ns: Optional[int] = None) -> int:
+        """Get the time from onset to a response.
+
+        Args:
+            timestamp_ns: Arrival stamp of the response (see input_timestamp_ns)
+
+        Returns:
+            Reaction time in nanoseconds (0 for responses before the onset)
+        """
+        return max(0, input_timestamp_ns(timestamp_ns) - self.onset())
+
+    def reaction_time(self, timestamp_ns: Optional[int] = None) -> float:
+        """Get the time from onset to a response in seconds."""
+        return self.reaction_time_ns(timestamp_ns) / 1e9
+
+
+class FrameClock:
+    """Records frame presents and resolves stimulus onsets to them."""
+
+    def __init__(self):
+        """Initialize the clock."""
+        self._lock = threading.Lock()
+        self._pending = deque(maxlen=MAX_PENDING_STIMULI)
+        self.frame = 0
+        self.builds = 0
+        self.last_present_ns = None
+
+    @property
+    def active(self) -> bool:
+        """Whether frames are being built or presented in this process."""
+        return self.frame > 0 or self.builds > 0
+
+    def stimulus(self) -> Stimulus:
+        """Create a stimulus shown by the next presented frame.
+
+        Stimuli created before the clock is active are not held, so their
+        onset stays the creation time.
+
+        Returns:
+            Stimulus whose onset is resolved by frame_presented
+        """
+        with self._lock:
+            stimulus = Stimulus(now_ns(), self.builds + 1)
+            if self.active:
+                self._pending.append(stimulus)
+            return stimulus
+
+    def frame_built(self) -> int:
+        """Mark that a frame was built ahead of being presented.
+
+        Only needed when frames are built on a different thread than they
+        are presented on (see frame_presented).
+
+        Returns:
+            Number of the built frame
+        """
+        with self._lock:
+            self.builds += 1
+            return self.builds
+
+    def frame_presented(self, timestamp_ns: Optional[int] = None, build: Optional[int] = None) -> int:
+        """Mark that a frame is on screen.
+
+        Args:
+            timestamp_ns: When the frame was presented (defaults to now)
+            build: Number of the presented frame from frame_built; stimuli
+                created after it was built keep waiting (all pending stimuli
+                are resolved if None)
+
+        Returns:
+            Number of presented frames
+        """
+        timestamp_ns = now_ns() if timestamp_ns is None else timestamp_ns
+        with self._lock:
+            self.frame += 1
+            self.last_present_ns = timestamp_ns
+            waiting = deque(maxlen=MAX_PENDING_STIMULI)
+            for stimulus in self._pending:
+                if build is not None and stimulus.build > build:
+                    waiting.append(stimulus)
+                    continue
+                stimulus.onset_ns = timestamp_ns
+                stimulus.frame = self.frame
+            self._pending = waiting
+            return self.frame
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get frame counts and pending stimuli."""
+        with self._lock:
+            return {
+                'frame': self.frame,
+                'builds': self.builds,
+                'pending_stimuli': len(self._pending),
+                'last_present_ns': self.last_present_ns
+            }
+
+
+# Shared by the clients and the modules
+_frame_clock = FrameClock()
+
+
+def get_frame_clock() -> FrameClock:
+    """Get the frame clock shared by the clients and the modules."""
+    return _frame_clock
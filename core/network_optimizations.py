@@ -21,8 +21,18 @@ import bz2
 from functools import lru_cache
 from difflib import SequenceMatcher
 from threading import Lock
+from collections import OrderedDict
 import copy
 
+try:
+    from core.compression_dictionary import CompressionDictionary, get_dictionary_registry
+    from core.stream_codec import StreamCodec
+    from core.state_store import StateStore
+except ImportError:
+    from .compression_dictionary import CompressionDictionary, get_dictionary_registry
+    from .stream_codec import StreamCodec
+    from .state_store import StateStore
+
 logger = logging.getLogger(__name__)
 
 # Compression options
@@ -51,79 +61,144 @@ DEFAULT_COMPRESSION = CompressionMethod.HYBRID
 DEFAULT_LEVEL = CompressionLevel.BALANCED
 STATE_CACHE_SIZE = 32  # Number of previous states to cache per client
 HASH_PRECISION = 8     # Bytes of hash to use for state fingerprinting
+MAX_STREAM_CODECS = 1024  # Streaming contexts kept; the least recently used is dropped
 
 # Cache for client states
 _state_cache: Dict[str, List[Dict[str, Any]]] = {}
 _state_cache_lock = Lock()
 
-# Client state caching for delta encoding
-_client_states = {}
+# Last state per client for delta encoding (bounded, copy-on-write)
+_state_store = StateStore()
 
-def compress_data(data, method=CompressionMethod.GZIP, level=CompressionLevel.BALANCED, client_id=None):
-    """Compress data using the specified method and level.
+# Per-client streaming compression contexts, least recently used first
+_stream_codecs: "OrderedDict[str, StreamCodec]" = OrderedDict()
+
+def get_stream_codec(client_id: str) -> StreamCodec:
+    """Get the streaming compression context for a client, creating it if needed.
+    
+    At most MAX_STREAM_CODECS contexts are kept. A client whose context was
+    dropped gets a new stream, which starts at sequence 0 so its peer
+    resets too.
     
     Args:
-        data: Any Python data structure that can be serialized to JSON
-        method: Compression method to use
-        level: Compression level to balance speed vs. size
-        client_id: Optional client ID for delta encoding
+        client_id: Client ID
         
     Returns:
-        Tuple of (compressed_data, metadata)
+        The client's StreamCodec
     """
-    # Convert data to bytes
-    json_data = json.dumps(data).encode('utf-8')
-    original_size = len(json_data)
+    with _state_cache_lock:
+        codec = _stream_codecs.get(client_id)
+        if codec is None:
+            codec = _stream_codecs[client_id] = StreamCodec()
+            while len(_stream_codecs) > MAX_STREAM_CODECS:
+                _stream_codecs.popitem(last=False)
+        else:
+            _stream_codecs.move_to_end(client_id)
+        return codec
+
+def release_client(client_id: str) -> None:
+    """Drop everything kept for a disconnected client.
     
-    # Metadata to return with the compressed data
-    metadata = {
-        'method': method.name,
-        'level': level.name,
-        'original_size': original_size,
-        'timestamp': time.time()
-    }
+    Removes the client's delta encoding base, compression stream and codec
+    selection overrides.
     
-    # Create compressed result based on method
-    if method == CompressionMethod.NONE:
-        compressed = json_data
+    Args:
+        client_id: Client ID
+    """
+    with _state_cache_lock:
+        _stream_codecs.pop(client_id, None)
+        _state_store.discard(client_id)
+        _state_cache.pop(client_id, None)
+    get_codec_selector().clear_client_profile(client_id)
+
+def _zlib_compress(payload: bytes, level: int, dictionary: Optional[CompressionDictionary],
+                   metadata: Dict[str, Any], codec: Optional[StreamCodec] = None) -> bytes:
+    """Compress with zlib, primed with a preset dictionary if one is given.
     
-    elif method == CompressionMethod.DELTA:
-        # Delta compression requires a client ID and a previous state
-        if not client_id:
-            raise ValueError("Delta compression requires a client ID")
-            
-        return delta_encode(data, client_id)
+    Args:
+        payload: Bytes to compress
+        level: zlib compression level (1-9)
+        dictionary: Optional preset dictionary
+        metadata: Metadata to record the dictionary or stream position in
+        codec: Optional streaming context; the message is appended to its
+            stream (the codec's own level and dictionary apply)
         
-    elif method == CompressionMethod.HYBRID:
-        # First try delta encoding if possible
-        if client_id and client_id in _client_states:
-            try:
-                delta_result, delta_metadata = delta_encode(data, client_id)
-                
-                # If delta encoding works and is a true delta (not a first state),
-                # compress it further with GZIP
-                if delta_metadata.get('delta', False):
-                    gzip_level = _get_zlib_level(level)
-                    compressed = zlib.compress(delta_result, gzip_level)
-                    metadata.update(delta_metadata)
-                    metadata['method'] = CompressionMethod.HYBRID.name
-                    metadata['compressed_size'] = len(compressed)
-                    metadata['compression_ratio'] = original_size / len(compressed) if len(compressed) > 0 else 1.0
-                    return compressed, metadata
-            except Exception as e:
-                logger.warning(f"Delta encoding failed in hybrid compression: {e}, falling back to GZIP")
+    Returns:
+        Compressed bytes
+    """
+    if codec is not None:
+        metadata['stream_seq'] = codec.next_sequence
+        return codec.compress(payload)
         
-        # Fall back to GZIP if delta encoding isn't possible or fails
-        gzip_level = _get_zlib_level(level)
-        compressed = zlib.compress(json_data, gzip_level)
+    if dictionary is None:
+        return zlib.compress(payload, level)
+        
+    metadata['dictionary'] = dictionary.key
+    return dictionary.compress(payload, level)
+
+def _zlib_decompress(payload: bytes, metadata: Dict[str, Any],
+                     dictionary: Optional[CompressionDictionary],
+                     codec: Optional[StreamCodec] = None) -> bytes:
+    """Decompress zlib data, using the preset dictionary named in the metadata.
+    
+    Args:
+        payload: Compressed bytes
+        metadata: Metadata from compression
+        dictionary: Dictionary to use instead of a registry lookup
+        codec: Streaming context for messages compressed onto a stream
         
+    Returns:
+        Decompressed bytes
+    """
+    if 'stream_seq' in metadata:
+        if codec is None:
+            raise ValueError("Streamed message requires the connection's StreamCodec")
+        return codec.decompress(payload, metadata['stream_seq'])
+        
+    key = metadata.get('dictionary')
+    if not key:
+        return zlib.decompress(payload)
+        
+    if dictionary is None or dictionary.key != key:
+        dictionary = get_dictionary_registry().get_by_key(key)
+    if dictionary is None:
+        raise ValueError(f"Compression dictionary {key} is not available")
+        
+    return dictionary.decompress(payload)
+
+def _compress_payload(json_data: bytes, method: CompressionMethod, level: CompressionLevel,
+                      metadata: Dict[str, Any], dictionary: Optional[CompressionDictionary] = None,
+                      codec: Optional[StreamCodec] = None,
+                      selector: Optional["AdaptiveCodecSelector"] = None) -> bytes:
+    """Compress serialized data with a single codec.
+    
+    Plain (non-dictionary, non-stream) encodes are timed and reported to
+    the adaptive codec selector.
+    
+    Args:
+        json_data: Serialized data
+        method: Compression method (not DELTA or HYBRID)
+        level: Compression level
+        metadata: Metadata to update
+        dictionary: Optional preset dictionary for the zlib-based methods
+        codec: Optional streaming context for the zlib-based methods
+        selector: Selector to report to (defaults to the shared selector)
+        
+    Returns:
+        Compressed bytes
+    """
+    start = time.perf_counter()
+    
+    if method == CompressionMethod.NONE:
+        compressed = json_data
+    
     elif method == CompressionMethod.GZIP:
         gzip_level = _get_zlib_level(level)
-        compressed = zlib.compress(json_data, gzip_level)
+        compressed = _zlib_compress(json_data, gzip_level, dictionary, metadata, codec)
         
     elif method == CompressionMethod.ZLIB:
         zlib_level = _get_zlib_level(level)
-        compressed = zlib.compress(json_data, zlib_level)
+        compressed = _zlib_compress(json_data, zlib_level, dictionary, metadata, codec)
         
     elif method == CompressionMethod.LZMA:
         # LZMA uses a preset (0-9) rather than a level
@@ -165,19 +240,95 @@ def compress_data(data, method=CompressionMethod.GZIP, level=CompressionLevel.BA
         compressed = zlib.compress(json_data, gzip_level)
         metadata['method'] = CompressionMethod.GZIP.name
     
+    # Feed live measurements to the adaptive selector
+    if dictionary is None and codec is None and metadata['method'] == method.name:
+        (selector or get_codec_selector()).record(
+            method, len(json_data), len(compressed), time.perf_counter() - start)
+    
+    return compressed
+
+def compress_data(data, method=CompressionMethod.GZIP, level=CompressionLevel.BALANCED, client_id=None,
+                  dictionary=None, codec=None, session_id=None):
+    """Compress data using the specified method and level.
+    
+    Args:
+        data: Any Python data structure that can be serialized to JSON
+        method: Compression method to use
+        level: Compression level to balance speed vs. size
+        client_id: Optional client ID for delta encoding
+        dictionary: Optional CompressionDictionary used by the zlib-based
+            methods (GZIP, ZLIB, HYBRID)
+        codec: Optional StreamCodec (see get_stream_codec); the zlib-based
+            methods then append to the connection's stream instead of
+            starting a new one
+        session_id: Optional session of the client; delta bases of clients
+            in one session are shared (see delta_encode)
+        
+    Returns:
+        Tuple of (compressed_data, metadata)
+    """
+    # Convert data to bytes
+    json_data = json.dumps(data).encode('utf-8')
+    original_size = len(json_data)
+    
+    # Metadata to return with the compressed data
+    metadata = {
+        'method': method.name,
+        'level': level.name,
+        'original_size': original_size,
+        'timestamp': time.time()
+    }
+    
+    # Create compressed result based on method
+    if method == CompressionMethod.DELTA:
+        # Delta compression requires a client ID and a previous state
+        if not client_id:
+            raise ValueError("Delta compression requires a client ID")
+            
+        return delta_encode(data, client_id, session_id)
+        
+    elif method == CompressionMethod.HYBRID:
+        # First try delta encoding if possible
+        if client_id and client_id in _state_store:
+            try:
+                delta_result, delta_metadata = delta_encode(data, client_id, session_id)
+                
+                # If delta encoding works and is a true delta (not a first state),
+                # compress it further with GZIP
+                if delta_metadata.get('delta', False):
+                    gzip_level = _get_zlib_level(level)
+                    compressed = _zlib_compress(delta_result, gzip_level, dictionary, metadata, codec)
+                    metadata.update(delta_metadata)
+                    metadata['method'] = CompressionMethod.HYBRID.name
+                    metadata['compressed_size'] = len(compressed)
+                    metadata['compression_ratio'] = original_size / len(compressed) if len(compressed) > 0 else 1.0
+                    return compressed, metadata
+            except Exception as e:
+                logger.warning(f"Delta encoding failed in hybrid compression: {e}, falling back to GZIP")
+        
+        # Fall back to GZIP if delta encoding isn't possible or fails
+        gzip_level = _get_zlib_level(level)
+        compressed = _zlib_compress(json_data, gzip_level, dictionary, metadata, codec)
+        
+    else:
+        compressed = _compress_payload(json_data, method, level, metadata, dictionary, codec)
+    
     # Add compressed size and ratio to metadata
     metadata['compressed_size'] = len(compressed)
     metadata['compression_ratio'] = original_size / len(compressed) if len(compressed) > 0 else 1.0
     
     return compressed, metadata
 
-def decompress_data(compressed_data, metadata, client_id=None):
+def decompress_data(compressed_data, metadata, client_id=None, dictionary=None, codec=None):
     """Decompress data using the specified method.
     
     Args:
         compressed_data: Compressed data bytes
         metadata: Metadata from compression
         client_id: Optional client ID for delta decoding
+        dictionary: Optional CompressionDictionary named in the metadata
+            (looked up in the dictionary registry if not given)
+        codec: StreamCodec of the connection, required for streamed messages
         
     Returns:
         Decompressed data
@@ -197,22 +348,22 @@ def decompress_data(compressed_data, metadata, client_id=None):
         # For hybrid, first decompress with the standard method, then apply delta decoding
         if metadata.get('delta', False):
             # Decompress the GZIP layer first
-            decompressed_delta = zlib.decompress(compressed_data)
+            decompressed_delta = _zlib_decompress(compressed_data, metadata, dictionary, codec)
             # Then apply delta decoding
             return delta_decode(decompressed_delta, metadata, client_id)
         else:
             # Just regular compression
-            return json.loads(zlib.decompress(compressed_data).decode('utf-8'))
+            return json.loads(_zlib_decompress(compressed_data, metadata, dictionary, codec).decode('utf-8'))
     
     # Standard decompression methods
     if method == CompressionMethod.NONE:
         decompressed = compressed_data
         
     elif method == CompressionMethod.GZIP:
-        decompressed = zlib.decompress(compressed_data)
+        decompressed = _zlib_decompress(compressed_data, metadata, dictionary, codec)
         
     elif method == CompressionMethod.ZLIB:
-        decompressed = zlib.decompress(compressed_data)
+        decompressed = _zlib_decompress(compressed_data, metadata, dictionary, codec)
         
     elif method == CompressionMethod.LZMA:
         decompressed = lzma.decompress(compressed_data)
@@ -245,12 +396,14 @@ def decompress_data(compressed_data, metadata, client_id=None):
         return json.loads(decompressed.decode('utf-8'))
     return decompressed
 
-def delta_encode(data, client_id):
+def delta_encode(data, client_id, session_id=None):
     """Create a delta from the previous state.
     
     Args:
         data: New state data to encode
         client_id: Client ID for state tracking
+        session_id: Optional session ID; clients of one session holding
+            identical states share a single stored snapshot
         
     Returns:
         Tuple of (delta_data, metadata)
@@ -259,15 +412,18 @@ def delta_encode(data, client_id):
         raise ValueError("client_id is required for delta encoding")
         
     with _state_cache_lock:
-        if client_id not in _client_states:
+        prev = _state_store.get(client_id)
+        if prev is None:
             # First time for this client, store and return the full data
-            _client_states[client_id] = copy.deepcopy(data)
+            snapshot = _state_store.put(client_id, data, namespace=session_id)
             
             # Return compressed, but mark as not a delta
             json_data = json.dumps(data).encode('utf-8')
             metadata = {
                 'method': CompressionMethod.DELTA.name,
                 'delta': False,
+                'version': _state_store.get_version(client_id),
+                'state_hash': snapshot.root_hash,
                 'original_size': len(json_data),
                 'compressed_size': len(json_data),
                 'compression_ratio': 1.0,
@@ -277,21 +433,25 @@ def delta_encode(data, client_id):
             return json_data, metadata
             
         # Get the previous state
-        prev_state = _client_states[client_id]
+        prev_state = prev.state
         
         # Compute the delta operations
         operations = []
+        changed_keys = set()
         
         # Find set and delete operations
         for key in set(prev_state.keys()) | set(data.keys()):
             if key not in data:
                 # Key was deleted
                 operations.append(('del', key, None))
+                changed_keys.add(key)
             elif key not in prev_state:
                 # Key was added
                 operations.append(('set', key, data[key]))
+                changed_keys.add(key)
             elif prev_state[key] != data[key]:
                 # Key was changed
+                changed_keys.add(key)
                 if isinstance(prev_state[key], dict) and isinstance(data[key], dict):
                     # For nested dictionaries, compute nested deltas
                     for nested_key in set(prev_state[key].keys()) | set(data[key].keys()):
@@ -305,27 +465,31 @@ def delta_encode(data, client_id):
                     # Simple value change
                     operations.append(('set', key, data[key]))
         
-        # Create compact representation of operations
+        # Create compact representation of operations; the base hash comes
+        # from the stored snapshot instead of re-serializing the old state
         delta_data = {
             'ops': operations,
-            'hash': hashlib.md5(json.dumps(prev_state).encode('utf-8')).hexdigest()
+            'hash': prev.root_hash
         }
         
-        # Store the new state for future deltas
-        _client_states[client_id] = copy.deepcopy(data)
+        # Store the new state for future deltas (only changed keys are
+        # hashed and copied)
+        snapshot = _state_store.put(client_id, data, namespace=session_id, changed_keys=changed_keys)
         
         # Encode and return
         json_delta = json.dumps(delta_data).encode('utf-8')
         
-        # Calculate original size for comparison
-        json_original = json.dumps(data).encode('utf-8')
-        original_size = len(json_original)
+        # Original size for comparison, from the per-key sizes the store
+        # already computed (values only, so slightly under the JSON size)
+        original_size = snapshot.size
         
         metadata = {
             'method': CompressionMethod.DELTA.name,
             'delta': True,
             'operations': len(operations),
+            'version': _state_store.get_version(client_id),
             'base_hash': delta_data['hash'],
+            'state_hash': snapshot.root_hash,
             'original_size': original_size,
             'compressed_size': len(json_delta),
             'compression_ratio': original_size / len(json_delta) if len(json_delta) > 0 else 1.0,
@@ -338,6 +502,9 @@ def delta_encode(data, client_id):
 def delta_decode(delta_data, metadata, client_id=None):
     """Decode delta-encoded data.
     
+    The result shares unchanged values with the stored base state, so it
+    must be treated as read-only (copy it before modifying).
+    
     Args:
         delta_data: Delta-encoded data
         metadata: Metadata from encoding
@@ -362,50 +529,47 @@ def delta_decode(delta_data, metadata, client_id=None):
     
     # Get the base state
     with _state_cache_lock:
-        if client_id not in _client_states:
+        base = _state_store.get(client_id)
+        if base is None:
             raise ValueError(f"No base state found for client {client_id}")
             
-        base_state = _client_states[client_id]
-        
         # Verify hash if provided - but be lenient for tests
-        if base_hash:
-            try:
-                base_hash_check = hashlib.md5(json.dumps(base_state).encode('utf-8')).hexdigest()
-                if base_hash != base_hash_check:
-                    logger.warning(f"Base state hash mismatch: expected {base_hash}, got {base_hash_check}")
-                    # Don't strictly fail in case of tests
-            except Exception as e:
-                logger.warning(f"Error checking hash: {e}")
+        if base_hash and base_hash != base.root_hash:
+            logger.warning(f"Base state hash mismatch: expected {base_hash}, got {base.root_hash}")
+            # Don't strictly fail in case of tests
                 
-        # Create a copy of the base state to modify
-        result = copy.deepcopy(base_state)
+        # Copy-on-write: only the top level and the parents of touched keys
+        # are copied, everything else is shared with the base state
+        result = dict(base.state)
+        copied = set()
         
         # Apply operations
         for op, key, value in operations:
-            if op == 'del':
-                # Handle nested keys
-                if '.' in key:
-                    parts = key.split('.')
-                    parent_key = parts[0]
-                    nested_key = '.'.join(parts[1:])
-                    if parent_key in result and nested_key in result[parent_key]:
-                        del result[parent_key][nested_key]
-                elif key in result:
-                    del result[key]
-            elif op == 'set':
-                # Handle nested keys
-                if '.' in key:
-                    parts = key.split('.')
-                    parent_key = parts[0]
-                    nested_key = '.'.join(parts[1:])
-                    if parent_key not in result:
-                        result[parent_key] = {}
+            if '.' in key:
+                parts = key.split('.')
+                parent_key = parts[0]
+                nested_key = '.'.join(parts[1:])
+                if parent_key not in copied:
+                    parent = result.get(parent_key)
+                    if not isinstance(parent, dict):
+                        if op == 'del':
+                            continue
+                        parent = {}
+                    result[parent_key] = dict(parent)
+                    copied.add(parent_key)
+                if op == 'del':
+                    result[parent_key].pop(nested_key, None)
+                elif op == 'set':
                     result[parent_key][nested_key] = value
-                else:
+            else:
+                copied.add(key)
+                if op == 'del':
+                    result.pop(key, None)
+                elif op == 'set':
                     result[key] = value
         
-        # Update the cache with the new state
-        _client_states[client_id] = copy.deepcopy(result)
+        # Update the store with the new state
+        _state_store.put(client_id, result, changed_keys=copied)
         
         return result
 
@@ -436,10 +600,22 @@ def clear_state_cache(client_id=None):
     """
     with _state_cache_lock:
         if client_id:
-            if client_id in _client_states:
-                del _client_states[client_id]
+            _state_store.discard(client_id)
+            # A resync starts a new compression stream as well
+            if client_id in _stream_codecs:
+                _stream_codecs[client_id].reset()
         else:
-            _client_states.clear()
+            _state_store.clear()
+            for codec in _stream_codecs.values():
+                codec.reset()
+
+def get_state_store_stats() -> Dict[str, Any]:
+    """Get statistics of the delta encoding state store.
+    
+    Returns:
+        Dictionary with hit counters and memory estimates
+    """
+    return _state_store.get_stats()
 
 def _get_zlib_level(level):
     """Convert CompressionLevel to zlib level (1-9)."""
@@ -486,40 +662,355 @@ def _get_lz4_level(level):
     else:
         return 6  # Default balanced
 
-def optimal_compression_method(data_size: int) -> CompressionMethod:
+# Adaptive codec selection
+DEFAULT_BANDWIDTH = 1_000_000      # Bytes per second assumed for a client link
+DEFAULT_LATENCY_BUDGET = 0.005     # Seconds of encode time allowed per message
+CODEC_EWMA_ALPHA = 0.2             # Weight of the newest measurement
+CODEC_EXPLORE_INTERVAL = 64        # Re-measure another codec every N selections per size class
+CODEC_EXPLORE_MARGIN = 2.0         # Only re-measure codecs predicted within this factor of the best
+UNMEASURED_ENCODE_RATE = 2_000_000 # Bytes per second assumed for a codec never measured
+
+def _available_adaptive_codecs() -> Tuple[CompressionMethod, ...]:
+    """Get the codecs the adaptive selector may choose from."""
+    codecs = [CompressionMethod.NONE, CompressionMethod.ZLIB,
+              CompressionMethod.BZIP2, CompressionMethod.LZMA]
+    try:
+        import lz4.frame
+        codecs.append(CompressionMethod.LZ4)
+    except ImportError:
+        pass
+    try:
+        import brotli
+        codecs.append(CompressionMethod.BROTLI)
+    except ImportError:
+        pass
+    return tuple(codecs)
+
+def _size_class(size: int) -> int:
+    """Bucket a payload size into classes a factor of 4 apart."""
+    return min(size.bit_length() // 2, 15)
+
+class AdaptiveCodecSelector:
+    """
+    Chooses a compression codec from live measurements.
+    
+    Each codec's encode time and compression ratio are tracked per size
+    class with an EWMA. A message gets the codec with the lowest predicted
+    encode time plus transmit time (compressed size / bandwidth) among
+    those whose encode time fits the latency budget. Codecs that were never
+    measured for a size class are tried when their worst-case encode time is
+    affordable, and every explore_interval selections the least recently
+    measured close competitor is re-measured. NONE needs no measuring: it
+    costs nothing to encode and sends the payload as is.
+    """
+    
+    def __init__(self, bandwidth: float = DEFAULT_BANDWIDTH,
+                 latency_budget: float = DEFAULT_LATENCY_BUDGET,
+                 codecs: Optional[Tuple[CompressionMethod, ...]] = None,
+                 alpha: float = CODEC_EWMA_ALPHA,
+                 explore_interval: int = CODEC_EXPLORE_INTERVAL):
+        """
+        Initialize the selector.
+        
+        Args:
+            bandwidth: Default link bandwidth in bytes per second
+            latency_budget: Default encode time budget per message in seconds
+            codecs: Codecs to choose from (defaults to the available ones)
+            alpha: EWMA weight of new measurements
+            explore_interval: Selections per size class between re-measurements
+        """
+        self.bandwidth = bandwidth
+        self.latency_budget = latency_budget
+        self.codecs = tuple(codecs or _available_adaptive_codecs())
+        self.alpha = alpha
+        self.explore_interval = explore_interval
+        
+        # (codec, size_class) -> {'encode_time', 'size', 'ratio', 'samples', 'measured_at'}
+        self._estimates: Dict[Tuple[CompressionMethod, int], Dict[str, float]] = {}
+        self._selections: Dict[int, int] = {}
+        self._client_profiles: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+        self.stats = {
+            'selections': 0,
+            'explorations': 0,
+            'measurements': 0,
+            'chosen': {codec.name: 0 for codec in self.codecs}
+        }
+    
+    def set_client_profile(self, client_id: str, bandwidth: Optional[float] = None,
+                           latency_budget: Optional[float] = None,
+                           method: Optional[CompressionMethod] = None) -> None:
+        """
+        Override the link parameters or the codec for one client.
+        
+        Args:
+            client_id: Client ID
+            bandwidth: Client bandwidth in bytes per second
+            latency_budget: Client encode time budget in seconds
+            method: Codec to always use for this client
+        """
+        with self._lock:
+            self._client_profiles[client_id] = {
+                'bandwidth': bandwidth,
+                'latency_budget': latency_budget,
+                'method': method
+            }
+    
+    def clear_client_profile(self, client_id: str) -> None:
+        """
+        Remove a client's overrides.
+        
+        Args:
+            client_id: Client ID
+        """
+        with self._lock:
+            self._client_profiles.pop(client_id, None)
+    
+    def _predict_encode_time(self, codec: CompressionMethod, size: int, size_class: int) -> Optional[float]:
+        """Predict encode time from the nearest measured size class, None if never measured."""
+        if codec == CompressionMethod.NONE:
+            return 0.0
+        for distance in range(16):
+            for candidate in (size_class - distance, size_class + distance):
+                estimate = self._estimates.get((codec, candidate))
+                if estimate:
+                    return estimate['encode_time'] * size / max(estimate['size'], 1.0)
+        return None
+    
+    def select(self, size: int, client_id: Optional[str] = None) -> CompressionMethod:
+        """
+        Choose a codec for a payload.
+        
+        Args:
+            size: Serialized payload size in bytes
+            client_id: Client the payload is for (applies its overrides)
+            
+        Returns:
+            Compression method to use
+        """
+        with self._lock:
+            profile = self._client_profiles.get(client_id, {}) if client_id else {}
+            if profile.get('method'):
+                return profile['method']
+            
+            bandwidth = profile.get('bandwidth') or self.bandwidth
+            budget = profile.get('latency_budget') or self.latency_budget
+            size_class = _size_class(size)
+            count = self._selections.get(size_class, 0) + 1
+            self._selections[size_class] = count
+            self.stats['selections'] += 1
+            
+            best, best_time = self._best_choice(size, size_class, bandwidth, budget)
+            choice = self._exploration_choice(size, size_class, count, budget, bandwidth, best_time)
+            if choice is not None:
+                self.stats['explorations'] += 1
+            else:
+                choice = best
+            
+            self.stats['chosen'][choice.name] += 1
+            return choice
+    
+    def _predict(self, codec: CompressionMethod, size: int, size_class: int,
+                 bandwidth: float) -> Optional[Tuple[float, float]]:
+        """Predict (encode_time, total_time) from this size class, None if unmeasured."""
+        if codec == CompressionMethod.NONE:
+            return 0.0, size / bandwidth
+        estimate = self._estimates.get((codec, size_class))
+        if estimate is None:
+            return None
+        encode_time = estimate['encode_time'] * size / max(estimate['size'], 1.0)
+        return encode_time, encode_time + size * estimate['ratio'] / bandwidth
+    
+    def _exploration_choice(self, size: int, size_class: int, count: int, budget: float,
+                            bandwidth: float, best_time: float) -> Optional[CompressionMethod]:
+        """Pick a codec to measure, or None to exploit the estimates."""
+        stale = None
+        for codec in self.codecs:
+            if codec == CompressionMethod.NONE:
+                continue
+            
+            predicted = self._predict_encode_time(codec, size, size_class)
+            if predicted is None:
+                predicted = size / UNMEASURED_ENCODE_RATE
+            if predicted > budget:
+                continue
+            
+            estimate = self._estimates.get((codec, size_class))
+            if estimate is None:
+                return codec
+            
+            # Only re-measure codecs that could plausibly win
+            _, total_time = self._predict(codec, size, size_class, bandwidth)
+            if total_time > best_time * CODEC_EXPLORE_MARGIN:
+                continue
+            if stale is None or estimate['measured_at'] < stale[1]:
+                stale = (codec, estimate['measured_at'])
+        
+        if stale is not None and count % self.explore_interval == 0:
+            return stale[0]
+        return None
+    
+    def _best_choice(self, size: int, size_class: int, bandwidth: float,
+                     budget: float) -> Tuple[CompressionMethod, float]:
+        """Pick the codec with the lowest predicted encode + transmit time."""
+        best = None
+        fastest = None
+        for codec in self.codecs:
+            prediction = self._predict(codec, size, size_class, bandwidth)
+            if prediction is None:
+                continue
+            
+            encode_time, total_time = prediction
+            if fastest is None or encode_time < fastest[1]:
+                fastest = (codec, encode_time, total_time)
+            if encode_time <= budget and (best is None or total_time < best[1]):
+                best = (codec, total_time)
+        
+        if best is not None:
+            return best
+        return fastest[0], fastest[2]
+    
+    def record(self, method: CompressionMethod, original_size: int,
+               compressed_size: int, encode_time: float) -> None:
+        """
+        Record a measured encode.
+        
+        Args:
+            method: Codec used
+            original_size: Payload size in bytes
+            compressed_size: Encoded size in bytes
+            encode_time: Encode time in seconds
+        """
+        if method not in self.codecs or original_size <= 0:
+            return
+            
+        ratio = compressed_size / original_size
+        key = (method, _size_class(original_size))
+        
+        with self._lock:
+            self.stats['measurements'] += 1
+            estimate = self._estimates.get(key)
+            if estimate is None:
+                self._estimates[key] = {
+                    'encode_time': encode_time,
+                    'size': float(original_size),
+                    'ratio': ratio,
+                    'samples': 1,
+                    'measured_at': self.stats['selections']
+                }
+                return
+            
+            alpha = self.alpha
+            estimate['encode_time'] += alpha * (encode_time - estimate['encode_time'])
+            estimate['size'] += alpha * (original_size - estimate['size'])
+            estimate['ratio'] += alpha * (ratio - estimate['ratio'])
+            estimate['samples'] += 1
+            estimate['measured_at'] = self.stats['selections']
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get selector statistics and current estimates.
+        
+        Returns:
+            Dictionary with statistics
+        """
+        with self._lock:
+            stats = copy.deepcopy(self.stats)
+            stats['estimates'] = {
+                f"{codec.name}/{1 << (2 * size_class)}": {
+                    'encode_ms': estimate['encode_time'] * 1000.0,
+                    'ratio': estimate['ratio'],
+                    'samples': estimate['samples']
+                }
+                for (codec, size_class), estimate in sorted(
+                    self._estimates.items(), key=lambda item: (item[0][1], item[0][0].value))
+            }
+            stats['client_profiles'] = len(self._client_profiles)
+            return stats
+
+_codec_selector: Optional[AdaptiveCodecSelector] = None
+
+def get_codec_selector() -> AdaptiveCodecSelector:
     """
-    Determine the optimal compression method based on data size.
+    Get the shared adaptive codec selector.
+    
+    Returns:
+        The process-wide AdaptiveCodecSelector
+    """
+    global _codec_selector
+    if _codec_selector is None:
+        with _state_cache_lock:
+            if _codec_selector is None:
+                _codec_selector = AdaptiveCodecSelector()
+    return _codec_selector
+
+def optimal_compression_method(data_size: int, client_id: Optional[str] = None) -> CompressionMethod:
+    """
+    Determine the optimal compression method for a payload.
+    
+    Delegates to the shared AdaptiveCodecSelector, which picks the codec
+    with the lowest measured encode + transmit time within the latency budget.
     
     Args:
         data_size: Size of data in bytes
+        client_id: Client the data is for (applies its overrides)
         
     Returns:
         Optimal compression method
     """
-    if data_size < 100:
-        return CompressionMethod.NONE  # Too small to benefit from compression
-    elif data_size < 1000:
-        return CompressionMethod.ZLIB  # Fast and good for small data
-    elif data_size < 10000:
-        return CompressionMethod.GZIP  # Good balance for medium data
-    elif data_size < 100000:
-        return CompressionMethod.BZIP2  # Better compression for larger data
-    else:
-        return CompressionMethod.LZMA  # Best compression for very large data
+    return get_codec_selector().select(data_size, client_id)
+
+def compress_adaptive(data: Any, client_id: Optional[str] = None,
+                      level: CompressionLevel = CompressionLevel.BALANCED,
+                      selector: Optional[AdaptiveCodecSelector] = None) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    Compress data with the codec chosen by the adaptive selector.
+    
+    Args:
+        data: Any Python data structure that can be serialized to JSON
+        client_id: Client the data is for (applies its overrides)
+        level: Compression level
+        selector: Selector to use (defaults to the shared selector)
+        
+    Returns:
+        Tuple of (compressed_data, metadata), decodable with decompress_data
+    """
+    selector = selector or get_codec_selector()
+    json_data = json.dumps(data).encode('utf-8')
+    method = selector.select(len(json_data), client_id)
+    
+    metadata = {
+        'method': method.name,
+        'level': level.name,
+        'original_size': len(json_data),
+        'timestamp': time.time()
+    }
+    compressed = _compress_payload(json_data, method, level, metadata, selector=selector)
+    metadata['compressed_size'] = len(compressed)
+    metadata['compression_ratio'] = len(json_data) / len(compressed) if len(compressed) > 0 else 1.0
+    
+    return compressed, metadata
 
-def encode_for_network(data: Any, client_id: Optional[str] = None) -> Dict[str, Any]:
+def encode_for_network(data: Any, client_id: Optional[str] = None,
+                       dictionary: Optional[CompressionDictionary] = None,
+                       codec: Optional[StreamCodec] = None,
+                       session_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Encode data for network transmission.
     
     Args:
         data: Data to encode
         client_id: Client ID for delta encoding
+        dictionary: Preset dictionary negotiated with the client
+        codec: Streaming compression context of the connection
+        session_id: Session of the client, for shared delta bases
         
     Returns:
         Encoded data with metadata
     """
     # Compress the data
-    compressed, metadata = compress_data(data, client_id=client_id)
+    compressed, metadata = compress_data(data, client_id=client_id, dictionary=dictionary, codec=codec,
+                                         session_id=session_id)
     
     # Base64 encode the compressed data
     encoded = base64.b64encode(compressed).decode('utf-8')
@@ -530,13 +1021,17 @@ def encode_for_network(data: Any, client_id: Optional[str] = None) -> Dict[str,
         'timestamp': time.time()
     }
 
-def decode_from_network(encoded_data: Dict[str, Any], client_id: Optional[str] = None) -> Any:
+def decode_from_network(encoded_data: Dict[str, Any], client_id: Optional[str] = None,
+                        dictionary: Optional[CompressionDictionary] = None,
+                        codec: Optional[StreamCodec] = None) -> Any:
     """
     Decode data from network transmission.
     
     Args:
         encoded_data: Data from encode_for_network
         client_id: Client ID for delta decoding
+        dictionary: Preset dictionary negotiated with the server
+        codec: Streaming compression context of the connection
         
     Returns:
         Decoded data
@@ -545,7 +1040,7 @@ def decode_from_network(encoded_data: Dict[str, Any], client_id: Optional[str] =
     compressed = base64.b64decode(encoded_data['data'])
     
     # Decompress the data
-    return decompress_data(compressed, encoded_data['metadata'], client_id)
+    return decompress_data(compressed, encoded_data['metadata'], client_id, dictionary, codec)
 
 def optimize_message(message: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -715,19 +1210,28 @@ def _run_length_decode(encoded: List[Any]) -> List[Any]:
     
     return result
 
-def batch_compress(messages: List[Dict[str, Any]], client_id: Optional[str] = None) -> Dict[str, Any]:
+def batch_compress(messages: List[Dict[str, Any]], client_id: Optional[str] = None,
+                   codec: Optional[StreamCodec] = None,
+                   session_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Compress a batch of messages for efficient network transmission.
     
     Args:
         messages: List of messages to compress
         client_id: Client ID for delta encoding
+        codec: Streaming compression context of the connection
+        session_id: Session of the client, for shared delta bases
         
     Returns:
         Compressed batch
     """
-    # Compress the whole batch
-    compressed, metadata = compress_data(messages, client_id=client_id)
+    # Compress the whole batch, onto the connection stream if there is one,
+    # otherwise with the codec the adaptive selector picks for its size
+    if codec is not None:
+        compressed, metadata = compress_data(messages, client_id=client_id, codec=codec,
+                                             session_id=session_id)
+    else:
+        compressed, metadata = compress_adaptive(messages, client_id)
     
     # Base64 encode the compressed data
     encoded = base64.b64encode(compressed).decode('utf-8')
@@ -740,13 +1244,15 @@ def batch_compress(messages: List[Dict[str, Any]], client_id: Optional[str] = No
         'timestamp': time.time()
     }
 
-def batch_decompress(batch: Dict[str, Any], client_id: Optional[str] = None) -> List[Dict[str, Any]]:
+def batch_decompress(batch: Dict[str, Any], client_id: Optional[str] = None,
+                     codec: Optional[StreamCodec] = None) -> List[Dict[str, Any]]:
     """
     Decompress a batch of messages.
     
     Args:
         batch: Compressed batch from batch_compress
         client_id: Client ID for delta decoding
+        codec: Streaming compression context of the connection
         
     Returns:
         List of decompressed messages
@@ -755,4 +1261,4 @@ def batch_decompress(batch: Dict[str, Any], client_id: Optional[str] = None) ->
     compressed = base64.b64decode(batch['data'])
     
     # Decompress the data
-    return decompress_data(compressed, batch['metadata'], client_id) 
\ No newline at end of file
+    return decompress_data(compressed, batch['metadata'], client_id, codec=codec) 
\ No newline at end of file
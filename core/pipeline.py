@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Frame Pipeline for MetaMindIQTrain
+
+Building blocks for running simulation and rendering on separate threads:
+
+1. FrameRecorder: a renderer stand-in that records a module's draw calls,
+   so a frame can be built on the simulation thread and replayed on the
+   render thread
+2. SnapshotBuffer: a double buffer handing the latest immutable frame
+   snapshot from the simulation thread to the render thread
+3. PipelineTimings: per-stage timings plus the time both threads were busy
+   at once, showing how much the stages overlap
+"""
+
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+try:
+    from core.streaming_stats import StreamingStats
+except ImportError:
+    from .streaming_stats import StreamingStats
+
+# One published frame. frame is the FrameClock build number; commands is a
+# tuple of (method, args, kwargs) draw calls; input_latency is the oldest
+# processed event's wait in seconds.
+FrameSnapshot = namedtuple('FrameSnapshot', 'tick frame sim_time commands events input_latency')
+
+
+class FrameRecorder:
+    """Records renderer draw calls for replay on another thread.
+
+    Method calls on the recorder are recorded instead of drawn. Recorded
+    arguments are shared with the snapshot, so callers must not mutate them
+    afterwards.
+    """
+
+    def __init__(self, width: int, height: int, renderer=None):
+        """Initialize the recorder.
+
+        Args:
+            width: Width reported to the module
+            height: Height reported to the module
+            renderer: Renderer the calls will be replayed on; if given, only
+                its methods are recorded and other attributes do not exist
+        """
+        self.width = width
+        self.height = height
+        self.renderer = renderer
+        self.commands = []
+
+    def get_size(self) -> Tuple[int, int]:
+        """Get the size of the recorded frame."""
+        return (self.width, self.height)
+
+    def draw_text(self, *args, **kwargs) -> Tuple[int, int]:
+        """Record a text draw call.
+
+        Returns:
+            (0, 0), since the text is only measured when it is replayed
+        """
+        self.commands.append(('draw_text', args, kwargs))
+        return (0, 0)
+
+    def __getattr__(self, name):
+        renderer = self.__dict__.get('renderer')
+        if name.startswith('_') or (renderer is not None and not callable(getattr(renderer, name, None))):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+        return record
+
+    def take(self) -> tuple:
+        """Get the recorded calls and start a new frame.
+
+        Returns:
+            Tuple of (method, args, kwargs)
+        """
+        commands = tuple(self.commands)
+        self.commands = []
+        return commands
+
+
+def replay(commands: Iterable[tuple], renderer) -> None:
+    """Issue recorded draw calls on a renderer.
+
+    Args:
+        commands: Recorded (method, args, kwargs) tuples
+        renderer: Renderer to draw with
+    """
+    for name, args, kwargs in commands:
+        getattr(renderer, name)(*args, **kwargs)
+
+
+class SnapshotBuffer:
+    """Double buffer passing the latest snapshot from one producer to one consumer.
+
+    The producer writes the back slot and swaps it to the front; the
+    consumer always gets the newest snapshot, and snapshots it never saw
+    are counted as dropped.
+    """
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._slots = [None, None]
+        self._front = 0
+        self._version = 0
+        self._consumed = 0
+        self._condition = threading.Condition()
+
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, snapshot: Any) -> int:
+        """Publish a new snapshot.
+
+        Args:
+            snapshot: Immutable snapshot
+
+        Returns:
+            Version of the published snapshot
+        """
+        with self._condition:
+            back = 1 - self._front
+            self._slots[back] = snapshot
+            self._front = back
+            if self._version > self._consumed:
+                self.dropped += 1
+            self._version += 1
+            self.published += 1
+            self._condition.notify_all()
+            return self._version
+
+    def latest(self, after_version: int = 0, timeout: Optional[float] = None) -> Tuple[int, Any]:
+        """Get the newest snapshot.
+
+        Args:
+            after_version: Wait for a snapshot newer than this version
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Tuple of (version, snapshot); the snapshot is None if nothing
+            newer than after_version was published in time
+        """
+        with self._condition:
+            if self._version <= after_version:
+                self._condition.wait_for(lambda: self._version > after_version, timeout)
+            if self._version <= after_version:
+                return after_version, None
+            self._consumed = self._version
+            return self._version, self._slots[self._front]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get publish and drop counts."""
+        with self._condition:
+            return {
+                'version': self._version,
+                'published': self.published,
+                'dropped': self.dropped
+            }
+
+
+class PipelineTimings:
+    """Per-stage timings and thread overlap of a frame pipeline."""
+
+    STAGES = ('events', 'update', 'build', 'render')
+
+    def __init__(self, capacity: int = 120):
+        """Initialize the timings.
+
+        Args:
+            capacity: Samples kept per stage
+        """
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all timings."""
+        with self._lock:
+            self.stages = {stage: StreamingStats(self.capacity) for stage in self.STAGES}
+            self.input_latency = StreamingStats(self.capacity)
+            self._busy: Dict[str, bool] = {}
+            self.busy_time: Dict[str, float] = {}
+            self.overlap_time = 0.0
+            self.started = self._last_change = time.perf_counter()
+
+    def _set_busy(self, thread: str, busy: bool) -> None:
+        """Account elapsed time before a thread changes state."""
+        now = time.perf_counter()
+        with self._lock:
+            elapsed = now - self._last_change
+            active = [name for name, is_busy in self._busy.items() if is_busy]
+            for name in active:
+                self.busy_time[name] = self.busy_time.get(name, 0.0) + elapsed
+            if len(active) > 1:
+                self.overlap_time += elapsed
+            self._last_change = now
+            self._busy[thread] = busy
+
+    @contextmanager
+    def stage(self, thread: str, name: str):
+        """Time one stage run by a thread.
+
+        Args:
+            thread: Name of the thread running the stage
+            name: Stage name
+        """
+        self._set_busy(thread, True)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._set_busy(thread, False)
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StreamingStats(self.capacity)
+            stats.add(elapsed_ms)
+
+    def add_input_latency(self, seconds: float) -> None:
+        """Record how long an input event waited before being processed."""
+        self.input_latency.add(seconds * 1000)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the timings.
+
+        Returns:
+            Dictionary with per-stage millisecond summaries, input latency,
+            the fraction of wall time each thread was busy, the fraction
+            both were busy at once, and the speedup over running the same
+            work serially
+        """
+        self._set_busy('_stats', False)
+        with self._lock:
+            wall = max(1e-9, time.perf_counter() - self.started)
+            busy = dict(self.busy_time)
+            overlap = self.overlap_time
+
+        total_busy = sum(busy.values())
+        union = total_busy - overlap
+        return {
+            'stages': {name: stats.to_dict() for name, stats in self.stages.items()},
+            'input_latency_ms': self.input_latency.to_dict(),
+            'busy': {name: value / wall for name, value in busy.items()},
+            'overlap': overlap / wall,
+            'speedup': total_busy / union if union > 0 else 1.0
+        }
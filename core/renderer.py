@@ -9,7 +9,9 @@ consistent API for component rendering.
 
 import logging
 import sys
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
@@ -180,6 +182,7 @@ class PygameBackend(RenderBackend):
         self.running = False
         self.screen = None
         self.clock = None
+        self.last_present_ns = None
         self.width = 800
         self.height = 600
         self.image_cache = {}
@@ -237,6 +240,19 @@ class PygameBackend(RenderBackend):
             
         import pygame
         
+        self._update_frame_stats()
+            
+        # Flip the display with vsync
+        pygame.display.flip()
+        self.last_present_ns = time.perf_counter_ns()
+        
+        # Use clock.tick to maintain stable framerate
+        self.clock.tick(60)
+    
+    def _update_frame_stats(self) -> None:
+        """Count a presented frame and update the FPS once per second."""
+        import pygame
+        
         # Update frame counter and calculate FPS
         self.render_stats["frame_count"] += 1
         current_time = pygame.time.get_ticks()
@@ -246,12 +262,6 @@ class PygameBackend(RenderBackend):
             self.render_stats["frame_count"] = 0
             self.render_stats["last_fps_update"] = current_time
             self.render_stats["draw_calls"] = 0
-            
-        # Flip the display with vsync
-        pygame.display.flip()
-        
-        # Use clock.tick to maintain stable framerate
-        self.clock.tick(60)
     
     def shutdown(self) -> None:
         """Shut down the Pygame backend."""
@@ -384,9 +394,21 @@ class PygameBackend(RenderBackend):
         if not self.initialized or not text:
             return (0, 0)
             
+        # Render the text
+        font = self._get_font(font_name, font_size)
+        text_surface = font.render(text, True, color[:3])
+        text_rect = self._align_text_rect(text_surface.get_rect(), x, y, align, center_vertically)
+            
+        # Draw the text
+        self.screen.blit(text_surface, text_rect)
+        self.render_stats["draw_calls"] += 1
+        
+        return (text_rect.width, text_rect.height)
+    
+    def _get_font(self, font_name: str, font_size: int):
+        """Get a font, loading it if it is not cached."""
         import pygame
         
-        # Get the font (or load it if not cached)
         font_key = f"{font_name}_{font_size}"
         if font_key not in self.font_cache:
             if font_name == "default":
@@ -397,13 +419,11 @@ class PygameBackend(RenderBackend):
                 except:
                     font = pygame.font.Font(None, font_size)
             self.font_cache[font_key] = font
-        else:
-            font = self.font_cache[font_key]
-            
-        # Render the text
-        text_surface = font.render(text, True, color[:3])
-        text_rect = text_surface.get_rect()
-        
+        return self.font_cache[font_key]
+    
+    @staticmethod
+    def _align_text_rect(text_rect, x: int, y: int, align: str, center_vertically: bool):
+        """Position a text rect relative to the anchor point."""
         # Apply alignment
         if align == "center":
             text_rect.centerx = x
@@ -417,12 +437,7 @@ class PygameBackend(RenderBackend):
             text_rect.centery = y
         else:
             text_rect.top = y
-            
-        # Draw the text
-        self.screen.blit(text_surface, text_rect)
-        self.render_stats["draw_calls"] += 1
-        
-        return (text_rect.width, text_rect.height)
+        return text_rect
     
     def draw_circle(self, x: int, y: int, radius: int,
                    color: Tuple[int, int, int, int],
@@ -540,6 +555,296 @@ class PygameBackend(RenderBackend):
         """Get the current rendering statistics."""
         return self.render_stats.copy()
 
+class SDL2Backend(PygameBackend):
+    """Texture-based rendering backend on pygame._sdl2.video.
+    
+    Text, rounded rectangles, circles and images are rendered to a surface
+    once, uploaded as a texture and cached, so a frame is only texture
+    copies and filled rects blended by the SDL renderer. Works with SDL's
+    software renderer, so it runs without a GPU (and headless with the dummy
+    video driver).
+    """
+    
+    # Cached textures before the least recently used are destroyed
+    MAX_CACHED_TEXTURES = 512
+    
+    def __init__(self, software: bool = False, vsync: bool = False):
+        """Initialize the SDL2 backend.
+        
+        Args:
+            software: Force SDL's software renderer
+            vsync: Synchronize present() with the display refresh
+        """
+        super().__init__()
+        self.software = software
+        self.vsync = vsync
+        self.window = None
+        self.sdl_renderer = None
+        self._blend_mode = None
+        self.texture_cache = OrderedDict()
+        self.render_stats.update({
+            "texture_uploads": 0,
+            "texture_hits": 0,
+            "texture_evictions": 0
+        })
+    
+    def initialize(self, width: int, height: int, title: str = "MetaMindIQTrain") -> bool:
+        """Create the window and an SDL renderer for it."""
+        try:
+            import pygame
+            from pygame._sdl2.video import Window, Renderer as SDLRenderer
+            pygame.init()
+            
+            self.width = width
+            self.height = height
+            self.window = Window(title, size=(width, height))
+            # accelerated=-1 lets SDL fall back to software without a GPU
+            self.sdl_renderer = SDLRenderer(self.window, accelerated=0 if self.software else -1,
+                                            vsync=self.vsync)
+            self._blend_mode = None
+            
+            self.clock = pygame.time.Clock()
+            self.running = True
+            self.initialized = True
+            self.render_stats["last_fps_update"] = pygame.time.get_ticks()
+            
+            logger.info(f"SDL2 texture backend initialized ({width}x{height}, "
+                        f"{'software' if self.software else 'accelerated'})")
+            return True
+            
+        except ImportError:
+            logger.error("pygame._sdl2 is not available. Please install pygame 2 to use this backend.")
+            return False
+        except Exception as e:
+            logger.error(f"Error initializing SDL2 backend: {e}")
+            return False
+    
+    def clear(self, color: Tuple[int, int, int, int] = (0, 0, 0, 255)) -> None:
+        """Clear the render target."""
+        if not self.initialized:
+            return
+            
+        self.sdl_renderer.draw_color = color
+        self.sdl_renderer.clear()
+        self.render_stats["draw_calls"] += 1
+    
+    def present(self) -> None:
+        """Present the rendered frame."""
+        if not self.initialized:
+            return
+            
+        self._update_frame_stats()
+        self.sdl_renderer.present()
+        self.last_present_ns = time.perf_counter_ns()
+        self.clock.tick(60)
+    
+    def shutdown(self) -> None:
+        """Destroy the cached textures, the renderer and the window."""
+        if not self.initialized:
+            return
+            
+        self.texture_cache.clear()
+        self.sdl_renderer = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+        super().shutdown()
+    
+    def read_pixels(self):
+        """Read back the current render target.
+        
+        Returns:
+            pygame Surface with the pixels drawn since the last clear
+        """
+        return self.sdl_renderer.to_surface()
+    
+    def _get_texture(self, key, build_surface):
+        """Get a cached texture, uploading it on first use.
+        
+        Args:
+            key: Hashable cache key
+            build_surface: Callable returning the surface to upload
+            
+        Returns:
+            Texture
+        """
+        texture = self.texture_cache.get(key)
+        if texture is not None:
+            self.texture_cache.move_to_end(key)
+            self.render_stats["texture_hits"] += 1
+            return texture
+        
+        from pygame._sdl2.video import Texture
+        texture = Texture.from_surface(self.sdl_renderer, build_surface())
+        self.texture_cache[key] = texture
+        self.render_stats["texture_uploads"] += 1
+        
+        while len(self.texture_cache) > self.MAX_CACHED_TEXTURES:
+            self.texture_cache.popitem(last=False)
+            self.render_stats["texture_evictions"] += 1
+        return texture
+    
+    @staticmethod
+    def _rgba(color) -> Tuple[int, int, int, int]:
+        """Get a color as an RGBA tuple."""
+        return tuple(color) if len(color) > 3 else (*color[:3], 255)
+    
+    def _set_draw_color(self, color) -> None:
+        """Set the color of rect and line primitives.
+        
+        Blending is only enabled for translucent colors: opaque fills are
+        plain copies, which the software renderer does much faster.
+        """
+        import pygame
+        
+        color = self._rgba(color)
+        blend_mode = pygame.BLENDMODE_BLEND if color[3] < 255 else pygame.BLENDMODE_NONE
+        if blend_mode != self._blend_mode:
+            self.sdl_renderer.draw_blend_mode = blend_mode
+            self._blend_mode = blend_mode
+        self.sdl_renderer.draw_color = color
+    
+    def draw_rectangle(self, x: int, y: int, width: int, height: int,
+                      color: Tuple[int, int, int, int], filled: bool = True) -> None:
+        """Draw a rectangle, blended by the renderer."""
+        if not self.initialized:
+            return
+            
+        import pygame
+        
+        color = self._rgba(color)
+        if filled and color[3] < 255 and width > 0 and height > 0:
+            # An opaque texture with alpha modulation blends faster than a
+            # translucent fill on the software renderer
+            def build():
+                surface = pygame.Surface((width, height))
+                surface.fill(color[:3])
+                return surface
+            
+            texture = self._get_texture(("fill", width, height, color[:3]), build)
+            texture.blend_mode = pygame.BLENDMODE_BLEND
+            texture.alpha = color[3]
+            texture.draw(dstrect=(x, y, width, height))
+        else:
+            self._set_draw_color(color)
+            if filled:
+                self.sdl_renderer.fill_rect((x, y, width, height))
+            else:
+                self.sdl_renderer.draw_rect((x, y, width, height))
+        self.render_stats["draw_calls"] += 1
+    
+    def draw_rounded_rectangle(self, x: int, y: int, width: int, height: int,
+                              color: Tuple[int, int, int, int], radius: int = 5,
+                              border_color: Optional[Tuple[int, int, int, int]] = None,
+                              border_width: int = 0) -> None:
+        """Draw a rounded rectangle from a cached texture."""
+        if not self.initialized or width <= 0 or height <= 0:
+            return
+            
+        import pygame
+        
+        color = self._rgba(color)
+        border_color = self._rgba(border_color) if border_color is not None and border_width > 0 else None
+        
+        def build():
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(surface, color, (0, 0, width, height), 0, radius)
+            if border_color is not None:
+                pygame.draw.rect(surface, border_color, (0, 0, width, height), border_width, radius)
+            return surface
+        
+        texture = self._get_texture(("rounded_rect", width, height, color, radius, border_color, border_width),
+                                    build)
+        texture.draw(dstrect=(x, y, width, height))
+        self.render_stats["draw_calls"] += 1
+    
+    def draw_line(self, x1: int, y1: int, x2: int, y2: int, 
+                 color: Tuple[int, int, int, int], thickness: int = 1) -> None:
+        """Draw a line, as a filled quad when thicker than one pixel."""
+        if not self.initialized:
+            return
+            
+        self._set_draw_color(color)
+        if thickness <= 1:
+            self.sdl_renderer.draw_line((x1, y1), (x2, y2))
+        else:
+            length = max(1e-6, ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5)
+            # Offset perpendicular to the line by half the thickness
+            ox = -(y2 - y1) / length * thickness / 2
+            oy = (x2 - x1) / length * thickness / 2
+            self.sdl_renderer.fill_quad((x1 + ox, y1 + oy), (x2 + ox, y2 + oy),
+                                        (x2 - ox, y2 - oy), (x1 - ox, y1 - oy))
+        self.render_stats["draw_calls"] += 1
+    
+    def draw_text(self, x: int, y: int, text: str, font_size: int = 16,
+                 color: Tuple[int, int, int, int] = (255, 255, 255, 255),
+                 align: str = "left", font_name: str = "default",
+                 center_vertically: bool = False) -> Tuple[int, int]:
+        """Draw text from a cached texture."""
+        if not self.initialized or not text:
+            return (0, 0)
+            
+        texture = self._get_texture(
+            ("text", font_name, font_size, text, tuple(color[:3])),
+            lambda: self._get_font(font_name, font_size).render(text, True, color[:3])
+        )
+        text_rect = self._align_text_rect(texture.get_rect(), x, y, align, center_vertically)
+        texture.draw(dstrect=text_rect)
+        self.render_stats["draw_calls"] += 1
+        
+        return (text_rect.width, text_rect.height)
+    
+    def draw_circle(self, x: int, y: int, radius: int,
+                   color: Tuple[int, int, int, int],
+                   border_color: Optional[Tuple[int, int, int, int]] = None,
+                   border_width: int = 0, filled: bool = True) -> None:
+        """Draw a circle from a cached texture."""
+        if not self.initialized or radius <= 0:
+            return
+            
+        import pygame
+        
+        color = self._rgba(color)
+        border_color = self._rgba(border_color) if border_color is not None and border_width > 0 else None
+        size = radius * 2 + 1
+        
+        def build():
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surface, color, (radius, radius), radius, 0 if filled else 1)
+            if border_color is not None:
+                pygame.draw.circle(surface, border_color, (radius, radius), radius, border_width)
+            return surface
+        
+        texture = self._get_texture(("circle", radius, color, border_color, border_width, filled), build)
+        texture.draw(dstrect=(x - radius, y - radius, size, size))
+        self.render_stats["draw_calls"] += 1
+    
+    def draw_image(self, x: int, y: int, image_path: str, 
+                  width: Optional[int] = None, height: Optional[int] = None) -> None:
+        """Draw an image from a cached texture, scaled by the renderer."""
+        if not self.initialized:
+            return
+            
+        import pygame
+        
+        try:
+            texture = self._get_texture(("image", image_path), lambda: pygame.image.load(image_path))
+        except Exception as e:
+            logger.error(f"Error loading image {image_path}: {e}")
+            return
+        
+        if width is not None and height is not None:
+            texture.draw(dstrect=(x, y, width, height))
+        else:
+            texture.draw(dstrect=(x, y))
+        self.render_stats["draw_calls"] += 1
+    
+    def get_render_stats(self) -> Dict[str, Any]:
+        """Get the current rendering and texture cache statistics."""
+        stats = self.render_stats.copy()
+        stats["cached_textures"] = len(self.texture_cache)
+        return stats
+
 class WebGLBackend(RenderBackend):
     """WebGL-based rendering backend for web clients."""
     
@@ -870,7 +1175,8 @@ class Renderer:
         Args:
             width: Window width
             height: Window height
-            backend: Renderer backend to use ('auto', 'pygame', 'webgl', 'headless')
+            backend: Renderer backend to use ('auto', 'pygame', 'sdl2',
+                'sdl2_software', 'webgl', 'headless')
             title: Window title
 
         Returns:
@@ -905,6 +1211,13 @@ class Renderer:
                 self.backend_name = "pygame"
             else:
                 return False
+        elif backend in ("sdl2", "sdl2_software"):
+            sdl2_backend = SDL2Backend(software=backend == "sdl2_software")
+            if sdl2_backend.initialize(width, height, title):
+                self.backend = sdl2_backend
+                self.backend_name = backend
+            else:
+                return False
         elif backend == "webgl":
             webgl_backend = WebGLBackend()
             if webgl_backend.initialize(width, height, title):
@@ -943,6 +1256,15 @@ class Renderer:
         if self.backend:
             self.backend.present()
             
+    def get_last_present_ns(self) -> Optional[int]:
+        """Get when the last frame reached the screen.
+        
+        Returns:
+            time.perf_counter_ns() right after the last flip, before frame
+            limiting, or None if the backend does not record it
+        """
+        return getattr(self.backend, 'last_present_ns', None)
+        
     def is_running(self) -> bool:
         """Check if the renderer is still running."""
         return self.backend and self.backend.is_running()
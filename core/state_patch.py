@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+State Patch Engine for MetaMindIQTrain
+
+This module computes and applies path-based state deltas (``{"a.b.c": value}``,
+where a value of None deletes the key) without deep-copying the whole state.
+
+Key features:
+1. Copy-on-write application: only containers on touched paths are copied,
+   untouched subtrees are shared with the previous state
+2. Delta coalescing: a queue of pending deltas is merged into one patch
+   before it is applied
+3. Full-state jumps: when a full state is queued, everything older is dropped
+4. Versioned snapshot ring: deltas from any recent version, so reconnecting
+   clients resume instead of receiving a full state
+5. State checksums: clients verify their state instead of being sent
+   periodic full states
+"""
+
+import json
+import logging
+import zlib
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keys carrying protocol metadata rather than state
+META_KEYS = frozenset(("_meta",))
+
+# Recent versions kept per session for resumable reconnects
+SNAPSHOT_RING_SIZE = 16
+
+
+def _set_path(root: Dict[str, Any], parts: List[str], value: Any, copied: set) -> None:
+    """Set or delete a path in a tree, copying containers on first touch.
+
+    Args:
+        root: Root dictionary (already owned by the caller)
+        parts: Path components
+        value: Value to set, or None to delete
+        copied: ids of containers already copied during this patch
+    """
+    curr = root
+    for part in parts[:-1]:
+        child = curr.get(part) if isinstance(curr, dict) else None
+        if not isinstance(child, dict):
+            # Missing or non-dict intermediate values become empty dicts
+            child = {}
+            copied.add(id(child))
+        elif id(child) not in copied:
+            child = dict(child)
+            copied.add(id(child))
+        curr[part] = child
+        curr = child
+
+    last = parts[-1]
+    if value is None:
+        curr.pop(last, None)
+    else:
+        curr[last] = value
+
+
+def _diff_into(prev: Any, curr: Any, delta: Dict[str, Any], path: str) -> None:
+    """Recursively collect the differences between two values.
+
+    Args:
+        prev: Previous value
+        curr: Current value
+        delta: Output delta dictionary
+        path: Dotted path of the values (empty at the root)
+    """
+    if type(prev) != type(curr):
+        if path:
+            delta[path] = curr
+        else:
+            delta.update(curr)
+        return
+
+    if isinstance(curr, dict):
+        for key in set(curr.keys()) - set(prev.keys()):
+            new_path = f"{path}.{key}" if path else key
+            delta[new_path] = curr[key]
+
+        for key in set(curr.keys()) & set(prev.keys()):
+            new_path = f"{path}.{key}" if path else key
+            if curr[key] != prev[key]:
+                if isinstance(curr[key], dict) and isinstance(prev[key], dict):
+                    _diff_into(prev[key], curr[key], delta, new_path)
+                else:
+                    delta[new_path] = curr[key]
+
+        # Keys only in the previous dict are deleted
+        for key in set(prev.keys()) - set(curr.keys()):
+            new_path = f"{path}.{key}" if path else key
+            delta[new_path] = None
+
+    elif curr != prev:
+        delta[path] = curr
+
+
+def compute_delta(previous_state: Dict[str, Any], current_state: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute the path-based delta between two states.
+
+    Args:
+        previous_state: Previous state dictionary
+        current_state: Current state dictionary
+
+    Returns:
+        Delta dictionary with only changed values (the current state itself
+        if there is no previous state)
+    """
+    if not previous_state:
+        return current_state
+
+    delta: Dict[str, Any] = {}
+    _diff_into(previous_state, current_state, delta, "")
+    return delta
+
+
+def apply_patch(base_state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a path-based delta with copy-on-write on touched paths.
+
+    The base state is never modified; the result shares every subtree the
+    delta does not touch.
+
+    Args:
+        base_state: Base state dictionary
+        delta: Delta dictionary mapping dotted paths to values
+
+    Returns:
+        Updated state dictionary
+    """
+    if not delta:
+        return base_state
+
+    result = dict(base_state)
+    copied = {id(result)}
+
+    for path, value in delta.items():
+        if path in META_KEYS:
+            continue
+        _set_path(result, path.split("."), value, copied)
+
+    return result
+
+
+def state_checksum(state: Dict[str, Any]) -> int:
+    """Compute a checksum of a state, ignoring metadata.
+
+    Server and client compute the same value for equal states regardless
+    of key order.
+
+    Args:
+        state: State dictionary
+
+    Returns:
+        CRC32 of the canonical JSON encoding
+    """
+    if any(key in state for key in META_KEYS):
+        state = {key: value for key, value in state.items() if key not in META_KEYS}
+    encoded = json.dumps(state, sort_keys=True, separators=(",", ":"), default=str)
+    return zlib.crc32(encoded.encode("utf-8"))
+
+
+def merge_deltas(deltas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge a sequence of path-based deltas into one equivalent delta.
+
+    Applying the merged delta gives the same result as applying each delta
+    in order. A later path overrides earlier writes to the same path or to
+    any of its descendants; a later write below an earlier path is folded
+    into a copy of the earlier value.
+
+    Args:
+        deltas: Deltas in the order they were produced
+
+    Returns:
+        Merged delta dictionary (metadata of the last delta is kept)
+    """
+    if len(deltas) == 1:
+        return deltas[0]
+
+    merged: Dict[str, Any] = {}
+    meta = None
+
+    for delta in deltas:
+        for path, value in delta.items():
+            if path in META_KEYS:
+                meta = value
+                continue
+
+            # Fold into an earlier write of an ancestor path
+            ancestor = None
+            parts = path.split(".")
+            for i in range(1, len(parts)):
+                prefix = ".".join(parts[:i])
+                if prefix in merged:
+                    ancestor = prefix
+                    break
+
+            if ancestor is not None:
+                base = merged[ancestor]
+                base = dict(base) if isinstance(base, dict) else {}
+                rest = parts[len(ancestor.split(".")):]
+                _set_path(base, rest, value, {id(base)})
+                merged[ancestor] = base
+                continue
+
+            # Drop earlier writes to descendants, they are overwritten
+            prefix = path + "."
+            for existing in [p for p in merged if p.startswith(prefix)]:
+                del merged[existing]
+
+            merged[path] = value
+
+    if meta is not None:
+        merged["_meta"] = meta
+
+    return merged
+
+
+class SnapshotRing:
+    """Ring of the most recent versioned states of one session.
+
+    States are stored by reference and must not be modified afterwards.
+    """
+
+    def __init__(self, capacity: int = SNAPSHOT_RING_SIZE):
+        """Initialize the ring.
+
+        Args:
+            capacity: Number of versions kept
+        """
+        self.capacity = capacity
+        # Entries are [version, state, checksum or None]
+        self._entries = deque(maxlen=capacity)
+
+    def push(self, version: int, state: Dict[str, Any]) -> None:
+        """Record the state of a new version.
+
+        Args:
+            version: Version number, higher than any recorded so far
+            state: State at that version
+        """
+        if self._entries and version <= self._entries[-1][0]:
+            # Versions restarted (e.g. a module reset), older ones are stale
+            self._entries.clear()
+        self._entries.append([version, state, None])
+
+    def _find(self, version: int) -> Optional[list]:
+        """Find the entry of a version."""
+        if not self._entries:
+            return None
+        index = version - self._entries[0][0]
+        if 0 <= index < len(self._entries) and self._entries[index][0] == version:
+            return self._entries[index]
+        for entry in self._entries:
+            if entry[0] == version:
+                return entry
+        return None
+
+    def get(self, version: int) -> Optional[Dict[str, Any]]:
+        """Get the state of a version.
+
+        Args:
+            version: Version number
+
+        Returns:
+            The state, or None if the version is not in the ring
+        """
+        entry = self._find(version)
+        return entry[1] if entry else None
+
+    def checksum(self, version: int) -> Optional[int]:
+        """Get the checksum of a version's state (computed once).
+
+        Args:
+            version: Version number
+
+        Returns:
+            The checksum, or None if the version is not in the ring
+        """
+        entry = self._find(version)
+        if entry is None:
+            return None
+        if entry[2] is None:
+            entry[2] = state_checksum(entry[1])
+        return entry[2]
+
+    def delta_since(self, version: int) -> Optional[Dict[str, Any]]:
+        """Compute the delta from a version to the latest one.
+
+        Args:
+            version: Version the receiver holds
+
+        Returns:
+            Delta dictionary, or None if the version is not in the ring
+        """
+        base = self.get(version)
+        if base is None:
+            return None
+        return compute_delta(base, self._entries[-1][1])
+
+    @property
+    def latest_version(self) -> int:
+        """Newest recorded version (0 if empty)."""
+        return self._entries[-1][0] if self._entries else 0
+
+    @property
+    def oldest_version(self) -> int:
+        """Oldest version still in the ring (0 if empty)."""
+        return self._entries[0][0] if self._entries else 0
+
+    def clear(self) -> None:
+        """Drop all versions."""
+        self._entries.clear()
+
+    def __contains__(self, version: int) -> bool:
+        return self._find(version) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PatchEngine:
+    """Applies queued state updates to a client-side state.
+
+    Pending updates are reduced before application: everything older than
+    the newest full state is discarded, and the deltas after it are merged
+    into a single patch applied with copy-on-write.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        """Initialize the patch engine.
+
+        Args:
+            state: Initial state dictionary
+        """
+        self.state = state if state is not None else {}
+        self.version = 0
+        self.needs_resync = False
+        self.stats = {
+            'checksums_verified': 0,
+            'checksum_mismatches': 0,
+            'batches': 0,
+            'updates_received': 0,
+            'patches_applied': 0,
+            'deltas_coalesced': 0,
+            'updates_skipped': 0,
+            'full_states_applied': 0
+        }
+
+    def apply(self, updates: List[Tuple[str, int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Apply a batch of queued updates.
+
+        Args:
+            updates: List of (update_type, version, data) tuples in arrival
+                order, where update_type is 'full' or 'delta'
+
+        Returns:
+            The updated state
+        """
+        if not updates:
+            return self.state
+
+        self.stats['batches'] += 1
+        self.stats['updates_received'] += len(updates)
+
+        # Jump to the newest full state if one is queued
+        start = 0
+        for index in range(len(updates) - 1, -1, -1):
+            if updates[index][0] == 'full':
+                start = index
+                break
+
+        if start:
+            self.stats['updates_skipped'] += start
+
+        pending = updates[start:]
+        if pending[0][0] == 'full':
+            _, version, data = pending[0]
+            self.state = data
+            self.version = version
+            self.needs_resync = False
+            self.stats['full_states_applied'] += 1
+            pending = pending[1:]
+
+        deltas = [data for update_type, _, data in pending if update_type == 'delta']
+        if deltas:
+            patch = merge_deltas(deltas)
+            self.state = apply_patch(self.state, patch)
+            self.version = pending[-1][1]
+            self.stats['patches_applied'] += 1
+            self.stats['deltas_coalesced'] += len(deltas) - 1
+
+        self._verify_checksum(updates[-1][2])
+
+        logger.debug(f"Applied {len(updates)} state updates, version: {self.version}")
+        return self.state
+
+    def _verify_checksum(self, data: Dict[str, Any]) -> None:
+        """Compare the state with the checksum the server sent, if any.
+
+        On a mismatch needs_resync is set; the owner requests a full state.
+
+        Args:
+            data: The newest applied update
+        """
+        meta = data.get('_meta') if isinstance(data, dict) else None
+        if not meta or 'checksum' not in meta:
+            return
+
+        self.stats['checksums_verified'] += 1
+        if state_checksum(self.state) != meta['checksum']:
+            self.stats['checksum_mismatches'] += 1
+            self.needs_resync = True
+            logger.warning(f"State checksum mismatch at version {self.version}, resync needed")
+
+    def reset(self, state: Optional[Dict[str, Any]] = None) -> None:
+        """Reset the engine to a new base state.
+
+        Args:
+            state: New base state dictionary
+        """
+        self.state = state if state is not None else {}
+        self.version = 0
+        self.needs_resync = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get patch engine statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return self.stats.copy()
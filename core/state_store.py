@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Versioned State Store for MetaMindIQTrain
+
+Keeps the last state sent to (or received from) each client for delta
+encoding, without a full deep copy and full re-hash on every update.
+
+Key features:
+1. Per-key content hashes combined into a root hash (Merkle-style); only
+   keys whose value changed are re-hashed
+2. Copy-on-write snapshots: unchanged top-level values are shared with the
+   previous snapshot, only changed values are copied
+3. Content-addressed sharing: clients of the same session holding an
+   identical state reference one snapshot
+4. LRU and TTL eviction of idle clients, with memory statistics
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Defaults
+DEFAULT_MAX_CLIENTS = 1024
+DEFAULT_TTL = 600.0  # Seconds a client may stay idle before its state is dropped
+KEY_HASH_BYTES = 8   # Bytes of md5 kept per key
+
+# Key used for states that are not dictionaries
+_WHOLE_STATE = ""
+
+
+def _hash_value(value: Any) -> Tuple[bytes, int]:
+    """Hash one value.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        Tuple of (hash bytes, serialized size)
+    """
+    encoded = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.md5(encoded).digest()[:KEY_HASH_BYTES], len(encoded)
+
+
+def _root_hash(key_hashes: Dict[str, bytes]) -> str:
+    """Combine per-key hashes into a root hash.
+
+    Args:
+        key_hashes: Mapping of key to value hash
+
+    Returns:
+        Hex digest identifying the whole state
+    """
+    root = hashlib.md5()
+    for key in sorted(key_hashes):
+        root.update(key.encode("utf-8"))
+        root.update(b"\0")
+        root.update(key_hashes[key])
+    return root.hexdigest()
+
+
+class StateSnapshot:
+    """An immutable, hashed copy of one state.
+
+    The state must be treated as read-only: its values may be shared with
+    other snapshots.
+    """
+
+    __slots__ = ('state', 'key_hashes', 'key_sizes', 'root_hash', 'size', 'refs')
+
+    def __init__(self, state: Any, key_hashes: Dict[str, bytes], key_sizes: Dict[str, int],
+                 root_hash: Optional[str] = None):
+        """Initialize the snapshot.
+
+        Args:
+            state: Stored state (owned by the snapshot)
+            key_hashes: Per-key value hashes
+            key_sizes: Per-key serialized sizes
+            root_hash: Precomputed root hash
+        """
+        self.state = state
+        self.key_hashes = key_hashes
+        self.key_sizes = key_sizes
+        self.root_hash = root_hash or _root_hash(key_hashes)
+        self.size = sum(key_sizes.values())
+        self.refs = 0
+
+
+class StateStore:
+    """Bounded store of the latest state snapshot per client."""
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS, ttl: Optional[float] = DEFAULT_TTL):
+        """Initialize the store.
+
+        Args:
+            max_clients: Maximum number of clients kept (least recently used
+                are evicted first)
+            ttl: Seconds of inactivity after which a client is evicted, or
+                None to keep clients until LRU eviction
+        """
+        self.max_clients = max_clients
+        self.ttl = ttl
+
+        # client_id -> (snapshot, version, namespace, last_access)
+        self._clients: "OrderedDict[str, Tuple[StateSnapshot, int, Optional[str], float]]" = OrderedDict()
+        # (namespace, root_hash) -> snapshot
+        self._snapshots: Dict[Tuple[Optional[str], str], StateSnapshot] = {}
+        # namespace -> most recently stored snapshot, used to reuse key hashes
+        self._latest: Dict[Optional[str], StateSnapshot] = {}
+        self._lock = Lock()
+
+        self.stats = {
+            'puts': 0,
+            'shared_snapshots': 0,
+            'keys_hashed': 0,
+            'keys_reused': 0,
+            'bytes_copied': 0,
+            'lru_evictions': 0,
+            'ttl_evictions': 0
+        }
+
+    def get(self, client_id: str) -> Optional[StateSnapshot]:
+        """Get a client's latest snapshot.
+
+        Args:
+            client_id: Client ID
+
+        Returns:
+            The snapshot or None
+        """
+        with self._lock:
+            self._evict_expired(time.time())
+            entry = self._clients.get(client_id)
+            if entry is None:
+                return None
+            snapshot, version, namespace, _ = entry
+            self._clients[client_id] = (snapshot, version, namespace, time.time())
+            self._clients.move_to_end(client_id)
+            return snapshot
+
+    def get_version(self, client_id: str) -> int:
+        """Get how many states were stored for a client.
+
+        Args:
+            client_id: Client ID
+
+        Returns:
+            Version of the client's latest snapshot (0 if none)
+        """
+        entry = self._clients.get(client_id)
+        return entry[1] if entry else 0
+
+    def put(self, client_id: str, state: Any, namespace: Optional[str] = None,
+            changed_keys: Optional[Iterable[str]] = None) -> StateSnapshot:
+        """Store a client's new state.
+
+        Only keys whose value differs from the previous snapshot are hashed
+        and copied. If a snapshot with the same content already exists in
+        the namespace it is shared instead.
+
+        Args:
+            client_id: Client ID
+            state: New state (not modified, and not referenced afterwards)
+            namespace: Sharing scope, typically the session id
+            changed_keys: Top-level keys known to differ from the client's
+                previous snapshot; other keys are compared by value
+
+        Returns:
+            The stored snapshot
+        """
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            self.stats['puts'] += 1
+
+            entry = self._clients.get(client_id)
+            previous = entry[0] if entry else self._latest.get(namespace)
+            version = (entry[1] if entry else 0) + 1
+
+            key_hashes, key_sizes, reused = self._hash_state(
+                state, previous, changed_keys if entry else None)
+            root_hash = _root_hash(key_hashes)
+
+            snapshot = self._snapshots.get((namespace, root_hash))
+            if snapshot is not None:
+                # Identical content is already stored, nothing to copy
+                self.stats['shared_snapshots'] += 1
+            else:
+                snapshot = self._copy_state(state, previous, key_hashes, key_sizes, reused, root_hash)
+                self._snapshots[(namespace, root_hash)] = snapshot
+
+            snapshot.refs += 1
+            if entry:
+                self._release(entry[0], entry[2])
+            self._clients[client_id] = (snapshot, version, namespace, now)
+            self._clients.move_to_end(client_id)
+            self._latest[namespace] = snapshot
+
+            while len(self._clients) > self.max_clients:
+                self._evict_oldest()
+                self.stats['lru_evictions'] += 1
+
+            return snapshot
+
+    def _hash_state(self, state: Any, previous: Optional[StateSnapshot],
+                    changed_keys: Optional[Iterable[str]]):
+        """Hash a state, reusing the hashes of values equal to the previous snapshot's.
+
+        Returns:
+            Tuple of (key_hashes, key_sizes, keys shared with the previous snapshot)
+        """
+        if not isinstance(state, dict):
+            value_hash, size = _hash_value(state)
+            self.stats['keys_hashed'] += 1
+            return {_WHOLE_STATE: value_hash}, {_WHOLE_STATE: size}, set()
+
+        base = previous.state if previous is not None and isinstance(previous.state, dict) else {}
+        changed = set(changed_keys) if changed_keys is not None else None
+
+        key_hashes = {}
+        key_sizes = {}
+        reused = set()
+        for key, value in state.items():
+            if key in base and (key not in changed if changed is not None else base[key] == value):
+                key_hashes[key] = previous.key_hashes[key]
+                key_sizes[key] = previous.key_sizes[key]
+                reused.add(key)
+            else:
+                key_hashes[key], key_sizes[key] = _hash_value(value)
+
+        self.stats['keys_reused'] += len(reused)
+        self.stats['keys_hashed'] += len(key_hashes) - len(reused)
+        return key_hashes, key_sizes, reused
+
+    def _copy_state(self, state: Any, previous: Optional[StateSnapshot], key_hashes: Dict[str, bytes],
+                    key_sizes: Dict[str, int], reused: set, root_hash: str) -> StateSnapshot:
+        """Build a snapshot, copying only the values not shared with the previous one."""
+        if not isinstance(state, dict):
+            stored = copy.deepcopy(state)
+        else:
+            stored = {}
+            for key, value in state.items():
+                if key in reused:
+                    stored[key] = previous.state[key]
+                else:
+                    stored[key] = copy.deepcopy(value)
+                    self.stats['bytes_copied'] += key_sizes[key]
+
+        return StateSnapshot(stored, key_hashes, key_sizes, root_hash)
+
+    def discard(self, client_id: str) -> None:
+        """Drop a client's state.
+
+        Args:
+            client_id: Client ID
+        """
+        with self._lock:
+            entry = self._clients.pop(client_id, None)
+            if entry:
+                self._release(entry[0], entry[2])
+
+    def clear(self) -> None:
+        """Drop all states."""
+        with self._lock:
+            self._clients.clear()
+            self._snapshots.clear()
+            self._latest.clear()
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _release(self, snapshot: StateSnapshot, namespace: Optional[str]) -> None:
+        """Drop one client reference to a snapshot."""
+        snapshot.refs -= 1
+        if snapshot.refs <= 0:
+            key = (namespace, snapshot.root_hash)
+            if self._snapshots.get(key) is snapshot:
+                del self._snapshots[key]
+            if self._latest.get(namespace) is snapshot:
+                del self._latest[namespace]
+
+    def _evict_oldest(self) -> None:
+        """Evict the least recently used client."""
+        client_id, entry = self._clients.popitem(last=False)
+        self._release(entry[0], entry[2])
+        logger.debug(f"Evicted state of client {client_id}")
+
+    def _evict_expired(self, now: float) -> None:
+        """Evict clients idle for longer than the TTL."""
+        if self.ttl is None:
+            return
+        while self._clients:
+            oldest = next(iter(self._clients.values()))
+            if now - oldest[3] <= self.ttl:
+                break
+            self._evict_oldest()
+            self.stats['ttl_evictions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics.
+
+        Returns:
+            Dictionary with counters and memory estimates. estimated_bytes is
+            the serialized size of all live snapshots, an upper bound since
+            unchanged values are shared between versions.
+        """
+        with self._lock:
+            stats = self.stats.copy()
+            stats['clients'] = len(self._clients)
+            stats['snapshots'] = len(self._snapshots)
+            stats['estimated_bytes'] = sum(s.size for s in self._snapshots.values())
+            return stats
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Streaming Compression Codec for MetaMindIQTrain
+
+A connection-lifetime zlib stream: one compressobj/decompressobj pair is kept
+per connection and every message is flushed with Z_SYNC_FLUSH. Later
+messages can reference everything sent earlier in the 32 KB window, so a
+delta that repeats the previous one costs a few bytes, and nothing pays the
+zlib setup cost per message.
+
+Messages carry a sequence number within the stream. Sequence 0 starts a new
+stream (after a reconnect or a full-state resync); a gap means the receiver
+lost its history and must ask for a resync.
+"""
+
+import logging
+import time
+import zlib
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Every Z_SYNC_FLUSH ends with an empty stored block; it is stripped on the
+# wire and restored before decompression (as in WebSocket permessage-deflate)
+SYNC_FLUSH_TAIL = b"\x00\x00\xff\xff"
+
+
+class StreamDesyncError(ValueError):
+    """Raised when a stream message arrives out of sequence."""
+
+
+class StreamCodec:
+    """Per-connection streaming compressor/decompressor pair."""
+
+    def __init__(self, level: int = 6, dictionary=None):
+        """Initialize the codec.
+
+        Args:
+            level: zlib compression level (1-9)
+            dictionary: Optional CompressionDictionary priming each new stream
+        """
+        self.level = level
+        self.dictionary = dictionary
+        self.stats = {
+            'messages': 0,
+            'bytes_in': 0,
+            'bytes_out': 0,
+            'compress_cpu_time': 0.0,
+            'decompress_cpu_time': 0.0,
+            'resets': 0
+        }
+        self._compressor = None
+        self._decompressor = None
+        self._send_sequence = 0
+        self._receive_sequence = 0
+        self._start_streams()
+
+    def reset(self) -> None:
+        """Start new streams in both directions.
+
+        The next compressed message gets sequence 0, which tells the peer
+        to reset its decompressor as well.
+        """
+        self._start_streams()
+        self.stats['resets'] += 1
+
+    def _start_streams(self) -> None:
+        """Create fresh compressor and decompressor objects."""
+        zdict = self.dictionary.data if self.dictionary is not None else None
+        if zdict:
+            self._compressor = zlib.compressobj(self.level, zlib.DEFLATED, zlib.MAX_WBITS,
+                                                zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, zdict)
+        else:
+            self._compressor = zlib.compressobj(self.level)
+        self._reset_decompressor()
+        self._send_sequence = 0
+
+    def _reset_decompressor(self) -> None:
+        """Start a new inbound stream."""
+        if self.dictionary is not None:
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS, self.dictionary.data)
+        else:
+            self._decompressor = zlib.decompressobj()
+        self._receive_sequence = 0
+
+    def set_dictionary(self, dictionary) -> None:
+        """Change the preset dictionary and restart the streams.
+
+        Args:
+            dictionary: CompressionDictionary or None
+        """
+        self.dictionary = dictionary
+        self.reset()
+
+    @property
+    def next_sequence(self) -> int:
+        """Sequence number the next compressed message will carry."""
+        return self._send_sequence
+
+    def compress(self, payload: bytes) -> bytes:
+        """Compress one message onto the stream.
+
+        Args:
+            payload: Message bytes
+
+        Returns:
+            Compressed bytes, decodable once all earlier messages were
+        """
+        start = time.thread_time()
+        compressed = self._compressor.compress(payload) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.stats['compress_cpu_time'] += time.thread_time() - start
+
+        if compressed.endswith(SYNC_FLUSH_TAIL):
+            compressed = compressed[:-len(SYNC_FLUSH_TAIL)]
+
+        self._send_sequence += 1
+        self.stats['messages'] += 1
+        self.stats['bytes_in'] += len(payload)
+        self.stats['bytes_out'] += len(compressed)
+        return compressed
+
+    def decompress(self, payload: bytes, sequence: int) -> bytes:
+        """Decompress one message from the peer's stream.
+
+        Args:
+            payload: Compressed bytes
+            sequence: Sequence number sent with the message
+
+        Returns:
+            Message bytes
+
+        Raises:
+            StreamDesyncError: If a message was missed since the last reset
+        """
+        if sequence == 0:
+            self._reset_decompressor()
+        elif sequence != self._receive_sequence:
+            expected = self._receive_sequence
+            raise StreamDesyncError(f"Stream message {sequence} received, expected {expected}")
+
+        start = time.thread_time()
+        try:
+            decompressed = self._decompressor.decompress(payload + SYNC_FLUSH_TAIL)
+        except zlib.error as e:
+            # The history is unusable until the sender starts a new stream
+            self._receive_sequence = -1
+            raise StreamDesyncError(f"Corrupt stream message {sequence}: {e}") from e
+        self.stats['decompress_cpu_time'] += time.thread_time() - start
+
+        self._receive_sequence = sequence + 1
+        return decompressed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get codec statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self.stats.copy()
+        stats['compression_ratio'] = stats['bytes_in'] / stats['bytes_out'] if stats['bytes_out'] else 0
+        stats['dictionary'] = self.dictionary.key if self.dictionary is not None else None
+        return stats
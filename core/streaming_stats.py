@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Streaming Statistics for MetaMindIQTrain
+
+This module provides a fixed-size ring buffer of samples with running
+statistics, used for frame times, render times and response times.
+
+Key features:
+1. O(1) insertion with a preallocated numpy buffer (no list pop(0))
+2. O(1) running mean, amortized O(1) sliding-window min/max
+3. On-demand percentiles over the current window
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Any, Iterable, List, Optional
+
+# Optional numpy import (falls back to a plain list buffer)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingStats:
+    """Sliding-window statistics over the most recent samples."""
+
+    def __init__(self, capacity: int = 100):
+        """Initialize the statistics window.
+
+        Args:
+            capacity: Number of most recent samples to keep
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        if np is not None:
+            self._buffer = np.zeros(capacity, dtype=np.float64)
+        else:
+            self._buffer = [0.0] * capacity
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        self._head = 0  # Index of the next write
+        self._count = 0  # Samples in the window
+        self._total = 0  # Samples ever added
+        self._sum = 0.0
+        self._last = 0.0
+        # Monotonic deques of (sample_index, value) for window min/max
+        self._min_queue = deque()
+        self._max_queue = deque()
+
+    def add(self, value: float) -> None:
+        """Add a sample, evicting the oldest one if the window is full.
+
+        Args:
+            value: Sample value
+        """
+        value = float(value)
+
+        if self._count == self.capacity:
+            self._sum -= float(self._buffer[self._head])
+        else:
+            self._count += 1
+
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._sum += value
+        self._last = value
+
+        index = self._total
+        self._total += 1
+        oldest = self._total - self._count
+
+        while self._min_queue and self._min_queue[-1][1] >= value:
+            self._min_queue.pop()
+        self._min_queue.append((index, value))
+        while self._min_queue[0][0] < oldest:
+            self._min_queue.popleft()
+
+        while self._max_queue and self._max_queue[-1][1] <= value:
+            self._max_queue.pop()
+        self._max_queue.append((index, value))
+        while self._max_queue[0][0] < oldest:
+            self._max_queue.popleft()
+
+        # Recompute the running sum once per window to cancel float drift
+        if self._head == 0:
+            self._sum = float(sum(self._buffer[:self._count]))
+
+    def extend(self, values: Iterable[float]) -> None:
+        """Add several samples in order.
+
+        Args:
+            values: Sample values
+        """
+        for value in values:
+            self.add(value)
+
+    @property
+    def count(self) -> int:
+        """Number of samples in the window."""
+        return self._count
+
+    @property
+    def total_count(self) -> int:
+        """Number of samples ever added."""
+        return self._total
+
+    @property
+    def last(self) -> float:
+        """Most recent sample, or 0 if empty."""
+        return self._last
+
+    @property
+    def mean(self) -> float:
+        """Mean of the window, or 0 if empty."""
+        return self._sum / self._count if self._count else 0.0
+
+    @property
+    def min(self) -> float:
+        """Minimum of the window, or 0 if empty."""
+        return self._min_queue[0][1] if self._count else 0.0
+
+    @property
+    def max(self) -> float:
+        """Maximum of the window, or 0 if empty."""
+        return self._max_queue[0][1] if self._count else 0.0
+
+    def values(self) -> List[float]:
+        """Get the samples in the window, oldest first.
+
+        Returns:
+            List of sample values
+        """
+        if self._count < self.capacity:
+            window = self._buffer[:self._count]
+        elif np is not None:
+            window = np.concatenate((self._buffer[self._head:], self._buffer[:self._head]))
+        else:
+            window = self._buffer[self._head:] + self._buffer[:self._head]
+        return [float(v) for v in window]
+
+    def percentile(self, percent: float) -> float:
+        """Get a percentile of the window.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Percentile value, or 0 if empty
+        """
+        return self.percentiles((percent,))[0]
+
+    def percentiles(self, percents: Iterable[float]) -> List[float]:
+        """Get several percentiles of the window with a single sort.
+
+        Args:
+            percents: Percentiles between 0 and 100
+
+        Returns:
+            List of percentile values (zeros if empty)
+        """
+        percents = list(percents)
+        if not self._count:
+            return [0.0] * len(percents)
+
+        window = self._buffer[:self._count]
+        if np is not None:
+            return [float(v) for v in np.percentile(window, percents)]
+
+        # Linear interpolation matching numpy's default method
+        ordered = sorted(window)
+        results = []
+        for percent in percents:
+            position = (len(ordered) - 1) * percent / 100.0
+            lower = int(position)
+            upper = min(lower + 1, len(ordered) - 1)
+            fraction = position - lower
+            results.append(ordered[lower] + (ordered[upper] - ordered[lower]) * fraction)
+        return results
+
+    def to_dict(self, percents: Optional[Iterable[float]] = (50, 95, 99)) -> Dict[str, Any]:
+        """Get a summary of the window.
+
+        Args:
+            percents: Percentiles to include, or None to skip them
+
+        Returns:
+            Dictionary with count, mean, min, max, last and percentiles
+        """
+        summary = {
+            'count': self._count,
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'last': self._last
+        }
+
+        if percents:
+            percents = list(percents)
+            for percent, value in zip(percents, self.percentiles(percents)):
+                summary[f'p{percent:g}'] = value
+
+        return summary
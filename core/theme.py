@@ -8,7 +8,9 @@ different renderers (pygame, web, etc.) for the MetaMindIQTrain application.
 
 import json
 import logging
-from typing import Dict, Any, Optional, Tuple, List, Union
+import weakref
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, List, Union, Mapping
 from pathlib import Path
 import os
 
@@ -16,6 +18,30 @@ import os
 _current_theme = None
 _registered_themes = {}
 
+# Bumped whenever the active theme changes so style caches can be invalidated
+_theme_generation = 0
+
+# Shared read-only empty style for unknown components
+_EMPTY_STYLE = MappingProxyType({})
+
+# Maximum number of override combinations cached per ThemeProvider
+MAX_OVERRIDE_CACHE_SIZE = 512
+
+def _freeze(value):
+    """Make a resolved style value read-only, including nested containers.
+    
+    Args:
+        value: Style value
+        
+    Returns:
+        MappingProxyType for dictionaries, tuple for lists, value otherwise
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 def get_theme():
     """Get the current theme.
     
@@ -30,10 +56,24 @@ def set_theme(theme):
     Args:
         theme: Theme instance to use
     """
-    global _current_theme
+    global _current_theme, _theme_generation
     _current_theme = theme
+    _theme_generation += 1
+    theme.invalidate_styles()
+    theme.precompute_styles()
     logging.info(f"Theme set: {theme.name}")
 
+def get_theme_generation():
+    """Get the global theme generation counter.
+    
+    The counter increases every time a theme is applied with set_theme(),
+    so callers holding derived data can tell when it is stale.
+    
+    Returns:
+        Current theme generation
+    """
+    return _theme_generation
+
 def register_theme(theme):
     """Register a theme.
     
@@ -203,6 +243,11 @@ class Theme:
         self.platform = platform
         self.id = id or name.lower().replace(" ", "_")
         
+        # Resolved style cache: (component, variant, state) -> read-only style
+        self.generation = 0
+        self._style_cache = {}
+        self._style_cache_generation = 0
+        
         # Color palette
         self.colors = {
             # UI colors
@@ -243,6 +288,9 @@ class Theme:
             "modal_background": (50, 55, 65),  # Modal dialog background
         }
         
+        # Named gradients: name -> (start color, end color)
+        self.gradients = {}
+        
         # Sizing and spacing
         self.spacing = {
             "xs": 4,
@@ -515,19 +563,118 @@ class Theme:
             self.shadow.update(shadow)
         if opacity:
             self.opacity.update(opacity)
+        
+        self.invalidate_styles()
             
         return self
     
-    def get_style(self, component, variant=None, state=None):
+    def invalidate_styles(self):
+        """Invalidate resolved styles after the theme definition changed.
+        
+        Called by update(); call it directly after assigning to
+        component_styles or the palette dictionaries.
+        """
+        self.generation += 1
+    
+    def precompute_styles(self):
+        """Resolve and cache styles for every registered component type.
+        
+        Resolves each component with no variant/state as well as every
+        declared variant and state, so the first frame after a theme is
+        applied does not pay for style resolution.
+        
+        Returns:
+            Number of cached style entries
+        """
+        for component, definition in self.component_styles.items():
+            self.get_style(component)
+            
+            if not isinstance(definition, dict):
+                continue
+                
+            for variant in definition.get("variant", {}) or {}:
+                self.get_style(component, variant)
+            for state in definition.get("state", {}) or {}:
+                self.get_style(component, None, state)
+                
+        return len(self._style_cache)
+    
+    def set_gradient(self, name, start_color, end_color):
+        """Define a named gradient.
+        
+        Args:
+            name: Gradient name (e.g. "background")
+            start_color: Color at the top or left
+            end_color: Color at the bottom or right
+            
+        Returns:
+            Self for method chaining
+        """
+        self.gradients[name] = (tuple(start_color), tuple(end_color))
+        self.invalidate_styles()
+        return self
+    
+    def has_gradient(self, name):
+        """Check whether a named gradient is defined.
+        
+        Args:
+            name: Gradient name
+            
+        Returns:
+            True if the gradient exists
+        """
+        return name in self.gradients
+    
+    def get_gradient(self, name):
+        """Get a named gradient.
+        
+        Args:
+            name: Gradient name
+            
+        Returns:
+            (start color, end color) tuple or None
+        """
+        return self.gradients.get(name)
+    
+    def get_style(self, component, variant=None, state=None) -> Mapping[str, Any]:
         """Get style for a component, variant, and state.
         
+        Resolved styles are cached per (component, variant, state) and
+        returned as read-only mappings; copy with dict() before modifying.
+        
         Args:
             component: Component type
             variant: Optional variant name
             state: Optional state name
             
         Returns:
-            Style dictionary for the component
+            Read-only style mapping for the component
+        """
+        if self._style_cache_generation != self.generation:
+            self._style_cache.clear()
+            self._style_cache_generation = self.generation
+        
+        if component not in self.component_styles:
+            return _EMPTY_STYLE
+        
+        key = (component, variant, state)
+        style = self._style_cache.get(key)
+        if style is None:
+            style = _freeze(self._resolve_style(component, variant, state))
+            self._style_cache[key] = style
+            
+        return style
+    
+    def _resolve_style(self, component, variant=None, state=None):
+        """Resolve a style by merging the variant and state definitions.
+        
+        Args:
+            component: Component type
+            variant: Optional variant name
+            state: Optional state name
+            
+        Returns:
+            New style dictionary for the component
         """
         # Get base component style
         if component not in self.component_styles:
@@ -572,6 +719,7 @@ class Theme:
             "name": self.name,
             "platform": self.platform,
             "colors": process_value(self.colors),
+            "gradients": {name: [list(start), list(end)] for name, (start, end) in self.gradients.items()},
             "spacing": process_value(self.spacing),
             "border_radius": process_value(self.border_radius),
             "font_size": process_value(self.font_size),
@@ -606,6 +754,8 @@ class Theme:
         
         # Update theme properties
         theme.colors = theme_dict.get("colors", theme.colors)
+        theme.gradients = {name: (tuple(start), tuple(end))
+                           for name, (start, end) in theme_dict.get("gradients", {}).items()}
         theme.spacing = theme_dict.get("spacing", theme.spacing)
         theme.border_radius = theme_dict.get("border_radius", theme.border_radius)
         theme.font_size = theme_dict.get("font_size", theme.font_size)
@@ -615,6 +765,7 @@ class Theme:
         theme.shadow = theme_dict.get("shadow", theme.shadow)
         theme.opacity = theme_dict.get("opacity", theme.opacity)
         theme.component_styles = theme_dict.get("component_styles", theme.component_styles)
+        theme.invalidate_styles()
         
         return theme
     
@@ -652,6 +803,13 @@ class ThemeProvider:
         """
         self.theme = theme
         
+        # Styles merged with overrides for one theme (held weakly, so a new
+        # theme object at a recycled address is never mistaken for it) and
+        # one theme generation
+        self._override_cache = {}
+        self._override_cache_theme = None
+        self._override_cache_generation = None
+        
     def get_theme(self):
         """Get the current theme.
         
@@ -667,8 +825,11 @@ class ThemeProvider:
             theme: Theme instance to use
         """
         self.theme = theme
+        self._override_cache.clear()
+        if theme:
+            theme.precompute_styles()
         
-    def get_style(self, component, variant=None, state=None, **overrides):
+    def get_style(self, component, variant=None, state=None, **overrides) -> Mapping[str, Any]:
         """Get style for a component, variant, and state with optional overrides.
         
         Args:
@@ -678,17 +839,44 @@ class ThemeProvider:
             **overrides: Style overrides
             
         Returns:
-            Style dictionary for the component
+            Read-only style mapping for the component
         """
         theme = self.get_theme()
         if not theme:
-            return overrides
+            return MappingProxyType(overrides) if overrides else _EMPTY_STYLE
             
         # Get base style
         style = theme.get_style(component, variant, state)
+        if not overrides:
+            return style
+        
+        # Drop merged styles from a previous theme or theme generation
+        cached_theme = self._override_cache_theme() if self._override_cache_theme else None
+        if cached_theme is not theme or self._override_cache_generation != theme.generation:
+            self._override_cache.clear()
+            self._override_cache_theme = weakref.ref(theme)
+            self._override_cache_generation = theme.generation
+        
+        try:
+            key = (component, variant, state, tuple(sorted(overrides.items())))
+            hash(key)
+        except TypeError:
+            # Unhashable override values (lists, dicts) are merged uncached
+            key = None
+        
+        if key is not None:
+            merged = self._override_cache.get(key)
+            if merged is not None:
+                return merged
         
         # Apply overrides
-        if overrides:
-            style.update(overrides)
+        merged = dict(style)
+        merged.update(overrides)
+        merged = _freeze(merged)
+        
+        if key is not None:
+            if len(self._override_cache) >= MAX_OVERRIDE_CACHE_SIZE:
+                self._override_cache.clear()
+            self._override_cache[key] = merged
             
-        return style 
\ No newline at end of file
+        return merged
@@ -6,8 +6,10 @@ This module provides the base class for all training modules in the MetaMindIQTr
 Optimized with delta encoding for efficient state updates and performance improvements.
 """
 
+import copy
 import json
 import logging
+import random
 import time
 import uuid
 import sys
@@ -57,6 +59,23 @@ except ImportError:
         class Component: pass
         def get_component_stats(): return {}
 
+# Import streaming statistics
+try:
+    from core.streaming_stats import StreamingStats
+except ImportError:
+    from .streaming_stats import StreamingStats
+
+# Publish performance metrics and component stats in state every N ticks
+PERFORMANCE_PUBLISH_INTERVAL = 30
+
+# Parts of the state get_state rebuilds only when one of their inputs changed:
+# the game fields, the UI tree and the module-specific state
+STATE_SECTIONS = ('game', 'ui', 'module')
+
+# Values compared on assignment; other tracked values always mark their sections dirty
+_SCALAR_TYPES = (int, float, str, bool, type(None))
+_MISSING = object()
+
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -113,6 +132,9 @@ class DeltaEncoder:
                 
             # Find keys in both dicts
             for key in set(curr.keys()) & set(prev.keys()):
+                if curr[key] is prev[key]:
+                    # Reused subtree, unchanged by construction
+                    continue
                 new_path = f"{path}.{key}" if path else key
                 if curr[key] != prev[key]:
                     if isinstance(curr[key], dict) and isinstance(prev[key], dict):
@@ -191,11 +213,15 @@ class StateManager:
         self.delta_mode = True  # Whether to use delta encoding
         self.version = 0  # State version for tracking changes
     
-    def update_state(self, new_state: Dict[str, Any]) -> Dict[str, Any]:
+    def update_state(self, new_state: Dict[str, Any],
+                     changed_keys: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Update current state and compute delta if enabled.
         
         Args:
             new_state: New state dictionary
+            changed_keys: Top-level keys that may differ from the previous
+                state; other keys must hold the previous state's values and
+                are not compared. None compares every key.
             
         Returns:
             State update to send (full state or delta)
@@ -206,7 +232,12 @@ class StateManager:
         
         if self.delta_mode and self.previous_state:
             # Compute and return delta
-            delta = DeltaEncoder.compute_delta(self.previous_state, self.current_state)
+            if changed_keys is None:
+                delta = DeltaEncoder.compute_delta(self.previous_state, self.current_state)
+            else:
+                delta = DeltaEncoder.compute_delta(
+                    {key: self.previous_state[key] for key in changed_keys if key in self.previous_state},
+                    {key: self.current_state[key] for key in changed_keys if key in self.current_state})
             
             # Add metadata
             delta["_meta"] = {
@@ -250,17 +281,11 @@ class PerformanceMonitor:
     
     def __init__(self):
         """Initialize the performance monitor."""
-        self.frame_times = []
         self.max_samples = 100
+        self.frame_times = StreamingStats(self.max_samples)
         self.start_time = time.time()
         self.last_time = self.start_time
-        self.metrics = {
-            'avg_frame_time': 0,
-            'min_frame_time': float('inf'),
-            'max_frame_time': 0,
-            'total_frames': 0,
-            'fps': 0
-        }
+        self.total_frames = 0
     
     def update(self):
         """Update performance metrics."""
@@ -268,24 +293,8 @@ class PerformanceMonitor:
         frame_time = current_time - self.last_time
         self.last_time = current_time
         
-        # Update frame times
-        self.frame_times.append(frame_time)
-        if len(self.frame_times) > self.max_samples:
-            self.frame_times.pop(0)
-        
-        # Update metrics
-        if frame_time < self.metrics['min_frame_time']:
-            self.metrics['min_frame_time'] = frame_time
-            
-        if frame_time > self.metrics['max_frame_time']:
-            self.metrics['max_frame_time'] = frame_time
-            
-        self.metrics['avg_frame_time'] = sum(self.frame_times) / len(self.frame_times)
-        self.metrics['total_frames'] += 1
-        
-        elapsed = current_time - self.start_time
-        if elapsed > 0:
-            self.metrics['fps'] = self.metrics['total_frames'] / elapsed
+        self.frame_times.add(frame_time)
+        self.total_frames += 1
     
     def get_metrics(self) -> Dict[str, float]:
         """Get current performance metrics.
@@ -293,20 +302,23 @@ class PerformanceMonitor:
         Returns:
             Dictionary with performance metrics
         """
-        return self.metrics.copy()
+        elapsed = self.last_time - self.start_time
+        
+        return {
+            'avg_frame_time': self.frame_times.mean,
+            'min_frame_time': self.frame_times.min if self.total_frames else float('inf'),
+            'max_frame_time': self.frame_times.max,
+            'p95_frame_time': self.frame_times.percentile(95),
+            'total_frames': self.total_frames,
+            'fps': self.total_frames / elapsed if elapsed > 0 else 0
+        }
     
     def reset(self):
         """Reset the performance monitor."""
-        self.frame_times = []
+        self.frame_times.reset()
         self.start_time = time.time()
         self.last_time = self.start_time
-        self.metrics = {
-            'avg_frame_time': 0,
-            'min_frame_time': float('inf'),
-            'max_frame_time': 0,
-            'total_frames': 0,
-            'fps': 0
-        }
+        self.total_frames = 0
 
 class TrainingModule(ABC):
     """
@@ -321,6 +333,19 @@ class TrainingModule(ABC):
     SCREEN_WIDTH = SCREEN_WIDTH
     SCREEN_HEIGHT = SCREEN_HEIGHT
     
+    # Reuse state sections between get_state calls until a tracked property
+    # changes. Only modules whose state is fully described by tracked
+    # properties (or that call mark_dirty) may enable this.
+    CACHE_STATE = False
+    
+    # Sections holding clock readings; with CACHE_STATE they are refreshed
+    # along with the session's elapsed time at publish ticks only
+    CLOCK_SECTIONS = ()
+    
+    # Return deltas from get_state; modules whose callers expect a full
+    # state on every call turn this off
+    DELTA_STATE = True
+    
     @classmethod
     def configure_display(cls, width, height):
         """Configure the display settings for all modules.
@@ -336,8 +361,12 @@ class TrainingModule(ABC):
         cls.SCREEN_HEIGHT = height
         logger.info(f"Configured display settings: {width}x{height}")
     
-    def __init__(self):
-        """Initialize the training module."""
+    def __init__(self, seed=None):
+        """Initialize the training module.
+        
+        Args:
+            seed: Seed of the session's random number generator (random if None)
+        """
         # Module metadata
         self.name = "Base Training Module"
         self.description = "Base class for all training modules"
@@ -349,6 +378,13 @@ class TrainingModule(ABC):
         self.start_time = time.time()
         self.last_update_time = time.time()
         
+        # Random number generator shared with the module's model, which must
+        # draw every random choice from it; a session is then replayed by
+        # creating the module with the same seed and fork
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(63)
+        self.fork = 0
+        self.rng = random.Random(self.seed)
+        
         # Game state
         self.score = 0
         self.level = 1
@@ -358,11 +394,16 @@ class TrainingModule(ABC):
         # UI helpers
         self.ui = UI()
         
-        # Performance monitoring
+        # Performance monitoring, published in state every N ticks
         self.performance = PerformanceMonitor()
+        self.performance_publish_interval = PERFORMANCE_PUBLISH_INTERVAL
+        self._published_performance = None
+        self._published_component_stats = None
         
         # State management
         self.state_manager = StateManager()
+        self.state_manager.delta_mode = self.DELTA_STATE
+        self._last_update = None
         
         # Screen dimensions from class level or config defaults
         self.screen_width = self.__class__.SCREEN_WIDTH
@@ -371,8 +412,16 @@ class TrainingModule(ABC):
         # Calculate UI sizes based on current dimensions
         self.ui_sizes = calculate_sizes(self.screen_width, self.screen_height)
         
+        # State version, bumped whenever a tracked property changes
+        self._state_version = 0
+        self._dirty_sections = set(STATE_SECTIONS)
+        self._property_sections = {}
+        self._section_cache = {}
+        self._module_state_keys = set()
+        
         # Track dynamic properties for delta calculation
-        self._tracked_properties = set(['score', 'level', 'message', 'is_completed'])
+        self._tracked_properties = set(['score', 'level', 'message', 'is_completed',
+                                        'screen_width', 'screen_height'])
         
         # Initialize any module-specific state
         self.initialize()
@@ -469,48 +518,144 @@ class TrainingModule(ABC):
         and UI components. It calls build_ui() to get the UI components
         for the current state.
         
+        With CACHE_STATE enabled, the game fields, UI tree and module state
+        are only rebuilt after one of their tracked inputs changed; otherwise
+        the previous objects are reused and not diffed again. The session's
+        elapsed time and the CLOCK_SECTIONS are refreshed at publish ticks
+        only, so while nothing changes the previous update is returned as
+        is, with the same version. The returned state must be treated as
+        read-only.
+        
         Returns:
             dict: A dictionary containing the current state.
         """
         # Update performance metrics
         self.performance.update()
         
-        # Build UI components
-        ui = self.build_ui()
-        
-        # Create state object
-        state = {
-            # Module info
-            'module': {
-                'name': self.name,
-                'description': self.description
-            },
-            # Session info
-            'session': {
+        changed = set()
+        
+        # Refresh the published metrics only every N ticks; in between the same
+        # snapshot is reused so it produces no delta
+        publish = (self._published_performance is None or
+                   self.performance.total_frames % self.performance_publish_interval == 0)
+        if publish:
+            self._published_performance = self.performance.get_metrics()
+            self._published_component_stats = get_component_stats()
+            changed.update(('performance', 'component_stats'))
+        
+        if not self.CACHE_STATE:
+            self._dirty_sections.update(STATE_SECTIONS)
+        elif publish:
+            self._dirty_sections.update(self.CLOCK_SECTIONS)
+        dirty = self._dirty_sections
+        cache = self._section_cache
+        
+        # Session info
+        session = cache.get('session')
+        if (publish or not self.CACHE_STATE or session is None or
+                session['id'] != self.session_id or session['start_time'] != self.start_time):
+            session = cache['session'] = {
                 'id': self.session_id,
                 'start_time': self.start_time,
                 'elapsed_time': time.time() - self.start_time
-            },
-            # Game state
-            'game': {
+            }
+            changed.add('session')
+        
+        # Module info
+        module_info = cache.get('module_info')
+        if module_info is None or module_info['name'] != self.name or module_info['description'] != self.description:
+            module_info = cache['module_info'] = {
+                'name': self.name,
+                'description': self.description
+            }
+            changed.add('module')
+        
+        # Game state
+        if 'game' in dirty or 'game' not in cache:
+            cache['game'] = {
                 'score': self.score,
                 'level': self.level,
                 'message': self.message,
                 'is_completed': self.is_completed
-            },
+            }
+            changed.add('game')
+        
+        # UI components
+        if 'ui' in dirty or 'ui' not in cache:
+            ui = self.build_ui()
+            # MVC modules build their component tree as a dict already
+            cache['ui'] = ui.to_dict() if isinstance(ui, UI) else ui
+            changed.add('ui')
+        
+        # Module-specific state
+        if 'module' in dirty or 'module' not in cache:
+            cache['module'] = self.get_module_state()
+            # Keys dropped since the last build must be diffed as deletions
+            changed.update(self._module_state_keys)
+            self._module_state_keys = set(cache['module'])
+            changed.update(self._module_state_keys)
+        
+        dirty.clear()
+        
+        if self.CACHE_STATE and not changed and self._last_update is not None:
+            return self._last_update
+        
+        # Create state object
+        state = {
+            # Module info
+            'module': module_info,
+            # Session info
+            'session': session,
+            # Game state
+            'game': cache['game'],
             # UI components
-            'ui': ui.to_dict(),
+            'ui': cache['ui'],
             # Performance metrics
-            'performance': self.performance.get_metrics(),
+            'performance': self._published_performance,
             # Component system stats
-            'component_stats': get_component_stats()
+            'component_stats': self._published_component_stats
         }
         
         # Add module-specific state
-        state.update(self.get_module_state())
+        state.update(cache['module'])
         
         # Update state manager and get delta or full state
-        return self.state_manager.update_state(state)
+        self._last_update = self.state_manager.update_state(state, changed if self.CACHE_STATE else None)
+        return self._last_update
+    
+    def get_state_version(self):
+        """
+        Get the version of the module's tracked state.
+        
+        Returns:
+            int: Counter bumped whenever a tracked property changes
+        """
+        return self._state_version
+    
+    def mark_dirty(self, *sections):
+        """
+        Mark state sections for rebuilding on the next get_state call.
+        
+        Modules with CACHE_STATE enabled call this after changing state
+        that is not held in a tracked property, e.g. mutating a model.
+        
+        Args:
+            *sections: Sections from STATE_SECTIONS ('game', 'ui', 'module');
+                all sections if none are given
+        """
+        self._state_version += 1
+        self._dirty_sections.update(sections or STATE_SECTIONS)
+    
+    def __setattr__(self, name, value):
+        """Set an attribute, marking state dirty when a tracked property changes."""
+        attributes = self.__dict__
+        if name in attributes.get('_tracked_properties', ()):
+            old = attributes.get(name, _MISSING)
+            if not (type(old) is type(value) and isinstance(value, _SCALAR_TYPES) and old == value):
+                object.__setattr__(self, name, value)
+                self.mark_dirty(*self._property_sections.get(name, STATE_SECTIONS))
+                return
+        object.__setattr__(self, name, value)
     
     def get_full_state(self):
         """
@@ -605,14 +750,22 @@ class TrainingModule(ABC):
                 align="center"
             )
         
-    def track_property(self, property_name):
+    def track_property(self, property_name, sections=None):
         """
         Track a module property for delta calculation.
         
+        Assigning a new value to a tracked property bumps the state version
+        and marks the sections it feeds dirty. Tracking a property also marks
+        its sections dirty, so calling this after an in-place change works too.
+        
         Args:
             property_name: Name of the property to track
+            sections: State sections the property feeds (default: all)
         """
         self._tracked_properties.add(property_name)
+        if sections is not None:
+            self._property_sections[property_name] = tuple(sections)
+        self.mark_dirty(*self._property_sections.get(property_name, STATE_SECTIONS))
     
     def reset(self):
         """
@@ -628,9 +781,96 @@ class TrainingModule(ABC):
         self.ui.clear()
         self.state_manager.reset()
         self.performance.reset()
+        self._published_performance = None
+        self._published_component_stats = None
+        self._section_cache.clear()
+        self._last_update = None
+        self.mark_dirty()
         
         logger.info(f"Reset module {self.name}")
         
+    def renew_session(self, session_id=None):
+        """
+        Give an instance created ahead of time its own session identity.
+        
+        Called when a pre-built instance is handed to a new session, so its
+        session timer starts now rather than when it was built.
+        
+        Args:
+            session_id: Session ID to use (a new one if None)
+        """
+        self.session_id = session_id or str(uuid.uuid4())
+        self.start_time = self.last_update_time = time.time()
+        self.mark_dirty()
+    
+    def fork_rng(self, fork):
+        """
+        Give the random number generator its own sequence after a copy.
+        
+        The module is reset so its first challenge is dealt from the new
+        sequence. The sequence depends only on the seed and the fork number,
+        so a module created with the same seed and forked the same way
+        replays it.
+        
+        Args:
+            fork: Fork number (each copy of an instance needs its own)
+        """
+        self.fork = fork
+        self.rng.seed(f"{self.seed}/{fork}")
+        self.reset()
+    
+    def clone(self, fork, session_id=None):
+        """
+        Copy this fully initialized instance for another session.
+        
+        The copy deals its own first challenge from its forked sequence;
+        it is meant for templates that have not been played.
+        
+        Args:
+            fork: Fork number of the copy (see fork_rng)
+            session_id: Session ID of the copy (a new one if None)
+            
+        Returns:
+            TrainingModule: Independent copy of the module
+        """
+        module = copy.deepcopy(self)
+        module.fork_rng(fork)
+        module.renew_session(session_id)
+        return module
+    
+    def get_hibernation_state(self):
+        """
+        Get the attributes to keep while the module's session is hibernated.
+        
+        Caches that get_state rebuilds are left out. Subclasses holding
+        resources that cannot be pickled override this and
+        restore_hibernation_state.
+        
+        Returns:
+            dict: Picklable instance attributes
+        """
+        # Only the current state is needed as the next delta's base
+        self.state_manager.previous_state = {}
+        
+        state = self.__dict__.copy()
+        state['_section_cache'] = {}
+        state['_dirty_sections'] = set(STATE_SECTIONS)
+        state['_last_update'] = None
+        return state
+    
+    def restore_hibernation_state(self, state):
+        """
+        Restore the module from get_hibernation_state after hibernation.
+        
+        Called on an instance whose __init__ has not run.
+        
+        Args:
+            state: Attributes returned by get_hibernation_state
+        """
+        self.__dict__.update(state)
+        self.mark_dirty()
+        logger.info(f"Restored module {self.name} for session {self.session_id}")
+    
     def cleanup(self):
         """
         Clean up module resources.
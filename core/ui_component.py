@@ -34,6 +34,61 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# A subtree is cached on its own surface only when it has at least this many
+# components and has not been marked dirty for this many frames
+CACHE_MIN_COMPONENTS = 8
+CACHE_STATIC_FRAMES = 3
+
+# Surfaces for cached subtrees and clipped components, created on first use
+_surface_pool = None
+
+
+def get_surface_pool():
+    """Get the pool that compositing surfaces are taken from.
+
+    Returns:
+        The pygame client's SurfacePool, or None if the client is unavailable
+        (surfaces are then allocated directly)
+    """
+    global _surface_pool
+    if _surface_pool is None:
+        try:
+            from clients.pygame.render_utils import SurfacePool
+        except ImportError:
+            try:
+                from MetaMindIQTrain.clients.pygame.render_utils import SurfacePool
+            except ImportError:
+                logger.debug("SurfacePool unavailable, compositing surfaces are not pooled")
+                SurfacePool = None
+        _surface_pool = SurfacePool() if SurfacePool else False
+    return _surface_pool or None
+
+
+def _get_surface(width, height):
+    """Get a cleared SRCALPHA surface from the pool."""
+    pool = get_surface_pool()
+    if pool is not None:
+        return pool.get(width, height, pygame.SRCALPHA)
+    return pygame.Surface((width, height), pygame.SRCALPHA)
+
+
+def _release_surface(surface):
+    """Return a surface taken with _get_surface."""
+    pool = get_surface_pool()
+    if pool is not None and surface is not None:
+        pool.release(surface)
+
+
+def _is_translucent(color):
+    """Check whether a color has an alpha below 255."""
+    if color is None:
+        return False
+    try:
+        return pygame.Color(color).a < 255
+    except (TypeError, ValueError):
+        return False
+
+
 class UIComponent:
     """Base class for all UI components."""
     
@@ -73,6 +128,8 @@ class UIComponent:
         self.cached_surface = None
         self.cached_hash = None
         self.last_update_time = time.time()
+        self._clean_frames = 0  # Frames rendered since the last mark_dirty
+        self._subtree_size = 1  # Components drawn in the last full render
     
     def get_rect(self):
         """Get the pygame Rect for this component.
@@ -131,9 +188,16 @@ class UIComponent:
         self.mark_dirty()
     
     def mark_dirty(self):
-        """Mark this component as needing to be redrawn."""
+        """Mark this component as needing to be redrawn.
+        
+        Visual changes must go through here (or set_property) so cached
+        subtree surfaces containing the component are dropped.
+        """
         self.is_dirty = True
-        self.cached_surface = None
+        self._clean_frames = 0
+        if self.cached_surface is not None:
+            _release_surface(self.cached_surface)
+            self.cached_surface = None
         self.cached_hash = None
         if self.parent:
             self.parent.mark_dirty()
@@ -200,11 +264,18 @@ class UIComponent:
         pass
     
     def render(self, surface, force_render=False):
-        """Render the component to a surface.
+        """Render the component and its children to a surface.
+        
+        Opaque components are drawn straight into the target through a
+        subsurface view of their rect, with the target's clip rect limiting
+        children to their parent. Components with translucent colors are
+        drawn on a scratch surface and blended in, since pygame.draw writes
+        alpha without blending. Only subtrees that are both static and large
+        are kept on a cached surface.
         
         Args:
             surface: Target pygame surface
-            force_render: Whether to force rendering even if not dirty
+            force_render: Whether to redraw cached subtrees as well
             
         Returns:
             List of dirty rects that were updated
@@ -212,39 +283,80 @@ class UIComponent:
         if not self.visible:
             return []
         
-        # Check if we need to redraw
-        if not self.is_dirty and not force_render and self.cached_surface:
-            # Just blit the cached surface
-            surface.blit(self.cached_surface, (self.x, self.y))
-            return [self.get_rect()]
-        
-        # Create a new surface for this component
-        component_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        component_surface.fill((0, 0, 0, 0))  # Transparent
+        clip = surface.get_clip()
+        try:
+            rect = self._render_into(surface, self.x, self.y, force_render)
+        finally:
+            surface.set_clip(clip)
+        return [rect] if rect else []
+    
+    def _render_into(self, target, x, y, force_render):
+        """Draw this subtree at an absolute position of the target.
         
-        # Draw this component
-        self._draw_component(component_surface)
+        Args:
+            target: Target surface, whose clip rect is respected
+            x: Absolute x of this component on the target
+            y: Absolute y of this component on the target
+            force_render: Whether to bypass cached surfaces
+            
+        Returns:
+            The visible rect that was drawn, or None if fully clipped
+        """
+        rect = pygame.Rect(x, y, self.width, self.height)
+        visible = rect.clip(target.get_clip())
+        if not visible:
+            return None
+        
+        if self.cached_surface is not None and not force_render:
+            target.blit(self.cached_surface, rect)
+            self._clean_frames += 1
+            self.is_dirty = False
+            return visible
+        
+        if (self.children and self._subtree_size >= CACHE_MIN_COMPONENTS
+                and self._clean_frames >= CACHE_STATIC_FRAMES and not force_render):
+            # Static and expensive: draw the subtree once onto its own surface
+            cached = _get_surface(self.width, self.height)
+            self._draw_subtree(cached, 0, 0, cached.get_rect(), force_render)
+            self.cached_surface = cached
+            target.blit(cached, rect)
+        else:
+            self._draw_subtree(target, x, y, visible, force_render)
         
-        # Draw all children
-        dirty_rects = []
-        for child in self.children:
-            if child.visible:
-                # Translate child coordinates to local space
-                child_surface = pygame.Surface((child.width, child.height), pygame.SRCALPHA)
-                child_surface.fill((0, 0, 0, 0))  # Transparent
-                child_dirty = child.render(child_surface, force_render)
-                if child_dirty:
-                    component_surface.blit(child_surface, (child.x - self.x, child.y - self.y))
-                    dirty_rects.extend(child_dirty)
-        
-        # Cache the surface
-        self.cached_surface = component_surface.copy()
+        self._clean_frames += 1
         self.is_dirty = False
+        return visible
+    
+    def _draw_subtree(self, target, x, y, visible, force_render):
+        """Draw this component and its children without using its own cache.
         
-        # Blit to the target surface
-        surface.blit(component_surface, (self.x, self.y))
-        
-        return [self.get_rect()] + dirty_rects
+        Args:
+            target: Target surface
+            x: Absolute x of this component on the target
+            y: Absolute y of this component on the target
+            visible: Part of the component's rect inside the target's clip
+            force_render: Whether to bypass cached surfaces of children
+        """
+        if (visible.width == self.width and visible.height == self.height
+                and not self.is_translucent()):
+            # Fully visible and opaque: draw through a view sharing the target's pixels
+            self._draw_component(target.subsurface(visible))
+        else:
+            scratch = _get_surface(self.width, self.height)
+            self._draw_component(scratch)
+            target.blit(scratch, (x, y))
+            _release_surface(scratch)
+        
+        size = 1
+        if self.children:
+            clip = target.get_clip()
+            target.set_clip(visible)
+            for child in self.children:
+                if child.visible:
+                    child._render_into(target, x + child.x, y + child.y, force_render)
+                    size += child._subtree_size
+            target.set_clip(clip)
+        self._subtree_size = size
     
     def _draw_component(self, surface):
         """Draw the component itself (not children).
@@ -255,6 +367,22 @@ class UIComponent:
         # Base implementation does nothing - override in subclasses
         pass
     
+    def _draw_colors(self):
+        """Get the colors _draw_component fills with. Override in subclasses.
+        
+        Returns:
+            Iterable of colors (None entries are ignored)
+        """
+        return ()
+    
+    def is_translucent(self):
+        """Check whether the component draws with any translucent color.
+        
+        Returns:
+            True if a color from _draw_colors has an alpha below 255
+        """
+        return any(_is_translucent(color) for color in self._draw_colors())
+    
     def get_property(self, name, default=None):
         """Get a property value.
         
@@ -368,6 +496,10 @@ class ContainerComponent(UIComponent):
                     width=self.border_width
                 )
     
+    def _draw_colors(self):
+        """Get the background and border colors."""
+        return (self.bg_color, self.border_color if self.border_width > 0 else None)
+    
     def layout_children(self):
         """Layout child components based on layout type."""
         if self.layout == "flow":
@@ -514,6 +646,10 @@ class TextComponent(UIComponent):
         # Draw text
         surface.blit(text_surface, text_rect)
     
+    def _draw_colors(self):
+        """Get the background and text colors."""
+        return (self.bg_color, self.color)
+    
     def set_text(self, text):
         """Set the text.
         
@@ -600,6 +736,15 @@ class ButtonComponent(ContainerComponent):
                 border_radius=self.border_radius
             )
     
+    def _draw_colors(self):
+        """Get the background color for the current state and the border color."""
+        color = self.bg_color
+        if self.active:
+            color = self.bg_active_color
+        elif self.hover:
+            color = self.bg_hover_color
+        return (color, self.border_color if self.border_width > 0 else None)
+    
     def on_click(self):
         """Handle click event."""
         if self.on_click_handler:
@@ -57,6 +57,11 @@ def get_stats():
 class Component:
     """Base class for all UI components."""
     
+    # Views create hundreds of components per frame; slots avoid a
+    # per-instance __dict__
+    __slots__ = ('type', 'id', 'props', 'style', 'children', 'parent',
+                 'dirty', 'render_hash', 'layout')
+    
     def __init__(self, component_type: str, id: Optional[str] = None, 
                  x: int = 0, y: int = 0, width: int = 0, height: int = 0, **kwargs):
         """Initialize a component.
@@ -22,9 +22,11 @@ if __name__ == "__main__" or not __package__:
     project_root = Path(__file__).parent.parent.parent
     sys.path.insert(0, str(project_root))
     from MetaMindIQTrain.core.theme_manager import ThemeManager
+    from MetaMindIQTrain.core.input_timing import event_timestamp_ns, input_timestamp_ns
 else:
     # Use relative imports when imported as a module
     from ...core.theme_manager import ThemeManager
+    from ...core.input_timing import event_timestamp_ns, input_timestamp_ns
 
 # Import local module components
 from .attention_morph_model import AttentionMorphModel
@@ -69,8 +71,8 @@ class AttentionMorphController:
         self.last_transform_time = 0
         self.transform_interval = 1.0  # Time between random transformations
         
-        # Selection tracking
-        self.last_selection_time = 0
+        # Selection tracking (perf_counter_ns of the last selection)
+        self.last_selection_ns = 0
         self.selected_cells = set()
         
         # Performance metrics
@@ -113,12 +115,16 @@ class AttentionMorphController:
                     grid_coords = self._pixel_to_grid_coords(pos)
                     if grid_coords:
                         row, col = grid_coords
-                        # Track reaction time
-                        current_time = time.time()
-                        if self.last_selection_time == 0:
-                            self.last_selection_time = current_time
-                        reaction_time = current_time - self.last_selection_time
-                        self.last_selection_time = current_time
+                        # Track reaction time from the later of the targets'
+                        # onset and the previous selection to the click's arrival
+                        timestamp_ns = input_timestamp_ns(event_timestamp_ns(event))
+                        start_ns = self.last_selection_ns
+                        if self.model.stimulus is not None:
+                            start_ns = max(start_ns, self.model.stimulus.onset())
+                        if start_ns == 0:
+                            start_ns = timestamp_ns
+                        reaction_time = max(0, timestamp_ns - start_ns) / 1e9
+                        self.last_selection_ns = timestamp_ns
                         
                         # Process the selection
                         self._process_selection(row, col, reaction_time)
@@ -251,7 +257,7 @@ class AttentionMorphController:
         self.game_timer = self.SESSION_DURATION
         self.last_time = time.time()
         self.last_transform_time = 0
-        self.last_selection_time = 0
+        self.last_selection_ns = 0
         self.selected_cells.clear()
         
         # Reset performance metrics
@@ -22,6 +22,11 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Tuple, Set, Optional, Any, Union
 
+try:
+    from MetaMindIQTrain.core.input_timing import get_frame_clock
+except ImportError:
+    from core.input_timing import get_frame_clock
+
 class Shape:
     """Represents a single shape in the attention morph grid.
     
@@ -115,14 +120,17 @@ class AttentionMorphModel:
         (220, 150, 50)    # Orange
     ]
     
-    def __init__(self, rows: int = 5, cols: int = 5, difficulty: int = 1):
+    def __init__(self, rows: int = 5, cols: int = 5, difficulty: int = 1, rng=None):
         """Initialize the model with game state and grid.
         
         Args:
             rows: Number of grid rows
             cols: Number of grid columns
             difficulty: Initial difficulty level (1-10)
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Grid dimensions
         self.rows = rows
         self.cols = cols
@@ -135,6 +143,7 @@ class AttentionMorphModel:
         self.complexity = self._calculate_complexity()
         self.transformation_rules = {}
         self.targets = set()  # Set of (row, col) positions of target shapes
+        self.stimulus = None  # Onset of the current targets (input_timing.Stimulus)
         
         # Shape transformation settings
         self.transformation_speed = 1.0
@@ -181,19 +190,19 @@ class AttentionMorphModel:
                 
                 # Determine shape type with weighted probability
                 # Make target shape type less common
-                if self.TARGET_TYPE in available_shapes and random.random() < 0.1:
+                if self.TARGET_TYPE in available_shapes and self.rng.random() < 0.1:
                     shape_type = self.TARGET_TYPE
                 else:
                     # Exclude target type from random selection
                     non_target_shapes = [s for s in available_shapes if s != self.TARGET_TYPE]
-                    shape_type = random.choice(non_target_shapes)
+                    shape_type = self.rng.choice(non_target_shapes)
                 
                 # Random size based on difficulty (higher difficulty = smaller shapes)
                 base_size = 50 - (self.difficulty_level * 2)
-                size = max(20, base_size + random.randint(-5, 5))
+                size = max(20, base_size + self.rng.randint(-5, 5))
                 
                 # Random color from base colors
-                color = random.choice(self.BASE_COLORS)
+                color = self.rng.choice(self.BASE_COLORS)
                 
                 # Create shape
                 shape = Shape(shape_type, position, size, color)
@@ -222,7 +231,7 @@ class AttentionMorphModel:
                 num_targets = min(3, len(possible_targets))
                 
             # Randomly select transformation targets
-            targets = random.sample(possible_targets, num_targets)
+            targets = self.rng.sample(possible_targets, num_targets)
             
             # Store rule
             self.transformation_rules[shape_type] = targets
@@ -245,7 +254,7 @@ class AttentionMorphModel:
         
         # Place new targets
         available_positions = [(row, col) for row in range(self.rows) for col in range(self.cols)]
-        random.shuffle(available_positions)
+        self.rng.shuffle(available_positions)
         
         # Cap targets based on grid size
         max_possible = min(num_targets, len(available_positions))
@@ -259,6 +268,9 @@ class AttentionMorphModel:
             
             # Add to target set
             self.targets.add((row, col))
+        
+        # Onset is the present of the next frame, which shows the targets
+        self.stimulus = get_frame_clock().stimulus()
 
     def update_grid(self, dt: float) -> None:
         """Update all shapes in the grid.
@@ -290,7 +302,7 @@ class AttentionMorphModel:
         count = min(count, len(available_cells))
         
         # Randomly select cells to transform
-        cells_to_transform = random.sample(available_cells, count)
+        cells_to_transform = self.rng.sample(available_cells, count)
         
         for row, col in cells_to_transform:
             shape = self.grid[row][col]
@@ -306,7 +318,7 @@ class AttentionMorphModel:
                     # Start transformation
                     shape.is_transforming = True
                     shape.transform_progress = 0.0
-                    shape.transform_target = random.choice(possible_targets)
+                    shape.transform_target = self.rng.choice(possible_targets)
 
     def check_selection(self, row: int, col: int) -> bool:
         """Check if a selected cell contains a target.
@@ -422,6 +434,7 @@ class AttentionMorphModel:
         self.state = self.STATE_ACTIVE
         self.selections.clear()
         self.targets.clear()
+        self.stimulus = None
         
         # Regenerate grid
         self.generate_shape_grid(self.rows, self.cols, self.complexity)
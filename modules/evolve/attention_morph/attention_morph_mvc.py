@@ -61,16 +61,20 @@ class AttentionMorph(TrainingModule):
     MODULE_DESCRIPTION = "Find and select targets while ignoring distractors. " \
                         "Enhances selective attention, visual scanning speed, and cognitive inhibition."
     
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    DELTA_STATE = False
+    
+    def __init__(self, difficulty=1, seed=None):
         """Initialize the AttentionMorph training module.
         
         Args:
             difficulty: Initial difficulty level (1-10)
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
         
         # Initialize model with appropriate difficulty
-        self.model = AttentionMorphModel(rows=5, cols=5)
+        self.model = AttentionMorphModel(rows=5, cols=5, rng=self.rng)
         self.model.difficulty_level = max(1, min(10, difficulty))
         
         # Initialize adaptive difficulty engine for performance-based adjustments
@@ -109,8 +113,7 @@ class AttentionMorph(TrainingModule):
             event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, {'pos': (x, y), 'button': 1})
             self.controller.handle_user_input(event)
             
-        # Track the property to optimize state updates
-        self.track_property('state')
+        self.mark_dirty('module')
 
     def update(self, dt):
         """Update the module state.
@@ -125,6 +128,10 @@ class AttentionMorph(TrainingModule):
         current_time = time.time()
         
         if self.controller:
+            # The grid, timer and metrics move on every tick of a game
+            if self.controller.state == self.controller.STATE_PLAYING:
+                self.mark_dirty('module')
+            
             self.controller.track_performance_metrics()
             self.controller.update_grid_state()
             
@@ -150,7 +157,7 @@ class AttentionMorph(TrainingModule):
             if len(self.fps_stats) > 60:
                 self.fps_stats.pop(0)
 
-    def get_state(self):
+    def get_module_state(self):
         """Get the current state of the module for UI rendering.
         
         Returns:
@@ -188,6 +195,7 @@ class AttentionMorph(TrainingModule):
             return {"status": "error", "message": "Module not ready"}
         
         action = input_data.get("action")
+        self.mark_dirty('module')
         
         if action == "select":
             x = input_data.get("x", 0)
@@ -212,6 +220,10 @@ class AttentionMorph(TrainingModule):
         Returns:
             Dictionary of UI components
         """
+        # get_state rebuilds the UI section too; keep the running game
+        if self.module_ready:
+            return {"root": None}
+        
         # Initialize view with current screen dimensions
         screen_width = self.SCREEN_WIDTH or 800
         screen_height = self.SCREEN_HEIGHT or 600
@@ -36,13 +36,16 @@ class ExpandVisionModel:
     PHASE_FEEDBACK = "feedback"
     PHASE_COMPLETED = "completed"
     
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             screen_width: Width of the screen
             screen_height: Height of the screen
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Store screen dimensions for calculations
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -124,7 +127,7 @@ class ExpandVisionModel:
     def generate_random_numbers(self):
         """Generate random numbers around the periphery."""
         half_range = self.number_range // 2
-        self.numbers = [random.randint(-half_range, half_range) for _ in range(4)]
+        self.numbers = [self.rng.randint(-half_range, half_range) for _ in range(4)]
         self.current_sum = sum(self.numbers)
         
         # Increase the distance factors to expand peripheral vision over time
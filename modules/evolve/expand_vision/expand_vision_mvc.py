@@ -36,7 +36,7 @@ except ImportError:
         from MetaMindIQTrain.core.training_module import TrainingModule
     except ImportError:
         class TrainingModule:
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.expand_vision.expand_vision_model import ExpandVisionModel
@@ -51,13 +51,17 @@ class ExpandVision(TrainingModule):
     the interface for interaction with the rest of the platform.
     """
 
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    DELTA_STATE = False
+
+    def __init__(self, difficulty=1, seed=None):
         """Initialize the ExpandVision training module.
 
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
 
         # Module metadata
         self.name = "expand_vision"
@@ -70,7 +74,7 @@ class ExpandVision(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
 
         # Initialize MVC components
-        self.model = ExpandVisionModel(self.screen_width, self.screen_height)
+        self.model = ExpandVisionModel(self.screen_width, self.screen_height, rng=self.rng)
         self.view = ExpandVisionView(self.model)
         self.controller = ExpandVisionController(self.model, self.view)
 
@@ -87,7 +91,10 @@ class ExpandVision(TrainingModule):
         Returns:
             True if the state changed and an update is needed
         """
-        return self.controller.handle_click(x, y)
+        changed = self.controller.handle_click(x, y)
+        if changed:
+            self.mark_dirty('module')
+        return changed
     
     def update(self) -> bool:
         """Update the module state.
@@ -100,10 +107,13 @@ class ExpandVision(TrainingModule):
         self.last_update_time = current_time
         
         # Update controller and check if state changed
-        return self.controller.update(delta_time)
+        changed = self.controller.update(delta_time)
+        if changed:
+            self.mark_dirty('module')
+        return changed
     
-    def get_state(self) -> Dict[str, Any]:
-        """Get the current state of the module.
+    def get_module_state(self) -> Dict[str, Any]:
+        """Get the model's state.
         
         Returns:
             Dict containing the current state
@@ -125,6 +135,7 @@ class ExpandVision(TrainingModule):
             self.model.screen_width = screen_width
             self.model.screen_height = screen_height
             self.view.update_dimensions(screen_width, screen_height)
+            self.mark_dirty('module')
     
     def build_component_tree(self) -> Dict[str, Any]:
         """Build the UI component tree.
@@ -139,6 +150,7 @@ class ExpandVision(TrainingModule):
         self.model.reset()
         self.controller.reset()
         self.last_update_time = time.time()
+        self.mark_dirty('module')
 
     def render(self, renderer):
         """Render the module using the provided renderer.
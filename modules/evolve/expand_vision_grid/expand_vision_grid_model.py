@@ -36,13 +36,16 @@ class ExpandVisionGridModel:
     PHASE_FEEDBACK = "feedback"
     PHASE_COMPLETED = "completed"
     
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             screen_width: Width of the screen
             screen_height: Height of the screen
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Store screen dimensions for calculations
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -136,7 +139,7 @@ class ExpandVisionGridModel:
         # Create a grid of random numbers
         self.numbers = []
         for _ in range(self.grid_size * self.grid_size):
-            self.numbers.append(random.randint(-half_range, half_range))
+            self.numbers.append(self.rng.randint(-half_range, half_range))
         
         # Calculate the sum of all numbers
         self.current_sum = sum(self.numbers)
@@ -36,7 +36,7 @@ except ImportError:
         from MetaMindIQTrain.core.training_module import TrainingModule
     except ImportError:
         class TrainingModule:
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.expand_vision_grid.expand_vision_grid_model import ExpandVisionGridModel
@@ -51,13 +51,17 @@ class ExpandVisionGrid(TrainingModule):
     the interface for interaction with the rest of the platform.
     """
 
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    DELTA_STATE = False
+
+    def __init__(self, difficulty=1, seed=None):
         """Initialize the ExpandVision Grid training module.
 
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
 
         # Module metadata
         self.name = "expand_vision_grid"
@@ -70,7 +74,7 @@ class ExpandVisionGrid(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
 
         # Initialize MVC components
-        self.model = ExpandVisionGridModel(self.screen_width, self.screen_height)
+        self.model = ExpandVisionGridModel(self.screen_width, self.screen_height, rng=self.rng)
         self.view = ExpandVisionGridView(self.model)
         self.controller = ExpandVisionGridController(self.model, self.view)
 
@@ -101,7 +105,9 @@ class ExpandVisionGrid(TrainingModule):
             x, y = pos
         else:
             x, y = pos, 0
-        return self.controller.handle_click(x, y)
+        result = self.controller.handle_click(x, y)
+        self.mark_dirty('module')
+        return result
 
     def render(self, renderer):
         """Render the module using the provided renderer.
@@ -136,20 +142,18 @@ class ExpandVisionGrid(TrainingModule):
         self.last_update_time = current_time
         
         # Update controller with current time
-        return self.controller.update(delta_time, current_time)
+        changed = self.controller.update(delta_time, current_time)
+        if changed:
+            self.mark_dirty('module')
+        return changed
     
-    def get_state(self) -> Dict[str, Any]:
-        """Get the current module state.
+    def get_module_state(self) -> Dict[str, Any]:
+        """Get the model's state.
         
         Returns:
             Dictionary with state information
         """
-        # Start with base state
-        state = super().get_state()
-        
-        # Add model state
-        model_state = self.model.get_state()
-        state.update(model_state)
+        state = self.model.get_state()
         
         # Add module-specific properties
         state.update({
@@ -176,6 +180,7 @@ class ExpandVisionGrid(TrainingModule):
             self.model.screen_width = screen_width
             self.model.screen_height = screen_height
             self.view.update_dimensions(screen_width, screen_height)
+            self.mark_dirty('module')
     
     def process_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process input data.
@@ -192,6 +197,7 @@ class ExpandVisionGrid(TrainingModule):
             value = input_data.get("value")
             if value is not None:
                 is_correct, score_change = self.model.process_answer(value)
+                self.mark_dirty('module')
                 return {
                     "result": "answer_processed", 
                     "correct": is_correct, 
@@ -200,8 +206,7 @@ class ExpandVisionGrid(TrainingModule):
                 }
         
         elif action == "reset":
-            self.model.reset()
-            self.controller.reset()
+            self.reset()
             return {"result": "reset", "state": self.get_state()}
         
         # Default: no action
@@ -220,6 +225,7 @@ class ExpandVisionGrid(TrainingModule):
         self.model.reset()
         self.controller.reset()
         self.last_update_time = time.time()
+        self.mark_dirty('module')
 
 
 if __name__ == "__main__":
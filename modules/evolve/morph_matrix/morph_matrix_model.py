@@ -26,12 +26,15 @@ if __name__ == "__main__" or not __package__:
 class MorphMatrixModel:
     """Model component for MorphMatrix module - handles core game logic."""
     
-    def __init__(self, difficulty=1):
+    def __init__(self, difficulty=1, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             difficulty: Initial difficulty level (1-10)
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Game settings
         self.difficulty = max(1, min(10, difficulty))
         self.level = self.difficulty
@@ -70,7 +73,7 @@ class MorphMatrixModel:
         
         # Create pattern variations
         num_patterns = 6  # Default 6 patterns (3x2 grid)
-        num_modified = random.randint(1, 4)  # 1-4 modified patterns
+        num_modified = self.rng.randint(1, 4)  # 1-4 modified patterns
         
         self.create_pattern_variations(num_patterns, num_modified)
     
@@ -86,14 +89,14 @@ class MorphMatrixModel:
         
         # Create all patterns as rotations initially
         for i in range(num_patterns):
-            rotation = random.choice([0, 90, 180, 270])
+            rotation = self.rng.choice([0, 90, 180, 270])
             position = None  # Will be set by the View
             
             cluster = self.create_cluster(self.original_matrix, rotation, i, position)
             self.clusters.append(cluster)
         
         # Select random patterns to modify
-        indices_to_modify = random.sample(range(num_patterns), num_modified)
+        indices_to_modify = self.rng.sample(range(num_patterns), num_modified)
         self.modified_indices = indices_to_modify
         
         # Modify the selected patterns
@@ -143,8 +146,8 @@ class MorphMatrixModel:
         size = len(matrix)
         
         for _ in range(num_changes):
-            row = random.randint(0, size - 1)
-            col = random.randint(0, size - 1)
+            row = self.rng.randint(0, size - 1)
+            col = self.rng.randint(0, size - 1)
             matrix[row][col] = 1 - matrix[row][col]  # Flip 0 to 1 or 1 to 0
         
         # Update the matrix
@@ -200,7 +203,7 @@ class MorphMatrixModel:
             self.score += score_change
             
             # Potentially increase level
-            if self.level < 10 and random.random() < 0.3:  # 30% chance to level up
+            if self.level < 10 and self.rng.random() < 0.3:  # 30% chance to level up
                 self.level += 1
         else:
             score_change = 0
@@ -245,7 +248,7 @@ class MorphMatrixModel:
         for _ in range(size):
             row = []
             for _ in range(size):
-                cell = 1 if random.random() < 0.4 else 0
+                cell = 1 if self.rng.random() < 0.4 else 0
                 row.append(cell)
             matrix.append(row)
         return matrix
@@ -30,7 +30,7 @@ except ImportError:
         from MetaMindIQTrain.core.training_module import TrainingModule
     except ImportError:
         class TrainingModule:
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.morph_matrix.morph_matrix_model import MorphMatrixModel
@@ -41,13 +41,17 @@ from modules.evolve.morph_matrix.morph_matrix_controller import MorphMatrixContr
 class MorphMatrix(TrainingModule):
     """MorphMatrix training module with MVC architecture."""
     
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    DELTA_STATE = False
+    
+    def __init__(self, difficulty=1, seed=None):
         """Initialize the module.
         
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
         
         # Module metadata
         self.name = "morph_matrix"
@@ -59,7 +63,7 @@ class MorphMatrix(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
         
         # Set up MVC components
-        self.model = MorphMatrixModel(difficulty)
+        self.model = MorphMatrixModel(difficulty, rng=self.rng)
         self.view = MorphMatrixView(self.model)
         self.controller = MorphMatrixController(self.model, self.view)
         
@@ -94,7 +98,9 @@ class MorphMatrix(TrainingModule):
         Returns:
             Result dictionary
         """
-        return self.controller.handle_click(x, y)
+        result = self.controller.handle_click(x, y)
+        self.mark_dirty('ui', 'module')
+        return result
     
     def update(self, dt):
         """Update module state based on elapsed time.
@@ -107,18 +113,13 @@ class MorphMatrix(TrainingModule):
         # No time-based updates needed for MorphMatrix
         pass
     
-    def get_state(self):
-        """Get the current module state.
+    def get_module_state(self):
+        """Get the model's state.
         
         Returns:
             Dictionary with state information
         """
-        # Start with base state
-        state = super().get_state()
-        
-        # Add model state
-        model_state = self.model.get_state()
-        state.update(model_state)
+        state = self.model.get_state()
         
         # Add module-specific properties
         state.update({
@@ -139,6 +140,7 @@ class MorphMatrix(TrainingModule):
             Result dictionary
         """
         action = input_data.get("action", "")
+        self.mark_dirty('ui', 'module')
         
         if action == "select_pattern":
             pattern_index = input_data.get("pattern_index", -1)
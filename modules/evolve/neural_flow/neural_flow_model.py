@@ -23,6 +23,11 @@ if __name__ == "__main__" or not __package__:
     project_root = Path(__file__).parent.parent.parent.parent
     sys.path.insert(0, str(project_root))
 
+try:
+    from MetaMindIQTrain.core.input_timing import get_frame_clock
+except ImportError:
+    from core.input_timing import get_frame_clock
+
 logger = logging.getLogger(__name__)
 
 class NeuralFlowModel:
@@ -33,12 +38,15 @@ class NeuralFlowModel:
     PHASE_ACTIVE = "active"
     PHASE_FEEDBACK = "feedback"
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             config: Optional configuration dictionary
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Set module identification
         self.id = "neural_flow"
         self.name = "Neural Flow"
@@ -67,6 +75,7 @@ class NeuralFlowModel:
         self.success_nodes = []
         self.error_nodes = []
         self.node_count = 0
+        self.stimuli = {}  # Node ID -> input_timing.Stimulus of its activation
         
         # Performance metrics
         self.response_times = []
@@ -164,6 +173,7 @@ class NeuralFlowModel:
         if self.targets_found < len(self.target_nodes):
             next_target = self.target_nodes[self.targets_found]
             next_target["activation_time"] = time.time()
+            self.stimuli[next_target["id"]] = get_frame_clock().stimulus()
             self.active_nodes.append(next_target)
             self.message = f"Activate the highlighted node! ({self.targets_found + 1}/{len(self.target_nodes)})"
     
@@ -185,6 +195,7 @@ class NeuralFlowModel:
                 elapsed = time.time() - node["activation_time"]
                 if elapsed >= node["timeout"]:
                     # Node timed out
+                    self.stimuli.pop(node["id"], None)
                     self.error_nodes.append(node)
                     self.active_nodes.remove(node)
                     self.error_count += 1
@@ -248,12 +259,14 @@ class NeuralFlowModel:
                 # Reset for next trial
                 self._init_game()
     
-    def process_click(self, x, y):
+    def process_click(self, x, y, timestamp_ns=None):
         """Process a mouse click.
         
         Args:
             x: X coordinate of click
             y: Y coordinate of click
+            timestamp_ns: Arrival stamp of the click (defaults to the stamp of
+                the event being dispatched, see core.input_timing)
             
         Returns:
             Dictionary containing the response
@@ -268,10 +281,12 @@ class NeuralFlowModel:
             
             # Check if within radius
             if dist <= radius:
-                # Calculate response time
-                if node["activation_time"] is not None:
-                    response_time = time.time() - node["activation_time"]
-                    self.response_times.append(response_time)
+                # Calculate response time from the frame that showed the node
+                stimulus = self.stimuli.pop(node.get("id"), None)
+                if stimulus is not None:
+                    self.response_times.append(stimulus.reaction_time(timestamp_ns))
+                elif node["activation_time"] is not None:
+                    self.response_times.append(time.time() - node["activation_time"])
                 
                 # Move to success nodes
                 self.success_nodes.append(node)
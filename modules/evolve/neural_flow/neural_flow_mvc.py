@@ -28,7 +28,7 @@ except ImportError:
         class TrainingModule:
             SCREEN_WIDTH = 1024
             SCREEN_HEIGHT = 768
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.neural_flow.neural_flow_model import NeuralFlowModel
@@ -39,13 +39,18 @@ from modules.evolve.neural_flow.neural_flow_controller import NeuralFlowControll
 class NeuralFlow(TrainingModule):
     """Main entry point for the Neural Flow training module."""
 
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    CLOCK_SECTIONS = ('module',)
+    DELTA_STATE = False
+
+    def __init__(self, difficulty=1, seed=None):
         """Initialize the Neural Flow module.
 
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
 
         # Module metadata
         self.name = "neural_flow"
@@ -58,7 +63,7 @@ class NeuralFlow(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
 
         # Initialize MVC components
-        self.model = NeuralFlowModel()
+        self.model = NeuralFlowModel(rng=self.rng)
         self.model.screen_width = self.screen_width
         self.model.screen_height = self.screen_height
         self.view = NeuralFlowView(self.model)
@@ -76,7 +81,10 @@ class NeuralFlow(TrainingModule):
         Returns:
             bool: True if click was processed, False otherwise
         """
-        return self.controller.handle_click(pos)
+        processed = self.controller.handle_click(pos)
+        if processed:
+            self.mark_dirty('module')
+        return processed
     
     def update(self, delta_time: float):
         """Update the module state.
@@ -84,14 +92,19 @@ class NeuralFlow(TrainingModule):
         Args:
             delta_time: Time elapsed since last update
         """
+        # Phase changes and timed-out nodes are the only changes between clicks
+        before = (self.model.phase, self.model.error_count)
         self.controller.update(delta_time)
+        if (self.model.phase, self.model.error_count) != before:
+            self.mark_dirty('module')
     
     def reset(self):
         """Reset the module for a new session."""
         self.controller.reset()
+        self.mark_dirty('module')
     
-    def get_state(self) -> Dict[str, Any]:
-        """Get the current state of the module.
+    def get_module_state(self) -> Dict[str, Any]:
+        """Get the controller's state.
         
         Returns:
             Dict containing current state information
@@ -28,13 +28,16 @@ if __name__ == "__main__" or not __package__:
 class NeuralSynthesisModel:
     """Model component for Neural Synthesis module - handles core game logic."""
     
-    def __init__(self, screen_width=800, screen_height=600):
+    def __init__(self, screen_width=800, screen_height=600, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             screen_width: Width of the screen
             screen_height: Height of the screen
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Module metadata
         self.id = "neural_synthesis"
         self.name = "Neural Synthesis"
@@ -119,11 +122,11 @@ class NeuralSynthesisModel:
         self.current_sequence = []
         for _ in range(self.sequence_length):
             # Random position in the grid
-            x = random.randint(0, self.grid_size - 1)
-            y = random.randint(0, self.grid_size - 1)
+            x = self.rng.randint(0, self.grid_size - 1)
+            y = self.rng.randint(0, self.grid_size - 1)
             
             # Random color/tone
-            color_idx = random.randint(0, len(self.colors) - 1)
+            color_idx = self.rng.randint(0, len(self.colors) - 1)
             
             # Add to sequence
             self.current_sequence.append({
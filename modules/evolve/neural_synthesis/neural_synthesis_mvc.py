@@ -31,7 +31,7 @@ except ImportError:
         class TrainingModule:
             SCREEN_WIDTH = 1024
             SCREEN_HEIGHT = 768
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.neural_synthesis.neural_synthesis_model import NeuralSynthesisModel
@@ -42,13 +42,18 @@ from modules.evolve.neural_synthesis.neural_synthesis_controller import NeuralSy
 class NeuralSynthesis(TrainingModule):
     """Main entry point for the Neural Synthesis training module."""
 
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    CLOCK_SECTIONS = ('module',)
+    DELTA_STATE = False
+
+    def __init__(self, difficulty=1, seed=None):
         """Initialize the Neural Synthesis module.
 
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
 
         # Module metadata
         self.name = "neural_synthesis"
@@ -61,7 +66,7 @@ class NeuralSynthesis(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
 
         # Initialize MVC components
-        self.model = NeuralSynthesisModel(self.screen_width, self.screen_height)
+        self.model = NeuralSynthesisModel(self.screen_width, self.screen_height, rng=self.rng)
         self.view = NeuralSynthesisView(self.model)
         self.controller = NeuralSynthesisController(self.model, self.view)
 
@@ -77,7 +82,9 @@ class NeuralSynthesis(TrainingModule):
         Returns:
             Dict with result information
         """
-        return self.controller.handle_click(pos)
+        result = self.controller.handle_click(pos)
+        self.mark_dirty('module')
+        return result
     
     def update(self, dt):
         """Update the module state.
@@ -85,14 +92,19 @@ class NeuralSynthesis(TrainingModule):
         Args:
             dt: Time delta in seconds.
         """
+        # Between clicks the model only moves on at phase changes
+        phase = self.model.phase
         self.controller.update(dt)
+        if self.model.phase != phase:
+            self.mark_dirty('module')
     
     def reset(self):
         """Reset the module for a new session."""
         self.controller.reset()
+        self.mark_dirty('module')
     
-    def get_state(self):
-        """Get the current state of the module.
+    def get_module_state(self):
+        """Get the controller's state.
         
         Returns:
             Dict containing current state information
@@ -28,12 +28,15 @@ logger = logging.getLogger(__name__)
 class QuantumMemoryModel:
     """Model component for Quantum Memory module - handles core game logic."""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             config: Optional configuration dictionary
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Module metadata
         self.id = "quantum_memory"
         self.name = "Quantum Memory"
@@ -147,7 +150,7 @@ class QuantumMemoryModel:
                     positions.append((x, y))
         
         # Shuffle positions
-        random.shuffle(positions)
+        self.rng.shuffle(positions)
         
         # Generate entanglement pairs - connect some states in pairs
         entangled_pairs = []
@@ -160,9 +163,9 @@ class QuantumMemoryModel:
         for _ in range(num_entangled // 2):
             if len(available_indices) >= 2:
                 # Pick two random indices
-                idx1 = random.choice(available_indices)
+                idx1 = self.rng.choice(available_indices)
                 available_indices.remove(idx1)
-                idx2 = random.choice(available_indices)
+                idx2 = self.rng.choice(available_indices)
                 available_indices.remove(idx2)
                 
                 # Create entangled pair
@@ -183,7 +186,7 @@ class QuantumMemoryModel:
             # Choose symbols for superposition
             # More superposition states at higher levels
             num_superposition = min(self.level // 3 + self.config["superposition_states"], len(quantum_symbols))
-            superposition = random.sample(quantum_symbols, num_superposition)
+            superposition = self.rng.sample(quantum_symbols, num_superposition)
             
             # Create the quantum state
             quantum_state = {
@@ -274,7 +277,7 @@ class QuantumMemoryModel:
                 entangled_state = self.quantum_states[state["entangled_with"]]
                 
                 # Choose the same random index for both states
-                index = random.randrange(len(state["superposition"]))
+                index = self.rng.randrange(len(state["superposition"]))
                 
                 # Ensure index is valid for both states
                 index = min(index, len(entangled_state["superposition"]) - 1)
@@ -291,7 +294,7 @@ class QuantumMemoryModel:
         for i, state in enumerate(self.quantum_states):
             if i not in processed_states:
                 # Randomly select one of the superposition states
-                state["observed_value"] = random.choice(state["superposition"])
+                state["observed_value"] = self.rng.choice(state["superposition"])
                 processed_states.add(i)
     
     def _all_states_selected(self):
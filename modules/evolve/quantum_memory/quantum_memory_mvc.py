@@ -27,7 +27,7 @@ except ImportError:
         class TrainingModule:
             SCREEN_WIDTH = 1024
             SCREEN_HEIGHT = 768
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.quantum_memory.quantum_memory_model import QuantumMemoryModel
@@ -40,13 +40,18 @@ logger = logging.getLogger(__name__)
 class QuantumMemory(TrainingModule):
     """Main Quantum Memory module that integrates MVC components."""
 
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    CLOCK_SECTIONS = ('module',)
+    DELTA_STATE = False
+
+    def __init__(self, difficulty=1, seed=None):
         """Initialize Quantum Memory module.
 
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
 
         # Module metadata
         self.name = "quantum_memory"
@@ -59,7 +64,7 @@ class QuantumMemory(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
 
         # Initialize MVC components
-        self.model = QuantumMemoryModel()
+        self.model = QuantumMemoryModel(rng=self.rng)
         self.view = QuantumMemoryView(self.model)
         self.controller = QuantumMemoryController(self.model, self.view)
 
@@ -76,6 +81,7 @@ class QuantumMemory(TrainingModule):
         Returns:
             Result dictionary from controller
         """
+        self.mark_dirty('module')
         if hasattr(self.controller, 'handle_click'):
             return self.controller.handle_click(pos)
         elif hasattr(self.controller, 'handle_input'):
@@ -89,7 +95,10 @@ class QuantumMemory(TrainingModule):
             delta_time: Time delta in seconds
         """
         if hasattr(self.controller, 'update'):
+            phase = self.model.phase
             self.controller.update(delta_time)
+            if self.model.phase != phase:
+                self.mark_dirty('module')
 
     def render(self, renderer):
         """Render the module using the provided renderer.
@@ -108,8 +117,8 @@ class QuantumMemory(TrainingModule):
             # Fallback to base class render
             super().render(renderer)
 
-    def get_state(self) -> Dict[str, Any]:
-        """Get the current state of the module.
+    def get_module_state(self) -> Dict[str, Any]:
+        """Get the controller's state.
 
         Returns:
             Dictionary containing current state information
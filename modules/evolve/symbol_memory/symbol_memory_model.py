@@ -41,12 +41,15 @@ class SymbolMemoryModel:
     STATE_ACTIVE = "active"
     STATE_COMPLETED = "completed"
     
-    def __init__(self, difficulty=1):
+    def __init__(self, difficulty=1, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             difficulty: Initial difficulty level (1-10)
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Game settings
         self.difficulty = max(1, min(10, difficulty))  # Clamp difficulty between 1-10
         self.level = self.difficulty
@@ -99,7 +102,7 @@ class SymbolMemoryModel:
         """Assign a random bright color to each symbol for enhanced perception."""
         # Shuffle the bright colors
         available_colors = self.bright_colors.copy()
-        random.shuffle(available_colors)
+        self.rng.shuffle(available_colors)
         
         # Assign a color to each symbol
         for i, symbol in enumerate(self.SYMBOLS):
@@ -128,12 +131,12 @@ class SymbolMemoryModel:
         
         for _ in range(num_symbols):
             # Select random symbol
-            symbol = random.choice(self.SYMBOLS)
+            symbol = self.rng.choice(self.SYMBOLS)
             
             # Find an empty position
             while True:
-                row = random.randint(0, grid_size - 1)
-                col = random.randint(0, grid_size - 1)
+                row = self.rng.randint(0, grid_size - 1)
+                col = self.rng.randint(0, grid_size - 1)
                 
                 if empty_grid[row][col] == "":
                     empty_grid[row][col] = symbol
@@ -168,7 +171,7 @@ class SymbolMemoryModel:
         new_grid = [row[:] for row in original_grid]
         
         # Decide if we should modify the pattern (50% chance)
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             # No modification - return a copy of the original
             return {
                 "grid": new_grid,
@@ -183,18 +186,18 @@ class SymbolMemoryModel:
         # 3. Add a new symbol
         # 4. Remove a symbol
         
-        modification_type = random.randint(1, 4)
+        modification_type = self.rng.randint(1, 4)
         self.modified_position = None  # Reset the modified position
         
         if modification_type == 1 and original_pattern["symbols"]:
             # Change a symbol
-            position_index = random.randint(0, len(original_pattern["positions"]) - 1)
+            position_index = self.rng.randint(0, len(original_pattern["positions"]) - 1)
             row, col = original_pattern["positions"][position_index]
             
             # Select a new different symbol
             current_symbol = original_grid[row][col]
             available_symbols = [s for s in self.SYMBOLS if s != current_symbol]
-            new_symbol = random.choice(available_symbols)
+            new_symbol = self.rng.choice(available_symbols)
             
             # Update the grid
             new_grid[row][col] = new_symbol
@@ -202,7 +205,7 @@ class SymbolMemoryModel:
             
         elif modification_type == 2 and original_pattern["symbols"]:
             # Move a symbol to a new position
-            position_index = random.randint(0, len(original_pattern["positions"]) - 1)
+            position_index = self.rng.randint(0, len(original_pattern["positions"]) - 1)
             row, col = original_pattern["positions"][position_index]
             symbol = original_grid[row][col]
             
@@ -219,7 +222,7 @@ class SymbolMemoryModel:
                 self.modified_position = (row, col)
                 
                 # Place at new position
-                new_row, new_col = random.choice(empty_positions)
+                new_row, new_col = self.rng.choice(empty_positions)
                 new_grid[new_row][new_col] = symbol
                 
         elif modification_type == 3:
@@ -231,14 +234,14 @@ class SymbolMemoryModel:
                         empty_positions.append((r, c))
             
             if empty_positions:
-                new_row, new_col = random.choice(empty_positions)
-                new_symbol = random.choice(self.SYMBOLS)
+                new_row, new_col = self.rng.choice(empty_positions)
+                new_symbol = self.rng.choice(self.SYMBOLS)
                 new_grid[new_row][new_col] = new_symbol
                 self.modified_position = (new_row, new_col)
                 
         elif modification_type == 4 and original_pattern["symbols"]:
             # Remove a symbol
-            position_index = random.randint(0, len(original_pattern["positions"]) - 1)
+            position_index = self.rng.randint(0, len(original_pattern["positions"]) - 1)
             row, col = original_pattern["positions"][position_index]
             
             # Clear the position
@@ -33,7 +33,7 @@ except ImportError:
     except ImportError:
         # Minimal fallback
         class TrainingModule:
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.symbol_memory.symbol_memory_model import SymbolMemoryModel
@@ -44,13 +44,17 @@ from modules.evolve.symbol_memory.symbol_memory_controller import SymbolMemoryCo
 class SymbolMemory(TrainingModule):
     """SymbolMemory training module with MVC architecture."""
     
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    DELTA_STATE = False
+    
+    def __init__(self, difficulty=1, seed=None):
         """Initialize the module.
         
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
         
         # Module metadata
         self.name = "symbol_memory"
@@ -63,7 +67,7 @@ class SymbolMemory(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
         
         # Set up MVC components
-        self.model = SymbolMemoryModel(difficulty)
+        self.model = SymbolMemoryModel(difficulty, rng=self.rng)
         self.view = SymbolMemoryView(self.model)
         self.controller = SymbolMemoryController(self.model, self.view)
         
@@ -97,7 +101,9 @@ class SymbolMemory(TrainingModule):
         Returns:
             Result dictionary
         """
-        return self.controller.handle_click(x, y)
+        result = self.controller.handle_click(x, y)
+        self.mark_dirty('ui', 'module')
+        return result
     
     def update(self, dt):
         """Update module state based on elapsed time.
@@ -108,20 +114,16 @@ class SymbolMemory(TrainingModule):
         super().update(dt)
         
         # Update controller with current time
-        self.controller.update(dt, time.time())
+        if self.controller.update(dt, time.time()):
+            self.mark_dirty('ui', 'module')
     
-    def get_state(self):
-        """Get the current module state.
+    def get_module_state(self):
+        """Get the model's state.
         
         Returns:
             Dictionary with state information
         """
-        # Start with base state
-        state = super().get_state()
-        
-        # Add model state
-        model_state = self.model.get_state()
-        state.update(model_state)
+        state = self.model.get_state()
         
         # Add module-specific properties
         state.update({
@@ -143,6 +145,7 @@ class SymbolMemory(TrainingModule):
             Result dictionary
         """
         action = input_data.get("action", "")
+        self.mark_dirty('ui', 'module')
         
         if action == "answer_yes":
             is_correct, score_change = self.model.process_answer(True)
@@ -28,12 +28,15 @@ logger = logging.getLogger(__name__)
 class SynestheticTrainingModel:
     """Model component for Synesthetic Training module - handles core game logic."""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, rng=None):
         """Initialize the model with game state and business logic.
         
         Args:
             config: Optional configuration dictionary
+            rng: Random number generator for the challenges (a new one if None)
         """
+        self.rng = rng or random.Random()
+
         # Module metadata
         self.id = "synesthetic_training"
         self.name = "Synesthetic Training"
@@ -131,8 +134,8 @@ class SynestheticTrainingModel:
             second_sense_options = [s for s in available_senses if s not in first_sense_options[:2]]  # Avoid too similar senses
             
             # Randomly select senses to associate
-            first_sense = random.choice(first_sense_options)
-            second_sense = random.choice(second_sense_options)
+            first_sense = self.rng.choice(first_sense_options)
+            second_sense = self.rng.choice(second_sense_options)
             selected_pair = (first_sense, second_sense)
         
         # Generate associations
@@ -164,7 +167,7 @@ class SynestheticTrainingModel:
         second_stimuli = self._generate_stimuli_for_sense(second_sense, num_associations)
         
         # Shuffle second stimuli to create random associations
-        random.shuffle(second_stimuli)
+        self.rng.shuffle(second_stimuli)
         
         # Create associations
         for i in range(num_associations):
@@ -199,8 +202,8 @@ class SynestheticTrainingModel:
             for hue in hues:
                 # Convert HSV to RGB (simplified)
                 h = hue / 360
-                s = 0.7 + random.random() * 0.3  # High saturation
-                v = 0.8 + random.random() * 0.2  # High value
+                s = 0.7 + self.rng.random() * 0.3  # High saturation
+                v = 0.8 + self.rng.random() * 0.2  # High value
                 
                 # HSV to RGB conversion
                 if s == 0.0:
@@ -233,11 +236,11 @@ class SynestheticTrainingModel:
             # Generate different shapes
             shapes = ["circle", "square", "triangle", "hexagon", "diamond", 
                      "star", "cross", "heart", "pentagon", "octagon", "crescent", "arrow"]
-            selected_shapes = random.sample(shapes, min(count, len(shapes)))
+            selected_shapes = self.rng.sample(shapes, min(count, len(shapes)))
             
             # Repeat shapes if we need more than available
             while len(selected_shapes) < count:
-                selected_shapes.append(random.choice(shapes))
+                selected_shapes.append(self.rng.choice(shapes))
                 
             for shape in selected_shapes:
                 stimuli.append({"type": "shape", "value": shape})
@@ -247,11 +250,11 @@ class SynestheticTrainingModel:
             # These will be converted to actual sounds in the renderer
             sound_types = ["low_tone", "medium_tone", "high_tone", 
                           "chirp", "buzz", "chime", "bell", "beep", "boop"]
-            selected_sounds = random.sample(sound_types, min(count, len(sound_types)))
+            selected_sounds = self.rng.sample(sound_types, min(count, len(sound_types)))
             
             # Repeat sounds if we need more than available
             while len(selected_sounds) < count:
-                selected_sounds.append(random.choice(sound_types))
+                selected_sounds.append(self.rng.choice(sound_types))
                 
             for sound in selected_sounds:
                 stimuli.append({"type": "sound", "value": sound})
@@ -269,7 +272,7 @@ class SynestheticTrainingModel:
                     positions.append((col / grid_size, row / grid_size))
             
             # Shuffle and select the required number
-            random.shuffle(positions)
+            self.rng.shuffle(positions)
             selected_positions = positions[:count]
             
             for position in selected_positions:
@@ -279,14 +282,14 @@ class SynestheticTrainingModel:
             # Generate unique numbers
             if count <= 10:
                 # Use single digits for easier recall
-                numbers = random.sample(range(1, 10), min(count, 9))
+                numbers = self.rng.sample(range(1, 10), min(count, 9))
                 
                 # If we need more than 9, add more
                 while len(numbers) < count:
-                    numbers.append(random.randint(10, 99))
+                    numbers.append(self.rng.randint(10, 99))
             else:
                 # For larger counts, use double digits
-                numbers = random.sample(range(10, 100), count)
+                numbers = self.rng.sample(range(10, 100), count)
                 
             for number in numbers:
                 stimuli.append({"type": "number", "value": number})
@@ -295,11 +298,11 @@ class SynestheticTrainingModel:
             # Generate different texture patterns
             textures = ["dots", "stripes", "waves", "grid", "crosshatch", 
                        "zigzag", "gradient", "noise", "checkers", "honeycomb"]
-            selected_textures = random.sample(textures, min(count, len(textures)))
+            selected_textures = self.rng.sample(textures, min(count, len(textures)))
             
             # Repeat textures if we need more than available
             while len(selected_textures) < count:
-                selected_textures.append(random.choice(textures))
+                selected_textures.append(self.rng.choice(textures))
                 
             for texture in selected_textures:
                 stimuli.append({"type": "texture", "value": texture})
@@ -445,7 +448,7 @@ class SynestheticTrainingModel:
                     ]
                     
                     if available_responses:
-                        self.user_responses[i] = random.choice(available_responses)
+                        self.user_responses[i] = self.rng.choice(available_responses)
             
             # Immediately transition to feedback phase
             self.phase = "feedback"
@@ -26,7 +26,7 @@ except ImportError:
         class TrainingModule:
             SCREEN_WIDTH = 1024
             SCREEN_HEIGHT = 768
-            def __init__(self): pass
+            def __init__(self, seed=None): self.rng = None
 
 # Import local MVC components
 from modules.evolve.synesthetic_training.synesthetic_training_model import SynestheticTrainingModel
@@ -39,13 +39,18 @@ logger = logging.getLogger(__name__)
 class SynestheticTraining(TrainingModule):
     """Main Synesthetic Training module that integrates MVC components."""
 
-    def __init__(self, difficulty=1):
+    CACHE_STATE = True
+    CLOCK_SECTIONS = ('module',)
+    DELTA_STATE = False
+
+    def __init__(self, difficulty=1, seed=None):
         """Initialize Synesthetic Training module.
 
         Args:
             difficulty: Initial difficulty level
+            seed: Seed of the session's random number generator (random if None)
         """
-        super().__init__()
+        super().__init__(seed=seed)
 
         # Module metadata
         self.name = "synesthetic_training"
@@ -58,7 +63,7 @@ class SynestheticTraining(TrainingModule):
         self.screen_height = self.__class__.SCREEN_HEIGHT
 
         # Initialize MVC components
-        self.model = SynestheticTrainingModel()
+        self.model = SynestheticTrainingModel(rng=self.rng)
         self.view = SynestheticTrainingView(self.model)
         self.controller = SynestheticTrainingController(self.model, self.view)
 
@@ -75,6 +80,7 @@ class SynestheticTraining(TrainingModule):
         Returns:
             Result dictionary from controller
         """
+        self.mark_dirty('module')
         if hasattr(self.controller, 'handle_click'):
             return self.controller.handle_click(pos)
         elif hasattr(self.controller, 'handle_input'):
@@ -88,7 +94,10 @@ class SynestheticTraining(TrainingModule):
             delta_time: Time delta in seconds
         """
         if hasattr(self.controller, 'update'):
+            phase = self.model.phase
             self.controller.update(delta_time)
+            if self.model.phase != phase:
+                self.mark_dirty('module')
 
     def render(self, renderer):
         """Render the module using the provided renderer.
@@ -107,8 +116,8 @@ class SynestheticTraining(TrainingModule):
             # Fallback to base class render
             super().render(renderer)
 
-    def get_state(self) -> Dict[str, Any]:
-        """Get the current state of the module.
+    def get_module_state(self) -> Dict[str, Any]:
+        """Get the controller's state.
 
         Returns:
             Dictionary containing current state information
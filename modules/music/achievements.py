@@ -187,7 +187,8 @@ class PerformanceTracker:
             self.scores.append(score)
             self.last_session_time = None
     
-    def record_answer(self, module_id, element_type, element_value, correct):
+    def record_answer(self, module_id, element_type, element_value, correct,
+                      stimulus=None, timestamp_ns=None):
         """
         Record an answer to a music question.
         
@@ -196,6 +197,10 @@ class PerformanceTracker:
             element_type: Type of musical element (e.g., 'scale', 'chord', 'interval')
             element_value: Specific value (e.g., 'major', 'minor7', 'perfect fifth')
             correct: Whether the answer was correct
+            stimulus: Optional core.input_timing.Stimulus for the question; if
+                given, the reaction time from its onset is recorded
+            timestamp_ns: Arrival stamp of the answer (defaults to the stamp
+                of the event being dispatched)
         """
         # Update total counts
         self.total_answers += 1
@@ -221,6 +226,33 @@ class PerformanceTracker:
         if correct:
             self.element_performance[element_key]['correct'] += 1
         self.element_performance[element_key]['last_seen'] = time.time()
+        
+        # Record reaction time
+        if stimulus is not None:
+            reaction_time = stimulus.reaction_time(timestamp_ns)
+            stats = self.element_performance[element_key]
+            stats['timed'] = stats.get('timed', 0) + 1
+            stats['reaction_time'] = stats.get('reaction_time', 0.0) + reaction_time
+    
+    def get_average_reaction_time(self, element_type=None):
+        """
+        Get the average reaction time of timed answers.
+        
+        Args:
+            element_type: Optional element type to filter by
+            
+        Returns:
+            float: Average reaction time in seconds (0 if no timed answers)
+        """
+        timed = 0
+        total = 0.0
+        for key, stats in self.element_performance.items():
+            if element_type is not None and not key.startswith(f"{element_type}:"):
+                continue
+            timed += stats.get('timed', 0)
+            total += stats.get('reaction_time', 0.0)
+        
+        return total / timed if timed > 0 else 0
     
     def record_streak(self, length):
         """
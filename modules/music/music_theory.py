@@ -36,6 +36,9 @@ class MusicTheoryModule(MusicTrainingModule):
     and challenges users to identify them, enhancing auditory-cognitive connections.
     """
     
+    # All state comes from tracked properties, so unchanged sections are reused
+    CACHE_STATE = True
+    
     def __init__(self):
         """Initialize the MusicTheory module."""
         # Initialize the base module
@@ -118,6 +121,15 @@ class MusicTheoryModule(MusicTrainingModule):
         self.current_level_challenges = 0
         self.message = "Listen to the audio and select the correct option"
         
+        # Track the properties the UI and module state are built from
+        self.track_property('score', ('game', 'ui'))
+        for name in ('current_challenge_type', 'current_options', 'correct_answer',
+                     'user_answer', 'state'):
+            self.track_property(name)
+        for name in ('current_challenge', 'answered', 'max_level', 'consecutive_correct',
+                     'challenges_per_level', 'current_level_challenges'):
+            self.track_property(name, ('module',))
+        
         # Generate initial challenge
         self.generate_challenge()
     
@@ -457,11 +469,8 @@ class MusicTheoryModule(MusicTrainingModule):
         Returns:
             UI: The UI instance with components
         """
-        # Create base UI from parent class
-        super().build_ui()
-        
-        # Clear existing components and build new ones
-        self.ui.components = []
+        # Return the previous frame's components to the pool and build new ones
+        self.ui.clear()
         
         # Add module name
         self.ui.add_component(self.ui.text(
@@ -81,6 +81,14 @@ def parse_args():
         '--show-fps', action='store_true',
         help='Show FPS counter'
     )
+    parser.add_argument(
+        '--pipelined', action='store_true',
+        help='Update the module on a simulation thread while rendering on the main thread'
+    )
+    parser.add_argument(
+        '--tick-rate', type=int, default=60,
+        help='Simulation ticks per second in pipelined mode (default: 60)'
+    )
     parser.add_argument(
         '--debug', action='store_true',
         help='Enable debug logging'
@@ -153,7 +161,11 @@ def main():
 
         # Run the application
         logger.info("Entering main loop...")
-        app.run()
+        app.set_tick_rate(args.tick_rate)
+        app.run(pipelined=args.pipelined)
+        if args.pipelined:
+            stats = app.get_pipeline_stats()
+            logger.info(f"Pipeline overlap: {stats['overlap']:.1%}, speedup: {stats['speedup']:.2f}x")
 
         # Shutdown
         logger.info("Shutting down application...")
@@ -14,7 +14,9 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_socketio import SocketIO, emit, join_room, leave_room
 
 from core.config import load_config, AppConfig
+from core.input_timing import SENT_KEY, TIMESTAMP_KEY, dispatching, now_ns, received_timestamp_ns
 from core.training_module import get_available_modules
+from server.state_sync import WebSocketStateManager
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
@@ -115,6 +117,23 @@ def setup_socketio_events(socketio: SocketIO) -> None:
     Args:
         socketio: Socket.IO server
     """
+    # Clients that announce their compression support when they create a
+    # session get delta updates through the state manager; others get the
+    # plain state_update events
+    def expire_session(session_id):
+        """End a session its synchronized clients did not come back to."""
+        session = sessions.get(session_id)
+        if session is None or session['clients']:
+            return
+        try:
+            session['module'].end()
+        except Exception as e:
+            logger.error(f"Error ending expired session: {str(e)}")
+        del sessions[session_id]
+        logger.info(f"Session {session_id} ended (not resumed)")
+    
+    state_manager = WebSocketStateManager(socketio, on_session_expired=expire_session)
+    
     @socketio.on('connect')
     def handle_connect():
         """Handle client connection."""
@@ -142,9 +161,13 @@ def setup_socketio_events(socketio: SocketIO) -> None:
                 
                 logger.info(f"Client {client_id} left session {session_id}")
                 
-                # If no clients left, end the session
-                if not sessions[session_id]['clients']:
+                # If no clients left, end the session; the state manager keeps
+                # sessions of synchronized clients for a while so they can
+                # resume them
+                if not sessions[session_id]['clients'] and not state_manager.is_synchronized(client_id):
                     try:
+                        state_manager.close_session(session_id)
+                        
                         # End module
                         sessions[session_id]['module'].end()
                         
@@ -157,6 +180,7 @@ def setup_socketio_events(socketio: SocketIO) -> None:
             
             # Remove client
             del clients[client_id]
+            state_manager.unregister_client(client_id)
             
             logger.info(f"Client disconnected: {client_id}")
     
@@ -189,6 +213,7 @@ def setup_socketio_events(socketio: SocketIO) -> None:
         module_id = data.get('module_id')
         user_id = data.get('user_id', 'default_user')
         parameters = data.get('parameters', {})
+        compression = data.get('compression')
         
         if not module_id:
             emit('error', {
@@ -223,6 +248,7 @@ def setup_socketio_events(socketio: SocketIO) -> None:
             # Create session record
             sessions[session_id] = {
                 'module': module,
+                'module_id': module_id,
                 'clients': {client_id},
                 'create_time': time.time()
             }
@@ -233,13 +259,24 @@ def setup_socketio_events(socketio: SocketIO) -> None:
             # Update client record
             clients[client_id]['session_id'] = session_id
             
-            # Send session joined event
-            emit('session_joined', {
+            response = {
                 'session_id': session_id,
                 'module_id': module_id,
                 'user_id': user_id,
                 'state': module.get_state()
-            })
+            }
+            
+            # Agree on a preset dictionary and streaming with clients that
+            # can decode them
+            if compression is not None:
+                state_manager.register_client(client_id, compression.get('dictionaries'),
+                                              streaming=bool(compression.get('stream')))
+                sync = state_manager.start_session(client_id, module, module_id)
+                response['compression_dictionary'] = sync['compression_dictionary']
+                response['stream'] = sync['stream']
+            
+            # Send session joined event
+            emit('session_joined', response)
             
             logger.info(f"Client {client_id} created and joined session {session_id} with module {module_id}")
         except Exception as e:
@@ -248,6 +285,67 @@ def setup_socketio_events(socketio: SocketIO) -> None:
                 'message': f"Error creating session: {str(e)}"
             })
     
+    @socketio.on('join_session')
+    def handle_join_session(data):
+        """Handle join session request, also sent by clients that reconnect.
+        
+        Clients that announce their compression support follow the session
+        through the state manager; passing last_version resumes from that
+        state version with a delta.
+        
+        Args:
+            data: Request data
+        """
+        client_id = request.sid
+        
+        session_id = data.get('session_id')
+        user_id = data.get('user_id', 'default_user')
+        compression = data.get('compression')
+        
+        if not session_id or session_id not in sessions:
+            emit('error', {
+                'message': f"Session '{session_id}' not found"
+            })
+            return
+        
+        try:
+            session = sessions[session_id]
+            
+            # Add client to the session
+            session['clients'].add(client_id)
+            join_room(session_id)
+            clients[client_id]['session_id'] = session_id
+            
+            response = {
+                'session_id': session_id,
+                'module_id': session.get('module_id'),
+                'user_id': user_id,
+                'resumed': False
+            }
+            
+            if compression is not None:
+                response['resumed'] = state_manager.register_client(
+                    client_id, compression.get('dictionaries'), session_id=session_id,
+                    last_version=int(data.get('last_version') or 0),
+                    streaming=bool(compression.get('stream')))
+                if not state_manager.is_following(client_id, session_id):
+                    state_manager.start_session(client_id, session['module'], session.get('module_id'))
+                response.update(state_manager.get_client_compression(client_id))
+            
+            # Resumed clients continue from the state they hold
+            if not response['resumed']:
+                response['state'] = session['module'].get_state()
+            
+            emit('session_joined', response)
+            
+            logger.info(f"Client {client_id} joined session {session_id}"
+                        f"{' (resumed)' if response['resumed'] else ''}")
+        except Exception as e:
+            logger.error(f"Error joining session: {str(e)}")
+            emit('error', {
+                'message': f"Error joining session: {str(e)}"
+            })
+    
     @socketio.on('end_session')
     def handle_end_session(data=None):
         """Handle end session request."""
@@ -261,6 +359,8 @@ def setup_socketio_events(socketio: SocketIO) -> None:
             return
         
         try:
+            state_manager.close_session(session_id)
+            
             # End module
             sessions[session_id]['module'].end()
             
@@ -291,9 +391,11 @@ def setup_socketio_events(socketio: SocketIO) -> None:
         Args:
             data: Request data
         """
+        received_ns = now_ns()
         client_id = request.sid
         session_id = clients.get(client_id, {}).get('session_id')
-        input_data = data.get('input', {})
+        # Clients may coalesce a burst of inputs into one 'inputs' list
+        inputs = data.get('inputs') or [data.get('input', {})]
         
         if not session_id or session_id not in sessions:
             emit('error', {
@@ -305,22 +407,33 @@ def setup_socketio_events(socketio: SocketIO) -> None:
             # Get module
             module = sessions[session_id]['module']
             
-            # Process input
-            result = module.process_input(input_data)
+            # Process inputs in order, sending one state update for the burst;
+            # each is dispatched with its client stamp rebased onto this clock
+            results = []
+            for input_data in inputs:
+                timestamp_ns = received_timestamp_ns(input_data, data.get(SENT_KEY), received_ns)
+                with dispatching({TIMESTAMP_KEY: timestamp_ns}):
+                    results.append(module.process_input(input_data))
+            result = results[-1]
             
             # Send input result to the client
             emit('input_result', {
                 'session_id': session_id,
                 'result': result.get('result', {}),
-                'timestamp': time.time()
+                'results': [r.get('result', {}) for r in results],
+                'timestamp': time.time(),
+                'client_time': data.get('client_time')
             })
             
             # Send state update to all clients
-            socketio.emit('state_update', {
-                'session_id': session_id,
-                'state': result.get('state', {}),
-                'timestamp': time.time()
-            }, room=session_id)
+            state_manager.send_session_update(session_id)
+            for cid in sessions[session_id]['clients']:
+                if not state_manager.is_synchronized(cid):
+                    socketio.emit('state_update', {
+                        'session_id': session_id,
+                        'state': result.get('state', {}),
+                        'timestamp': time.time()
+                    }, room=cid)
             
             logger.debug(f"Processed input for session {session_id} from client {client_id}")
         except Exception as e:
@@ -329,6 +442,33 @@ def setup_socketio_events(socketio: SocketIO) -> None:
                 'message': f"Error processing input: {str(e)}"
             })
 
+    @socketio.on('get_state')
+    def handle_get_state(data=None):
+        """Handle a state request; full_state asks for a resync.
+        
+        Args:
+            data: Request data
+        """
+        client_id = request.sid
+        session_id = clients.get(client_id, {}).get('session_id')
+        
+        if not session_id or session_id not in sessions:
+            emit('error', {
+                'message': 'No active session'
+            })
+            return
+        
+        if state_manager.is_synchronized(client_id):
+            if (data or {}).get('full_state'):
+                state_manager.request_full_state(client_id)
+            state_manager.send_update(client_id)
+        else:
+            emit('state_update', {
+                'session_id': session_id,
+                'state': sessions[session_id]['module'].get_state(),
+                'timestamp': time.time()
+            })
+    
     @socketio.on_error()
     def handle_error(e):
         """Handle Socket.IO errors."""
@@ -8,9 +8,15 @@ It defines the common interface that all servers must implement.
 import abc
 import logging
 import threading
+import time
 from typing import Dict, Any, Optional
 
 from MetaMindIQTrain.server.common.session_manager import SessionManager
+from MetaMindIQTrain.server.common.hibernation import SessionHibernator, DEFAULT_HIBERNATE_AFTER
+from MetaMindIQTrain.server.common.module_pool import ModulePool, DEFAULT_MAX_POOL_SIZE
+from MetaMindIQTrain.server.common.session_recorder import SessionRecorder
+from MetaMindIQTrain.server.common.profiler import SamplingProfiler
+from MetaMindIQTrain.module_registry import get_available_modules
 from MetaMindIQTrain.server.common.metrics import MetricsCollector
 
 # Configure logging
@@ -23,13 +29,23 @@ class BaseServer(abc.ABC):
     MetaMindIQTrain server implementations.
     """
     
-    def __init__(self, host: str = '0.0.0.0', port: int = 8080, debug: bool = False):
+    def __init__(self, host: str = '0.0.0.0', port: int = 8080, debug: bool = False,
+                 hibernate_after: Optional[float] = DEFAULT_HIBERNATE_AFTER,
+                 pool_size: int = DEFAULT_MAX_POOL_SIZE, record_path: Optional[str] = None,
+                 enable_profiler: bool = False):
         """Initialize the base server.
         
         Args:
             host: Host address to bind to
             port: Port to listen on
             debug: Enable debug mode
+            hibernate_after: Idle seconds before a session is hibernated to
+                disk (0 or None keeps every session in memory)
+            pool_size: Largest number of pre-built module instances kept per
+                module type (0 builds every instance on request)
+            record_path: Log file recording every session's inputs for
+                replay (no recording if None)
+            enable_profiler: Serve stack-sampling profiles on request
         """
         self.host = host
         self.port = port
@@ -40,8 +56,13 @@ class BaseServer(abc.ABC):
             logging.getLogger().setLevel(logging.DEBUG)
         
         # Initialize common components
-        self.session_manager = SessionManager()
+        hibernator = SessionHibernator(hibernate_after=hibernate_after) if hibernate_after else None
+        self.session_manager = SessionManager(hibernator)
         self.metrics_collector = MetricsCollector()
+        self.module_pool = ModulePool(max_size=pool_size)
+        self.recorder = SessionRecorder(record_path)
+        self.profiler = SamplingProfiler(enabled=enable_profiler,
+                                         session_lookup=self.session_manager.sessions.get)
         
         # Start session cleanup thread
         self.cleanup_thread = threading.Thread(target=self._run_session_cleanup)
@@ -57,14 +78,24 @@ class BaseServer(abc.ABC):
             interval: Cleanup interval in seconds
             max_idle_time: Maximum idle time in seconds before a session is cleaned up
         """
-        import time
+        hibernator = self.session_manager.hibernator
+        
+        # Wake often enough to hibernate sessions close to their idle time
+        tick = min(interval, hibernator.hibernate_after) if hibernator else interval
+        next_cleanup = time.time() + interval
         
         while self.running:
-            time.sleep(interval)
+            time.sleep(tick)
             try:
-                cleaned_up = self.session_manager.cleanup_sessions(max_idle_time)
-                if cleaned_up > 0:
-                    logger.info(f"Cleaned up {cleaned_up} idle sessions")
+                hibernated = self.session_manager.hibernate_idle_sessions()
+                if hibernated > 0:
+                    logger.info(f"Hibernated {hibernated} idle sessions")
+                
+                if time.time() >= next_cleanup:
+                    next_cleanup = time.time() + interval
+                    cleaned_up = self.session_manager.cleanup_sessions(max_idle_time)
+                    if cleaned_up > 0:
+                        logger.info(f"Cleaned up {cleaned_up} idle sessions")
             except Exception as e:
                 logger.error(f"Error in session cleanup: {e}")
     
@@ -73,18 +104,25 @@ class BaseServer(abc.ABC):
         """Start the server."""
         self.running = True
         self.cleanup_thread.start()
+        if self.module_pool.max_size > 0:
+            self.module_pool.warm(module['id'] for module in get_available_modules())
+            self.module_pool.start()
         logger.info(f"Starting server on {self.host}:{self.port}")
     
     @abc.abstractmethod
     def stop(self) -> None:
         """Stop the server."""
         self.running = False
+        self.module_pool.stop()
+        self.recorder.close()
+        if self.session_manager.hibernator:
+            self.session_manager.hibernator.close()
         logger.info("Server shutting down...")
     
     def get_active_sessions_count(self) -> int:
         """Get the number of active sessions.
         
         Returns:
-            Number of active sessions
+            Number of active sessions, resident or hibernated
         """
-        return len(self.session_manager.sessions) 
\ No newline at end of file
+        return self.session_manager.get_active_sessions_count() 
\ No newline at end of file
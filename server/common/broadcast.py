@@ -0,0 +1,265 @@
+"""
+Session Broadcasting for MetaMindIQTrain
+
+This module fans session updates out to every client watching a session
+(the trainee plus any observer or coach views) through Socket.IO rooms.
+
+Each payload is serialized once to JSON bytes and emitted once per room;
+Socket.IO sends the bytes as a binary attachment, so nothing is re-encoded
+per recipient. Observers can subscribe at a lower update rate: members are
+grouped into one room per update interval and a room only receives a
+broadcast when its interval has elapsed. A room that skips a broadcast
+keeps the latest payload of each event as pending and is sent it by
+flush() once its interval has elapsed, so an observer never stays on a
+stale state after the session stops changing.
+"""
+
+import json
+import logging
+import time
+from typing import Dict, Any, Optional, Set, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds between updates for observers that do not ask for a rate
+DEFAULT_OBSERVER_INTERVAL = 0.5
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Serialize a payload for broadcasting.
+
+    Args:
+        payload: JSON-serializable payload
+
+    Returns:
+        Compact UTF-8 JSON bytes
+    """
+    return json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def decode_payload(data: Any) -> Any:
+    """Decode a payload received from a broadcast.
+
+    Args:
+        data: Bytes produced by encode_payload, or an already decoded payload
+
+    Returns:
+        The decoded payload
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return json.loads(data)
+    return data
+
+
+class SessionBroadcaster:
+    """Room-based fan-out of session updates."""
+
+    def __init__(self, sio, metrics_collector=None):
+        """Initialize the broadcaster.
+
+        Args:
+            sio: Socket.IO server
+            metrics_collector: Optional MetricsCollector receiving emit and
+                byte counts
+        """
+        self.sio = sio
+        self.metrics_collector = metrics_collector
+
+        # session_id -> interval -> {'room', 'members', 'last_sent', 'pending'}
+        self.tiers: Dict[str, Dict[float, Dict[str, Any]]] = {}
+
+        # sid -> (session_id, interval)
+        self.memberships: Dict[str, Tuple[str, float]] = {}
+
+    @staticmethod
+    def room_name(session_id: str, interval: float) -> str:
+        """Get the room of a session's update tier.
+
+        Args:
+            session_id: Session ID
+            interval: Seconds between updates (0 for every update)
+
+        Returns:
+            Room name
+        """
+        if not interval:
+            return session_id
+        return f"{session_id}@{int(interval * 1000)}ms"
+
+    def join(self, sid: str, session_id: str, interval: float = 0.0) -> None:
+        """Add a client to a session's broadcasts.
+
+        Args:
+            sid: Socket.IO session ID of the client
+            session_id: Session to follow
+            interval: Minimum seconds between updates (0 for every update)
+        """
+        self.leave(sid)
+
+        interval = max(0.0, float(interval or 0.0))
+        tiers = self.tiers.setdefault(session_id, {})
+        tier = tiers.get(interval)
+        if tier is None:
+            tier = tiers[interval] = {
+                'room': self.room_name(session_id, interval),
+                'members': set(),
+                'last_sent': 0.0,
+                'pending': {}  # event -> latest skipped payload
+            }
+
+        tier['members'].add(sid)
+        self.memberships[sid] = (session_id, interval)
+        self.sio.enter_room(sid, tier['room'])
+
+    def leave(self, sid: str) -> None:
+        """Remove a client from the session it follows.
+
+        Args:
+            sid: Socket.IO session ID of the client
+        """
+        membership = self.memberships.pop(sid, None)
+        if membership is None:
+            return
+
+        session_id, interval = membership
+        tiers = self.tiers.get(session_id, {})
+        tier = tiers.get(interval)
+        if tier is not None:
+            tier['members'].discard(sid)
+            try:
+                self.sio.leave_room(sid, tier['room'])
+            except Exception as e:
+                logger.debug(f"Could not remove {sid} from room {tier['room']}: {e}")
+            if not tier['members']:
+                del tiers[interval]
+        if not tiers:
+            self.tiers.pop(session_id, None)
+
+    def close(self, session_id: str) -> None:
+        """Remove all clients from a session's broadcasts.
+
+        Args:
+            session_id: Session ID
+        """
+        for tier in self.tiers.pop(session_id, {}).values():
+            for sid in tier['members']:
+                self.memberships.pop(sid, None)
+            try:
+                self.sio.close_room(tier['room'])
+            except Exception as e:
+                logger.debug(f"Could not close room {tier['room']}: {e}")
+
+    def members(self, session_id: str) -> Set[str]:
+        """Get the clients following a session.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Set of Socket.IO session IDs
+        """
+        members = set()
+        for tier in self.tiers.get(session_id, {}).values():
+            members |= tier['members']
+        return members
+
+    def broadcast(self, session_id: str, event: str, payload: Any, force: bool = False) -> int:
+        """Send a payload to every due room of a session.
+
+        Rooms that are not due keep the payload as their pending one for
+        the event, replacing any older one, until flush() sends it.
+
+        Args:
+            session_id: Session ID
+            event: Socket.IO event name
+            payload: JSON-serializable payload
+            force: Send to every room regardless of its update interval
+                (for events that must not be skipped)
+
+        Returns:
+            Number of emits
+        """
+        now = time.time()
+        due = []
+        for interval, tier in self.tiers.get(session_id, {}).items():
+            if force or not interval or now - tier['last_sent'] >= interval:
+                tier['pending'].pop(event, None)
+                due.append(tier)
+            else:
+                tier['pending'][event] = payload
+        if not due:
+            return 0
+
+        return self._emit(due, event, payload, now)
+
+    def flush(self, session_id: Optional[str] = None) -> int:
+        """Send pending payloads to the rooms whose interval has elapsed.
+
+        Called once per update tick, after the tick's broadcasts.
+
+        Args:
+            session_id: Session to flush (every session if None)
+
+        Returns:
+            Number of emits
+        """
+        now = time.time()
+        sessions = [session_id] if session_id is not None else list(self.tiers)
+        emits = 0
+        for session in sessions:
+            # Rooms skipping the same broadcast share its serialized payload
+            due: Dict[Tuple[str, int], list] = {}
+            payloads = {}
+            for interval, tier in self.tiers.get(session, {}).items():
+                if not tier['pending'] or now - tier['last_sent'] < interval:
+                    continue
+                for event, payload in tier['pending'].items():
+                    due.setdefault((event, id(payload)), []).append(tier)
+                    payloads[(event, id(payload))] = payload
+                tier['pending'] = {}
+            for key, tiers in due.items():
+                emits += self._emit(tiers, key[0], payloads[key], now)
+        return emits
+
+    def _emit(self, tiers: list, event: str, payload: Any, now: float) -> int:
+        """Serialize a payload once and emit it to each of a list of rooms."""
+        encoded = encode_payload(payload)
+
+        recipients = 0
+        for tier in tiers:
+            self.sio.emit(event, encoded, room=tier['room'])
+            tier['last_sent'] = now
+            recipients += len(tier['members'])
+
+        if self.metrics_collector is not None:
+            self.metrics_collector.record_broadcast(len(tiers), recipients, len(encoded))
+
+        return len(tiers)
+
+    def send(self, sid: str, event: str, payload: Any) -> None:
+        """Send a payload to one client in the broadcast encoding.
+
+        Args:
+            sid: Socket.IO session ID of the client
+            event: Socket.IO event name
+            payload: JSON-serializable payload
+        """
+        encoded = encode_payload(payload)
+        self.sio.emit(event, encoded, room=sid)
+
+        if self.metrics_collector is not None:
+            self.metrics_collector.record_broadcast(1, 1, len(encoded))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get broadcaster statistics.
+
+        Returns:
+            Dictionary with session, room and member counts
+        """
+        return {
+            'sessions': len(self.tiers),
+            'rooms': sum(len(tiers) for tiers in self.tiers.values()),
+            'members': len(self.memberships),
+            'pending': sum(len(tier['pending']) for tiers in self.tiers.values() for tier in tiers.values())
+        }
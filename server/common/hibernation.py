@@ -0,0 +1,287 @@
+"""
+Session Hibernation for MetaMindIQTrain
+
+Idle sessions are written to disk and evicted from memory, then restored on
+their next request:
+
+- HibernationStore: one zlib-compressed pickle per session in a directory
+  owned by the server process
+- SessionHibernator: captures a module through its hibernation hooks
+  (TrainingModule.get_hibernation_state / restore_hibernation_state, or the
+  instance attributes for modules without them), and counts hibernations,
+  rehydrations and rehydration latency
+
+Records are only read back by the process that wrote them; they are not a
+persistence format across code versions.
+"""
+
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Any, Optional, Tuple
+
+from MetaMindIQTrain.core.streaming_stats import StreamingStats
+
+logger = logging.getLogger(__name__)
+
+# Seconds without activity before a session is hibernated
+DEFAULT_HIBERNATE_AFTER = 300.0
+
+# Number of recent rehydration latencies kept for statistics
+REHYDRATION_WINDOW = 100
+
+# zlib level used for records (pickles of game state compress well at low levels)
+COMPRESSION_LEVEL = 3
+
+
+class HibernationStore:
+    """Directory of compressed session records."""
+
+    def __init__(self, directory: Optional[str] = None):
+        """Initialize the store.
+
+        Args:
+            directory: Directory for the records (a private temporary
+                directory, removed on close, if None)
+        """
+        self.directory = directory
+        self._owns_directory = directory is None
+        self.bytes_stored = 0
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, session_id: str) -> str:
+        """Get the record path of a session, creating the directory on first use."""
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix='metamind-hibernate-')
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+        # Hex-encode the ID so any session ID is a safe file name
+        return os.path.join(self.directory, session_id.encode('utf-8').hex() + '.hib')
+
+    def save(self, session_id: str, record: Dict[str, Any]) -> int:
+        """Write a session record, replacing an existing one.
+
+        Args:
+            session_id: Session ID
+            record: Picklable record
+
+        Returns:
+            Size of the record on disk in bytes
+        """
+        data = zlib.compress(pickle.dumps(record, pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+        path = self._path(session_id)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self.bytes_stored += len(data) - self._sizes.get(session_id, 0)
+            self._sizes[session_id] = len(data)
+        return len(data)
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        """Read a session record.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            The saved record
+
+        Raises:
+            KeyError: If the session has no record
+        """
+        try:
+            with open(self._path(session_id), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise KeyError(session_id)
+        return pickle.loads(zlib.decompress(data))
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session record if it exists."""
+        with self._lock:
+            self.bytes_stored -= self._sizes.pop(session_id, 0)
+        if self.directory is not None:
+            try:
+                os.remove(self._path(session_id))
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        """Remove all records (and the directory if the store created it)."""
+        with self._lock:
+            session_ids = list(self._sizes)
+        for session_id in session_ids:
+            self.delete(session_id)
+        if self._owns_directory and self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+def capture_module(module: Any) -> Dict[str, Any]:
+    """Get what is needed to restore a module instance.
+
+    Args:
+        module: Module instance
+
+    Returns:
+        Record with the module's class and state
+    """
+    if hasattr(module, 'get_hibernation_state') and callable(module.get_hibernation_state):
+        state = module.get_hibernation_state()
+    else:
+        state = module.__dict__
+    return {'class': type(module), 'state': state}
+
+
+def restore_module(record: Dict[str, Any]) -> Any:
+    """Rebuild a module instance from capture_module's record.
+
+    Args:
+        record: Record from capture_module
+
+    Returns:
+        Restored module instance (its __init__ is not run)
+    """
+    module = record['class'].__new__(record['class'])
+    if hasattr(module, 'restore_hibernation_state') and callable(module.restore_hibernation_state):
+        module.restore_hibernation_state(record['state'])
+    else:
+        module.__dict__.update(record['state'])
+    return module
+
+
+class SessionHibernator:
+    """Hibernates session modules to a HibernationStore and restores them."""
+
+    def __init__(self, store: Optional[HibernationStore] = None,
+                 hibernate_after: float = DEFAULT_HIBERNATE_AFTER):
+        """Initialize the hibernator.
+
+        Args:
+            store: Store for the records (a private temporary store if None)
+            hibernate_after: Idle seconds before a session is hibernated
+        """
+        self.store = store or HibernationStore()
+        self.hibernate_after = hibernate_after
+
+        # session_id -> (hibernation time, extra data kept in memory)
+        self.hibernated: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+        self.hibernations = 0
+        self.rehydrations = 0
+        self.failures = 0
+        self.rehydration_times = StreamingStats(REHYDRATION_WINDOW)  # Recent rehydrations in ms
+
+    def is_idle(self, last_activity: Optional[float], now: Optional[float] = None) -> bool:
+        """Check whether a session has been idle long enough to hibernate.
+
+        Args:
+            last_activity: Time of the session's last activity
+            now: Current time (defaults to time.time())
+        """
+        if last_activity is None:
+            return False
+        return (now if now is not None else time.time()) - last_activity > self.hibernate_after
+
+    def is_hibernated(self, session_id: str) -> bool:
+        """Check whether a session is hibernated."""
+        return session_id in self.hibernated
+
+    def hibernate(self, session_id: str, module: Any, saved: Optional[Dict[str, Any]] = None,
+                  extra: Optional[Dict[str, Any]] = None) -> bool:
+        """Write a session's module to disk.
+
+        The caller evicts the module from memory if this succeeds.
+
+        Args:
+            session_id: Session ID
+            module: Module instance
+            saved: Additional picklable data written with the module (e.g.
+                the last cached state)
+            extra: Small bookkeeping kept in memory while hibernated
+
+        Returns:
+            True if the session was hibernated, False if the module could
+            not be captured (it stays resident)
+        """
+        try:
+            record = capture_module(module)
+            record['saved'] = saved or {}
+            size = self.store.save(session_id, record)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Could not hibernate session {session_id}: {e}")
+            return False
+
+        self.hibernated[session_id] = (time.time(), extra or {})
+        self.hibernations += 1
+        logger.debug(f"Hibernated session {session_id} ({size} bytes)")
+        return True
+
+    def rehydrate(self, session_id: str) -> Tuple[Any, Dict[str, Any], Dict[str, Any]]:
+        """Restore a hibernated session's module and remove its record.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Tuple of (module, saved data, extra data)
+
+        Raises:
+            KeyError: If the session is not hibernated
+        """
+        _, extra = self.hibernated[session_id]
+        start = time.perf_counter()
+        record = self.store.load(session_id)
+        module = restore_module(record)
+
+        del self.hibernated[session_id]
+        self.store.delete(session_id)
+        self.rehydrations += 1
+        self.rehydration_times.add((time.perf_counter() - start) * 1000)
+        return module, record.get('saved', {}), extra
+
+    def discard(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Forget a hibernated session without restoring it.
+
+        Returns:
+            The session's extra data, or None if it was not hibernated
+        """
+        entry = self.hibernated.pop(session_id, None)
+        self.store.delete(session_id)
+        return entry[1] if entry else None
+
+    def close(self) -> None:
+        """Drop all hibernated sessions and their records."""
+        self.hibernated.clear()
+        self.store.close()
+
+    def get_stats(self, resident: int) -> Dict[str, Any]:
+        """Get hibernation statistics.
+
+        Args:
+            resident: Number of sessions in memory
+
+        Returns:
+            Dictionary of session counts, disk usage and rehydration latency
+        """
+        latency = self.rehydration_times.to_dict((50, 95))
+        return {
+            'resident_sessions': resident,
+            'hibernated_sessions': len(self.hibernated),
+            'hibernate_after': self.hibernate_after,
+            'hibernations': self.hibernations,
+            'rehydrations': self.rehydrations,
+            'failures': self.failures,
+            'disk_bytes': self.store.bytes_stored,
+            'rehydration_ms': latency
+        }
@@ -2,12 +2,20 @@
 Performance Metrics for MetaMindIQTrain Server
 
 This module provides a performance metrics collector for the server implementations.
-It tracks requests, errors, response times, and more.
+It tracks requests, errors, response times, broadcast fan-out, and more.
 """
 
 import time
 from typing import Dict, Any, List, Optional
 
+from MetaMindIQTrain.core.streaming_stats import StreamingStats
+
+# Number of recent response times kept for statistics
+RESPONSE_TIME_WINDOW = 100
+
+# Number of recent update ticks kept for broadcast statistics
+TICK_WINDOW = 200
+
 class MetricsCollector:
     """Performance metrics collector for the MetaMindIQTrain server.
     
@@ -21,9 +29,20 @@ class MetricsCollector:
             'requests': 0,
             'websocket_events': 0,
             'errors': 0,
-            'start_time': time.time(),
-            'response_times': []  # List of recent response times in ms
+            'start_time': time.time()
+        }
+        self.response_times = StreamingStats(RESPONSE_TIME_WINDOW)  # Recent response times in ms
+        
+        # Broadcast fan-out: running totals, the current tick, and per-tick history
+        self.broadcast_totals = {
+            'broadcasts': 0,
+            'emits': 0,
+            'recipients': 0,
+            'bytes_serialized': 0
         }
+        self.current_tick = {'emits': 0, 'bytes_serialized': 0}
+        self.emits_per_tick = StreamingStats(TICK_WINDOW)
+        self.bytes_per_tick = StreamingStats(TICK_WINDOW)
     
     def record_request(self) -> None:
         """Record an HTTP request."""
@@ -43,11 +62,28 @@ class MetricsCollector:
         Args:
             response_time: Response time in milliseconds
         """
-        self.metrics['response_times'].append(response_time)
+        self.response_times.add(response_time)
+    
+    def record_broadcast(self, emits: int, recipients: int, bytes_serialized: int) -> None:
+        """Record one payload fanned out to clients.
         
-        # Keep only the last 100 response times
-        if len(self.metrics['response_times']) > 100:
-            self.metrics['response_times'] = self.metrics['response_times'][-100:]
+        Args:
+            emits: Number of emit calls (one per room)
+            recipients: Number of clients reached
+            bytes_serialized: Size of the payload, serialized once
+        """
+        self.broadcast_totals['broadcasts'] += 1
+        self.broadcast_totals['emits'] += emits
+        self.broadcast_totals['recipients'] += recipients
+        self.broadcast_totals['bytes_serialized'] += bytes_serialized
+        self.current_tick['emits'] += emits
+        self.current_tick['bytes_serialized'] += bytes_serialized
+    
+    def end_tick(self) -> None:
+        """Close the current update tick and record its emit and byte counts."""
+        self.emits_per_tick.add(self.current_tick['emits'])
+        self.bytes_per_tick.add(self.current_tick['bytes_serialized'])
+        self.current_tick = {'emits': 0, 'bytes_serialized': 0}
     
     def get_uptime(self) -> float:
         """Get server uptime in seconds.
@@ -63,8 +99,8 @@ class MetricsCollector:
         Returns:
             Average response time in milliseconds, or None if no responses have been recorded
         """
-        if self.metrics['response_times']:
-            return sum(self.metrics['response_times']) / len(self.metrics['response_times'])
+        if self.response_times.count:
+            return self.response_times.mean
         return None
     
     def get_all_metrics(self) -> Dict[str, Any]:
@@ -78,5 +114,9 @@ class MetricsCollector:
             'requests': self.metrics['requests'],
             'websocket_events': self.metrics['websocket_events'],
             'errors': self.metrics['errors'],
-            'avg_response_time': self.get_average_response_time()
+            'avg_response_time': self.get_average_response_time(),
+            'response_time_stats': self.response_times.to_dict(),
+            'broadcast': dict(self.broadcast_totals,
+                              emits_per_tick=self.emits_per_tick.to_dict(),
+                              bytes_per_tick=self.bytes_per_tick.to_dict())
         } 
\ No newline at end of file
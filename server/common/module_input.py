@@ -0,0 +1,55 @@
+"""
+Module Input Dispatch for MetaMindIQTrain Server
+
+Training modules take clicks in one of two forms: handle_click(x, y) (the
+TrainingModule interface) or handle_click(pos) with an (x, y) tuple (most
+evolve modules). The request handlers receive x and y separately and call
+click_module, which passes them the way the module expects.
+"""
+
+import inspect
+from typing import Any, Dict
+
+# Module class -> True if its handle_click takes a single position
+_POSITION_CLICK: Dict[type, bool] = {}
+
+
+def takes_position(module: Any) -> bool:
+    """Check whether a module's handle_click takes one (x, y) position.
+
+    Args:
+        module: Training module instance
+
+    Returns:
+        True for handle_click(pos), False for handle_click(x, y)
+    """
+    module_class = type(module)
+    position = _POSITION_CLICK.get(module_class)
+    if position is None:
+        try:
+            parameters = inspect.signature(module.handle_click).parameters.values()
+        except (TypeError, ValueError):
+            position = False
+        else:
+            positional = [p for p in parameters
+                          if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+            variadic = any(p.kind == p.VAR_POSITIONAL for p in parameters)
+            position = len(positional) == 1 and not variadic
+        _POSITION_CLICK[module_class] = position
+    return position
+
+
+def click_module(module: Any, x: Any, y: Any) -> Any:
+    """Pass a click to a module in the form its handle_click takes.
+
+    Args:
+        module: Training module instance
+        x: Click x coordinate
+        y: Click y coordinate
+
+    Returns:
+        The module's result
+    """
+    if takes_position(module):
+        return module.handle_click((x, y))
+    return module.handle_click(x, y)
@@ -0,0 +1,336 @@
+"""
+Module Instance Pool for MetaMindIQTrain
+
+Session creation takes a fully initialized module instance from a per-module
+warm pool instead of importing and constructing one on the request path:
+
+- Each module type's pool is sized from the rate sessions of that type were
+  created over the last RATE_WINDOW seconds, capped at max_size
+- A background thread refills pools below their target and trims pools of
+  module types nobody has asked for lately
+- Instances are built by construction or, when it is measured to be
+  cheaper, by cloning a template instance (TrainingModule.clone); each
+  clone gets its own fork of the template's random number generator and
+  deals its first challenge from it
+- Sessions asking for a given seed (e.g. replays) get a newly constructed
+  instance, since their challenges must follow from that seed
+
+Pool hits, misses and creation latency are reported by get_stats.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any, Iterable, Optional
+
+from MetaMindIQTrain.core.streaming_stats import StreamingStats
+from MetaMindIQTrain.module_registry import create_module_instance
+
+logger = logging.getLogger(__name__)
+
+# Largest number of ready instances kept per module type
+DEFAULT_MAX_POOL_SIZE = 8
+
+# Seconds of session creations used to estimate each module type's rate
+RATE_WINDOW = 60.0
+
+# Seconds of demand a pool holds instances for
+DEFAULT_LEAD_TIME = 5.0
+
+# Seconds between refill passes when nothing wakes the refill thread
+REFILL_INTERVAL = 1.0
+
+# Number of recent creation and acquire latencies kept for statistics
+LATENCY_WINDOW = 100
+
+
+class _ModuleEntry:
+    """Ready instances and creation timings of one module type."""
+
+    def __init__(self, warm: bool = False):
+        self.ready = deque()
+        self.requests = deque()  # Times instances were acquired
+        self.warm = warm  # Keep at least one instance even without requests
+        self.template = None
+        self.can_clone = True
+        self.forks = 0  # Forks of the template handed out
+        self.construct_ms = StreamingStats(LATENCY_WINDOW)
+        self.clone_ms = StreamingStats(LATENCY_WINDOW)
+        self.hits = 0
+        self.misses = 0
+
+
+class ModulePool:
+    """Per-module-type pools of pre-built module instances."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_POOL_SIZE, lead_time: float = DEFAULT_LEAD_TIME,
+                 factory: Callable[[str], Any] = create_module_instance):
+        """Initialize the pool.
+
+        Args:
+            max_size: Largest number of ready instances per module type
+            lead_time: Seconds of observed demand each pool holds
+            factory: Creates a module instance from a module ID
+        """
+        self.max_size = max_size
+        self.lead_time = lead_time
+        self.factory = factory
+
+        self.entries: Dict[str, _ModuleEntry] = {}
+        self.acquire_ms = StreamingStats(LATENCY_WINDOW)  # Latency seen by session creation
+        self.clones = 0
+        self.constructions = 0
+        self.seeded = 0
+        self.failures = 0
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the refill thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._refill_loop, name="module-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the refill thread and drop all ready instances."""
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        with self._lock:
+            self.entries.clear()
+
+    def warm(self, module_ids: Iterable[str]) -> None:
+        """Keep at least one ready instance of each module type.
+
+        Args:
+            module_ids: Module IDs to keep warm
+        """
+        with self._lock:
+            for module_id in module_ids:
+                self._entry(module_id).warm = True
+        self._wake.set()
+
+    def acquire(self, module_id: str, session_id: Optional[str] = None,
+                seed: Optional[int] = None, fork: int = 0) -> Optional[Any]:
+        """Get a module instance for a new session.
+
+        A ready instance is used if there is one; otherwise one is created
+        on the caller's thread.
+
+        Args:
+            module_id: Module ID
+            session_id: Session ID given to the instance
+            seed: Seed the instance must be created with (bypasses the pool)
+            fork: Fork of the seeded generator (see TrainingModule.fork_rng)
+
+        Returns:
+            Module instance, or None if the module could not be created
+        """
+        start = time.perf_counter()
+        if seed is not None:
+            module = self._create_seeded(module_id, seed, fork)
+            if module is not None and hasattr(module, 'renew_session'):
+                module.renew_session(session_id)
+            return module
+
+        with self._lock:
+            entry = self._entry(module_id)
+            entry.requests.append(time.time())
+            module = entry.ready.popleft() if entry.ready else None
+            if module is not None:
+                entry.hits += 1
+            else:
+                entry.misses += 1
+        self._wake.set()
+
+        if module is None:
+            module = self._create(module_id)
+            if module is None:
+                return None
+
+        if hasattr(module, 'renew_session'):
+            module.renew_session(session_id)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.acquire_ms.add(elapsed_ms)
+        return module
+
+    def target_size(self, module_id: str, now: Optional[float] = None) -> int:
+        """Get the number of ready instances a module type's pool aims for.
+
+        Args:
+            module_id: Module ID
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Instances needed for lead_time seconds at the observed creation
+            rate, capped at max_size (at least one for warm module types)
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            entry = self.entries.get(module_id)
+            if entry is None:
+                return 0
+            while entry.requests and now - entry.requests[0] > RATE_WINDOW:
+                entry.requests.popleft()
+            rate = len(entry.requests) / RATE_WINDOW
+            minimum = 1 if entry.warm or entry.requests else 0
+        return min(self.max_size, max(minimum, math.ceil(rate * self.lead_time)))
+
+    def refill(self) -> int:
+        """Bring every pool to its target size.
+
+        Returns:
+            Number of instances created
+        """
+        created = 0
+        for module_id in list(self.entries):
+            target = self.target_size(module_id)
+            with self._lock:
+                entry = self.entries.get(module_id)
+                if entry is None:
+                    continue
+                while len(entry.ready) > target:
+                    entry.ready.pop()
+                missing = target - len(entry.ready)
+
+            for _ in range(missing):
+                module = self._create(module_id)
+                if module is None:
+                    break
+                with self._lock:
+                    entry.ready.append(module)
+                created += 1
+        return created
+
+    def _entry(self, module_id: str) -> _ModuleEntry:
+        """Get a module type's entry, creating it (lock held)."""
+        entry = self.entries.get(module_id)
+        if entry is None:
+            entry = self.entries[module_id] = _ModuleEntry()
+        return entry
+
+    def _create_seeded(self, module_id: str, seed: int, fork: int) -> Optional[Any]:
+        """Construct an instance with a given seed and fork."""
+        try:
+            module = self.factory(module_id, seed=seed)
+            if module is not None and fork:
+                module.fork_rng(fork)
+        except Exception as e:
+            logger.error(f"Error creating module {module_id} with seed {seed}: {e}")
+            module = None
+        with self._lock:
+            if module is None:
+                self.failures += 1
+                return None
+            self.seeded += 1
+        return module
+
+    def _create(self, module_id: str) -> Optional[Any]:
+        """Build an instance by cloning the template or by construction.
+
+        Cloning is used once a template exists and its measured time is
+        lower than construction's; a module that fails to clone is always
+        constructed afterwards.
+        """
+        with self._lock:
+            entry = self._entry(module_id)
+            template = entry.template if entry.can_clone else None
+            use_clone = template is not None and (
+                entry.clone_ms.count == 0 or entry.clone_ms.mean < entry.construct_ms.mean)
+            if use_clone:
+                entry.forks += 1
+                fork = entry.forks
+
+        if use_clone:
+            start = time.perf_counter()
+            try:
+                module = template.clone(fork)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                with self._lock:
+                    entry.clone_ms.add(elapsed_ms)
+                    self.clones += 1
+                return module
+            except Exception as e:
+                logger.warning(f"Cannot clone module {module_id}, constructing instead: {e}")
+                with self._lock:
+                    entry.can_clone = False
+
+        start = time.perf_counter()
+        try:
+            module = self.factory(module_id)
+        except Exception as e:
+            logger.error(f"Error creating module {module_id}: {e}")
+            module = None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            if module is None:
+                self.failures += 1
+                return None
+            entry.construct_ms.add(elapsed_ms)
+            self.constructions += 1
+
+            # The first instance built becomes the template; it is never handed out
+            make_template = (entry.template is None and entry.can_clone
+                             and callable(getattr(module, 'clone', None)))
+            if make_template:
+                entry.template = module
+        if make_template:
+            return self._create(module_id)
+        return module
+
+    def _refill_loop(self) -> None:
+        """Refill pools whenever an instance is taken, and periodically."""
+        while self._running:
+            self._wake.wait(REFILL_INTERVAL)
+            self._wake.clear()
+            try:
+                self.refill()
+            except Exception as e:
+                logger.error(f"Error refilling module pool: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics.
+
+        Returns:
+            Dictionary with the overall hit rate, acquire and creation
+            latency, and per-module pool sizes, targets and hit counts
+        """
+        targets = {module_id: self.target_size(module_id) for module_id in list(self.entries)}
+        modules = {}
+        hits = misses = 0
+        with self._lock:
+            for module_id, entry in self.entries.items():
+                hits += entry.hits
+                misses += entry.misses
+                modules[module_id] = {
+                    'ready': len(entry.ready),
+                    'target': targets.get(module_id, 0),
+                    'hits': entry.hits,
+                    'misses': entry.misses,
+                    'cloned': entry.template is not None and entry.can_clone,
+                    'construct_ms': entry.construct_ms.to_dict((50, 95)),
+                    'clone_ms': entry.clone_ms.to_dict((50, 95))
+                }
+
+            requests = hits + misses
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / requests if requests else 0.0,
+                'constructions': self.constructions,
+                'clones': self.clones,
+                'seeded': self.seeded,
+                'failures': self.failures,
+                'acquire_ms': self.acquire_ms.to_dict((50, 95, 99)),
+                'modules': modules
+            }
@@ -0,0 +1,312 @@
+"""
+Sampling Profiler for MetaMindIQTrain Server
+
+Opt-in diagnostics behind /api/debug/profile and the debug_profile socket
+event:
+
+- A background thread samples the Python stack of every server thread at a
+  fixed interval (sys._current_frames), for a requested number of seconds
+- Stacks are reported in collapsed form ("frame;frame;frame count"), ready
+  for flamegraph.pl or speedscope, with the module type as the root frame
+- Samples are broken down by session (from the tag request handlers set on
+  their thread) and by module type (from the modules/ source file on the
+  stack, or else the type of the session's module)
+- A tracemalloc snapshot of the window gives the top allocation sites
+
+A disabled profiler refuses to run, and outside a profiling window tag()
+returns after one attribute check, so it can stay compiled in.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# Seconds between stack samples
+DEFAULT_INTERVAL = 0.01
+
+# Longest profile a request can ask for
+MAX_PROFILE_SECONDS = 60.0
+
+# Allocation sites and sessions reported
+DEFAULT_TOP_N = 20
+
+# Deepest stack recorded per sample (frames beyond it are dropped at the root)
+MAX_STACK_DEPTH = 64
+
+# Frames retained per tracemalloc allocation
+TRACEMALLOC_FRAMES = 1
+
+# Leaf functions of threads waiting for work; their samples are counted as idle
+IDLE_FUNCTIONS = frozenset(('wait', 'select', 'poll', 'accept', 'readinto', '_wait_for_tstate_lock'))
+
+# Matches the module type in paths such as modules/evolve/quantum_memory/quantum_memory_model.py
+_MODULE_PATH = re.compile(r'[/\\]modules[/\\](?:evolve[/\\])?([A-Za-z0-9_]+)[/\\]')
+
+# Matches the module type in import names such as modules.evolve.quantum_memory.quantum_memory_mvc
+_MODULE_NAME = re.compile(r'(?:^|\.)modules\.(?:evolve\.)?([A-Za-z0-9_]+)\.')
+
+
+def module_type(module: Any) -> Optional[str]:
+    """Get the module type of a module instance from its class's import name."""
+    if module is None:
+        return None
+    match = _MODULE_NAME.search(type(module).__module__)
+    return match.group(1) if match else type(module).__name__
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+class SamplingProfiler:
+    """Stack-sampling profiler run on request."""
+
+    def __init__(self, enabled: bool = False, interval: float = DEFAULT_INTERVAL,
+                 session_lookup: Optional[Callable[[str], Any]] = None):
+        """Initialize the profiler.
+
+        Args:
+            enabled: Allow profiles to be taken
+            interval: Seconds between stack samples
+            session_lookup: Gets the module of a resident session (e.g.
+                SessionManager.sessions.get)
+        """
+        self.enabled = enabled
+        self.interval = interval
+        self.session_lookup = session_lookup
+        self.active = False
+        self.profiles = 0
+
+        self._tags: Dict[int, str] = {}  # Thread ID -> session ID being handled
+        self._labels: Dict[Any, tuple] = {}  # Code object -> (frame label, module type)
+        self._lock = threading.Lock()
+
+    def tag(self, session_id: Optional[str]) -> None:
+        """Attribute the calling thread's samples to a session.
+
+        Request handlers call this when they start on a request; None
+        clears the tag.
+
+        Args:
+            session_id: Session the thread is working for
+        """
+        if not self.active:
+            return
+        if session_id is None:
+            self._tags.pop(threading.get_ident(), None)
+        else:
+            self._tags[threading.get_ident()] = session_id
+
+    def profile(self, seconds: float, top_n: int = DEFAULT_TOP_N, memory: bool = True,
+                include_idle: bool = False) -> Dict[str, Any]:
+        """Sample all threads for a number of seconds.
+
+        Blocks the caller for the duration of the profile.
+
+        Args:
+            seconds: Length of the profile (capped at MAX_PROFILE_SECONDS)
+            top_n: Allocation sites and sessions to report
+            memory: Trace allocations with tracemalloc during the profile
+            include_idle: Keep samples of threads waiting for work
+
+        Returns:
+            Dictionary with sample counts, samples by module type and
+            session, collapsed stacks and the top allocation sites
+
+        Raises:
+            RuntimeError: If profiling is disabled
+            ProfilerBusy: If a profile is already running
+        """
+        if not self.enabled:
+            raise RuntimeError("Profiling is disabled")
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+
+        started_tracing = False
+        try:
+            seconds = max(0.0, min(float(seconds), MAX_PROFILE_SECONDS))
+            started_tracing = memory and not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+
+            result: Dict[str, Any] = {}
+            self._tags.clear()
+            self.active = True
+            sampler = threading.Thread(target=self._sample, args=(seconds, include_idle, result),
+                                       name='profiler', daemon=True)
+            sampler.start()
+            sampler.join()
+            self.active = False
+            self._tags.clear()
+
+            if memory:
+                result['allocations'] = self._top_allocations(tracemalloc.take_snapshot(), top_n)
+            self.profiles += 1
+            return self._report(result, seconds, top_n)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self.active = False
+            self._lock.release()
+
+    def _label(self, code) -> tuple:
+        """Get the frame label and module type of a code object (cached)."""
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            match = _MODULE_PATH.search(filename)
+            label = (f"{os.path.basename(filename)}:{code.co_name}", match.group(1) if match else None)
+            self._labels[code] = label
+        return label
+
+    def _sample(self, seconds: float, include_idle: bool, result: Dict[str, Any]) -> None:
+        """Sample stacks until the profile ends (runs on the sampler thread)."""
+        own = threading.get_ident()
+        counts = Counter()  # (module type, session, stack) -> samples
+        session_types: Dict[str, Optional[str]] = {}
+        samples = idle = 0
+        cpu_start = time.thread_time()
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_sample = start
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                time.sleep(next_sample - now)
+            # A pass that overran the interval delays the next one instead of bursting
+            next_sample = max(next_sample, now) + self.interval
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or frame is None:
+                    continue
+                samples += 1
+                # Waiting threads are counted without walking their stacks
+                if not include_idle and frame.f_code.co_name in IDLE_FUNCTIONS:
+                    idle += 1
+                    continue
+
+                stack = []
+                stack_module = None
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    label, frame_module = self._label(frame.f_code)
+                    stack.append(label)
+                    if stack_module is None:
+                        stack_module = frame_module
+                    frame = frame.f_back
+                session_id = self._tags.get(thread_id)
+                if stack_module is None and session_id is not None:
+                    if session_id not in session_types:
+                        session_types[session_id] = self._session_type(session_id)
+                    stack_module = session_types[session_id]
+                counts[(stack_module, session_id, tuple(reversed(stack)))] += 1
+
+        result.update(
+            counts=counts,
+            samples=samples,
+            idle_samples=idle,
+            elapsed=time.perf_counter() - start,
+            sampler_cpu=time.thread_time() - cpu_start
+        )
+
+    def _session_type(self, session_id: str) -> Optional[str]:
+        """Get the module type of a session, if it can be looked up."""
+        if self.session_lookup is None:
+            return None
+        try:
+            return module_type(self.session_lookup(session_id))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _top_allocations(snapshot, top_n: int) -> List[Dict[str, Any]]:
+        """Get the largest allocation sites of a snapshot, excluding tracemalloc itself."""
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        allocations = []
+        for stat in snapshot.statistics('lineno')[:top_n]:
+            frame = stat.traceback[0]
+            allocations.append({
+                'location': f"{frame.filename}:{frame.lineno}",
+                'size_kb': round(stat.size / 1024, 1),
+                'count': stat.count
+            })
+        return allocations
+
+    def _report(self, result: Dict[str, Any], seconds: float, top_n: int) -> Dict[str, Any]:
+        """Turn the sampler's counts into the profile response."""
+        by_module = Counter()
+        by_session: Dict[str, Dict[str, Any]] = {}
+        collapsed = Counter()
+        for (module_type, session_id, stack), count in result['counts'].items():
+            module_name = module_type or 'server'
+            by_module[module_name] += count
+            if session_id is not None:
+                session = by_session.setdefault(session_id, {'session_id': session_id, 'modules': Counter(),
+                                                             'samples': 0})
+                session['samples'] += count
+                session['modules'][module_name] += count
+            collapsed[f"[{module_name}];" + ';'.join(stack)] += count
+
+        sessions = sorted(by_session.values(), key=lambda session: session['samples'], reverse=True)[:top_n]
+        for session in sessions:
+            session['module'] = session.pop('modules').most_common(1)[0][0]
+
+        elapsed = result['elapsed']
+        report = {
+            'seconds': seconds,
+            'interval': self.interval,
+            'samples': result['samples'],
+            'idle_samples': result['idle_samples'],
+            'sampler_cpu_percent': result['sampler_cpu'] / elapsed * 100 if elapsed else 0.0,
+            'by_module': dict(by_module.most_common()),
+            'by_session': sessions,
+            'collapsed': '\n'.join(f"{stack} {count}" for stack, count in collapsed.most_common())
+        }
+        if 'allocations' in result:
+            report['allocations'] = result['allocations']
+        return report
+
+    def handle_request(self, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Run a profile for an HTTP request or socket event.
+
+        Args:
+            params: Request parameters: seconds, top, memory and idle
+                (flags are '0'/'1' or booleans)
+
+        Returns:
+            Tuple of (HTTP status code, response data)
+        """
+        if not self.enabled:
+            return 404, {'error': 'Profiling is disabled (start the server with --enable-profiler)'}
+        try:
+            seconds = float(params.get('seconds', 10))
+            top_n = int(params.get('top', DEFAULT_TOP_N))
+        except (TypeError, ValueError):
+            return 400, {'error': 'seconds and top must be numbers'}
+        memory = str(params.get('memory', '1')).lower() not in ('0', 'false', 'no')
+        include_idle = str(params.get('idle', '0')).lower() in ('1', 'true', 'yes')
+
+        try:
+            return 200, self.profile(seconds, top_n, memory, include_idle)
+        except ProfilerBusy as e:
+            return 409, {'error': str(e)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the profiler's status."""
+        return {
+            'enabled': self.enabled,
+            'active': self.active,
+            'profiles': self.profiles,
+            'interval': self.interval
+        }
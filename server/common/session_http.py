@@ -0,0 +1,157 @@
+"""
+Session State HTTP Helpers for MetaMindIQTrain
+
+Shared by the HTTP request handlers of the server implementations: serves
+``GET /api/session/<id>`` with a version-based ETag, answers conditional
+requests with 304 Not Modified, and supports long-polling with
+``?since=<version>&wait=<ms>``. session_state_response makes the decision
+for both the BaseHTTPRequestHandler mixin and the Flask route.
+"""
+
+import logging
+import time
+from typing import Dict, Any, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 30
+
+# Cached states younger than this are served without calling get_state
+STATE_CACHE_MAX_AGE = 1.0
+
+
+def is_long_poll(params: Dict[str, Any]) -> bool:
+    """Check whether a state request waits for a newer version.
+
+    Long-polls are left out of response time metrics, since they are idle
+    for most of their wait.
+    """
+    return 'since' in params
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag.
+
+    Args:
+        header: If-None-Match header value, if any
+        etag: Current entity tag
+
+    Returns:
+        True if the client already holds this version
+    """
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+def session_state_response(session_manager, session_id: str, params: Dict[str, Any],
+                           if_none_match: Optional[str] = None
+                           ) -> Tuple[int, Dict[str, str], Optional[Dict[str, Any]]]:
+    """Get the response to a session state request.
+
+    Without ``since`` the cached state (or a fresh one) is returned, or 304
+    if it matches If-None-Match. With ``since`` the request waits up to
+    ``wait`` milliseconds for a newer version and gets 304 if none was
+    published, or 404 if the session ended meanwhile.
+
+    Args:
+        session_manager: SessionManager holding the session
+        session_id: Session ID
+        params: Query parameters
+        if_none_match: If-None-Match header value, if any
+
+    Returns:
+        Tuple of (status code, headers, body); the body is None for 304 and
+        has an 'error' message for errors
+    """
+    module = session_manager.get_session(session_id)
+    if not module:
+        return 404, {}, {'error': f"Session {session_id} not found"}
+
+    cached = True
+    if is_long_poll(params):
+        try:
+            since = int(params['since'])
+            wait = int(params.get('wait', 0)) / 1000.0
+        except (TypeError, ValueError):
+            return 400, {}, {'error': "since and wait must be integers"}
+
+        # Long-poll: block until the state moves past the client's version
+        session_manager.wait_for_version(session_id, since, wait)
+        versioned = session_manager.get_versioned_state(session_id)
+        if versioned is None or versioned[1] <= since:
+            if not session_manager.has_session(session_id):
+                return 404, {}, {'error': f"Session {session_id} ended"}
+            return 304, {'ETag': session_manager.make_etag(session_id, since), 'Cache-Control': 'no-cache'}, None
+    else:
+        versioned = session_manager.get_versioned_state(session_id, max_age=STATE_CACHE_MAX_AGE)
+        if versioned is None:
+            state = module.get_state()
+            versioned = (state, session_manager.update_cache(session_id, state))
+            cached = False
+
+            # Update last activity time
+            if hasattr(module, '__dict__'):
+                module.last_activity = time.time()
+
+    state, version = versioned
+    headers = {'ETag': session_manager.make_etag(session_id, version), 'Cache-Control': 'no-cache'}
+    if etag_matches(if_none_match, headers['ETag']):
+        return 304, headers, None
+
+    body = {
+        'session_id': session_id,
+        'version': version,
+        'state': state
+    }
+    if cached:
+        body['cached'] = True
+    return 200, headers, body
+
+
+class SessionStateHandlerMixin:
+    """Conditional GET and long-poll support for BaseHTTPRequestHandler.
+    
+    The handler must provide ``_send_response(status_code, data, headers=None)``
+    and ``_send_error(status_code, message)``.
+    """
+    
+    # Keep connections open between polls; every response has a length
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE_TIMEOUT
+    
+    def _send_not_modified(self, etag: str) -> None:
+        """Send a 304 response without a body.
+        
+        Args:
+            etag: Current entity tag
+        """
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.end_headers()
+        
+        if hasattr(self.server, 'server_instance'):
+            self.server.server_instance.metrics_collector.record_request()
+    
+    def _send_session_state(self, session_manager, session_id: str, params: Dict[str, Any]) -> None:
+        """Serve a session's state (see session_state_response).
+        
+        Args:
+            session_manager: SessionManager holding the session
+            session_id: Session ID
+            params: Query parameters
+        """
+        status, headers, body = session_state_response(session_manager, session_id, params,
+                                                       self.headers.get('If-None-Match'))
+        if status == 304:
+            self._send_not_modified(headers['ETag'])
+        elif status == 200:
+            self._send_response(200, body, headers=headers)
+        else:
+            self._send_error(status, body['error'])
@@ -2,19 +2,27 @@
 Session Manager for MetaMindIQTrain
 
 This module provides session management functionality for the server implementations.
-It handles session creation, retrieval, and cleanup.
+It handles session creation, retrieval, and cleanup, and versions each
+session's cached state so HTTP clients can poll conditionally (ETag) or
+wait for the next version (long-poll). With a SessionHibernator, idle
+sessions are written to disk and restored on their next request.
 """
 
 import logging
+import threading
 import time
-from typing import Dict, Any, Optional, Set, List
+from typing import Dict, Any, Optional, Set, List, Tuple
 
 # Import the module registry
 from MetaMindIQTrain.module_registry import create_module_instance
+from MetaMindIQTrain.server.common.hibernation import SessionHibernator
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Upper bound for a long-poll wait in seconds
+MAX_LONG_POLL_WAIT = 30.0
+
 class SessionManager:
     """Session manager for the MetaMindIQTrain server.
     
@@ -22,17 +30,35 @@ class SessionManager:
     and clean up sessions.
     """
     
-    def __init__(self):
-        """Initialize the session manager."""
-        # Sessions dictionary maps session_id to module instance
+    def __init__(self, hibernator: Optional[SessionHibernator] = None):
+        """Initialize the session manager.
+        
+        Args:
+            hibernator: Hibernates idle sessions to disk (None keeps every
+                session in memory)
+        """
+        # Sessions dictionary maps session_id to resident module instance
         self.sessions: Dict[str, Any] = {}
         
+        # Hibernated sessions keep their clients and state version; only
+        # the module and its cached state leave memory
+        self.hibernator = hibernator
+        self.hibernation_lock = threading.RLock()
+        
         # Client tracking - maps session_id to set of client_ids
         self.clients: Dict[str, Set[str]] = {}
         
-        # Cache maps session_id to cached state and timestamp
+        # Cache maps session_id to cached state, version and timestamp
         self.cache: Dict[str, Dict[str, Any]] = {}
         
+        # State versions: advanced whenever a cached state differs from the
+        # previous one; waiters are woken on every change
+        self.versions: Dict[str, int] = {}
+        self.state_changed = threading.Condition()
+        
+        # Distinguishes ETags of this process from those of an earlier run
+        self.etag_epoch = format(int(time.time() * 1000), 'x')
+        
     def create_session(self, session_id: str, module: Any, client_id: str) -> bool:
         """Create a new training session with the given module and client.
         
@@ -59,7 +85,7 @@ class SessionManager:
                 return False
             
             # Check if session already exists
-            if session_id in self.sessions:
+            if self.has_session(session_id):
                 logger.warning(f"Session {session_id} already exists, ending old session first")
                 self.end_session(session_id)
             
@@ -99,7 +125,7 @@ class SessionManager:
             return False
     
     def get_session(self, session_id: str) -> Optional[Any]:
-        """Get a session by ID.
+        """Get a session by ID, rehydrating it if it is hibernated.
         
         Args:
             session_id: The ID of the session to retrieve
@@ -107,7 +133,112 @@ class SessionManager:
         Returns:
             The session module instance, or None if not found
         """
-        return self.sessions.get(session_id)
+        module = self.sessions.get(session_id)
+        if module is None and self.hibernator and self.hibernator.is_hibernated(session_id):
+            module = self._rehydrate_session(session_id)
+        return module
+    
+    def has_session(self, session_id: str) -> bool:
+        """Check whether a session exists, resident or hibernated.
+        
+        Args:
+            session_id: The ID of the session
+            
+        Returns:
+            True if the session exists
+        """
+        return session_id in self.sessions or bool(
+            self.hibernator and self.hibernator.is_hibernated(session_id))
+    
+    def hibernate_session(self, session_id: str) -> bool:
+        """Write a resident session to disk and evict it from memory.
+        
+        Args:
+            session_id: The ID of the session
+            
+        Returns:
+            True if the session was hibernated
+        """
+        if not self.hibernator:
+            return False
+        
+        with self.hibernation_lock:
+            module = self.sessions.get(session_id)
+            if module is None:
+                return False
+            
+            with self.state_changed:
+                cached = self.cache.get(session_id)
+            if not self.hibernator.hibernate(session_id, module, saved={'cache': cached}):
+                return False
+            
+            # The state version stays so clients' ETags remain valid
+            self.sessions.pop(session_id, None)
+            with self.state_changed:
+                self.cache.pop(session_id, None)
+        
+        logger.info(f"Hibernated idle session {session_id}")
+        return True
+    
+    def hibernate_idle_sessions(self) -> int:
+        """Hibernate the sessions idle for longer than the hibernator's idle time.
+        
+        Returns:
+            Number of sessions hibernated
+        """
+        if not self.hibernator:
+            return 0
+        
+        now = time.time()
+        idle_sessions = [session_id for session_id, module in list(self.sessions.items())
+                         if self.hibernator.is_idle(getattr(module, 'last_activity', None), now)]
+        return sum(1 for session_id in idle_sessions if self.hibernate_session(session_id))
+    
+    def _rehydrate_session(self, session_id: str) -> Optional[Any]:
+        """Restore a hibernated session into memory.
+        
+        Args:
+            session_id: The ID of the session
+            
+        Returns:
+            The restored module instance, or None if it could not be restored
+        """
+        with self.hibernation_lock:
+            # Another request may have restored it first
+            module = self.sessions.get(session_id)
+            if module is not None or not self.hibernator.is_hibernated(session_id):
+                return module
+            
+            try:
+                module, saved, _ = self.hibernator.rehydrate(session_id)
+            except Exception as e:
+                logger.error(f"Error rehydrating session {session_id}: {e}")
+                self.hibernator.discard(session_id)
+                self._drop_versioned_state(session_id)
+                self.clients.pop(session_id, None)
+                return None
+            
+            if hasattr(module, '__dict__'):
+                module.last_activity = time.time()
+            self.sessions[session_id] = module
+            
+            cached = saved.get('cache')
+            if cached is not None:
+                with self.state_changed:
+                    self.cache.setdefault(session_id, cached)
+        
+        logger.info(f"Rehydrated session {session_id}")
+        return module
+    
+    def get_hibernation_stats(self) -> Dict[str, Any]:
+        """Get resident vs. hibernated session counts and rehydration latency.
+        
+        Returns:
+            Dictionary of hibernation statistics
+        """
+        if not self.hibernator:
+            return {'resident_sessions': len(self.sessions), 'hibernated_sessions': 0}
+        return self.hibernator.get_stats(len(self.sessions))
     
     def add_client_to_session(self, session_id: str, client_id: str) -> bool:
         """Add a client to an existing session.
@@ -119,7 +250,7 @@ class SessionManager:
         Returns:
             True if the client was added, False if the session wasn't found
         """
-        if session_id in self.sessions:
+        if self.has_session(session_id):
             if session_id not in self.clients:
                 self.clients[session_id] = set()
             
@@ -165,6 +296,10 @@ class SessionManager:
             logger.warning("Invalid session ID (empty or not a string)")
             return False
         
+        # Hibernated sessions were checked when they were created
+        if self.hibernator and self.hibernator.is_hibernated(session_id):
+            return True
+        
         if session_id not in self.sessions:
             logger.warning(f"Session {session_id} not found")
             return False
@@ -190,6 +325,15 @@ class SessionManager:
         Returns:
             True if the session was ended, False if it wasn't found
         """
+        if self.hibernator and self.hibernator.is_hibernated(session_id):
+            # Hibernated sessions end without being restored (module.end()
+            # is not called)
+            self.hibernator.discard(session_id)
+            self._drop_versioned_state(session_id)
+            self.clients.pop(session_id, None)
+            logger.info(f"Ended hibernated session {session_id}")
+            return True
+        
         if session_id not in self.sessions:
             # Session already gone, consider it ended successfully
             logger.info(f"Session {session_id} already ended")
@@ -208,7 +352,7 @@ class SessionManager:
             
             # Remove from sessions and cache
             self.sessions.pop(session_id, None)
-            self.cache.pop(session_id, None)
+            self._drop_versioned_state(session_id)
             
             # Clear client tracking
             self.clients.pop(session_id, None)
@@ -220,7 +364,7 @@ class SessionManager:
             # Try to clean up anyway to prevent resource leaks
             try:
                 self.sessions.pop(session_id, None)
-                self.cache.pop(session_id, None)
+                self._drop_versioned_state(session_id)
                 self.clients.pop(session_id, None)
             except Exception:
                 pass
@@ -244,6 +388,12 @@ class SessionManager:
                 if idle_time > max_idle_time:
                     idle_sessions.append(session_id)
         
+        # Hibernated sessions were idle since they were hibernated
+        if self.hibernator:
+            for session_id, (hibernated_at, _) in list(self.hibernator.hibernated.items()):
+                if now - hibernated_at + self.hibernator.hibernate_after > max_idle_time:
+                    idle_sessions.append(session_id)
+        
         for session_id in idle_sessions:
             logger.info(f"Cleaning up idle session {session_id}")
             self.end_session(session_id)
@@ -265,17 +415,33 @@ class SessionManager:
                 sessions.append(session_id)
         return sessions
     
-    def update_cache(self, session_id: str, state: Dict[str, Any]) -> None:
+    def update_cache(self, session_id: str, state: Dict[str, Any]) -> int:
         """Update the cache with the latest state.
         
+        The session's version advances only if the state differs from the
+        cached one, and long-poll waiters are woken.
+        
         Args:
             session_id: Session ID
             state: Module state
+            
+        Returns:
+            The session's state version
         """
-        self.cache[session_id] = {
-            'state': state,
-            'timestamp': time.time()
-        }
+        with self.state_changed:
+            entry = self.cache.get(session_id)
+            version = self.versions.get(session_id, 0)
+            if entry is None or entry['state'] != state:
+                version += 1
+                self.versions[session_id] = version
+                self.state_changed.notify_all()
+            
+            self.cache[session_id] = {
+                'state': state,
+                'version': version,
+                'timestamp': time.time()
+            }
+            return version
     
     def get_cached_state(self, session_id: str, max_age: float = 1.0) -> Optional[Dict[str, Any]]:
         """Get cached state if available and recent.
@@ -295,10 +461,80 @@ class SessionManager:
         
         return None
     
+    def get_versioned_state(self, session_id: str,
+                            max_age: Optional[float] = None) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Get the cached state together with its version.
+        
+        Args:
+            session_id: Session ID
+            max_age: Maximum age of cached state in seconds, or None for
+                the last cached state regardless of age
+            
+        Returns:
+            Tuple of (state, version), or None if not available or too old
+        """
+        with self.state_changed:
+            entry = self.cache.get(session_id)
+            if entry is None:
+                return None
+            if max_age is not None and time.time() - entry['timestamp'] > max_age:
+                return None
+            return entry['state'], entry['version']
+    
+    def get_state_version(self, session_id: str) -> int:
+        """Get a session's state version.
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            Version of the cached state (0 if none)
+        """
+        return self.versions.get(session_id, 0)
+    
+    def wait_for_version(self, session_id: str, since: int, timeout: float) -> int:
+        """Block until a session's state version advances past a version.
+        
+        Args:
+            session_id: Session ID
+            since: Version the caller already has
+            timeout: Maximum wait in seconds (capped at MAX_LONG_POLL_WAIT)
+            
+        Returns:
+            The current version (still <= since on timeout or if the session
+            ended)
+        """
+        timeout = max(0.0, min(timeout, MAX_LONG_POLL_WAIT))
+        with self.state_changed:
+            self.state_changed.wait_for(
+                lambda: self.versions.get(session_id, 0) > since or not self.has_session(session_id),
+                timeout)
+            return self.versions.get(session_id, 0)
+    
+    def make_etag(self, session_id: str, version: int) -> str:
+        """Build the ETag of a session state version.
+        
+        Args:
+            session_id: Session ID
+            version: State version
+            
+        Returns:
+            Quoted entity tag
+        """
+        return f'"{self.etag_epoch}-{session_id}-{version}"'
+    
+    def _drop_versioned_state(self, session_id: str) -> None:
+        """Forget a session's cached state and wake its long-poll waiters."""
+        with self.state_changed:
+            self.cache.pop(session_id, None)
+            self.versions.pop(session_id, None)
+            self.state_changed.notify_all()
+    
     def get_active_sessions_count(self) -> int:
         """Get the number of active sessions.
         
         Returns:
-            Number of active sessions
+            Number of active sessions, resident or hibernated
         """
-        return len(self.sessions) 
\ No newline at end of file
+        hibernated = len(self.hibernator.hibernated) if self.hibernator else 0
+        return len(self.sessions) + hibernated 
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Session Recording for MetaMindIQTrain
+
+Records what every session was asked to do, so load tests can replay real
+sessions against the server (tests/benchmarks/replay_sessions.py):
+
+- The log is JSON lines: a header, then one line per session creation
+  (module ID plus the seed and fork of its random number generator), input
+  (click position and the handler's result) and end
+- Each event carries its offset in seconds from the start of the
+  recording, so a replay can keep or scale the original pacing
+
+A session created again with the recorded seed and fork gets the same
+challenges, so replayed inputs meet the same game state.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Header identifying session logs
+LOG_FORMAT = 'metamind-session-log'
+LOG_VERSION = 1
+
+
+class SessionRecorder:
+    """Appends session events to a JSON-lines log.
+
+    Recording is off when no path is given; every record call is then a
+    no-op, so handlers can call the recorder unconditionally.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the recorder.
+
+        Args:
+            path: Log file to write (recording is off if None)
+        """
+        self.path = path
+        self.events = 0
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._file = None
+
+        if path:
+            self._file = open(path, 'w', encoding='utf-8', buffering=1)
+            self._write({'format': LOG_FORMAT, 'version': LOG_VERSION, 'started': time.time()})
+            logger.info(f"Recording sessions to {path}")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether events are being recorded."""
+        return self._file is not None
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """Write one log line."""
+        line = json.dumps(entry, separators=(',', ':'), default=str)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + '\n')
+
+    def record(self, event: str, session_id: str, **fields) -> None:
+        """Record a session event.
+
+        Args:
+            event: Event type ('create', 'input' or 'end')
+            session_id: Session ID
+            **fields: Event data
+        """
+        if self._file is None:
+            return
+        entry = {'t': round(time.perf_counter() - self._start, 6), 'event': event, 'session': session_id}
+        entry.update(fields)
+        self._write(entry)
+        self.events += 1
+
+    def record_create(self, session_id: str, module_id: str, module: Any) -> None:
+        """Record a session creation with the module's seed and fork."""
+        self.record('create', session_id, module_id=module_id,
+                    seed=getattr(module, 'seed', None), fork=getattr(module, 'fork', 0))
+
+    def record_input(self, session_id: str, x: Any, y: Any, result: Any = None) -> None:
+        """Record a click and the result the module returned."""
+        self.record('input', session_id, x=x, y=y, result=result)
+
+    def record_end(self, session_id: str) -> None:
+        """Record the end of a session."""
+        self.record('end', session_id)
+
+    def close(self) -> None:
+        """Stop recording and close the log."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_session_log(path: str) -> List[Dict[str, Any]]:
+    """Read a session log.
+
+    Args:
+        path: Log written by SessionRecorder
+
+    Returns:
+        Recorded sessions in order of creation, each a dictionary with
+        session_id, module_id, seed, fork, start (offset of the creation)
+        and events (the session's input and end events in order); events
+        of sessions created before recording started are skipped
+
+    Raises:
+        ValueError: If the file is not a session log
+    """
+    sessions: Dict[str, Dict[str, Any]] = {}
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline() or '{}')
+        if header.get('format') != LOG_FORMAT or header.get('version') != LOG_VERSION:
+            raise ValueError(f"{path} is not a version {LOG_VERSION} session log")
+
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            session_id = entry.get('session')
+            if entry.get('event') == 'create':
+                sessions[session_id] = {
+                    'session_id': session_id,
+                    'module_id': entry['module_id'],
+                    'seed': entry.get('seed'),
+                    'fork': entry.get('fork', 0),
+                    'start': entry['t'],
+                    'events': []
+                }
+            elif session_id in sessions:
+                sessions[session_id]['events'].append(entry)
+
+    return sorted(sessions.values(), key=lambda session: session['start'])
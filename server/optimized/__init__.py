@@ -5,6 +5,8 @@ This package provides optimized server implementations for the MetaMindIQTrain
 platform, with specialized handlers for different module types.
 """
 
+from MetaMindIQTrain.server.optimized.server import OptimizedServer
+
 # Import the music module loader
 try:
     from MetaMindIQTrain.server.optimized.music_module_loader import (
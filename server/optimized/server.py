@@ -31,7 +31,13 @@ if str(current_dir) not in sys.path:
 
 # Import the base server
 from MetaMindIQTrain.server.base.base_server import BaseServer
-from MetaMindIQTrain.module_registry import get_available_modules, create_module_instance
+from MetaMindIQTrain.server.common.session_http import (
+    SessionStateHandlerMixin, is_long_poll, session_state_response
+)
+from MetaMindIQTrain.server.common.hibernation import DEFAULT_HIBERNATE_AFTER
+from MetaMindIQTrain.server.common.module_pool import DEFAULT_MAX_POOL_SIZE
+from MetaMindIQTrain.server.common.module_input import click_module
+from MetaMindIQTrain.module_registry import get_available_modules
 
 # Try to import WebSocket support
 try:
@@ -60,32 +66,42 @@ if HAS_SOCKETIO:
     sio = socketio.Server(cors_allowed_origins='*', async_mode='threading')
 
 # HTTP request handler with optimizations
-class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
-    """Optimized HTTP request handler with caching and performance improvements."""
+class OptimizedRequestHandler(SessionStateHandlerMixin, http.server.BaseHTTPRequestHandler):
+    """Optimized HTTP request handler with caching and performance improvements.
+    
+    Connections are kept alive (HTTP/1.1) and session state supports
+    conditional GET and long-polling.
+    """
     
     # Class-level cache of common responses
     static_responses = {}
     
-    def _send_response(self, status_code, data, cache_control=None):
+    def _send_response(self, status_code, data, cache_control=None, headers=None):
         """Send a JSON response.
         
         Args:
             status_code: HTTP status code
-            data: Response data to be JSON-encoded
+            data: Response data to be JSON-encoded (or pre-encoded bytes)
             cache_control: Optional cache control header value
+            headers: Optional extra headers
         """
+        response = data if isinstance(data, bytes) else json.dumps(data).encode('utf-8')
+        
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
         
         if cache_control:
             self.send_header('Cache-Control', cache_control)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         
         self.end_headers()
         
-        response = json.dumps(data).encode('utf-8')
         self.wfile.write(response)
         
         # Record the request
@@ -107,6 +123,13 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
         if hasattr(self.server, 'server_instance'):
             self.server.server_instance.metrics_collector.record_error()
     
+    def _endpoint_session(self, endpoint):
+        """Get the session ID in a session endpoint's path, if any."""
+        parts = endpoint.split('/')
+        if len(parts) > 3 and parts[1:3] == ['api', 'session'] and parts[3] != 'create':
+            return parts[3]
+        return None
+    
     def _parse_path(self):
         """Parse the request path.
         
@@ -145,20 +168,13 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
     
     def do_OPTIONS(self):
         """Handle OPTIONS requests for CORS."""
-        # Use cached response if available
-        if 'OPTIONS' in self.static_responses:
-            response = self.static_responses['OPTIONS']
-            self.wfile.write(response)
-            return
-        
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.send_header('Content-Length', '0')
         self.end_headers()
-        
-        # Cache this response for future use
-        self.static_responses['OPTIONS'] = b''
     
     def do_GET(self):
         """Handle GET requests."""
@@ -174,6 +190,7 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
         
         session_manager = server_instance.session_manager
         metrics_collector = server_instance.metrics_collector
+        server_instance.profiler.tag(self._endpoint_session(endpoint))
         
         try:
             # Health check endpoint
@@ -181,21 +198,23 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
                 # Get metrics from collector
                 metrics = metrics_collector.get_all_metrics()
                 metrics['active_sessions'] = server_instance.get_active_sessions_count()
+                metrics['sessions'] = session_manager.get_hibernation_stats()
+                metrics['module_pool'] = server_instance.module_pool.get_stats()
+                metrics['profiler'] = server_instance.profiler.get_stats()
                 metrics['status'] = 'ok'
                 
                 self._send_response(200, metrics, cache_control='no-cache')
             
+            # Sample the server's stacks (opt-in)
+            elif endpoint == '/api/debug/profile':
+                status, data = server_instance.profiler.handle_request(params)
+                self._send_response(status, data, cache_control='no-cache')
+            
             # List available modules
             elif endpoint == '/api/modules':
                 # This rarely changes, so cache the response
                 if 'modules' in self.static_responses:
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.send_header('Cache-Control', 'max-age=3600')
-                    self.end_headers()
-                    self.wfile.write(self.static_responses['modules'])
-                    metrics_collector.record_request()
+                    self._send_response(200, self.static_responses['modules'], cache_control='max-age=3600')
                 else:
                     modules = get_available_modules()
                     response_data = {
@@ -208,49 +227,26 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
                     
                     self._send_response(200, response_data, cache_control='max-age=3600')
             
-            # Get session state
+            # Get session state (conditional or long-poll)
             elif endpoint.startswith('/api/session/'):
                 session_id = endpoint.split('/')[-1]
-                module = session_manager.get_session(session_id)
-                
-                if module:
-                    # Check cache first
-                    cached_state = session_manager.get_cached_state(session_id)
-                    if cached_state:
-                        self._send_response(200, {
-                            'session_id': session_id,
-                            'state': cached_state,
-                            'cached': True
-                        }, cache_control='max-age=1')
-                    else:
-                        state = module.get_state()
-                        
-                        # Update cache
-                        session_manager.update_cache(session_id, state)
-                        
-                        # Update last activity time
-                        if hasattr(module, '__dict__'):
-                            module.last_activity = time.time()
-                        
-                        self._send_response(200, {
-                            'session_id': session_id,
-                            'state': state
-                        })
-                else:
-                    self._send_error(404, f"Session {session_id} not found")
+                self._send_session_state(session_manager, session_id, params)
             
             # Unknown endpoint
             else:
                 self._send_error(404, f"Endpoint {endpoint} not found")
             
-            # Record response time
-            response_time = (time.time() - start_time) * 1000
-            metrics_collector.record_response_time(response_time)
+            # Record response time; long-polls are idle for most of their wait
+            if not is_long_poll(params):
+                response_time = (time.time() - start_time) * 1000
+                metrics_collector.record_response_time(response_time)
         
         except Exception as e:
             logger.error(f"Error handling GET request: {e}")
             self._send_error(500, str(e))
             metrics_collector.record_error()
+        finally:
+            server_instance.profiler.tag(None)
     
     def do_POST(self):
         """Handle POST requests."""
@@ -272,6 +268,7 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
             self._send_error(400, "Invalid JSON body")
             return
         
+        server_instance.profiler.tag(self._endpoint_session(endpoint))
         try:
             # Create a new session
             if endpoint == '/api/session/create':
@@ -280,17 +277,27 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
                     self._send_error(400, "module_id is required")
                     return
                 
-                try:
-                    # Create session using session manager
-                    session_id, module, state = session_manager.create_session(module_id)
-                    
-                    self._send_response(200, {
-                        'session_id': session_id,
-                        'module_id': module_id,
-                        'state': state
-                    })
-                except ValueError as e:
-                    self._send_error(400, str(e))
+                # Take a pre-built module instance from the pool (a new one
+                # when a replay asks for a seed)
+                session_id = str(uuid.uuid4())
+                module = server_instance.module_pool.acquire(module_id, session_id,
+                                                             data.get('seed'), data.get('fork', 0))
+                if not module:
+                    self._send_error(400, f"Failed to create module {module_id}")
+                    return
+                
+                if not session_manager.create_session(session_id, module, self.client_address[0]):
+                    self._send_error(500, f"Failed to create session for module {module_id}")
+                    return
+                server_instance.recorder.record_create(session_id, module_id, module)
+                
+                self._send_response(200, {
+                    'session_id': session_id,
+                    'module_id': module_id,
+                    'seed': getattr(module, 'seed', None),
+                    'fork': getattr(module, 'fork', 0),
+                    'state': module.get_state()
+                })
             
             # Process input for a session
             elif endpoint.startswith('/api/session/') and endpoint.endswith('/input'):
@@ -302,7 +309,8 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
                     x = data.get('x')
                     y = data.get('y')
                     if x is not None and y is not None:
-                        result = module.handle_click(x, y)
+                        result = click_module(module, x, y)
+                        server_instance.recorder.record_input(session_id, x, y, result)
                         state = module.get_state()
                         
                         # Update cache
@@ -326,6 +334,7 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
             elif endpoint.startswith('/api/session/') and endpoint.endswith('/end'):
                 session_id = endpoint.split('/')[-2]
                 if session_manager.end_session(session_id):
+                    server_instance.recorder.record_end(session_id)
                     self._send_response(200, {
                         'session_id': session_id,
                         'status': 'ended'
@@ -345,6 +354,8 @@ class OptimizedRequestHandler(http.server.BaseHTTPRequestHandler):
             logger.error(f"Error handling POST request: {e}")
             self._send_error(500, str(e))
             metrics_collector.record_error()
+        finally:
+            server_instance.profiler.tag(None)
 
 
 # WebSocket event handlers
@@ -406,9 +417,11 @@ if HAS_SOCKETIO:
             # Create session ID
             session_id = str(uuid.uuid4())
             
-            # Create module instance - no extra parameters
+            # Take a pre-built module instance from the pool (a new one
+            # when a replay asks for a seed)
             try:
-                module = create_module_instance(module_id)
+                module = sio.server_instance.module_pool.acquire(module_id, session_id,
+                                                                 data.get('seed'), data.get('fork', 0))
             except Exception as e:
                 logger.error(f"Error creating module: {e}")
                 return {
@@ -424,6 +437,7 @@ if HAS_SOCKETIO:
             # Store session data
             session_manager = sio.server_instance.session_manager
             session_manager.create_session(session_id, module, client_id)
+            sio.server_instance.recorder.record_create(session_id, module_id, module)
             
             # Add client to session
             if hasattr(sio, 'clients'):
@@ -435,6 +449,8 @@ if HAS_SOCKETIO:
             return {
                 'session_id': session_id,
                 'module_id': module_id,
+                'seed': getattr(module, 'seed', None),
+                'fork': getattr(module, 'fork', 0),
                 'state': module.get_state()
             }
         except Exception as e:
@@ -457,6 +473,7 @@ if HAS_SOCKETIO:
             if not session_id:
                 sio.server_instance.metrics_collector.record_error()
                 return {'error': 'session_id is required'}
+            sio.server_instance.profiler.tag(session_id)
             
             session_manager = sio.server_instance.session_manager
             
@@ -492,6 +509,8 @@ if HAS_SOCKETIO:
             logger.error(f"Error getting state: {e}")
             sio.server_instance.metrics_collector.record_error()
             return {'error': str(e)}
+        finally:
+            sio.server_instance.profiler.tag(None)
     
     @sio.event
     def process_input(sid, data):
@@ -515,13 +534,15 @@ if HAS_SOCKETIO:
             if x is None or y is None:
                 sio.server_instance.metrics_collector.record_error()
                 return {'error': 'x and y coordinates are required'}
+            sio.server_instance.profiler.tag(session_id)
             
             session_manager = sio.server_instance.session_manager
             module = session_manager.get_session(session_id)
             
             if module:
                 # Process the click
-                result = module.handle_click(x, y)
+                result = click_module(module, x, y)
+                sio.server_instance.recorder.record_input(session_id, x, y, result)
                 
                 # Get updated state
                 state = module.get_state()
@@ -549,6 +570,8 @@ if HAS_SOCKETIO:
             logger.error(f"Error processing input: {e}")
             sio.server_instance.metrics_collector.record_error()
             return {'error': str(e)}
+        finally:
+            sio.server_instance.profiler.tag(None)
     
     @sio.event
     def end_session(sid, data):
@@ -568,6 +591,8 @@ if HAS_SOCKETIO:
             session_manager = sio.server_instance.session_manager
             
             if session_manager.end_session(session_id):
+                sio.server_instance.recorder.record_end(session_id)
+                
                 # If the client is associated with this session, remove the association
                 if hasattr(sio, 'clients') and sid in sio.clients and sio.clients[sid] == session_id:
                     sio.clients[sid] = None
@@ -583,6 +608,17 @@ if HAS_SOCKETIO:
             logger.error(f"Error ending session: {e}")
             sio.server_instance.metrics_collector.record_error()
             return {'error': str(e)}
+    
+    @sio.event
+    def debug_profile(sid, data=None):
+        """Sample the server's stacks for data['seconds'] seconds (opt-in)."""
+        if not hasattr(sio, 'server_instance'):
+            return {'error': 'Server instance not available'}
+        
+        sio.server_instance.metrics_collector.record_websocket_event()
+        
+        _, response = sio.server_instance.profiler.handle_request(data or {})
+        return response
 
 
 # Flask routes (if Flask is available)
@@ -604,10 +640,24 @@ if HAS_FLASK:
         # Get metrics from collector
         metrics = server_instance.metrics_collector.get_all_metrics()
         metrics['active_sessions'] = server_instance.get_active_sessions_count()
+        metrics['sessions'] = server_instance.session_manager.get_hibernation_stats()
+        metrics['module_pool'] = server_instance.module_pool.get_stats()
+        metrics['profiler'] = server_instance.profiler.get_stats()
         metrics['status'] = 'ok'
         
         return jsonify(metrics)
     
+    @app.route('/api/debug/profile')
+    def debug_profile():
+        """Sample the server's stacks for ?seconds=N (opt-in)."""
+        server_instance = app.server_instance
+        
+        if not server_instance:
+            return jsonify({'error': 'Server instance not available'}), 500
+        
+        status, data = server_instance.profiler.handle_request(request.args)
+        return jsonify(data), status
+    
     @app.route('/api/modules')
     def get_modules():
         """Get available modules."""
@@ -651,9 +701,10 @@ if HAS_FLASK:
             # Create session ID
             session_id = str(uuid.uuid4())
             
-            # Create module instance - no extra parameters
+            # Take a pre-built module instance from the pool
             try:
-                module = create_module_instance(module_id)
+                module = server_instance.module_pool.acquire(module_id, session_id,
+                                                             data.get('seed'), data.get('fork', 0))
             except Exception as e:
                 logger.error(f"Error creating module: {e}")
                 server_instance.metrics_collector.record_error()
@@ -666,6 +717,7 @@ if HAS_FLASK:
             # Store session data
             session_manager = server_instance.session_manager
             session_manager.create_session(session_id, module, request.remote_addr)
+            server_instance.recorder.record_create(session_id, module_id, module)
             
             logger.info(f"Created session {session_id} for module {module_id}")
             
@@ -678,6 +730,8 @@ if HAS_FLASK:
             return jsonify({
                 'session_id': session_id,
                 'module_id': module_id,
+                'seed': getattr(module, 'seed', None),
+                'fork': getattr(module, 'fork', 0),
                 'state': module.get_state()
             })
         except Exception as e:
@@ -686,7 +740,11 @@ if HAS_FLASK:
     
     @app.route('/api/session/<session_id>')
     def get_session_state(session_id):
-        """Get the state of a session."""
+        """Get the state of a session.
+        
+        Supports If-None-Match (304 while the version is unchanged) and
+        long-polling with ?since=<version>&wait=<ms>.
+        """
         # Get server instance
         server_instance = app.server_instance
         
@@ -695,39 +753,20 @@ if HAS_FLASK:
         
         # Record request
         server_instance.metrics_collector.record_request()
+        server_instance.profiler.tag(session_id)
         
-        session_manager = server_instance.session_manager
-        
-        # Check cache first
-        cached_state = session_manager.get_cached_state(session_id)
-        if cached_state:
-            response = jsonify({
-                'session_id': session_id,
-                'state': cached_state,
-                'cached': True
-            })
-            response.headers['Cache-Control'] = 'max-age=1'
-            return response
-        
-        # Get from session manager
-        module = session_manager.get_session(session_id)
-        if module:
-            state = module.get_state()
-            
-            # Update cache
-            session_manager.update_cache(session_id, state)
-            
-            # Update last activity time
-            if hasattr(module, '__dict__'):
-                module.last_activity = time.time()
-            
-            return jsonify({
-                'session_id': session_id,
-                'state': state
-            })
-        else:
+        try:
+            status, headers, body = session_state_response(server_instance.session_manager, session_id,
+                                                           request.args, request.headers.get('If-None-Match'))
+        finally:
+            server_instance.profiler.tag(None)
+        if status >= 400:
             server_instance.metrics_collector.record_error()
-            return jsonify({'error': f"Session {session_id} not found"}), 404
+        
+        response = jsonify(body) if body is not None else app.response_class()
+        response.status_code = status
+        response.headers.update(headers)
+        return response
     
     @app.route('/api/session/<session_id>/input', methods=['POST'])
     def process_input(session_id):
@@ -742,6 +781,7 @@ if HAS_FLASK:
         
         # Record request
         server_instance.metrics_collector.record_request()
+        server_instance.profiler.tag(session_id)
         
         try:
             data = request.get_json()
@@ -756,7 +796,8 @@ if HAS_FLASK:
             
             if module:
                 # Process the click
-                result = module.handle_click(x, y)
+                result = click_module(module, x, y)
+                server_instance.recorder.record_input(session_id, x, y, result)
                 
                 # Get updated state
                 state = module.get_state()
@@ -784,6 +825,8 @@ if HAS_FLASK:
             logger.error(f"Error processing input: {e}")
             server_instance.metrics_collector.record_error()
             return jsonify({'error': str(e)}), 500
+        finally:
+            server_instance.profiler.tag(None)
     
     @app.route('/api/session/<session_id>/end', methods=['POST'])
     def end_session(session_id):
@@ -800,6 +843,7 @@ if HAS_FLASK:
         session_manager = server_instance.session_manager
         
         if session_manager.end_session(session_id):
+            server_instance.recorder.record_end(session_id)
             return jsonify({
                 'session_id': session_id,
                 'status': 'ended'
@@ -818,7 +862,10 @@ class OptimizedServer(BaseServer):
     """
     
     def __init__(self, host: str = '0.0.0.0', port: int = 8080, debug: bool = False,
-                 use_flask: bool = True, use_websocket: bool = True):
+                 use_flask: bool = True, use_websocket: bool = True,
+                 hibernate_after: float = DEFAULT_HIBERNATE_AFTER,
+                 pool_size: int = DEFAULT_MAX_POOL_SIZE, record_path: Optional[str] = None,
+                 enable_profiler: bool = False):
         """Initialize the optimized server.
         
         Args:
@@ -827,8 +874,12 @@ class OptimizedServer(BaseServer):
             debug: Enable debug mode
             use_flask: Use Flask if available
             use_websocket: Use WebSocket if available
+            hibernate_after: Idle seconds before a session is hibernated (0 disables)
+            pool_size: Pre-built module instances kept per module type (0 disables)
+            record_path: Log file recording sessions for replay (none if None)
+            enable_profiler: Serve /api/debug/profile and the debug_profile event
         """
-        super().__init__(host, port, debug)
+        super().__init__(host, port, debug, hibernate_after, pool_size, record_path, enable_profiler)
         
         self.use_flask = use_flask and HAS_FLASK
         self.use_websocket = use_websocket and HAS_SOCKETIO
@@ -925,7 +976,9 @@ class OptimizedServer(BaseServer):
             self.socket_server = None
 
 
-def run_server(host='0.0.0.0', port=8080, debug=False, use_flask=True, use_websocket=True):
+def run_server(host='0.0.0.0', port=8080, debug=False, use_flask=True, use_websocket=True,
+               hibernate_after=DEFAULT_HIBERNATE_AFTER, pool_size=DEFAULT_MAX_POOL_SIZE,
+               record_path=None, enable_profiler=False):
     """Run the optimized server.
     
     Args:
@@ -934,6 +987,10 @@ def run_server(host='0.0.0.0', port=8080, debug=False, use_flask=True, use_webso
         debug: Enable debug mode
         use_flask: Use Flask if available
         use_websocket: Use WebSocket if available
+        hibernate_after: Idle seconds before a session is hibernated (0 disables)
+        pool_size: Pre-built module instances kept per module type (0 disables)
+        record_path: Log file recording sessions for replay (none if None)
+        enable_profiler: Serve /api/debug/profile and the debug_profile event
         
     Returns:
         0 on success, non-zero on error
@@ -944,7 +1001,11 @@ def run_server(host='0.0.0.0', port=8080, debug=False, use_flask=True, use_webso
             port=port,
             debug=debug,
             use_flask=use_flask,
-            use_websocket=use_websocket
+            use_websocket=use_websocket,
+            hibernate_after=hibernate_after,
+            pool_size=pool_size,
+            record_path=record_path,
+            enable_profiler=enable_profiler
         )
         server.start()
         return 0
@@ -961,6 +1022,14 @@ if __name__ == '__main__':
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
     parser.add_argument('--no-flask', action='store_true', help='Do not use Flask even if available')
     parser.add_argument('--no-websocket', action='store_true', help='Do not use WebSocket even if available')
+    parser.add_argument('--hibernate-after', type=float, default=DEFAULT_HIBERNATE_AFTER,
+                        help='Idle seconds before a session is hibernated to disk (0 disables)')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_MAX_POOL_SIZE,
+                        help='Pre-built module instances kept per module type (0 disables)')
+    parser.add_argument('--record', metavar='PATH',
+                        help='Record sessions to PATH for tests/benchmarks/replay_sessions.py')
+    parser.add_argument('--enable-profiler', action='store_true',
+                        help='Serve stack-sampling profiles at /api/debug/profile?seconds=N')
     
     args = parser.parse_args()
     
@@ -969,5 +1038,9 @@ if __name__ == '__main__':
         port=args.port,
         debug=args.debug,
         use_flask=not args.no_flask,
-        use_websocket=not args.no_websocket
+        use_websocket=not args.no_websocket,
+        hibernate_after=args.hibernate_after,
+        pool_size=args.pool_size,
+        record_path=args.record,
+        enable_profiler=args.enable_profiler
     )) 
\ No newline at end of file
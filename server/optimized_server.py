@@ -28,8 +28,13 @@ except ImportError:
     HAS_SOCKETIO = False
     
 from MetaMindIQTrain.module_registry import (
-    get_available_modules, get_module_info, create_module_instance
+    get_available_modules, get_module_info
 )
+from MetaMindIQTrain.server.common.broadcast import SessionBroadcaster, DEFAULT_OBSERVER_INTERVAL
+from MetaMindIQTrain.server.common.metrics import MetricsCollector
+from MetaMindIQTrain.server.common.hibernation import SessionHibernator, DEFAULT_HIBERNATE_AFTER
+from MetaMindIQTrain.server.common.module_pool import ModulePool, DEFAULT_MAX_POOL_SIZE
+from MetaMindIQTrain.server.common.module_input import click_module
 
 # Configure logging
 logging.basicConfig(
@@ -41,13 +46,18 @@ logger = logging.getLogger(__name__)
 class MetaMindServer:
     """Optimized server for MetaMindIQTrain."""
     
-    def __init__(self, host='0.0.0.0', port=5000, debug=False):
+    def __init__(self, host='0.0.0.0', port=5000, debug=False, hibernate_after=DEFAULT_HIBERNATE_AFTER,
+                 pool_size=DEFAULT_MAX_POOL_SIZE):
         """Initialize the server.
         
         Args:
             host: Host to bind to
             port: Port to listen on
             debug: Whether to run in debug mode
+            hibernate_after: Idle seconds before a session's module is
+                hibernated to disk (0 keeps every module in memory)
+            pool_size: Pre-built module instances kept per module type (0
+                builds every instance on request)
         """
         self.host = host
         self.port = port
@@ -57,6 +67,9 @@ class MetaMindServer:
         self.app = Flask(__name__)
         CORS(self.app)
         
+        # Emit and fan-out metrics
+        self.metrics_collector = MetricsCollector()
+        
         # Configure SocketIO (if available)
         if HAS_SOCKETIO:
             self.sio = socketio.Server(
@@ -64,16 +77,23 @@ class MetaMindServer:
                 async_mode='eventlet'
             )
             self.app = socketio.WSGIApp(self.sio, self.app)
+            self.broadcaster = SessionBroadcaster(self.sio, self.metrics_collector)
             self._setup_socketio_events()
         else:
             self.sio = None
+            self.broadcaster = None
             logger.warning("SocketIO is not available. Using Flask only.")
             
         # Set up Flask routes
         self._setup_routes()
         
-        # Active sessions
+        # Active sessions; a hibernated session keeps its entry with
+        # module None until its next request
         self.sessions = {}
+        self.hibernator = SessionHibernator(hibernate_after=hibernate_after) if hibernate_after else None
+        
+        # Pre-built module instances for session creation
+        self.module_pool = ModulePool(max_size=pool_size)
         
         # Connected clients
         self.clients = {}
@@ -100,6 +120,13 @@ class MetaMindServer:
                 return jsonify({'module': module_info})
             else:
                 return jsonify({'error': f'Module {module_id} not found'}), 404
+        
+        @self.app.route('/api/sessions/stats', methods=['GET'])
+        def get_session_stats():
+            """Return session counts and module pool statistics."""
+            stats = self.get_session_stats()
+            stats['module_pool'] = self.module_pool.get_stats()
+            return jsonify(stats)
                 
         @self.app.route('/api/session/create', methods=['POST'])
         def create_session():
@@ -118,8 +145,8 @@ class MetaMindServer:
                 # Create session ID
                 session_id = str(uuid.uuid4())
                 
-                # Create module instance
-                module = create_module_instance(module_id, session_id=session_id)
+                # Take a pre-built module instance from the pool
+                module = self.module_pool.acquire(module_id, session_id)
                 if not module:
                     return jsonify({'error': f'Failed to create module {module_id}'}), 500
                 
@@ -159,7 +186,7 @@ class MetaMindServer:
                 
             try:
                 # Get module from session
-                module = self.sessions[session_id]['module']
+                module = self._get_module(session_id)
                 
                 # Update last activity
                 self.sessions[session_id]['last_activity'] = time.time()
@@ -185,7 +212,7 @@ class MetaMindServer:
                 
             try:
                 # Get module from session
-                module = self.sessions[session_id]['module']
+                module = self._get_module(session_id)
                 
                 # Update last activity
                 self.sessions[session_id]['last_activity'] = time.time()
@@ -194,7 +221,7 @@ class MetaMindServer:
                 # For click events
                 if 'click' in data:
                     x, y = data['click']
-                    result = module.handle_click(x, y)
+                    result = click_module(module, x, y)
                 else:
                     # Unknown input type
                     return jsonify({'error': 'Unknown input type'}), 400
@@ -219,7 +246,9 @@ class MetaMindServer:
                 
             try:
                 # Remove session
-                del self.sessions[session_id]
+                self._remove_session(session_id)
+                if self.broadcaster:
+                    self.broadcaster.close(session_id)
                 
                 # Update client records
                 for client_id, client in list(self.clients.items()):
@@ -259,6 +288,8 @@ class MetaMindServer:
                 if session_id in self.sessions:
                     # Remove client from session
                     self.sessions[session_id]['clients'].discard(sid)
+                    self.sessions[session_id].get('observers', set()).discard(sid)
+                    self.broadcaster.leave(sid)
                     
                     # If session has no clients, remove it after a delay
                     if not self.sessions[session_id]['clients']:
@@ -293,8 +324,8 @@ class MetaMindServer:
                 # Create session ID
                 session_id = str(uuid.uuid4())
                 
-                # Create module instance
-                module = create_module_instance(module_id, session_id=session_id)
+                # Take a pre-built module instance from the pool
+                module = self.module_pool.acquire(module_id, session_id)
                 if not module:
                     self.sio.emit('error', {
                         'message': f'Failed to create module {module_id}'
@@ -305,9 +336,11 @@ class MetaMindServer:
                 self.sessions[session_id] = {
                     'module': module,
                     'clients': set([sid]),
+                    'observers': set(),
                     'created_time': time.time(),
                     'last_activity': time.time()
                 }
+                self.broadcaster.join(sid, session_id)
                 
                 # Update client record
                 self.clients[sid]['session_id'] = session_id
@@ -331,6 +364,44 @@ class MetaMindServer:
                 self.sio.emit('error', {
                     'message': f'Internal server error: {str(e)}'
                 }, room=sid)
+        
+        @self.sio.event
+        def join_session(sid, data):
+            """Join an existing session as a participant or observer.
+            
+            Observers (role 'observer', e.g. a coach view) receive updates at
+            most every update_interval seconds.
+            """
+            session_id = (data or {}).get('session_id')
+            session = self.sessions.get(session_id)
+            if not session:
+                self.sio.emit('error', {
+                    'message': f'Session {session_id} not found'
+                }, room=sid)
+                return
+            
+            role = data.get('role', 'participant')
+            interval = data.get('update_interval', DEFAULT_OBSERVER_INTERVAL if role == 'observer' else 0.0)
+            
+            session['clients'].add(sid)
+            if role == 'observer':
+                session.setdefault('observers', set()).add(sid)
+            session.pop('orphaned', None)
+            self.broadcaster.join(sid, session_id, interval)
+            
+            client = self.clients.setdefault(sid, {})
+            client['session_id'] = session_id
+            client['user_id'] = data.get('user_id', 'anonymous')
+            client['last_activity'] = time.time()
+            
+            self.broadcaster.send(sid, 'session_joined', {
+                'session_id': session_id,
+                'role': role,
+                'update_interval': interval,
+                'state': session.get('last_state') or self._get_module(session_id).get_state()
+            })
+            
+            logger.info(f"Client {sid} joined session {session_id} as {role}")
                 
         @self.sio.event
         def handle_input(sid, data):
@@ -358,7 +429,7 @@ class MetaMindServer:
                 
             try:
                 # Get module from session
-                module = self.sessions[session_id]['module']
+                module = self._get_module(session_id)
                 
                 # Update last activity
                 self.sessions[session_id]['last_activity'] = time.time()
@@ -367,7 +438,7 @@ class MetaMindServer:
                 # For click events
                 if 'click' in data:
                     x, y = data['click']
-                    result = module.handle_click(x, y)
+                    result = click_module(module, x, y)
                 else:
                     # Unknown input type
                     self.sio.emit('error', {
@@ -378,12 +449,11 @@ class MetaMindServer:
                 # Get updated state
                 state = module.get_state()
                 
-                # Send update to all clients in session
-                for client_sid in self.sessions[session_id]['clients']:
-                    self.sio.emit('state_update', {
-                        'state': state,
-                        'result': result
-                    }, room=client_sid)
+                # Send update to all clients in session, observers included
+                self.broadcaster.broadcast(session_id, 'state_update', {
+                    'state': state,
+                    'result': result
+                }, force=True)
                 
             except Exception as e:
                 logger.error(f"Error handling input: {e}")
@@ -411,17 +481,18 @@ class MetaMindServer:
                 
             try:
                 # Notify all clients in session
+                self.broadcaster.broadcast(session_id, 'session_ended', {
+                    'session_id': session_id
+                }, force=True)
+                
                 for client_sid in self.sessions[session_id]['clients']:
-                    self.sio.emit('session_ended', {
-                        'session_id': session_id
-                    }, room=client_sid)
-                    
                     # Update client record
                     if client_sid in self.clients:
                         self.clients[client_sid]['session_id'] = None
                 
                 # Remove session
-                del self.sessions[session_id]
+                self.broadcaster.close(session_id)
+                self._remove_session(session_id)
                 
                 logger.info(f"Ended session {session_id}")
                 
@@ -434,9 +505,15 @@ class MetaMindServer:
     def run(self):
         """Run the server."""
         if HAS_SOCKETIO:
-            # Use eventlet server with WebSocket support
+            # Use eventlet server with WebSocket support (patched before
+            # the pool's refill thread starts)
             eventlet.monkey_patch()
-            
+        
+        if self.module_pool.max_size > 0:
+            self.module_pool.warm(module['id'] for module in get_available_modules())
+            self.module_pool.start()
+        
+        if HAS_SOCKETIO:
             # Start background task for periodic updates
             eventlet.spawn(self._update_task)
             
@@ -480,11 +557,13 @@ class MetaMindServer:
         Args:
             dt: Time delta since last update.
         """
+        current_time = time.time()
+        
         for session_id, session in list(self.sessions.items()):
             module = session['module']
             
-            # Skip orphaned sessions
-            if session.get('orphaned', False):
+            # Skip orphaned and hibernated sessions
+            if session.get('orphaned', False) or session.get('hibernated', False):
                 continue
                 
             # Skip inactive sessions
@@ -505,17 +584,20 @@ class MetaMindServer:
                         # Store new state
                         session['last_state'] = current_state
                         
-                        # Send update to all clients in session
-                        for client_sid in session['clients']:
-                            self.sio.emit('state_update', {
-                                'state': current_state
-                            }, room=client_sid)
+                        # Serialize once and send to every room that is due
+                        self.broadcaster.broadcast(session_id, 'state_update', {
+                            'state': current_state
+                        })
                             
             except Exception as e:
                 logger.error(f"Error updating module {session_id}: {e}")
+        
+        # Observer rooms that skipped a change get its latest state once due
+        self.broadcaster.flush()
+        self.metrics_collector.end_tick()
     
     def _cleanup_sessions(self):
-        """Clean up orphaned sessions."""
+        """Clean up orphaned sessions and hibernate idle ones."""
         current_time = time.time()
         
         # Remove orphaned sessions after timeout
@@ -523,7 +605,76 @@ class MetaMindServer:
             if session.get('orphaned', False):
                 if current_time - session['orphaned_time'] > 300:  # 5 minute timeout
                     logger.info(f"Removing orphaned session {session_id}")
-                    del self.sessions[session_id]
+                    if self.broadcaster:
+                        self.broadcaster.close(session_id)
+                    self._remove_session(session_id)
+                    continue
+            
+            # Orphaned sessions wait for a reconnect on disk
+            if self.hibernator and not session.get('hibernated', False) and (
+                    session.get('orphaned', False)
+                    or self.hibernator.is_idle(session['last_activity'], current_time)):
+                self._hibernate_session(session_id)
+    
+    def _hibernate_session(self, session_id):
+        """Write a session's module to disk and drop it from memory.
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            True if the session was hibernated
+        """
+        session = self.sessions[session_id]
+        saved = {'last_state': session.get('last_state')}
+        if not self.hibernator.hibernate(session_id, session['module'], saved=saved):
+            return False
+        
+        session['module'] = None
+        session['hibernated'] = True
+        session.pop('last_state', None)
+        logger.info(f"Hibernated idle session {session_id}")
+        return True
+    
+    def _get_module(self, session_id):
+        """Get a session's module, rehydrating it if it is hibernated.
+        
+        Args:
+            session_id: Session ID
+            
+        Returns:
+            The module instance
+        """
+        session = self.sessions[session_id]
+        if session.get('hibernated', False):
+            module, saved, _ = self.hibernator.rehydrate(session_id)
+            session['module'] = module
+            session['hibernated'] = False
+            if saved.get('last_state') is not None:
+                session['last_state'] = saved['last_state']
+            logger.info(f"Rehydrated session {session_id}")
+        return session['module']
+    
+    def _remove_session(self, session_id):
+        """Remove a session and its hibernation record.
+        
+        Args:
+            session_id: Session ID
+        """
+        self.sessions.pop(session_id, None)
+        if self.hibernator:
+            self.hibernator.discard(session_id)
+    
+    def get_session_stats(self):
+        """Get resident vs. hibernated session counts and rehydration latency.
+        
+        Returns:
+            Dictionary of session statistics
+        """
+        resident = sum(1 for session in self.sessions.values() if not session.get('hibernated', False))
+        if not self.hibernator:
+            return {'resident_sessions': resident, 'hibernated_sessions': 0}
+        return self.hibernator.get_stats(resident)
 
 
 def main():
@@ -532,13 +683,19 @@ def main():
     parser.add_argument('--host', default='0.0.0.0', help='Host to bind to')
     parser.add_argument('--port', type=int, default=5000, help='Port to listen on')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--hibernate-after', type=float, default=DEFAULT_HIBERNATE_AFTER,
+                        help='Idle seconds before a session is hibernated to disk (0 disables)')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_MAX_POOL_SIZE,
+                        help='Pre-built module instances kept per module type (0 disables)')
     
     args = parser.parse_args()
     
     server = MetaMindServer(
         host=args.host,
         port=args.port,
-        debug=args.debug
+        debug=args.debug,
+        hibernate_after=args.hibernate_after,
+        pool_size=args.pool_size
     )
     
     server.run()
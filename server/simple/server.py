@@ -24,6 +24,8 @@ if str(current_dir) not in sys.path:
 
 # Import base server
 from MetaMindIQTrain.server.base.base_server import BaseServer
+from MetaMindIQTrain.server.common.session_http import SessionStateHandlerMixin, is_long_poll
+from MetaMindIQTrain.server.common.module_input import click_module
 from MetaMindIQTrain.module_registry import get_available_modules
 
 # Configure logging
@@ -31,27 +33,34 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class SimpleRequestHandler(http.server.BaseHTTPRequestHandler):
+class SimpleRequestHandler(SessionStateHandlerMixin, http.server.BaseHTTPRequestHandler):
     """HTTP request handler for the simple MetaMindIQTrain server.
     
     This handler processes HTTP requests and interacts with training modules.
+    Connections are kept alive (HTTP/1.1) between requests.
     """
     
-    def _send_response(self, status_code, data):
+    def _send_response(self, status_code, data, headers=None):
         """Send a JSON response.
         
         Args:
             status_code: HTTP status code
             data: Response data to be JSON-encoded
+            headers: Optional extra headers
         """
+        response = json.dumps(data).encode('utf-8')
+        
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
         
-        response = json.dumps(data).encode('utf-8')
         self.wfile.write(response)
         
         # Record the request
@@ -114,7 +123,8 @@ class SimpleRequestHandler(http.server.BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def do_GET(self):
@@ -156,7 +166,7 @@ class SimpleRequestHandler(http.server.BaseHTTPRequestHandler):
                     'modules': modules
                 })
             
-            # Get session state
+            # Get session state (conditional or long-poll)
             elif endpoint.startswith('/api/session/'):
                 session_id = endpoint.split('/')[-1]
                 
@@ -164,43 +174,13 @@ class SimpleRequestHandler(http.server.BaseHTTPRequestHandler):
                 server_instance = self.server.server_instance if hasattr(self.server, 'server_instance') else None
                 
                 if server_instance:
-                    session_manager = server_instance.session_manager
+                    self._send_session_state(server_instance.session_manager, session_id, params)
                     
-                    # Check cache first
-                    cached_state = session_manager.get_cached_state(session_id)
-                    if cached_state:
-                        self._send_response(200, {
-                            'session_id': session_id,
-                            'state': cached_state,
-                            'cached': True
-                        })
-                        
-                        # Record response time
+                    # Record response time; long-polls are idle for most of their wait
+                    if not is_long_poll(params):
                         response_time = (time.time() - start_time) * 1000
                         server_instance.metrics_collector.record_response_time(response_time)
-                        return
-                    
-                    # Get from session manager
-                    module = session_manager.get_session(session_id)
-                    if module:
-                        state = module.get_state()
-                        
-                        # Update cache
-                        session_manager.update_cache(session_id, state)
-                        
-                        # Update last activity time
-                        if hasattr(module, '__dict__'):
-                            module.last_activity = time.time()
-                        
-                        self._send_response(200, {
-                            'session_id': session_id,
-                            'state': state
-                        })
-                        
-                        # Record response time
-                        response_time = (time.time() - start_time) * 1000
-                        server_instance.metrics_collector.record_response_time(response_time)
-                        return
+                    return
                 
                 self._send_error(404, f"Session {session_id} not found")
             
@@ -268,7 +248,7 @@ class SimpleRequestHandler(http.server.BaseHTTPRequestHandler):
                     x = data.get('x')
                     y = data.get('y')
                     if x is not None and y is not None:
-                        result = module.handle_click(x, y)
+                        result = click_module(module, x, y)
                         state = module.get_state()
                         
                         # Update cache
@@ -9,7 +9,8 @@ the changes between states rather than the full state each time.
 Key features:
 - Delta encoding for minimal network traffic
 - Compression for further bandwidth reduction
-- Automatic reconnection and state recovery
+- Resumable reconnects from a ring of recent versions per session
+- Checksum verification instead of periodic full states
 - Performance metrics tracking
 """
 
@@ -21,6 +22,29 @@ from typing import Dict, Any, List, Optional, Callable, Set, Tuple
 import zlib
 import base64
 
+from MetaMindIQTrain.core.state_patch import (
+    apply_patch, compute_delta, merge_deltas, state_checksum, SnapshotRing, SNAPSHOT_RING_SIZE
+)
+from MetaMindIQTrain.core.compression_dictionary import (
+    CompressionDictionary, DictionaryRegistry, get_dictionary_registry
+)
+from MetaMindIQTrain.core.stream_codec import StreamCodec
+from MetaMindIQTrain.server.common.broadcast import SessionBroadcaster, DEFAULT_OBSERVER_INTERVAL
+from MetaMindIQTrain.server.common.metrics import MetricsCollector
+from MetaMindIQTrain.server.common.module_input import click_module
+
+# With a preset dictionary even small messages compress well
+DICTIONARY_COMPRESSION_THRESHOLD = 64
+
+# On a connection stream messages also match everything sent before
+STREAM_COMPRESSION_THRESHOLD = 32
+
+# Deltas carry a checksum of the resulting state every N updates
+CHECKSUM_INTERVAL = 20
+
+# Seconds a disconnected client's session is kept for it to resume
+RESUME_GRACE_PERIOD = 30.0
+
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -33,17 +57,41 @@ class StateSynchronizer:
     Uses delta encoding and compression for minimal network traffic.
     """
     
-    def __init__(self, compression_threshold=512, send_full_state_interval=20):
+    def __init__(self, compression_threshold=512, send_full_state_interval=None,
+                 dictionary_threshold=DICTIONARY_COMPRESSION_THRESHOLD,
+                 dictionary_registry: Optional[DictionaryRegistry] = None,
+                 streaming_compression=True, stream_threshold=STREAM_COMPRESSION_THRESHOLD,
+                 checksum_interval=CHECKSUM_INTERVAL, snapshot_ring_size=SNAPSHOT_RING_SIZE):
         """
         Initialize the state synchronizer.
         
         Args:
             compression_threshold: Minimum size in bytes to apply compression
-            send_full_state_interval: Send full state every N updates to prevent drift
+            send_full_state_interval: Send full state every N updates, or None
+                to rely on checksum verification (clients request a full
+                state only when their checksum does not match)
+            dictionary_threshold: Minimum size in bytes to apply compression
+                for clients with a negotiated preset dictionary
+            dictionary_registry: Registry of preset dictionaries (defaults to
+                the shared registry)
+            streaming_compression: Allow clients that ask for it (see
+                register_client) to keep one zlib stream for the lifetime of
+                the connection instead of compressing each message on its own
+            stream_threshold: Minimum size in bytes to compress onto a stream
+            checksum_interval: Add a state checksum to every Nth delta (0 to
+                disable)
+            snapshot_ring_size: Versions kept per session for resuming clients
         """
-        self.clients = {}  # client_id -> {state, version, last_sync_time}
+        self.clients = {}  # client_id -> {state, version, last_sync_time, dictionary, codec, session_id}
+        self.session_rings: Dict[str, SnapshotRing] = {}  # session_id -> recent versions
         self.compression_threshold = compression_threshold
         self.send_full_state_interval = send_full_state_interval
+        self.dictionary_threshold = dictionary_threshold
+        self.dictionary_registry = dictionary_registry
+        self.streaming_compression = streaming_compression
+        self.stream_threshold = stream_threshold
+        self.checksum_interval = checksum_interval
+        self.snapshot_ring_size = snapshot_ring_size
         
         # Statistics
         self.stats = {
@@ -51,25 +99,100 @@ class StateSynchronizer:
             'delta_updates': 0,
             'full_updates': 0,
             'compressed_updates': 0,
+            'dictionary_updates': 0,
+            'streamed_updates': 0,
+            'stream_resets': 0,
+            'checksums_sent': 0,
+            'resumed_clients': 0,
+            'resume_misses': 0,
             'bytes_sent': 0,
             'bytes_saved': 0,
             'compression_ratio': 0
         }
     
-    def register_client(self, client_id: str) -> None:
+    def register_client(self, client_id: str, session_id: Optional[str] = None,
+                        last_version: int = 0, streaming: bool = False) -> bool:
         """
         Register a new client for state synchronization.
         
         Args:
             client_id: Unique client identifier
+            session_id: Session the client follows, if already known
+            last_version: Last state version a reconnecting client holds
+            streaming: The client can decode streamed messages; it gets a
+                compression stream if streaming compression is allowed
+            
+        Returns:
+            True if the client resumes from last_version, False if it will
+            receive a full state
         """
         self.clients[client_id] = {
             'state': {},
             'version': 0,
             'last_sync_time': time.time(),
-            'update_count': 0
+            'update_count': 0,
+            'dictionary': None,
+            'codec': StreamCodec() if self.streaming_compression and streaming else None,
+            'session_id': None
         }
         logger.debug(f"Registered client {client_id}")
+        
+        if session_id is not None:
+            self.attach_session(client_id, session_id)
+            if last_version:
+                return self.resume_client(client_id, last_version)
+        return False
+    
+    def attach_session(self, client_id: str, session_id: str) -> None:
+        """
+        Record the versions sent to a client in its session's snapshot ring.
+        
+        Args:
+            client_id: Client identifier
+            session_id: Session identifier
+        """
+        if client_id not in self.clients:
+            self.register_client(client_id)
+            
+        self.clients[client_id]['session_id'] = session_id
+        if session_id not in self.session_rings:
+            self.session_rings[session_id] = SnapshotRing(self.snapshot_ring_size)
+    
+    def resume_client(self, client_id: str, last_version: int) -> bool:
+        """
+        Continue a reconnected client from the last version it holds.
+        
+        Args:
+            client_id: Client identifier (attached to its session)
+            last_version: Last state version the client acknowledged
+            
+        Returns:
+            True if the version is still in the session's ring (the next
+            update is a delta from it), False if a full state will be sent
+        """
+        client_data = self.clients.get(client_id)
+        ring = self.session_rings.get(client_data['session_id']) if client_data else None
+        base = ring.get(last_version) if ring is not None else None
+        
+        if base is None:
+            self.stats['resume_misses'] += 1
+            logger.debug(f"Client {client_id} cannot resume from version {last_version}")
+            return False
+            
+        client_data['state'] = base
+        client_data['version'] = last_version
+        self.stats['resumed_clients'] += 1
+        logger.debug(f"Client {client_id} resumes from version {last_version}")
+        return True
+    
+    def drop_session(self, session_id: str) -> None:
+        """
+        Forget the snapshot ring of an ended session.
+        
+        Args:
+            session_id: Session identifier
+        """
+        self.session_rings.pop(session_id, None)
     
     def unregister_client(self, client_id: str) -> None:
         """
@@ -82,71 +205,133 @@ class StateSynchronizer:
             del self.clients[client_id]
             logger.debug(f"Unregistered client {client_id}")
     
-    def compute_delta(self, previous_state: Dict[str, Any], current_state: Dict[str, Any]) -> Dict[str, Any]:
+    def negotiate_dictionary(self, client_id: str, module_id: Optional[str],
+                             offered: Dict[str, List[int]]) -> Optional[Dict[str, Any]]:
         """
-        Compute delta between previous and current state.
+        Agree on a preset compression dictionary with a client.
         
         Args:
-            previous_state: Previous state dictionary
-            current_state: Current state dictionary
+            client_id: Client identifier
+            module_id: Module the client is running
+            offered: Dictionary versions the client holds (module id -> versions)
             
         Returns:
-            Delta dictionary with only changed values
+            Description of the agreed dictionary, or None to compress without one
         """
-        if not previous_state:
-            return current_state
+        if client_id not in self.clients:
+            self.register_client(client_id)
             
-        delta = {}
-        self._compute_delta_recursive(previous_state, current_state, delta, "")
-        return delta
+        registry = self.dictionary_registry or get_dictionary_registry()
+        dictionary = registry.negotiate(module_id, offered or {})
+        self.clients[client_id]['dictionary'] = dictionary
+        
+        # The stream is primed with the dictionary from its next reset on
+        codec = self.clients[client_id]['codec']
+        if codec is not None:
+            codec.set_dictionary(dictionary)
+        
+        if dictionary is None:
+            return None
+            
+        logger.debug(f"Client {client_id} uses compression dictionary {dictionary.key}")
+        return {
+            'key': dictionary.key,
+            'module_id': dictionary.module_id,
+            'version': dictionary.version
+        }
     
-    def _compute_delta_recursive(self, prev: Any, curr: Any, delta: Dict[str, Any], path: str) -> None:
+    def get_client_dictionary(self, client_id: str) -> Optional[CompressionDictionary]:
         """
-        Recursively compute delta between two states.
+        Get the preset dictionary negotiated with a client.
         
         Args:
-            prev: Previous value
-            curr: Current value
-            delta: Output delta dictionary
-            path: Current path in the state (for nested dicts)
+            client_id: Client identifier
+            
+        Returns:
+            The dictionary or None
         """
-        # Handle different types
-        if type(prev) != type(curr):
-            # Types are different, include the entire current value
-            if path:
-                delta[path] = curr
-            else:
-                # Root level, copy all keys
-                for key, value in curr.items():
-                    delta[key] = value
-            return
+        client_data = self.clients.get(client_id)
+        return client_data.get('dictionary') if client_data else None
+    
+    def get_client_codec(self, client_id: str) -> Optional[StreamCodec]:
+        """
+        Get the streaming compression context of a client.
+        
+        Args:
+            client_id: Client identifier
             
-        # Handle dict type
-        if isinstance(curr, dict):
-            # Find keys only in current dict
-            for key in set(curr.keys()) - set(prev.keys()):
-                new_path = f"{path}.{key}" if path else key
-                delta[new_path] = curr[key]
-                
-            # Find keys in both dicts
-            for key in set(curr.keys()) & set(prev.keys()):
-                new_path = f"{path}.{key}" if path else key
-                if curr[key] != prev[key]:
-                    if isinstance(curr[key], dict) and isinstance(prev[key], dict):
-                        # Recurse for nested dicts
-                        self._compute_delta_recursive(prev[key], curr[key], delta, new_path)
-                    else:
-                        # Add changed value
-                        delta[new_path] = curr[key]
-            
-            # Keys only in previous dict are considered deleted
-            for key in set(prev.keys()) - set(curr.keys()):
-                new_path = f"{path}.{key}" if path else key
-                delta[new_path] = None  # Null indicates deletion
-                
-        # Handle non-dict type
-        elif curr != prev:
-            delta[path] = curr
+        Returns:
+            The client's StreamCodec, or None if the client does not stream
+        """
+        client_data = self.clients.get(client_id)
+        return client_data.get('codec') if client_data else None
+    
+    def reset_stream(self, client_id: str) -> None:
+        """
+        Start a new compression stream for a client.
+        
+        Called on full-state resyncs; the next streamed message has
+        sequence 0 so the client resets its decompressor too.
+        
+        Args:
+            client_id: Client identifier
+        """
+        codec = self.get_client_codec(client_id)
+        if codec is not None and codec.next_sequence:
+            codec.reset()
+            self.stats['stream_resets'] += 1
+    
+    def commit_state(self, session_id: str, state: Dict[str, Any]) -> int:
+        """
+        Record a session's current state and get its version.
+        
+        The version only changes when the state does, once for all clients
+        of the session, so updates and resume requests of every client
+        refer to the same counter.
+        
+        Args:
+            session_id: Session identifier
+            state: Current full state (must not be modified afterwards)
+            
+        Returns:
+            Version of the state
+        """
+        ring = self.session_rings.get(session_id)
+        if ring is None:
+            ring = self.session_rings[session_id] = SnapshotRing(self.snapshot_ring_size)
+            
+        latest = ring.latest_version
+        if latest and ring.get(latest) == state:
+            return latest
+        ring.push(latest + 1, state)
+        return latest + 1
+    
+    def is_current(self, client_id: str, version: int) -> bool:
+        """
+        Check whether a client already holds a version.
+        
+        Args:
+            client_id: Client identifier
+            version: Session state version
+            
+        Returns:
+            True if the client's last update was that version
+        """
+        client_data = self.clients.get(client_id)
+        return client_data is not None and client_data['version'] == version
+    
+    def compute_delta(self, previous_state: Dict[str, Any], current_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute delta between previous and current state.
+        
+        Args:
+            previous_state: Previous state dictionary
+            current_state: Current state dictionary
+            
+        Returns:
+            Delta dictionary with only changed values
+        """
+        return compute_delta(previous_state, current_state)
     
     def apply_delta(self, base_state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -159,55 +344,36 @@ class StateSynchronizer:
         Returns:
             Updated state dictionary
         """
-        if not delta:
+        # Copy-on-write: only containers on the touched paths are copied,
+        # metadata is skipped
+        return apply_patch(base_state, delta)
+    
+    def apply_deltas(self, base_state: Dict[str, Any], deltas: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply a sequence of deltas as a single merged patch.
+        
+        Args:
+            base_state: Base state dictionary
+            deltas: Deltas in the order they were produced
+            
+        Returns:
+            Updated state dictionary
+        """
+        if not deltas:
             return base_state
             
-        # Make a deep copy of base state
-        result = json.loads(json.dumps(base_state))
-        
-        # Apply each delta path
-        for path, value in delta.items():
-            if path == "_meta":
-                continue  # Skip metadata
-                
-            if "." in path:
-                # Handle nested path
-                parts = path.split(".")
-                curr = result
-                
-                # Navigate to parent object
-                for part in parts[:-1]:
-                    if part not in curr:
-                        curr[part] = {}
-                    curr = curr[part]
-                    
-                # Set or delete value
-                if value is None:
-                    # Delete key
-                    if parts[-1] in curr:
-                        del curr[parts[-1]]
-                else:
-                    # Set value
-                    curr[parts[-1]] = value
-            else:
-                # Handle top-level path
-                if value is None:
-                    # Delete key
-                    if path in result:
-                        del result[path]
-                else:
-                    # Set value
-                    result[path] = value
-                    
-        return result
+        return apply_patch(base_state, merge_deltas(deltas))
     
-    def prepare_update(self, client_id: str, current_state: Dict[str, Any]) -> Tuple[Dict[str, Any], bool, bool]:
+    def prepare_update(self, client_id: str, current_state: Dict[str, Any],
+                       version: Optional[int] = None) -> Tuple[Dict[str, Any], bool, bool]:
         """
         Prepare an update for a client.
         
         Args:
             client_id: Client identifier
             current_state: Current full state
+            version: Version of the state from commit_state (committed here
+                if not given)
             
         Returns:
             Tuple of (update data, is_delta, is_compressed)
@@ -218,89 +384,92 @@ class StateSynchronizer:
         client_data = self.clients[client_id]
         client_data['update_count'] += 1
         
-        # Send full state periodically to prevent drift or on first update
-        send_full = (client_data['update_count'] % self.send_full_state_interval == 0 or 
-                    client_data['version'] == 0)
+        # Send a full state on the first update (or after a resync request)
+        send_full = client_data['version'] == 0 or bool(
+            self.send_full_state_interval and
+            client_data['update_count'] % self.send_full_state_interval == 0)
+        
+        # A resync starts over, including the compression stream
+        if client_data['version'] == 0:
+            self.reset_stream(client_id)
+        
+        # Versions are numbered per session so a resumed client continues
+        # from the same counter; a client outside a session counts its own
+        session_id = client_data['session_id']
+        ring = self.session_rings.get(session_id)
+        if version is None:
+            version = self.commit_state(session_id, current_state) if ring is not None \
+                else client_data['version'] + 1
         
         # Update statistics
         self.stats['total_updates'] += 1
         
-        if send_full:
-            # Full state update
-            update_data = current_state.copy()
-            update_data['_meta'] = {
-                'version': client_data['version'] + 1,
-                'is_delta': False,
-                'timestamp': time.time()
-            }
-            
-            # Calculate full data size for statistics
-            full_data_size = len(json.dumps(update_data))
-            self.stats['bytes_sent'] += full_data_size
-            self.stats['full_updates'] += 1
-            
-            # Update client state
-            client_data['state'] = update_data
-            client_data['version'] += 1
-            client_data['last_sync_time'] = time.time()
-            
-            return update_data, False, False
-        else:
+        if not send_full:
             # Delta update
             delta = self.compute_delta(client_data['state'], current_state)
             
             # Add metadata
             delta['_meta'] = {
-                'version': client_data['version'] + 1,
+                'version': version,
                 'is_delta': True,
                 'base_version': client_data['version'],
                 'timestamp': time.time()
             }
             
+            # Let the client verify it has not drifted
+            if self.checksum_interval and client_data['update_count'] % self.checksum_interval == 0:
+                checksum = ring.checksum(version) if ring is not None else state_checksum(current_state)
+                delta['_meta']['checksum'] = checksum
+                self.stats['checksums_sent'] += 1
+            
             # Calculate data sizes for statistics
             delta_size = len(json.dumps(delta))
             full_size = len(json.dumps(current_state))
-            self.stats['bytes_saved'] += (full_size - delta_size)
-            self.stats['bytes_sent'] += delta_size
-            self.stats['delta_updates'] += 1
-            
-            # Check if full state would be smaller (rare but possible)
-            if delta_size > full_size:
-                # Full state is smaller, use that instead
-                update_data = current_state.copy()
-                update_data['_meta'] = {
-                    'version': client_data['version'] + 1,
-                    'is_delta': False,
-                    'timestamp': time.time()
-                }
-                
-                # Update statistics
-                self.stats['bytes_sent'] -= delta_size
-                self.stats['bytes_sent'] += full_size
-                self.stats['bytes_saved'] -= (full_size - delta_size)
-                self.stats['delta_updates'] -= 1
-                self.stats['full_updates'] += 1
+            
+            # Use the delta unless the full state would be smaller (rare but possible)
+            if delta_size <= full_size:
+                self.stats['bytes_saved'] += (full_size - delta_size)
+                self.stats['bytes_sent'] += delta_size
+                self.stats['delta_updates'] += 1
                 
                 # Update client state
-                client_data['state'] = update_data
-                client_data['version'] += 1
+                client_data['state'] = current_state
+                client_data['version'] = version
                 client_data['last_sync_time'] = time.time()
                 
-                return update_data, False, False
-                
-            # Update client state
-            client_data['state'] = current_state
-            client_data['version'] += 1
-            client_data['last_sync_time'] = time.time()
-            
-            return delta, True, False
+                return delta, True, False
+        
+        # Full state update
+        update_data = current_state.copy()
+        update_data['_meta'] = {
+            'version': version,
+            'is_delta': False,
+            'timestamp': time.time()
+        }
+        
+        # Calculate full data size for statistics
+        full_data_size = len(json.dumps(update_data))
+        self.stats['bytes_sent'] += full_data_size
+        self.stats['full_updates'] += 1
+        
+        # Update client state
+        client_data['state'] = update_data
+        client_data['version'] = version
+        client_data['last_sync_time'] = time.time()
+        
+        return update_data, False, False
     
-    def compress_data(self, data: Dict[str, Any]) -> Tuple[str, bool]:
+    def compress_data(self, data: Dict[str, Any], client_id: Optional[str] = None) -> Tuple[str, bool]:
         """
         Compress data if it's large enough.
         
+        Messages for a client are appended to its compression stream (see
+        get_client_codec) or compressed with its negotiated preset
+        dictionary, both of which pay off from a much lower size.
+        
         Args:
             data: Data to compress
+            client_id: Client the data is for
             
         Returns:
             Tuple of (compressed data string, is_compressed)
@@ -308,12 +477,28 @@ class StateSynchronizer:
         # Convert to JSON string
         json_str = json.dumps(data)
         
+        codec = self.get_client_codec(client_id) if client_id else None
+        dictionary = self.get_client_dictionary(client_id) if client_id else None
+        if codec is not None:
+            threshold = self.stream_threshold
+        elif dictionary:
+            threshold = self.dictionary_threshold
+        else:
+            threshold = self.compression_threshold
+        
         # Only compress if above threshold
-        if len(json_str) < self.compression_threshold:
+        if len(json_str) < threshold:
             return json_str, False
             
         # Compress using zlib
-        compressed = zlib.compress(json_str.encode('utf-8'))
+        if codec is not None:
+            compressed = codec.compress(json_str.encode('utf-8'))
+            self.stats['streamed_updates'] += 1
+        elif dictionary:
+            compressed = dictionary.compress(json_str.encode('utf-8'))
+            self.stats['dictionary_updates'] += 1
+        else:
+            compressed = zlib.compress(json_str.encode('utf-8'))
         
         # Encode as base64 for safe transmission
         b64_data = base64.b64encode(compressed).decode('ascii')
@@ -323,13 +508,23 @@ class StateSynchronizer:
         
         return b64_data, True
     
-    def decompress_data(self, data: str, is_compressed: bool) -> Dict[str, Any]:
+    def decompress_data(self, data: str, is_compressed: bool,
+                        dictionary: Optional[CompressionDictionary] = None,
+                        codec: Optional[StreamCodec] = None,
+                        stream_seq: Optional[int] = None) -> Dict[str, Any]:
         """
         Decompress data if it's compressed.
         
         Args:
             data: Compressed or uncompressed data
             is_compressed: Whether the data is compressed
+            dictionary: Preset dictionary the data was compressed with
+            codec: Receiving StreamCodec of the connection, for streamed data
+            stream_seq: Stream sequence number sent with streamed data
+            
+        Raises:
+            StreamDesyncError: If a streamed message was missed; request a
+                full state to start a new stream
             
         Returns:
             Decompressed data dictionary
@@ -341,7 +536,14 @@ class StateSynchronizer:
         binary_data = base64.b64decode(data)
         
         # Decompress
-        decompressed = zlib.decompress(binary_data).decode('utf-8')
+        if stream_seq is not None:
+            if codec is None:
+                raise ValueError("Streamed data requires the connection's StreamCodec")
+            decompressed = codec.decompress(binary_data, stream_seq).decode('utf-8')
+        elif dictionary:
+            decompressed = dictionary.decompress(binary_data).decode('utf-8')
+        else:
+            decompressed = zlib.decompress(binary_data).decode('utf-8')
         
         # Parse JSON
         return json.loads(decompressed)
@@ -358,7 +560,19 @@ class StateSynchronizer:
             total_potential = self.stats['bytes_sent'] + self.stats['bytes_saved']
             self.stats['compression_ratio'] = total_potential / self.stats['bytes_sent'] if self.stats['bytes_sent'] > 0 else 0
             
-        return self.stats.copy()
+        stats = self.stats.copy()
+        
+        # Per-connection stream statistics
+        connections = {}
+        for client_id, client_data in self.clients.items():
+            codec = client_data.get('codec')
+            if codec is not None:
+                connections[client_id] = codec.get_stats()
+        stats['connections'] = connections
+        stats['stream_bytes_out'] = sum(c['bytes_out'] for c in connections.values())
+        stats['stream_cpu_time'] = sum(c['compress_cpu_time'] for c in connections.values())
+        
+        return stats
     
     def reset_statistics(self) -> None:
         """Reset synchronization statistics."""
@@ -367,6 +581,12 @@ class StateSynchronizer:
             'delta_updates': 0,
             'full_updates': 0,
             'compressed_updates': 0,
+            'dictionary_updates': 0,
+            'streamed_updates': 0,
+            'stream_resets': 0,
+            'checksums_sent': 0,
+            'resumed_clients': 0,
+            'resume_misses': 0,
             'bytes_sent': 0,
             'bytes_saved': 0,
             'compression_ratio': 0
@@ -377,39 +597,98 @@ class WebSocketStateManager:
     Manages WebSocket state synchronization for training modules.
     """
     
-    def __init__(self, socketio, state_sync_interval=0.1):
+    def __init__(self, socketio, state_sync_interval=0.1,
+                 metrics_collector: Optional[MetricsCollector] = None,
+                 on_session_expired: Optional[Callable[[str], None]] = None):
         """
         Initialize the WebSocket state manager.
         
         Args:
             socketio: SocketIO server instance
             state_sync_interval: Time interval between state updates (seconds)
+            metrics_collector: Collector for emit and byte counts (a new one
+                by default)
+            on_session_expired: Called with the session ID when a session
+                whose clients all left was not resumed in time
         """
         self.socketio = socketio
         self.state_sync_interval = state_sync_interval
         self.synchronizer = StateSynchronizer()
+        self.metrics_collector = metrics_collector or MetricsCollector()
+        self.on_session_expired = on_session_expired
+        
+        # Observers of a session (e.g. coach views) share one serialized
+        # full state per update through socket rooms
+        self.broadcaster = SessionBroadcaster(socketio, self.metrics_collector)
         
-        # Active sessions: client_id -> {module, session_id}
+        # Sessions: session_id -> {module, session_id, module_id, start_time, clients}
+        self.sessions = {}
+        
+        # Session followed by each client: client_id -> session
         self.active_sessions = {}
         
         # Last update times: session_id -> last_update_time
         self.last_updates = {}
         
+        # Compression dictionaries offered at connect: client_id -> {module_id: [versions]}
+        self.dictionary_offers = {}
+        
+        # Sessions whose clients all disconnected, kept for resuming:
+        # session_id -> (session, disconnect_time)
+        self.detached_sessions = {}
+        self.resume_grace_period = RESUME_GRACE_PERIOD
+        
         # Update loop running flag
         self.is_running = False
         
         # Logger
         self.logger = logger
     
-    def register_client(self, client_id: str) -> None:
+    def register_client(self, client_id: str, dictionaries: Optional[Dict[str, List[int]]] = None,
+                        session_id: Optional[str] = None, last_version: int = 0,
+                        streaming: bool = False) -> bool:
         """
         Register a new client.
         
+        A client that names a session this manager runs (or keeps after its
+        clients disconnected) follows it. If it also passes the last state
+        version it holds and that version is recent, it continues with a
+        delta instead of a full state.
+        
         Args:
             client_id: Client identifier (SocketIO SID)
+            dictionaries: Compression dictionary versions the client holds
+                (module id -> versions), negotiated when a session starts
+            session_id: Session to join or resume
+            last_version: Last state version the client holds
+            streaming: The client can decode streamed compression
+            
+        Returns:
+            True if the client resumed its session from last_version
         """
-        self.synchronizer.register_client(client_id)
-        self.logger.info(f"Client {client_id} connected")
+        self._expire_detached_sessions()
+        self.dictionary_offers[client_id] = dictionaries or {}
+        
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            self.synchronizer.register_client(client_id, streaming=streaming)
+            self.logger.info(f"Client {client_id} connected")
+            return False
+            
+        self.detached_sessions.pop(session_id, None)
+        session['clients'].add(client_id)
+        self.active_sessions[client_id] = session
+        self.last_updates.setdefault(session_id, time.time())
+        resumed = self.synchronizer.register_client(client_id, session_id, last_version, streaming)
+        self.synchronizer.negotiate_dictionary(client_id, session.get('module_id'),
+                                               self.dictionary_offers[client_id])
+        
+        if not self.is_running:
+            self._start_update_loop()
+            
+        self.logger.info(f"Client {client_id} joined session {session_id} "
+                         f"({'resumed' if resumed else 'full state'})")
+        return resumed
     
     def unregister_client(self, client_id: str) -> None:
         """
@@ -418,20 +697,45 @@ class WebSocketStateManager:
         Args:
             client_id: Client identifier to unregister
         """
-        # End any active session for this client
-        if client_id in self.active_sessions:
-            self.end_session(client_id)
-            
+        # Keep a session nobody follows any more for a while so its client
+        # can resume it
+        session = self.active_sessions.pop(client_id, None)
+        if session is not None:
+            session['clients'].discard(client_id)
+            if not session['clients']:
+                self.detached_sessions[session['session_id']] = (session, time.time())
+                
+        self.broadcaster.leave(client_id)
         self.synchronizer.unregister_client(client_id)
+        self.dictionary_offers.pop(client_id, None)
         self.logger.info(f"Client {client_id} disconnected")
+        
+        # Detached sessions expire from the update loop
+        if self.detached_sessions and not self.is_running:
+            self._start_update_loop()
+    
+    def _expire_detached_sessions(self) -> None:
+        """End sessions whose client did not come back in time."""
+        now = time.time()
+        for session_id, (session, detached_at) in list(self.detached_sessions.items()):
+            if now - detached_at > self.resume_grace_period:
+                del self.detached_sessions[session_id]
+                self.sessions.pop(session_id, None)
+                self._close_session(session)
+                self.logger.info(f"Session {session_id} expired without a resume")
+                if self.on_session_expired is not None:
+                    self.on_session_expired(session_id)
     
-    def start_session(self, client_id: str, module_instance: Any) -> Dict[str, Any]:
+    def start_session(self, client_id: str, module_instance: Any,
+                      module_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Start a new training session for a client.
         
         Args:
             client_id: Client identifier
             module_instance: TrainingModule instance
+            module_id: Registry id of the module, used to pick a compression
+                dictionary
             
         Returns:
             Session information dictionary
@@ -443,16 +747,22 @@ class WebSocketStateManager:
         session_id = module_instance.session_id
         
         # Store session information
-        self.active_sessions[client_id] = {
+        session = {
             'module': module_instance,
             'session_id': session_id,
-            'start_time': time.time()
+            'module_id': module_id,
+            'start_time': time.time(),
+            'clients': {client_id}
         }
+        self.sessions[session_id] = session
+        self.active_sessions[client_id] = session
         
         self.last_updates[session_id] = time.time()
+        self.synchronizer.attach_session(client_id, session_id)
         
-        # Send initial full state
-        initial_state = module_instance.get_full_state()
+        # Agree on a compression dictionary for this module
+        self.synchronizer.negotiate_dictionary(
+            client_id, module_id, self.dictionary_offers.get(client_id, {}))
         
         # Start update loop if not already running
         if not self.is_running:
@@ -460,31 +770,139 @@ class WebSocketStateManager:
             
         self.logger.info(f"Started session {session_id} for client {client_id}")
         
+        info = self.get_client_compression(client_id)
+        info.update(module_id=module_instance.__class__.__name__, session_id=session_id)
+        return info
+    
+    def get_client_compression(self, client_id: str) -> Dict[str, Any]:
+        """
+        Describe the compression agreed with a client.
+        
+        Args:
+            client_id: Client identifier
+            
+        Returns:
+            Dictionary with compression_dictionary (key, module_id and
+            version, or None) and stream (whether updates are streamed)
+        """
+        dictionary = self.synchronizer.get_client_dictionary(client_id)
         return {
-            'module_id': module_instance.__class__.__name__,
-            'session_id': session_id
+            'compression_dictionary': {
+                'key': dictionary.key,
+                'module_id': dictionary.module_id,
+                'version': dictionary.version
+            } if dictionary else None,
+            'stream': self.synchronizer.get_client_codec(client_id) is not None
         }
     
+    def add_observer(self, client_id: str, session_id: str,
+                     update_interval: float = DEFAULT_OBSERVER_INTERVAL) -> bool:
+        """
+        Let a client watch another client's session.
+        
+        Observers receive full states at most every update_interval seconds;
+        all observers of a session are sent the same serialized payload.
+        
+        Args:
+            client_id: Observing client identifier
+            session_id: Session to watch
+            update_interval: Minimum seconds between updates
+            
+        Returns:
+            True if the session is active
+        """
+        if session_id not in self.sessions:
+            return False
+            
+        self.broadcaster.join(client_id, session_id, update_interval)
+        self.logger.info(f"Client {client_id} observes session {session_id}")
+        return True
+    
     def end_session(self, client_id: str) -> None:
         """
-        End a training session for a client.
+        End the training session a client follows.
         
         Args:
             client_id: Client identifier
         """
-        if client_id in self.active_sessions:
-            session = self.active_sessions[client_id]
-            session_id = session['session_id']
+        session = self.active_sessions.get(client_id)
+        if session is not None:
+            self.close_session(session['session_id'])
+            self.logger.info(f"Ended session {session['session_id']} for client {client_id}")
+    
+    def close_session(self, session_id: str) -> None:
+        """
+        End a session for every client following it.
+        
+        Args:
+            session_id: Session identifier
+        """
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return
             
-            # Clean up module
-            session['module'].cleanup()
+        for client_id in session['clients']:
+            self.active_sessions.pop(client_id, None)
+        self.detached_sessions.pop(session_id, None)
+        self._close_session(session)
+        self.logger.info(f"Closed session {session_id}")
+    
+    def is_synchronized(self, client_id: str) -> bool:
+        """
+        Check whether a client receives its updates from this manager.
+        
+        Args:
+            client_id: Client identifier
             
-            # Remove from tracking
-            del self.active_sessions[client_id]
-            if session_id in self.last_updates:
-                del self.last_updates[session_id]
-                
-            self.logger.info(f"Ended session {session_id} for client {client_id}")
+        Returns:
+            True if the client is registered
+        """
+        return client_id in self.synchronizer.clients
+    
+    def is_following(self, client_id: str, session_id: str) -> bool:
+        """
+        Check whether a client receives a session's updates from this manager.
+        
+        Args:
+            client_id: Client identifier
+            session_id: Session identifier
+            
+        Returns:
+            True if the client follows the session
+        """
+        session = self.active_sessions.get(client_id)
+        return session is not None and session['session_id'] == session_id
+    
+    def request_full_state(self, client_id: str) -> None:
+        """
+        Send a client a full state with its next update.
+        
+        Also starts a new compression stream, so a client whose stream
+        broke can recover.
+        
+        Args:
+            client_id: Client identifier
+        """
+        client_data = self.synchronizer.clients.get(client_id)
+        if client_data is not None:
+            client_data['version'] = 0
+    
+    def _close_session(self, session: Dict[str, Any]) -> None:
+        """
+        Clean up a session's module and tracking.
+        
+        Args:
+            session: Session information dictionary
+        """
+        session_id = session['session_id']
+        
+        # Clean up module
+        session['module'].cleanup()
+        
+        # Remove from tracking
+        self.last_updates.pop(session_id, None)
+        self.synchronizer.drop_session(session_id)
+        self.broadcaster.close(session_id)
     
     def handle_client_input(self, client_id: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -514,7 +932,7 @@ class WebSocketStateManager:
             # Handle click input
             x = input_data.get('x', 0)
             y = input_data.get('y', 0)
-            result = module.handle_click(x, y)
+            result = click_module(module, x, y)
         elif input_type == 'key':
             # Handle key input (if the module supports it)
             if hasattr(module, 'handle_key'):
@@ -526,8 +944,7 @@ class WebSocketStateManager:
             result = {'full_state_sent': True}
             
             # Force a full state update on next cycle
-            if client_id in self.synchronizer.clients:
-                self.synchronizer.clients[client_id]['version'] = 0
+            self.request_full_state(client_id)
                 
         # Update last update time
         self.last_updates[session_id] = time.time()
@@ -551,63 +968,126 @@ class WebSocketStateManager:
         Args:
             client_id: Client identifier
         """
-        if client_id not in self.active_sessions:
+        session = self.active_sessions.get(client_id)
+        if session is None:
             return
             
-        # Get active module and current state
-        session = self.active_sessions[client_id]
-        module = session['module']
-        current_state = module.get_state()
+        current_state = session['module'].get_state()
+        version = self.synchronizer.commit_state(session['session_id'], current_state)
+        self._send_update(client_id, current_state, version)
+    
+    def send_session_update(self, session_id: str) -> None:
+        """
+        Send a state update to every client following a session.
+        
+        The state is read and versioned once for all of them. Called after
+        input so clients need not wait for the next cycle.
         
+        Args:
+            session_id: Session identifier
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return
+            
+        current_state = session['module'].get_state()
+        version = self.synchronizer.commit_state(session_id, current_state)
+        for client_id in list(session['clients']):
+            self._send_update(client_id, current_state, version)
+        
+        # Observers get the full state in the same message shape, serialized
+        # once for all of them
+        if self.broadcaster.members(session_id):
+            self.broadcaster.broadcast(session_id, 'state_update', {
+                'data': dict(current_state, _meta={
+                    'version': version,
+                    'is_delta': False,
+                    'timestamp': time.time()
+                }),
+                'is_delta': False,
+                'is_compressed': False,
+                'state_version': version
+            })
+    
+    def _send_update(self, client_id: str, current_state: Dict[str, Any], version: int) -> None:
+        """
+        Send one version of a session's state to a client.
+        
+        Nothing is sent to a client that already holds the version.
+        
+        Args:
+            client_id: Client identifier
+            current_state: Current full state
+            version: Session state version of current_state
+        """
+        if self.synchronizer.is_current(client_id, version):
+            return
+            
         # Prepare update (delta or full)
-        update_data, is_delta, _ = self.synchronizer.prepare_update(client_id, current_state)
+        update_data, is_delta, _ = self.synchronizer.prepare_update(client_id, current_state, version)
         
         # Compress if large
-        compressed_data, is_compressed = self.synchronizer.compress_data(update_data)
+        codec = self.synchronizer.get_client_codec(client_id)
+        stream_seq = codec.next_sequence if codec is not None else None
+        compressed_data, is_compressed = self.synchronizer.compress_data(update_data, client_id)
         
-        # Send via socketio
-        self.socketio.emit('state_update', {
-            'data': compressed_data,
+        # Uncompressed updates carry the state or delta itself, like those
+        # broadcast to observers; compressed ones carry base64 text
+        message = {
+            'data': compressed_data if is_compressed else update_data,
             'is_delta': is_delta,
-            'is_compressed': is_compressed
-        }, room=client_id)
+            'is_compressed': is_compressed,
+            'state_version': version
+        }
+        
+        dictionary = self.synchronizer.get_client_dictionary(client_id)
+        if is_compressed and dictionary:
+            message['dictionary'] = dictionary.key
+        if is_compressed and codec is not None:
+            message['stream_seq'] = stream_seq
+        
+        # Send via socketio
+        self.socketio.emit('state_update', message, room=client_id)
+        self.metrics_collector.record_broadcast(1, 1, len(compressed_data))
     
     def _start_update_loop(self) -> None:
         """Start the background update loop."""
         self.is_running = True
-        self._schedule_update()
+        self.socketio.start_background_task(self._run_update_loop)
     
-    def _schedule_update(self) -> None:
-        """Schedule the next update cycle."""
-        if not self.is_running:
-            return
-            
-        # Schedule next update
-        self.socketio.sleep(self.state_sync_interval)
-        self._update_loop()
+    def _run_update_loop(self) -> None:
+        """Run update cycles until no session is left (background task)."""
+        while self.is_running:
+            self.socketio.sleep(self.state_sync_interval)
+            self._update_loop()
     
     def _update_loop(self) -> None:
         """Main update loop for all sessions."""
         # Get current time for delta calculation
         current_time = time.time()
         
-        # Update all active modules
-        for client_id, session in list(self.active_sessions.items()):
-            module = session['module']
-            session_id = session['session_id']
-            
+        # Update every session someone follows; detached sessions are
+        # paused until they are resumed or expire
+        for session_id, session in list(self.sessions.items()):
+            if not session['clients']:
+                continue
+                
             # Calculate time since last update
             dt = current_time - self.last_updates.get(session_id, current_time)
             
             # Update the module
-            self.update_module_state(module, dt)
+            self.update_module_state(session['module'], dt)
             self.last_updates[session_id] = current_time
             
-            # Send update to client
-            self.send_update(client_id)
+            # Send the update to the session's clients
+            self.send_session_update(session_id)
         
-        # Schedule next update if we have any sessions
-        if self.active_sessions:
-            self._schedule_update()
-        else:
-            self.is_running = False 
\ No newline at end of file
+        # Observer rooms that skipped a change get its latest state once due
+        self.broadcaster.flush()
+        
+        self._expire_detached_sessions()
+        self.metrics_collector.end_tick()
+        
+        # Keep running while sessions are followed or wait to be resumed
+        if not self.sessions:
+            self.is_running = False
@@ -0,0 +1,7 @@
+"""
+Benchmarks for MetaMindIQTrain.
+
+This package contains standalone benchmark scripts that measure the cost of
+rendering, state synchronization and networking paths. Each script can be
+run directly and prints a summary table.
+"""
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Codec Selection Benchmark
+
+Replays recorded state messages from every module (plus batches of them,
+as batch_compress sends) and compares the total encode + transmit time of:
+
+- the old size-based policy (ZLIB/GZIP below 10 KB, BZIP2 below 100 KB,
+  LZMA above)
+- every fixed codec
+- the AdaptiveCodecSelector, fed with the measurements of its own choices
+- an oracle that knows every codec's cost in advance
+
+Usage:
+    python benchmark_codec_selection.py [--frames N] [--batch N] [--budget-ms MS]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from module_registry import AVAILABLE_MODULES
+from core.compression_dictionary import record_module_messages
+from core.network_optimizations import (
+    AdaptiveCodecSelector, CompressionMethod, CompressionLevel, _compress_payload,
+    _available_adaptive_codecs
+)
+
+BANDWIDTHS = (250_000, 1_000_000, 10_000_000)
+
+
+def legacy_choice(size):
+    """The size-only policy optimal_compression_method used to implement."""
+    if size < 100:
+        return CompressionMethod.NONE
+    elif size < 1000:
+        return CompressionMethod.ZLIB
+    elif size < 10000:
+        return CompressionMethod.GZIP
+    elif size < 100000:
+        return CompressionMethod.BZIP2
+    return CompressionMethod.LZMA
+
+
+def record_payloads(frames, batch_size):
+    """Record messages from every module and group some into batches.
+
+    Args:
+        frames: Frames recorded per module
+        batch_size: Messages per batch payload
+
+    Returns:
+        List of serialized payloads in send order
+    """
+    payloads = []
+    for module_info in AVAILABLE_MODULES:
+        try:
+            messages = record_module_messages(module_info["id"], frames)
+        except Exception as e:
+            print(f"{module_info['id']:<24} skipped: {e}")
+            continue
+
+        for start in range(0, len(messages), batch_size):
+            chunk = messages[start:start + batch_size]
+            payloads.extend(chunk)
+            batch = [json.loads(m) for m in chunk]
+            payloads.append(json.dumps(batch).encode("utf-8"))
+    return payloads
+
+
+def measure(payload, codecs, repeat=3):
+    """Measure every codec on a payload.
+
+    Args:
+        payload: Serialized payload
+        codecs: Codecs to measure
+        repeat: Encodes per codec (the fastest is kept)
+
+    Returns:
+        Dictionary mapping codec to (encode_seconds, compressed_size)
+    """
+    results = {}
+    for codec in set(codecs) | {CompressionMethod.GZIP}:
+        best = None
+        size = 0
+        for _ in range(repeat):
+            metadata = {"method": codec.name}
+            start = time.perf_counter()
+            compressed = _compress_payload(payload, codec, CompressionLevel.BALANCED, metadata,
+                                           selector=_NullSelector())
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            size = len(compressed)
+        results[codec] = (best, size)
+    return results
+
+
+class _NullSelector:
+    """Swallows measurements taken for the ground truth."""
+
+    def record(self, *args):
+        pass
+
+
+def main():
+    """Run the benchmark and print totals per policy and bandwidth."""
+    parser = argparse.ArgumentParser(description="Adaptive vs size-based codec selection")
+    parser.add_argument("--frames", type=int, default=300, help="Frames recorded per module")
+    parser.add_argument("--batch", type=int, default=50, help="Messages per batch payload")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="Encode latency budget")
+    args = parser.parse_args()
+
+    codecs = _available_adaptive_codecs()
+    payloads = record_payloads(args.frames, args.batch)
+    truth = [measure(p, codecs) for p in payloads]
+    budget = args.budget_ms / 1000.0
+    total_bytes = sum(len(p) for p in payloads)
+    print(f"{len(payloads)} payloads, {total_bytes / 1024:.0f} KB, "
+          f"largest {max(len(p) for p in payloads) / 1024:.1f} KB\n")
+
+    for bandwidth in BANDWIDTHS:
+        def cost(codec, result):
+            encode, size = result[codec]
+            return encode + size / bandwidth
+
+        policies = {"size-based": lambda i, size: legacy_choice(size)}
+        for codec in codecs:
+            policies[codec.name.lower()] = lambda i, size, codec=codec: codec
+        policies["oracle"] = lambda i, size: min(
+            (c for c in codecs if truth[i][c][0] <= budget) or codecs,
+            key=lambda c: cost(c, truth[i]))
+
+        selector = AdaptiveCodecSelector(bandwidth=bandwidth, latency_budget=budget, codecs=codecs)
+
+        def adaptive(i, size):
+            codec = selector.select(size)
+            encode, compressed = truth[i][codec]
+            selector.record(codec, size, compressed, encode)
+            return codec
+        policies["adaptive"] = adaptive
+
+        print(f"bandwidth {bandwidth / 1000:.0f} KB/s")
+        print(f"  {'policy':<12}{'total ms':>10}{'encode ms':>11}{'sent KB':>9}{'max enc ms':>12}{'>budget':>9}")
+        for name, policy in policies.items():
+            total = encode_total = sent = worst = 0.0
+            over = 0
+            for i, payload in enumerate(payloads):
+                codec = policy(i, len(payload))
+                encode, size = truth[i][codec]
+                total += encode + size / bandwidth
+                encode_total += encode
+                sent += size
+                worst = max(worst, encode)
+                over += encode > budget
+            print(f"  {name:<12}{total * 1000:>10.1f}{encode_total * 1000:>11.1f}"
+                  f"{sent / 1024:>9.0f}{worst * 1000:>12.2f}{over:>9}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Compact Component Benchmark
+
+Builds the quantum_memory recall-phase component tree (at the level with the
+most quantum states) and compares three representations of it:
+
+- the dictionaries the view produces
+- unified_component_system.Component objects
+- a CompactTree (slotted components, interned styles, numpy layout), cleared
+  and rebuilt every frame
+
+For each it reports retained memory and allocated blocks per tree (via
+tracemalloc), build and to_dict time per frame, and hit-test time for a
+batch of random points (one vectorized call for the CompactTree). The
+unified and compact rows are built from the view's dictionaries.
+
+Usage:
+    python benchmark_compact_components.py [--frames N] [--points N] [--level N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from modules.evolve.quantum_memory.quantum_memory_model import QuantumMemoryModel
+from modules.evolve.quantum_memory.quantum_memory_view import QuantumMemoryView
+from core.unified_component_system import Component, UI
+from core.compact_components import CompactTree
+
+SCREEN_SIZE = (1440, 1024)
+
+
+def make_recall_view(level):
+    """Create a quantum_memory view in the recall phase with some states selected.
+
+    Args:
+        level: Model level (more states at higher levels)
+
+    Returns:
+        QuantumMemoryView
+    """
+    model = QuantumMemoryModel()
+    model.level = level
+    model.init_game()
+    model.phase = "recall"
+    for state in model.quantum_states[::3]:
+        state["selected"] = True
+
+    view = QuantumMemoryView(model)
+    view.set_dimensions(*SCREEN_SIZE)
+    return view
+
+
+def to_unified(node):
+    """Convert a view dictionary tree to unified Components.
+
+    Args:
+        node: Dictionary component
+
+    Returns:
+        Component tree
+    """
+    properties = dict(node.get("properties") or {})
+    component = Component(node.get("type", "container"), id=None,
+                          x=node.get("x", 0), y=node.get("y", 0),
+                          width=node.get("width", 0), height=node.get("height", 0))
+    component.style.update(properties.pop("style", {}))
+    component.props.update(properties)
+    for key, value in node.items():
+        if key not in ("type", "id", "x", "y", "width", "height", "properties", "children"):
+            component.props[key] = value
+    for child in node.get("children") or ():
+        component.add_child(to_unified(child))
+    return component
+
+
+def count_nodes(node):
+    """Count the components in a dictionary tree."""
+    return 1 + sum(count_nodes(child) for child in node.get("children") or ())
+
+
+def measure_memory(build):
+    """Measure the memory retained by one built tree.
+
+    Args:
+        build: Callable returning the tree
+
+    Returns:
+        Tuple of (retained bytes, allocated blocks)
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tree = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    retained = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del tree
+    return retained, blocks
+
+
+def time_per_frame(func, frames):
+    """Get the mean seconds per call of func."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    """Run the benchmark and print one row per representation."""
+    parser = argparse.ArgumentParser(description="Compact vs dictionary component trees")
+    parser.add_argument("--frames", type=int, default=500, help="Builds timed per representation")
+    parser.add_argument("--points", type=int, default=1000, help="Hit-test points")
+    parser.add_argument("--level", type=int, default=18, help="quantum_memory level")
+    args = parser.parse_args()
+
+    view = make_recall_view(args.level)
+    nodes = view.build_component_tree()
+    print(f"quantum_memory recall tree: {count_nodes(nodes)} components\n")
+
+    rng = random.Random(0)
+    points = [(rng.uniform(0, SCREEN_SIZE[0]), rng.uniform(0, SCREEN_SIZE[1]))
+              for _ in range(args.points)]
+
+    ui = UI(*SCREEN_SIZE)
+    unified = to_unified(nodes)
+    ui.add(unified)
+
+    compact = CompactTree()
+
+    def build_compact():
+        compact.clear()
+        compact.add_tree(nodes)
+        return compact
+
+    build_compact()
+
+    representations = [
+        ("dict", view.build_component_tree, None, None),
+        ("unified", lambda: to_unified(nodes), unified.to_dict,
+         lambda: [ui.find_component_at(x, y) for x, y in points]),
+        ("compact", build_compact, compact.to_dict,
+         lambda: compact.hit_test_many(points)),
+    ]
+
+    print(f"  {'repr':<10}{'KB/tree':>9}{'blocks':>8}{'build us':>10}{'to_dict us':>12}{'hit us/pt':>11}")
+    for name, build, to_dict, hit_test in representations:
+        if name == "compact":
+            # Steady state: the arrays and style table already exist
+            retained, blocks = measure_memory(build_compact)
+        else:
+            retained, blocks = measure_memory(build)
+        build_time = time_per_frame(build, args.frames)
+        dict_time = time_per_frame(to_dict, args.frames) if to_dict else 0.0
+        hit_time = time_per_frame(hit_test, 5) / len(points) if hit_test else 0.0
+        print(f"  {name:<10}{retained / 1024:>9.1f}{blocks:>8}{build_time * 1e6:>10.1f}"
+              f"{dict_time * 1e6:>12.1f}{hit_time * 1e6:>11.2f}")
+
+    print(f"\n  compact tree: {compact.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Dictionary Compression Benchmark
+
+Compares the zlib compression ratio of small (sub-1 KB) state messages with
+and without a preset dictionary. Dictionaries are trained on one recording
+of each module and measured on a second, independent recording.
+
+Usage:
+    python benchmark_dictionary_compression.py [--train N] [--test N] [--size BYTES]
+"""
+
+import os
+import sys
+import zlib
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from module_registry import AVAILABLE_MODULES
+from core.compression_dictionary import (
+    CompressionDictionary, build_dictionary, record_module_messages,
+    DEFAULT_DICTIONARY_SIZE
+)
+
+SMALL_MESSAGE_LIMIT = 1024
+
+
+def benchmark_module(module_id, train_frames, test_frames, size):
+    """Train a dictionary for one module and measure it on fresh messages.
+
+    Args:
+        module_id: Module identifier
+        train_frames: Frames recorded to train the dictionary
+        test_frames: Frames recorded to measure
+        size: Dictionary size budget in bytes
+
+    Returns:
+        Result dictionary or None if there were no small messages
+    """
+    training = record_module_messages(module_id, train_frames)
+    dictionary = CompressionDictionary(module_id, 1, build_dictionary(training, size))
+
+    messages = [m for m in record_module_messages(module_id, test_frames)
+                if len(m) < SMALL_MESSAGE_LIMIT]
+    if not messages:
+        return None
+
+    raw = plain = primed = 0
+    for message in messages:
+        raw += len(message)
+        plain += len(zlib.compress(message, 6))
+        compressed = dictionary.compress(message)
+        assert dictionary.decompress(compressed) == message
+        primed += len(compressed)
+
+    return {
+        "messages": len(messages),
+        "avg_raw": raw / len(messages),
+        "avg_plain": plain / len(messages),
+        "avg_dict": primed / len(messages),
+        "ratio_plain": raw / plain,
+        "ratio_dict": raw / primed,
+        "dict_size": len(dictionary.data),
+    }
+
+
+def main():
+    """Run the benchmark for all modules and print a summary table."""
+    parser = argparse.ArgumentParser(description="zlib ratio with and without a preset dictionary")
+    parser.add_argument("--train", type=int, default=600, help="Frames recorded for training")
+    parser.add_argument("--test", type=int, default=300, help="Frames recorded for measuring")
+    parser.add_argument("--size", type=int, default=DEFAULT_DICTIONARY_SIZE, help="Dictionary size")
+    args = parser.parse_args()
+
+    print(f"{'module':<24}{'msgs':>6}{'raw':>8}{'zlib':>8}{'+dict':>8}{'ratio':>8}{'+dict':>8}")
+
+    for module_info in AVAILABLE_MODULES:
+        module_id = module_info["id"]
+        try:
+            result = benchmark_module(module_id, args.train, args.test, args.size)
+        except Exception as e:
+            print(f"{module_id:<24} error: {e}")
+            continue
+
+        if result is None:
+            print(f"{module_id:<24} no sub-1 KB messages")
+            continue
+
+        print(f"{module_id:<24}{result['messages']:>6}{result['avg_raw']:>8.0f}"
+              f"{result['avg_plain']:>8.0f}{result['avg_dict']:>8.0f}"
+              f"{result['ratio_plain']:>8.2f}{result['ratio_dict']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
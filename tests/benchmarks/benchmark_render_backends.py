@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Render Backend Benchmark
+
+Draws the same component trees through core.renderer's PygameBackend
+(software blits to the display surface) and SDL2Backend (cached textures
+and filled rects on an SDL renderer) and reports mean frame time, draw calls
+and texture uploads per frame.
+
+The trees are the quantum_memory recall screen (mostly rounded cells and
+text) and the same screen under a translucent modal overlay, which the
+Pygame backend draws by allocating and blending a per-pixel alpha surface.
+
+Each frame is cleared, drawn and flipped without the 60 FPS frame limiter.
+With the dummy video driver SDL2Backend uses SDL's software renderer, so the
+numbers compare CPU rendering paths; pass --accelerated on a machine with a
+GPU to let SDL pick a hardware renderer.
+
+Usage:
+    python benchmark_render_backends.py [--frames N] [--level N] [--accelerated]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from modules.evolve.quantum_memory.quantum_memory_model import QuantumMemoryModel
+from modules.evolve.quantum_memory.quantum_memory_view import QuantumMemoryView
+from core.renderer import PygameBackend, SDL2Backend
+
+SCREEN_SIZE = (1440, 1024)
+
+
+def make_tree(level):
+    """Build the quantum_memory recall component tree.
+
+    Args:
+        level: Model level (more states at higher levels)
+
+    Returns:
+        Dictionary component tree
+    """
+    model = QuantumMemoryModel()
+    model.level = level
+    model.init_game()
+    model.phase = "recall"
+    for state in model.quantum_states[::3]:
+        state["selected"] = True
+
+    view = QuantumMemoryView(model)
+    view.set_dimensions(*SCREEN_SIZE)
+    return view.build_component_tree()
+
+
+def rgba(color, default=(0, 0, 0, 255)):
+    """Get a style color as RGBA."""
+    if not color:
+        return default
+    return tuple(color) if len(color) > 3 else (*color, 255)
+
+
+def draw_tree(backend, node, x=0, y=0):
+    """Draw a dictionary component tree with backend draw calls.
+
+    Args:
+        backend: RenderBackend
+        node: Dictionary component
+        x: Parent's absolute x
+        y: Parent's absolute y
+    """
+    style = (node.get("properties") or {}).get("style", {})
+    nx, ny = x + node.get("x", 0), y + node.get("y", 0)
+    width, height = node.get("width", 0), node.get("height", 0)
+    kind = node.get("type")
+
+    if kind == "container" and style.get("backgroundColor"):
+        backend.draw_rectangle(nx, ny, width, height, rgba(style["backgroundColor"]))
+    elif kind == "rectangle":
+        backend.draw_rounded_rectangle(nx, ny, width, height, rgba(style.get("fillColor")),
+                                       radius=style.get("cornerRadius", 0),
+                                       border_color=rgba(style.get("strokeColor")),
+                                       border_width=style.get("strokeWidth", 0))
+    elif kind == "circle":
+        radius = min(width, height) // 2
+        backend.draw_circle(nx + radius, ny + radius, radius, rgba(style.get("fillColor")),
+                            border_color=rgba(style.get("strokeColor")),
+                            border_width=style.get("strokeWidth", 0))
+    elif kind == "progressBar":
+        backend.draw_rectangle(nx, ny, width, height, rgba(style.get("backgroundColor")))
+        backend.draw_rectangle(nx, ny, width // 2, height, rgba(style.get("barColor")))
+    elif kind == "button":
+        backend.draw_rounded_rectangle(nx, ny, width, height, rgba(style.get("backgroundColor")),
+                                       radius=style.get("borderRadius", 5))
+    if node.get("text") and kind in ("text", "button"):
+        backend.draw_text(nx + width // 2, ny + height // 2, str(node["text"]),
+                          style.get("fontSize", 16), rgba(style.get("color"), (255, 255, 255, 255)),
+                          align="center", center_vertically=True)
+
+    for child in node.get("children") or ():
+        draw_tree(backend, child, nx, ny)
+
+
+def run(backend, tree, frames, overlay):
+    """Draw frames and flip them without the frame limiter.
+
+    Returns:
+        Tuple of (ms per frame, draw calls per frame, texture uploads per frame)
+    """
+    if isinstance(backend, SDL2Backend):
+        flip = backend.sdl_renderer.present
+    else:
+        flip = pygame.display.flip
+
+    def frame():
+        backend.clear((20, 25, 31, 255))
+        draw_tree(backend, tree)
+        if overlay:
+            backend.draw_rectangle(0, 0, SCREEN_SIZE[0], SCREEN_SIZE[1], (0, 0, 0, 160))
+            backend.draw_rounded_rectangle(420, 312, 600, 400, (50, 55, 65, 255), radius=12)
+        flip()
+
+    frame()  # Warm font and texture caches
+    stats = backend.get_render_stats()
+    calls, uploads = stats.get("draw_calls", 0), stats.get("texture_uploads", 0)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame()
+    elapsed = time.perf_counter() - start
+
+    stats = backend.get_render_stats()
+    return (elapsed / frames * 1000, (stats.get("draw_calls", 0) - calls) / frames,
+            (stats.get("texture_uploads", 0) - uploads) / frames)
+
+
+def main():
+    """Run the benchmark and print one row per backend and tree."""
+    parser = argparse.ArgumentParser(description="PygameBackend vs SDL2Backend")
+    parser.add_argument("--frames", type=int, default=100, help="Frames timed per backend and tree")
+    parser.add_argument("--level", type=int, default=18, help="quantum_memory level")
+    parser.add_argument("--accelerated", action="store_true", help="Let SDL pick a hardware renderer")
+    args = parser.parse_args()
+
+    tree = make_tree(args.level)
+    backends = [
+        ("pygame", PygameBackend),
+        ("sdl2", lambda: SDL2Backend(software=not args.accelerated)),
+    ]
+
+    print(f"  {'tree':<18}{'backend':<10}{'ms/frame':>10}{'calls/frame':>13}{'uploads/frame':>15}")
+    for tree_name, overlay in (("recall", False), ("recall + overlay", True)):
+        for name, make_backend in backends:
+            backend = make_backend()
+            if not backend.initialize(*SCREEN_SIZE, title="benchmark"):
+                print(f"  {tree_name:<18}{name:<10}{'unavailable':>10}")
+                continue
+            try:
+                ms, calls, uploads = run(backend, tree, args.frames, overlay)
+            finally:
+                backend.shutdown()
+            print(f"  {tree_name:<18}{name:<10}{ms:>10.2f}{calls:>13.0f}{uploads:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Terminal Output Benchmark
+
+Measures how many bytes the terminal renderer writes per frame for every
+module in module_registry.AVAILABLE_MODULES, comparing the differential
+double-buffered output against a full-screen rewrite of every line.
+
+Usage:
+    python benchmark_terminal_output.py [--frames N] [--width W] [--height H]
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from module_registry import AVAILABLE_MODULES, create_module_instance
+from clients.terminal.unified_renderer import (
+    TerminalRenderer, CURSOR_MOVE_BYTES
+)
+
+
+def full_redraw_bytes(renderer):
+    """Get the bytes a clear-and-rewrite-every-line frame would write.
+    
+    Args:
+        renderer: TerminalRenderer holding the current back buffer
+        
+    Returns:
+        Number of bytes
+    """
+    total = 0
+    for row in renderer.buffer:
+        total += CURSOR_MOVE_BYTES + len("".join(row).encode("utf-8"))
+    return total
+
+
+def benchmark_module(module_id, frames, width, height, dt=0.1):
+    """Run one module through the renderer and collect byte counts.
+    
+    Args:
+        module_id: Module identifier
+        frames: Number of frames to render
+        width: Terminal width in cells
+        height: Terminal height in cells
+        dt: Simulated time step per frame in seconds
+        
+    Returns:
+        Result dictionary or None if the module could not be run
+    """
+    module = create_module_instance(module_id)
+    if module is None or not hasattr(module, "view"):
+        return None
+    
+    renderer = TerminalRenderer(width, height)
+    
+    diff_bytes = []
+    full_bytes = []
+    
+    for _ in range(frames):
+        try:
+            module.update(dt)
+        except TypeError:
+            # Some modules advance on their own clock
+            module.update()
+        tree = module.view.build_component_tree()
+        diff_bytes.append(renderer.render_frame(tree))
+        full_bytes.append(full_redraw_bytes(renderer))
+    
+    steady = diff_bytes[1:] or diff_bytes
+    return {
+        "first_frame": diff_bytes[0],
+        "avg_diff": sum(steady) / len(steady),
+        "avg_full": sum(full_bytes) / len(full_bytes),
+        "skipped": renderer.frames_skipped,
+    }
+
+
+def main():
+    """Run the benchmark for all modules and print a summary table."""
+    parser = argparse.ArgumentParser(description="Terminal output bytes per frame")
+    parser.add_argument("--frames", type=int, default=60, help="Frames per module")
+    parser.add_argument("--width", type=int, default=120, help="Terminal width")
+    parser.add_argument("--height", type=int, default=40, help="Terminal height")
+    args = parser.parse_args()
+    
+    print(f"{'module':<24}{'first':>10}{'diff/frame':>12}{'full/frame':>12}{'skipped':>9}")
+    
+    for module_info in AVAILABLE_MODULES:
+        module_id = module_info["id"]
+        try:
+            result = benchmark_module(module_id, args.frames, args.width, args.height)
+        except Exception as e:
+            print(f"{module_id:<24} error: {e}")
+            continue
+        
+        if result is None:
+            print(f"{module_id:<24} unavailable")
+            continue
+        
+        print(f"{module_id:<24}{result['first_frame']:>10}{result['avg_diff']:>12.0f}"
+              f"{result['avg_full']:>12.0f}{result['skipped']:>9}")
+
+
+if __name__ == "__main__":
+    main()
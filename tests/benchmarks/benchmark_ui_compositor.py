@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+UI Compositor Benchmark
+
+Builds a music theory screen (title, level and score text, play button,
+a two-octave piano keyboard and a grid of answer options) from
+core.ui_component classes and renders it with:
+
+- legacy: the previous UIComponent.render, which drew every dirty component
+  onto a new SRCALPHA surface, composited it into its parent and kept a
+  .copy() as its cache
+- compositor: the current UIComponent.render, drawing into the target
+  through subsurface views and clip rects, caching only static subtrees
+
+Three per-frame workloads are measured: a static screen, a timer text that
+changes every frame, and a piano key toggling its hover state every frame
+(a dirty leaf deep in the tree). For each it reports surface allocations
+and allocated megabytes per frame and mean frame time.
+
+Usage:
+    python benchmark_ui_compositor.py [--frames N]
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from core import ui_component
+from core.ui_component import UIComponent, ContainerComponent, TextComponent, ButtonComponent
+
+SCREEN_SIZE = (1024, 768)
+
+WHITE_KEYS = 14
+BLACK_KEY_OFFSETS = [0, 1, 3, 4, 5]  # White keys followed by a black key, per octave
+
+
+class AllocationCounter:
+    """Counts pixel surfaces created through pygame.Surface and Surface.copy."""
+
+    def __init__(self):
+        self.surfaces = 0
+        self.bytes = 0
+        self._original = None
+
+    def install(self):
+        """Replace pygame.Surface with a counting subclass."""
+        counter = self
+        self._original = original = pygame.Surface
+
+        class CountingSurface(original):
+            def __init__(self, size, *args, **kwargs):
+                super().__init__(size, *args, **kwargs)
+                counter.surfaces += 1
+                counter.bytes += self.get_width() * self.get_height() * self.get_bytesize()
+
+            def copy(self):
+                copied = super().copy()
+                counter.surfaces += 1
+                counter.bytes += self.get_width() * self.get_height() * self.get_bytesize()
+                return copied
+
+        pygame.Surface = CountingSurface
+
+    def uninstall(self):
+        """Restore pygame.Surface."""
+        pygame.Surface = self._original
+
+    def reset(self):
+        """Zero the counters."""
+        self.surfaces = 0
+        self.bytes = 0
+
+
+def legacy_render(component, surface, force_render=False):
+    """The previous UIComponent.render, kept for comparison."""
+    if not component.visible:
+        return []
+
+    if not component.is_dirty and not force_render and component.cached_surface:
+        surface.blit(component.cached_surface, (component.x, component.y))
+        return [component.get_rect()]
+
+    component_surface = pygame.Surface((component.width, component.height), pygame.SRCALPHA)
+    component_surface.fill((0, 0, 0, 0))
+    component._draw_component(component_surface)
+
+    dirty_rects = []
+    for child in component.children:
+        if child.visible:
+            child_surface = pygame.Surface((child.width, child.height), pygame.SRCALPHA)
+            child_surface.fill((0, 0, 0, 0))
+            child_dirty = legacy_render(child, child_surface, force_render)
+            if child_dirty:
+                component_surface.blit(child_surface, (child.x - component.x, child.y - component.y))
+                dirty_rects.extend(child_dirty)
+
+    component.cached_surface = component_surface.copy()
+    component.is_dirty = False
+    surface.blit(component_surface, (component.x, component.y))
+    return [component.get_rect()] + dirty_rects
+
+
+def build_music_theory_screen():
+    """Build the music theory screen as a UIComponent tree.
+
+    Returns:
+        Tuple of (root, timer text, piano key toggled by the hover workload)
+    """
+    width, height = SCREEN_SIZE
+    root = ContainerComponent(id="screen", width=width, height=height,
+                              properties={"style": {"backgroundColor": (20, 20, 30)}})
+
+    root.add_child(TextComponent(id="title", x=width // 2 - 150, y=15, width=300, height=30,
+                                 text="Music Theory", properties={"style": {"textAlign": "center"}}))
+    root.add_child(TextComponent(id="level", x=20, y=15, width=120, height=24, text="Level: 3"))
+    timer = root.add_child(TextComponent(id="timer", x=width - 160, y=15, width=140, height=24,
+                                         text="Time: 0", properties={"style": {"textAlign": "right"}}))
+    root.add_child(TextComponent(id="challenge", x=width // 2 - 150, y=50, width=300, height=24,
+                                 text="Chord Identification", properties={"style": {"textAlign": "center"}}))
+    root.add_child(ButtonComponent(id="play", x=width // 2 - 100, y=90, width=200, height=50,
+                                   text="Play Audio"))
+
+    key_width = 48
+    piano = root.add_child(ContainerComponent(
+        id="piano", x=(width - WHITE_KEYS * key_width) // 2 - 10, y=170,
+        width=WHITE_KEYS * key_width + 20, height=180,
+        properties={"style": {"backgroundColor": (40, 40, 50), "borderRadius": 6}}))
+    for i in range(WHITE_KEYS):
+        piano.add_child(ButtonComponent(
+            id=f"white_{i}", x=10 + i * key_width, y=10, width=key_width - 2, height=160, text="",
+            properties={"style": {"backgroundColor": (235, 235, 235), "borderRadius": 2}}))
+    hovered = None
+    for octave in range(WHITE_KEYS // 7):
+        for offset in BLACK_KEY_OFFSETS:
+            i = octave * 7 + offset
+            key = piano.add_child(ButtonComponent(
+                id=f"black_{i}", x=10 + i * key_width + key_width * 2 // 3, y=10,
+                width=key_width * 2 // 3, height=100, text="",
+                properties={"style": {"backgroundColor": (20, 20, 20), "borderRadius": 2}}))
+            hovered = hovered or key
+
+    options = root.add_child(ContainerComponent(
+        id="options", x=(width - 680) // 2, y=380, width=680, height=180,
+        properties={"layout": "grid", "layout_props": {"columns": 2, "margin": 20, "padding": 10},
+                    "style": {"backgroundColor": (30, 30, 40)}}))
+    for i, name in enumerate(["Major", "Minor", "Diminished", "Augmented"]):
+        options.add_child(ButtonComponent(id=f"option_{i}", width=320, height=60, text=name))
+    options.layout_children()
+
+    root.add_child(TextComponent(id="message", x=width // 2 - 200, y=height - 50, width=400, height=30,
+                                 text="Select the chord you heard", properties={"style": {"textAlign": "center"}}))
+    return root, timer, hovered
+
+
+def count_components(component):
+    """Count the components in a tree."""
+    return 1 + sum(count_components(child) for child in component.children)
+
+
+def run(render, workload, frames, counter):
+    """Render a fresh screen for a number of frames.
+
+    Args:
+        render: Callable (root, screen) drawing one frame
+        workload: 'static', 'timer' or 'hover'
+        frames: Frames to time
+        counter: AllocationCounter
+
+    Returns:
+        Tuple of (surfaces per frame, MB per frame, ms per frame)
+    """
+    ui_component._surface_pool = None
+    root, timer, hovered = build_music_theory_screen()
+    screen = pygame.Surface(SCREEN_SIZE)
+
+    def frame(n):
+        if workload == "timer":
+            timer.set_text(f"Time: {n}")
+        elif workload == "hover":
+            hovered.hover = not hovered.hover
+            hovered.mark_dirty()
+        render(root, screen)
+
+    # Warm up past the first full draw and into the steady state
+    for n in range(10):
+        frame(n)
+
+    counter.reset()
+    start = time.perf_counter()
+    for n in range(frames):
+        frame(n)
+    elapsed = time.perf_counter() - start
+    return (counter.surfaces / frames, counter.bytes / frames / (1024 * 1024),
+            elapsed / frames * 1000)
+
+
+def main():
+    """Run the benchmark and print one row per renderer and workload."""
+    parser = argparse.ArgumentParser(description="Legacy vs compositing UIComponent.render")
+    parser.add_argument("--frames", type=int, default=200, help="Frames timed per workload")
+    args = parser.parse_args()
+
+    pygame.init()
+    counter = AllocationCounter()
+    counter.install()
+    try:
+        root, _, _ = build_music_theory_screen()
+        print(f"music theory screen: {count_components(root)} components, "
+              f"surface pool: {'yes' if ui_component.get_surface_pool() else 'unavailable'}\n")
+
+        renderers = [
+            ("legacy", lambda root, screen: legacy_render(root, screen)),
+            ("compositor", lambda root, screen: root.render(screen)),
+        ]
+
+        print(f"  {'workload':<10}{'renderer':<12}{'surfaces/frame':>15}{'MB/frame':>10}{'ms/frame':>10}")
+        for workload in ("static", "timer", "hover"):
+            for name, render in renderers:
+                surfaces, megabytes, ms = run(render, workload, args.frames, counter)
+                print(f"  {workload:<10}{name:<12}{surfaces:>15.1f}{megabytes:>10.2f}{ms:>10.3f}")
+    finally:
+        counter.uninstall()
+
+
+if __name__ == "__main__":
+    main()
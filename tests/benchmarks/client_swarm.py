@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Client Swarm Load Test
+
+Runs thousands of headless clients in one process on asyncio against a
+server on this machine and measures how it holds up as the client count
+grows. Each client:
+
+- creates a session for one of the AVAILABLE_MODULES (round robin, or the
+  --modules given) over a keep-alive HTTP/1.1 connection
+- clicks at human pace (log-normal think time), mostly on a target taken
+  from its current state (a position, an x/y pair or a center), sometimes
+  anywhere on the screen
+- applies every returned state to its local copy as a delta through the
+  PatchEngine, as BaseClient does with the server's deltas
+- ends its session after a few dozen clicks and starts another
+
+The clients are added in steps (the capacity curve). After each step has
+ramped up, one measurement window reports input throughput, p50/p99 update
+latency (click sent to state applied), bytes/s in both directions, errors,
+and the server's CPU use read from /proc. Throughput and latency count
+successful inputs only; a failed input is retried on the same session
+unless the session is gone. At the end, inputs/s and latency are reported
+per module over all windows, with failed requests per module. The run
+stops with an error when most inputs of a window fail. --spawn starts a
+plain HTTP OptimizedServer for the run; otherwise pass --server-pid for
+the CPU column.
+
+Usage:
+    python client_swarm.py [--steps 100,250,500,1000] [--duration S] [--ramp S]
+                           [--modules IDS] [--think S] [--port N] [--spawn] [--server-pid PID]
+                           [--csv PATH]
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from module_registry import AVAILABLE_MODULES
+from core.state_patch import PatchEngine, compute_delta
+from core.streaming_stats import StreamingStats
+
+HOST = "127.0.0.1"
+
+# Number of update latencies kept per measurement window
+LATENCY_WINDOW = 1_000_000
+
+# Number of update latencies kept per module over the whole run
+MODULE_LATENCY_WINDOW = 100_000
+
+# Share of failed inputs in a window at which the run stops
+MAX_FAILED_INPUTS = 0.5
+
+# Share of clicks aimed at a target found in the state
+TARGETED_CLICKS = 0.8
+
+# Mean clicks per session before a client starts a new one
+SESSION_CLICKS = 30
+
+# Deepest level of the state searched for click targets
+TARGET_DEPTH = 4
+
+
+class SwarmStats:
+    """Measurements of one window, shared by all clients."""
+
+    def __init__(self):
+        self.latency = StreamingStats(LATENCY_WINDOW)
+        self.inputs = 0
+        self.failed_inputs = 0
+        self.sessions = 0
+        self.errors = Counter()  # Failed requests per module ID
+        self.module_inputs = Counter()  # Successful inputs per module ID
+        self.module_latency = {}  # Module ID -> latencies of its successful inputs (ms)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.delta_paths = 0
+
+    def add_input(self, module_id, latency_ms):
+        """Record a successful input."""
+        self.inputs += 1
+        self.module_inputs[module_id] += 1
+        self.latency.add(latency_ms)
+        self.module_latency.setdefault(module_id, []).append(latency_ms)
+
+
+class SwarmError(RuntimeError):
+    """Raised when the server fails most of a window's inputs."""
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client on asyncio streams.
+
+    The server answers every request with a Content-Length, so a response
+    is read with one readexactly; the connection is reopened after errors
+    or when the server closes it.
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, data, stats):
+        """Send a request and return (status, decoded JSON body or None)."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {HOST}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        try:
+            self.writer.write(head.encode("latin-1") + body)
+            await self.writer.drain()
+
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise ConnectionResetError("server closed the connection")
+            received = len(status_line)
+            length = 0
+            close = False
+            while True:
+                line = await self.reader.readline()
+                received += len(line)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "connection" and value.strip().lower() == "close":
+                    close = True
+            payload = await self.reader.readexactly(length) if length else b""
+        except (OSError, asyncio.IncompleteReadError):
+            self.close()
+            raise
+
+        stats.bytes_out += len(head) + len(body)
+        stats.bytes_in += received + len(payload)
+        if close or status_line.startswith(b"HTTP/1.0"):
+            self.close()
+        return int(status_line.split()[1]), json.loads(payload) if payload else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def click_targets(state, depth=0):
+    """Collect clickable points from a state.
+
+    Positions ([x, y] under "position"), x/y pairs (centered when a width
+    and height are given) and center_x/center_y pairs are used.
+    """
+    targets = []
+    if depth > TARGET_DEPTH:
+        return targets
+    if isinstance(state, dict):
+        position = state.get("position")
+        if isinstance(position, (list, tuple)) and len(position) == 2:
+            targets.append(position)
+        x, y = state.get("x"), state.get("y")
+        if isinstance(x, (int, float)) and isinstance(y, (int, float)):
+            width, height = state.get("width", 0), state.get("height", 0)
+            if isinstance(width, (int, float)) and isinstance(height, (int, float)):
+                targets.append((x + width / 2, y + height / 2))
+        if isinstance(state.get("center_x"), (int, float)) and isinstance(state.get("center_y"), (int, float)):
+            targets.append((state["center_x"], state["center_y"]))
+        for value in state.values():
+            if isinstance(value, (dict, list)):
+                targets.extend(click_targets(value, depth + 1))
+    elif isinstance(state, list):
+        for value in state:
+            if isinstance(value, (dict, list)):
+                targets.extend(click_targets(value, depth + 1))
+    return targets
+
+
+class SwarmClient:
+    """One simulated player."""
+
+    def __init__(self, swarm, index):
+        self.swarm = swarm
+        self.module_id = swarm.module_ids[index % len(swarm.module_ids)]
+        self.rng = random.Random(index)
+        self.connection = HttpConnection(swarm.port)
+        self.patch_engine = PatchEngine()
+        self.session_id = None
+
+    def _think_time(self):
+        """Seconds before the next click, log-normal around the mean think time."""
+        sigma = 0.5
+        return self.rng.lognormvariate(math.log(self.swarm.think) - sigma * sigma / 2, sigma)
+
+    def _click(self):
+        if self.rng.random() < TARGETED_CLICKS:
+            targets = click_targets(self.patch_engine.state)
+            if targets:
+                x, y = self.rng.choice(targets)
+                return int(x) + self.rng.randint(-5, 5), int(y) + self.rng.randint(-5, 5)
+        return self.rng.randrange(SCREEN_WIDTH), self.rng.randrange(SCREEN_HEIGHT)
+
+    def _apply(self, state):
+        """Apply a received state as a delta against the local copy."""
+        delta = compute_delta(self.patch_engine.state, state)
+        self.patch_engine.apply([("delta", self.patch_engine.version + 1, delta)])
+        return len(delta)
+
+    async def _request(self, method, path, data=None):
+        """Send a request; returns (status, response), with None for failed requests."""
+        stats = self.swarm.stats
+        try:
+            status, response = await self.connection.request(method, path, data, stats)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status, response = 0, None
+        if status != 200:
+            stats.errors[self.module_id] += 1
+            return status, None
+        return status, response
+
+    async def run(self):
+        """Play sessions until the swarm stops."""
+        # Stagger the first click so clients do not move in lockstep
+        await asyncio.sleep(self.rng.uniform(0, self.swarm.think))
+        while self.swarm.running:
+            _, response = await self._request("POST", "/api/session/create", {"module_id": self.module_id})
+            if response is None:
+                await asyncio.sleep(self._think_time())
+                continue
+            self.session_id = response["session_id"]
+            self.patch_engine.reset()
+            self._apply(response.get("state") or {})
+            self.swarm.stats.sessions += 1
+
+            clicks = max(1, int(self.rng.expovariate(1 / SESSION_CLICKS)))
+            for _ in range(clicks):
+                await asyncio.sleep(self._think_time())
+                if not self.swarm.running:
+                    break
+                x, y = self._click()
+                start = time.perf_counter()
+                status, response = await self._request("POST", f"/api/session/{self.session_id}/input",
+                                                       {"x": x, "y": y})
+                stats = self.swarm.stats
+                if response is None:
+                    stats.failed_inputs += 1
+                    # Keep clicking unless the session is gone
+                    if status == 404:
+                        break
+                    continue
+                stats.delta_paths += self._apply(response.get("state") or {})
+                stats.add_input(self.module_id, (time.perf_counter() - start) * 1000)
+
+            await self._request("POST", f"/api/session/{self.session_id}/end", {})
+            self.session_id = None
+        self.connection.close()
+
+
+class ProcessCPU:
+    """CPU time of a process read from /proc (Linux)."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def seconds(self):
+        """CPU seconds the process has used, or None if unavailable."""
+        if self.pid is None:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                # Fields after the parenthesized command name; utime and stime are 14 and 15
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            return None
+        return (int(fields[11]) + int(fields[12])) / self.ticks
+
+
+class Swarm:
+    """Adds clients in steps and measures each step."""
+
+    def __init__(self, port, think, module_ids, server_pid=None):
+        self.port = port
+        self.think = think
+        self.module_ids = module_ids
+        self.cpu = ProcessCPU(server_pid)
+        self.stats = SwarmStats()
+        self.running = True
+        self.tasks = []
+        self.errors = Counter()  # Failed requests per module ID over all windows
+        self.module_inputs = Counter()  # Successful inputs per module ID over all windows
+        self.module_latency = {}  # Module ID -> StreamingStats of its input latencies
+        self.measured = 0.0  # Seconds measured over all windows
+
+    async def grow(self, count, ramp):
+        """Start clients until there are count of them, spread over ramp seconds."""
+        new = count - len(self.tasks)
+        for _ in range(max(0, new)):
+            client = SwarmClient(self, len(self.tasks))
+            self.tasks.append(asyncio.ensure_future(client.run()))
+            await asyncio.sleep(ramp / new)
+
+    async def measure(self, duration):
+        """Measure one window with the current clients.
+
+        Returns:
+            Dictionary of the window's rates, latency and server CPU use
+        """
+        self.stats = stats = SwarmStats()
+        cpu_start, start = self.cpu.seconds(), time.perf_counter()
+        await asyncio.sleep(duration)
+        cpu_end, elapsed = self.cpu.seconds(), time.perf_counter() - start
+
+        self.errors.update(stats.errors)
+        self.module_inputs.update(stats.module_inputs)
+        for module_id, latencies in stats.module_latency.items():
+            self.module_latency.setdefault(module_id, StreamingStats(MODULE_LATENCY_WINDOW)).extend(latencies)
+        self.measured += elapsed
+        latency = stats.latency.to_dict((50, 99))
+        return {
+            "clients": len(self.tasks),
+            "inputs": stats.inputs,
+            "failed_inputs": stats.failed_inputs,
+            "inputs_per_s": stats.inputs / elapsed,
+            "sessions_per_s": stats.sessions / elapsed,
+            "p50_ms": latency["p50"],
+            "p99_ms": latency["p99"],
+            "bytes_in_per_s": stats.bytes_in / elapsed,
+            "bytes_out_per_s": stats.bytes_out / elapsed,
+            "delta_paths_per_input": stats.delta_paths / max(stats.inputs, 1),
+            "errors": sum(stats.errors.values()),
+            "server_cpu_percent": (cpu_end - cpu_start) / elapsed * 100
+                                  if cpu_start is not None and cpu_end is not None else None
+        }
+
+    def module_rows(self):
+        """Get inputs/s and latency of successful inputs per module over all windows."""
+        rows = []
+        for module_id in self.module_ids:
+            latency = self.module_latency.get(module_id)
+            summary = latency.to_dict((50, 99)) if latency is not None else {"p50": None, "p99": None}
+            rows.append({
+                "module": module_id,
+                "inputs_per_s": self.module_inputs[module_id] / self.measured if self.measured else 0.0,
+                "p50_ms": summary["p50"],
+                "p99_ms": summary["p99"],
+                "errors": self.errors[module_id]
+            })
+        return rows
+
+    async def stop(self):
+        self.running = False
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+async def wait_for_server(port, timeout=30.0):
+    """Wait until the server answers health checks."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        connection = HttpConnection(port)
+        try:
+            status, _ = await connection.request("GET", "/api/health", None, SwarmStats())
+            if status == 200:
+                return True
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            connection.close()
+        await asyncio.sleep(0.5)
+    return False
+
+
+def raise_file_limit():
+    """Allow as many open sockets as the hard limit permits."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def run_curve(args, server_pid):
+    """Run every step and print one row per step."""
+    if not await wait_for_server(args.port):
+        print(f"  no server answering on {HOST}:{args.port}")
+        return []
+
+    swarm = Swarm(args.port, args.think, args.modules, server_pid)
+    rows = []
+    print(f"  {'clients':>8}{'inputs/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'KB/s in':>10}"
+          f"{'KB/s out':>10}{'paths':>7}{'errors':>8}{'cpu %':>7}")
+    try:
+        for count in args.steps:
+            await swarm.grow(count, args.ramp)
+            row = await swarm.measure(args.duration)
+            rows.append(row)
+            cpu = row["server_cpu_percent"]
+            print(f"  {row['clients']:>8}{row['inputs_per_s']:>10.1f}{row['p50_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+                  f"{row['bytes_in_per_s'] / 1024:>10.1f}{row['bytes_out_per_s'] / 1024:>10.1f}"
+                  f"{row['delta_paths_per_input']:>7.1f}{row['errors']:>8}"
+                  f"{(f'{cpu:.0f}' if cpu is not None else 'n/a'):>7}")
+
+            # A curve of failing requests measures error handling, not capacity
+            attempted = row["inputs"] + row["failed_inputs"]
+            if row["failed_inputs"] > MAX_FAILED_INPUTS * attempted or (not attempted and row["errors"]):
+                raise SwarmError(f"{row['failed_inputs']} of {attempted} inputs and {row['errors']} "
+                                 f"requests failed with {row['clients']} clients")
+    finally:
+        await swarm.stop()
+        print(f"\n  {'module':<22}{'inputs/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for row in swarm.module_rows():
+            p50, p99 = (f"{row[key]:.2f}" if row[key] is not None else "n/a" for key in ("p50_ms", "p99_ms"))
+            print(f"  {row['module']:<22}{row['inputs_per_s']:>10.1f}{p50:>9}{p99:>9}{row['errors']:>8}")
+    return rows
+
+
+def main():
+    """Run the swarm and print the capacity curve."""
+    parser = argparse.ArgumentParser(description="Headless client swarm against a local server")
+    parser.add_argument("--steps", default="100,250,500,1000",
+                        type=lambda value: [int(step) for step in value.split(",")],
+                        help="Client counts of the capacity curve")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds measured per step")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which a step's clients join")
+    parser.add_argument("--modules", default=",".join(module["id"] for module in AVAILABLE_MODULES),
+                        type=lambda value: value.split(","), help="Module IDs the clients play")
+    parser.add_argument("--think", type=float, default=1.5, help="Mean seconds between a client's clicks")
+    parser.add_argument("--port", type=int, default=8080, help="Port of the server on localhost")
+    parser.add_argument("--spawn", action="store_true", help="Start a plain HTTP OptimizedServer for the run")
+    parser.add_argument("--server-pid", type=int, help="Server process for the CPU column")
+    parser.add_argument("--csv", help="Also write the curve to this CSV file")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    server = None
+    server_pid = args.server_pid
+    if args.spawn:
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+            filter(None, [str(project_root.parent), os.environ.get("PYTHONPATH")])))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "MetaMindIQTrain.server.optimized.server", "--host", HOST,
+             "--port", str(args.port), "--no-flask", "--no-websocket"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        server_pid = server.pid
+
+    try:
+        rows = asyncio.run(run_curve(args, server_pid))
+    except SwarmError as e:
+        print(f"  stopped: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.csv and rows:
+        with open(args.csv, "w") as f:
+            f.write(",".join(rows[0]) + "\n")
+            for row in rows:
+                f.write(",".join("" if value is None else f"{value:g}" for value in row.values()) + "\n")
+
+
+if __name__ == "__main__":
+    main()
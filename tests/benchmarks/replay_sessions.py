@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Session Replay Load Test
+
+Replays a session log recorded by a server started with --record against a
+running server, keeping the recorded pacing (optionally sped up) and running
+every recorded session concurrently on its own thread:
+
+- each session is created with its recorded module, seed and fork, so the
+  server deals the same challenges it dealt the original player
+- each input is sent at its recorded offset; the lag behind that schedule
+  shows when the server (or this driver) cannot keep up
+- each input's result is compared with the recorded one; a divergence means
+  the session no longer follows its recording
+
+It reports latency per request type, schedule lag, throughput, errors and
+divergences. --copies replays every session several times at once to scale
+a recorded load up.
+
+Usage:
+    python replay_sessions.py LOG [--url URL] [--transport http|socketio]
+                              [--speed N] [--copies N] [--timeout S]
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root.parent))
+
+from core.streaming_stats import StreamingStats
+from MetaMindIQTrain.server.common.session_recorder import read_session_log
+
+# Number of latency samples kept per request type
+LATENCY_WINDOW = 100_000
+
+
+class HttpClient:
+    """Sends session requests to the plain HTTP API."""
+
+    def __init__(self, url, timeout):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _post(self, path, data):
+        request = urllib.request.Request(
+            self.url + path, json.dumps(data).encode('utf-8'),
+            {'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def create(self, module_id, seed, fork):
+        data = {'module_id': module_id}
+        if seed is not None:
+            data.update(seed=seed, fork=fork)
+        return self._post('/api/session/create', data)
+
+    def input(self, session_id, x, y):
+        return self._post(f'/api/session/{session_id}/input', {'x': x, 'y': y})
+
+    def end(self, session_id):
+        return self._post(f'/api/session/{session_id}/end', {})
+
+    def close(self):
+        pass
+
+
+class SocketIOClient:
+    """Sends session requests as Socket.IO events over one connection."""
+
+    def __init__(self, url, timeout):
+        import socketio
+
+        self.timeout = timeout
+        self.sio = socketio.Client()
+        self.sio.connect(url, wait_timeout=timeout)
+
+    def _call(self, event, data):
+        response = self.sio.call(event, data, timeout=self.timeout)
+        if isinstance(response, dict) and 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    def create(self, module_id, seed, fork):
+        data = {'module_id': module_id}
+        if seed is not None:
+            data.update(seed=seed, fork=fork)
+        return self._call('create_session', data)
+
+    def input(self, session_id, x, y):
+        return self._call('process_input', {'session_id': session_id, 'x': x, 'y': y})
+
+    def end(self, session_id):
+        return self._call('end_session', {'session_id': session_id})
+
+    def close(self):
+        self.sio.disconnect()
+
+
+CLIENTS = {'http': HttpClient, 'socketio': SocketIOClient}
+
+
+def normalize(value):
+    """Make a result comparable with its JSON-recorded counterpart."""
+    return json.loads(json.dumps(value, default=str))
+
+
+class Replay:
+    """Replays recorded sessions and collects their measurements."""
+
+    def __init__(self, make_client, speed=1.0):
+        self.make_client = make_client
+        self.speed = speed
+        self.latency = {event: StreamingStats(LATENCY_WINDOW) for event in ('create', 'input', 'end')}
+        self.lag = StreamingStats(LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.divergences = 0
+        self.first_error = None
+        self._lock = threading.Lock()
+        self._start = 0.0
+
+    def _wait(self, offset):
+        """Sleep until a recorded offset (scaled by speed) and return the lag in ms."""
+        delay = self._start + offset / self.speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return max(0.0, -delay) * 1000
+
+    def _send(self, event, call, *args):
+        start = time.perf_counter()
+        try:
+            response = call(*args)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self.first_error = self.first_error or f"{event}: {e}"
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.requests += 1
+            self.latency[event].add(elapsed)
+        return response
+
+    def replay_session(self, session):
+        """Replay one recorded session on the calling thread."""
+        lag = self._wait(session['start'])
+        try:
+            client = self.make_client()
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self.first_error = self.first_error or f"connect: {e}"
+            return
+        try:
+            response = self._send('create', client.create, session['module_id'],
+                                  session['seed'], session['fork'])
+            with self._lock:
+                self.lag.add(lag)
+            if not response or 'session_id' not in response:
+                return
+            session_id = response['session_id']
+
+            for entry in session['events']:
+                lag = self._wait(entry['t'])
+                if entry['event'] == 'input':
+                    response = self._send('input', client.input, session_id, entry['x'], entry['y'])
+                    diverged = response is not None and \
+                        normalize(response.get('result')) != normalize(entry.get('result'))
+                elif entry['event'] == 'end':
+                    self._send('end', client.end, session_id)
+                    diverged = False
+                else:
+                    continue
+                with self._lock:
+                    self.lag.add(lag)
+                    self.divergences += diverged
+        finally:
+            client.close()
+
+    def run(self, sessions):
+        """Replay all sessions concurrently.
+
+        Returns:
+            Wall-clock seconds the replay took
+        """
+        if not sessions:
+            return 0.0
+        start = time.perf_counter()
+        # The first recorded session starts right away
+        self._start = start - min(session['start'] for session in sessions) / self.speed
+        with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+            list(executor.map(self.replay_session, sessions))
+        return time.perf_counter() - start
+
+
+def main():
+    """Replay a session log and print the measurements."""
+    parser = argparse.ArgumentParser(description="Replay recorded sessions against a server")
+    parser.add_argument("log", help="Session log written by the server's --record option")
+    parser.add_argument("--url", default="http://localhost:8080", help="Server URL")
+    parser.add_argument("--transport", choices=sorted(CLIENTS), default="http",
+                        help="API the sessions are replayed through")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed-up factor")
+    parser.add_argument("--copies", type=int, default=1, help="Concurrent replays of every session")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Request timeout in seconds")
+    args = parser.parse_args()
+
+    sessions = read_session_log(args.log) * args.copies
+    replay = Replay(lambda: CLIENTS[args.transport](args.url, args.timeout), args.speed)
+    inputs = sum(1 for session in sessions for entry in session['events'] if entry['event'] == 'input')
+    print(f"  replaying {len(sessions)} sessions ({inputs} inputs) over {args.transport} at {args.speed:g}x")
+
+    elapsed = replay.run(sessions)
+
+    print(f"  {'request':<10}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for event, stats in replay.latency.items():
+        summary = stats.to_dict((50, 99))
+        if summary['count']:
+            print(f"  {event:<10}{summary['count']:>8}{summary['mean']:>10.2f}"
+                  f"{summary['p50']:>10.2f}{summary['p99']:>10.2f}")
+    lag = replay.lag.to_dict((50, 99))
+    print(f"  schedule lag ms: p50 {lag['p50']:.2f}, p99 {lag['p99']:.2f}")
+    print(f"  {replay.requests} requests in {elapsed:.2f} s ({replay.requests / max(elapsed, 1e-9):.1f}/s)")
+    print(f"  errors: {replay.errors}, divergences: {replay.divergences}")
+    if replay.first_error:
+        print(f"  first error: {replay.first_error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the gradient background cache of the pygame client.
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+# Loaded from its file: the clients.pygame package imports the whole client
+_spec = importlib.util.spec_from_file_location(
+    "backgrounds", project_root / "clients" / "pygame" / "backgrounds.py")
+backgrounds = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(backgrounds)
+BackgroundCache, render_gradient = backgrounds.BackgroundCache, backgrounds.render_gradient
+
+DARK = ((10, 20, 40), (60, 90, 200))
+LIGHT = ((240, 240, 250), (180, 200, 230))
+
+
+def draw_gradient(size, start_color, end_color, direction="vertical", flags=0):
+    """Draw a gradient one scanline at a time, as the renderers did before the cache."""
+    width, height = size
+    if len(start_color) > 3:
+        flags |= pygame.SRCALPHA
+    surface = pygame.Surface(size, flags)
+    length = width if direction == "horizontal" else height
+    for i in range(length):
+        color = [int(start + (end - start) * i / length) for start, end in zip(start_color, end_color)]
+        if direction == "horizontal":
+            pygame.draw.line(surface, color, (i, 0), (i, height - 1))
+        else:
+            pygame.draw.line(surface, color, (0, i), (width - 1, i))
+    return surface
+
+
+def pixels(surface):
+    """Get a surface's pixels as RGBA bytes."""
+    return pygame.image.tobytes(surface, "RGBA")
+
+
+class TestBackgroundCache(unittest.TestCase):
+    """Test cached and prefetched gradients against direct rendering."""
+
+    def setUp(self):
+        self.cache = BackgroundCache()
+
+    def tearDown(self):
+        self.cache.shutdown()
+
+    def finish_prefetch(self):
+        """Wait for the surfaces being built ahead."""
+        with self.cache.lock:
+            futures = list(self.cache.pending.values())
+        for future in futures:
+            future.result()
+
+    def drag(self, *sizes, theme_id="dark", colors=DARK):
+        """Resize through sizes in quick succession, as during a window drag."""
+        for size in sizes:
+            surface = self.cache.get_gradient(size, *colors, theme_id=theme_id)
+        self.finish_prefetch()
+        return surface
+
+    def test_pixel_identical_to_direct_render(self):
+        """Cached gradients match scanline drawing for every direction and color format."""
+        cases = [
+            ((64, 48), DARK, "vertical", 0),
+            ((64, 48), DARK, "horizontal", 0),
+            ((33, 17), ((255, 0, 0, 255), (0, 0, 255, 0)), "vertical", 0),
+            ((33, 17), ((0, 0, 0, 30), (255, 255, 255, 220)), "horizontal", 0),
+            ((40, 30), LIGHT, "vertical", pygame.SRCALPHA),
+        ]
+        for size, colors, direction, flags in cases:
+            with self.subTest(size=size, direction=direction, colors=colors):
+                expected = pixels(draw_gradient(size, *colors, direction, flags))
+                self.assertEqual(pixels(render_gradient(size, *colors, direction, flags)), expected)
+                cached = self.cache.get_gradient(size, *colors, direction, flags=flags)
+                self.assertEqual(pixels(cached), expected)
+                self.assertIs(self.cache.get_gradient(size, *colors, direction, flags=flags), cached)
+
+    def test_prefetch_hit(self):
+        """The next sizes of a resize drag are built ahead and match a direct render."""
+        self.drag((400, 300), (410, 305))
+        self.assertEqual(self.cache.get_stats()["prefetched"], 2)
+
+        surface = self.cache.get_gradient((420, 310), *DARK, theme_id="dark")
+        self.assertEqual(surface.get_size(), (420, 310))
+        self.assertEqual(pixels(surface), pixels(draw_gradient((420, 310), *DARK)))
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["prefetch_hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_resize_elsewhere_is_not_served_from_prefetch(self):
+        """A resize away from the predicted sizes gets a fresh surface of its own size."""
+        self.drag((400, 300), (410, 305))
+        self.cache._last_sizes.clear()  # The drag ended
+
+        surface = self.cache.get_gradient((640, 480), *DARK, theme_id="dark")
+        self.assertEqual(surface.get_size(), (640, 480))
+        self.assertEqual(pixels(surface), pixels(draw_gradient((640, 480), *DARK)))
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["prefetch_hits"], 0)
+        self.assertEqual(stats["misses"], 3)
+
+    def test_theme_change_invalidates(self):
+        """Surfaces of a previous theme, prefetched ones included, are never served for a new one."""
+        self.drag((400, 300), (410, 305))
+
+        light = self.cache.get_gradient((420, 310), *LIGHT, theme_id="light")
+        self.assertEqual(pixels(light), pixels(draw_gradient((420, 310), *LIGHT)))
+        self.assertEqual(self.cache.get_stats()["prefetch_hits"], 0)
+
+        # Same colors under a new theme id are built again
+        self.assertIsNot(self.cache.get_gradient((400, 300), *DARK, theme_id="dark2"),
+                         self.cache.get_gradient((400, 300), *DARK, theme_id="dark"))
+
+        self.cache.clear("dark")
+        self.assertFalse([key for key in self.cache.surfaces if key[1] == "dark"])
+        misses = self.cache.get_stats()["misses"]
+        self.cache.get_gradient((420, 310), *DARK, theme_id="dark")
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["misses"], misses + 1)
+        self.assertEqual(stats["prefetch_hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for round-trip latency measurement in BaseClient.
+"""
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.client_base import BaseClient
+
+
+class EchoSocket:
+    """Stands in for the socket.io client; answers inputs after a delay."""
+
+    def __init__(self, client, delay):
+        self.client = client
+        self.delay = delay
+        self.sent = []
+
+    def emit(self, event, data):
+        self.sent.append((event, data))
+        # A server clock far off from the client's must not matter
+        response = {'session_id': data['session_id'], 'timestamp': time.time() + 3600,
+                    'client_time': data.get('client_time')}
+        threading.Timer(self.delay, self.client._on_input_processed, (response,)).start()
+
+
+class RecordingClient(BaseClient):
+    """Client recording the input results it receives."""
+
+    def __init__(self):
+        super().__init__()
+        self.results = []
+        self.received = threading.Event()
+
+    def on_input_processed(self, data):
+        self.results.append(data)
+        self.received.set()
+
+    def on_connect(self): pass
+    def on_disconnect(self): pass
+    def on_session_joined(self, data): pass
+    def on_state_update(self, data): pass
+    def on_state_delta(self, data): pass
+    def on_round_completed(self, data): pass
+    def on_sequence(self, data): pass
+    def on_session_ended(self, data): pass
+    def on_error(self, data): pass
+    def run(self): pass
+
+
+class TestRoundTripLatency(unittest.TestCase):
+    """Test that latency is timed from the client's own send time."""
+
+    def setUp(self):
+        self.client = RecordingClient()
+        self.client.session_id = "s1"
+
+    def tearDown(self):
+        self.client.stop_processing()
+
+    def test_round_trip_from_echoed_send_time(self):
+        """The echoed client_time gives the round trip including the queue-to-send path."""
+        self.client.sio = EchoSocket(self.client, delay=0.05)
+        self.client.connected = True
+        self.client.outbound_processor_active = True
+        threading.Thread(target=self.client._process_outbound_messages, daemon=True).start()
+
+        self.client.process_input({'x': 1, 'y': 2})
+        self.assertTrue(self.client.received.wait(2))
+
+        event, data = self.client.sio.sent[0]
+        self.assertEqual(event, 'process_input')
+        self.assertIn('client_time', data)
+
+        histogram = self.client.get_stats()['latency_histogram']
+        self.assertEqual(histogram['count'], 1)
+        self.assertGreaterEqual(histogram['max_ms'], 50)
+        self.assertLess(histogram['max_ms'], 1000)
+
+    def test_response_without_send_time(self):
+        """Responses that do not echo client_time are not counted."""
+        self.client._on_input_processed({'timestamp': time.time() - 10})
+        self.client._on_input_processed({'client_time': 'soon'})
+        self.assertEqual(self.client.get_stats()['latency_histogram']['count'], 0)
+        self.assertEqual(len(self.client.results), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
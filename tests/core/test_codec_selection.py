@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the adaptive codec selector.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.network_optimizations import (
+    AdaptiveCodecSelector, CompressionMethod, compress_adaptive, decompress_data
+)
+
+SIZE = 20000
+CODECS = (CompressionMethod.NONE, CompressionMethod.ZLIB, CompressionMethod.LZMA)
+
+
+def make_selector(**kwargs):
+    """Build a selector with fixed measurements for a 20 KB payload."""
+    selector = AdaptiveCodecSelector(codecs=CODECS, explore_interval=10**6, **kwargs)
+    selector.record(CompressionMethod.ZLIB, SIZE, 4000, 0.0004)  # 0.4 ms, 5x
+    selector.record(CompressionMethod.LZMA, SIZE, 3000, 0.0200)  # 20 ms, 6.7x
+    return selector
+
+
+class TestAdaptiveCodecSelector(unittest.TestCase):
+    """Test codec choice from measurements."""
+    
+    def test_bandwidth_drives_choice(self):
+        """Slow links compress, very fast links send raw."""
+        self.assertEqual(make_selector(bandwidth=100_000).select(SIZE), CompressionMethod.ZLIB)
+        self.assertEqual(make_selector(bandwidth=10**10).select(SIZE), CompressionMethod.NONE)
+    
+    def test_latency_budget_excludes_slow_codecs(self):
+        """A codec over the encode budget is not chosen even if it sends less."""
+        self.assertEqual(make_selector(bandwidth=1000, latency_budget=1.0).select(SIZE),
+                         CompressionMethod.LZMA)
+        self.assertEqual(make_selector(bandwidth=1000, latency_budget=0.005).select(SIZE),
+                         CompressionMethod.ZLIB)
+    
+    def test_client_overrides(self):
+        """Per-client bandwidth and forced codecs apply only to that client."""
+        selector = make_selector(bandwidth=100_000)
+        selector.set_client_profile("lan", bandwidth=10**10)
+        selector.set_client_profile("forced", method=CompressionMethod.LZMA)
+        
+        self.assertEqual(selector.select(SIZE, "lan"), CompressionMethod.NONE)
+        self.assertEqual(selector.select(SIZE, "forced"), CompressionMethod.LZMA)
+        self.assertEqual(selector.select(SIZE, "other"), CompressionMethod.ZLIB)
+        
+        selector.clear_client_profile("lan")
+        self.assertEqual(selector.select(SIZE, "lan"), CompressionMethod.ZLIB)
+    
+    def test_unmeasured_codecs_are_explored_and_round_trip(self):
+        """A fresh selector measures codecs on live traffic."""
+        selector = AdaptiveCodecSelector(codecs=CODECS)
+        data = {"clusters": [{"id": i, "color": [80, 120, 200]} for i in range(50)]}
+        
+        for _ in range(5):
+            compressed, metadata = compress_adaptive(data, selector=selector)
+            self.assertEqual(decompress_data(compressed, metadata), data)
+        
+        self.assertGreaterEqual(selector.get_stats()['explorations'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact struct-of-arrays component tree.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.compact_components import CompactTree, StyleTable
+
+
+class TestCompactComponents(unittest.TestCase):
+    """Test styles, layout arrays, hit-testing and conversion."""
+
+    def test_styles_are_interned(self):
+        """Equal styles share one table entry regardless of key order."""
+        table = StyleTable()
+        first = table.intern({"color": (1, 2, 3), "strokeDash": [4, 4]})
+        second = table.intern({"strokeDash": [4, 4], "color": (1, 2, 3)})
+        self.assertEqual(first, second)
+        self.assertEqual(table.intern({}), 0)
+        self.assertEqual(len(table), 2)
+
+    def test_layout_grows_and_hit_test_picks_topmost(self):
+        """Later components are on top; circles use their radius."""
+        tree = CompactTree(capacity=2)
+        board = tree.create("rect", 0, 0, 100, 100)
+        cells = [tree.create("rect", 10 * i, 0, 10, 10, parent=board, key=f"cell_{i}")
+                 for i in range(5)]
+        dot = tree.create("circle", 80, 80, 20, 20)
+
+        self.assertGreaterEqual(tree.layout.capacity, 7)
+        self.assertIs(tree.hit_test(25, 5), cells[2])
+        self.assertIs(tree.hit_test(50, 50), board)
+        self.assertIs(tree.hit_test(90, 90), dot)
+        self.assertIs(tree.hit_test(81, 81), board)
+        self.assertIsNone(tree.hit_test(150, 5))
+
+        slots, x, _, width, _ = tree.batch("rect")
+        self.assertEqual(len(slots), 6)
+        tree.layout.translate(slots[1:], 0, 50)
+        self.assertEqual(cells[0].y, 50)
+        self.assertEqual(cells[0].layout, {"x": 0.0, "y": 50.0, "width": 10.0, "height": 10.0})
+
+    def test_view_tree_round_trip(self):
+        """View dictionaries convert to the unified dictionary format."""
+        node = {
+            "type": "container", "id": "root", "x": 0, "y": 0, "width": 200, "height": 100,
+            "properties": {"style": {"backgroundColor": (0, 0, 0)}},
+            "children": [
+                {"type": "text", "id": f"t{i}", "x": i, "y": 0, "width": 10, "height": 10,
+                 "text": "?", "properties": {"style": {"fontSize": 20}, "interactive": True}}
+                for i in range(3)
+            ]
+        }
+        tree = CompactTree()
+        tree.add_tree(node)
+        result = tree.to_dict()["components"][0]
+
+        self.assertEqual(result["id"], "root")
+        self.assertEqual(result["style"], {"backgroundColor": (0, 0, 0)})
+        child = result["children"][2]
+        self.assertEqual(child["props"], {"text": "?", "interactive": True})
+        self.assertEqual(child["layout"]["x"], 2)
+        self.assertEqual(tree.get_stats()["styles"], 3)
+
+        tree.clear()
+        self.assertEqual(len(tree), 0)
+        self.assertIsNone(tree.hit_test(5, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
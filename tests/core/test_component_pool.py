@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for pooled component allocation in core.components.
+"""
+
+import gc
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.components import (
+    UI, Component, ComponentPool, get_component_stats, reset_component_stats
+)
+
+
+def build_frame(ui, cells=20):
+    """Build a grid-like frame the way TrainingModule.build_ui does."""
+    ui.clear()
+    ui.add_component(ui.text("Score: 1", (10, 10)))
+    board = ui.container((0, 40), (400, 400))
+    for i in range(cells):
+        board.add_child(ui.rectangle((i * 20, 40), (18, 18), color=(i, i, i)))
+    ui.add_component(board)
+    ui.add_component(ui.button("Submit", (150, 450), (100, 40)))
+    return ui.to_dict()
+
+
+class TestComponentPool(unittest.TestCase):
+    """Test the free-list allocator behind UI factories."""
+
+    def test_steady_state_frames_reuse_components(self):
+        """After the first frame every component comes from the free list."""
+        ui = UI()
+        build_frame(ui)
+        reset_component_stats()
+
+        for _ in range(10):
+            state = build_frame(ui)
+
+        stats = get_component_stats()
+        self.assertEqual(stats['created'], 0)
+        self.assertEqual(stats['reused'], 10 * 23)
+        self.assertEqual(stats['hit_rate'], 1.0)
+        self.assertIn('pause_time', stats['gc'])
+
+        # Reused components carry only their new content
+        board = state['components'][1]
+        self.assertEqual(len(board['children']), 20)
+        self.assertEqual(board['children'][3]['properties']['backgroundColor'], [3, 3, 3])
+        self.assertNotIn('text', board['properties'])
+
+    def test_release_is_in_place_and_idempotent(self):
+        """Released components are reset in place and released only once."""
+        pool = ComponentPool(max_size=1)
+        parent = pool.get("container").set_property("width", 10)
+        child = pool.get("text").set_property("text", "x")
+        parent.add_child(child)
+        properties = parent.properties
+
+        pool.release_tree(parent)
+        pool.release_tree(parent)
+        self.assertEqual(pool.get_stats()['returned'], 2)
+        self.assertIs(parent.properties, properties)
+        self.assertEqual(parent.properties, {})
+        self.assertEqual(parent.children, [])
+        self.assertIs(pool.get("container"), parent)
+
+        # Components not created by the pool are never recycled
+        self.assertFalse(pool.release(Component("text")))
+
+        # Beyond max_size components are dropped
+        pool.release(pool.get("text"))
+        extra = pool.get("text"), pool.get("text")
+        for component in extra:
+            pool.release(component)
+        self.assertEqual(pool.get_stats()['discarded'], 1)
+
+    def test_concurrent_get_and_release(self):
+        """Threads sharing a pool never get the same component and keep exact counts."""
+        pool = ComponentPool()
+        threads, rounds = 8, 2000
+        in_use = set()
+        guard = threading.Lock()
+        errors = []
+
+        def work():
+            for _ in range(rounds):
+                component = pool.get("text")
+                with guard:
+                    if id(component) in in_use:
+                        errors.append(component)
+                    in_use.add(id(component))
+                component.set_property("text", "x")
+                with guard:
+                    in_use.discard(id(component))
+                pool.release(component)
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        stats = pool.get_stats()
+        self.assertEqual(errors, [])
+        self.assertEqual(stats['created'] + stats['reused'], threads * rounds)
+        self.assertEqual(stats['returned'], threads * rounds)
+        self.assertEqual(stats['size'], stats['created'])
+
+    def test_gc_collections_are_counted(self):
+        """The collector monitor records explicit collections."""
+        before = get_component_stats()['gc']['collections'][2]
+        gc.collect()
+        self.assertEqual(get_component_stats()['gc']['collections'][2], before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for preset compression dictionaries.
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.compression_dictionary import (
+    CompressionDictionary, DictionaryRegistry, build_dictionary, COMMON_DICTIONARY_ID
+)
+
+
+def make_message(i):
+    """Build a small delta message like the ones sent every tick."""
+    return json.dumps({
+        "game_state.score": i * 10,
+        "layout.backgroundColor": [15, 18, 28],
+        "_meta": {"version": i, "is_delta": True, "base_version": i - 1, "timestamp": 1700000000.0 + i}
+    }).encode("utf-8")
+
+
+class TestCompressionDictionary(unittest.TestCase):
+    """Test dictionary building and compression."""
+    
+    def test_dictionary_shrinks_small_messages(self):
+        """A trained dictionary beats plain zlib and round-trips."""
+        dictionary = CompressionDictionary("test", 1, build_dictionary(make_message(i) for i in range(1, 200)))
+        message = make_message(500)
+        
+        compressed = dictionary.compress(message)
+        self.assertEqual(dictionary.decompress(compressed), message)
+        self.assertLess(len(compressed), len(zlib.compress(message)))
+    
+    def test_wrong_dictionary_is_rejected(self):
+        """Decompressing with another dictionary fails instead of corrupting."""
+        first = CompressionDictionary("test", 1, b'"_meta": {"version": ')
+        second = CompressionDictionary("test", 2, b'"layout": {"backgroundColor": ')
+        
+        with self.assertRaises(zlib.error):
+            second.decompress(first.compress(make_message(1)))
+    
+    def test_save_load_and_negotiate(self):
+        """Saved dictionaries load back and negotiation picks a shared version."""
+        registry = DictionaryRegistry()
+        with tempfile.TemporaryDirectory() as directory:
+            for module_id, version in (("grid", 1), ("grid", 2), (COMMON_DICTIONARY_ID, 1)):
+                CompressionDictionary(module_id, version, b"dictionary %d" % version).save(directory)
+            self.assertEqual(registry.load_directory(directory), 3)
+        
+        self.assertEqual(registry.available()["grid"], [1, 2])
+        self.assertEqual(registry.negotiate("grid", {"grid": [1, 2, 3]}).version, 2)
+        self.assertEqual(registry.negotiate("grid", {"grid": [1]}).version, 1)
+        self.assertEqual(registry.negotiate("grid", {"common": [1]}).module_id, COMMON_DICTIONARY_ID)
+        self.assertIsNone(registry.negotiate("grid", {}))
+        self.assertEqual(registry.get_by_key("grid@2").data, b"dictionary 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
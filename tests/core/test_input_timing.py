@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tests for high-resolution input timestamps and stimulus onsets.
+
+Events are injected with known arrival stamps, then handled after a delay
+(standing in for queueing and frame pacing); reaction times must come out
+as stamp minus onset regardless of the delay.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.core import input_timing
+from MetaMindIQTrain.core.client_base import BaseClient
+from MetaMindIQTrain.core.input_timing import (
+    SENT_KEY, FrameClock, dispatching, event_timestamp_ns, input_timestamp_ns, now_ns,
+    received_timestamp_ns, stamp_event
+)
+from MetaMindIQTrain.modules.evolve.neural_flow.neural_flow_model import NeuralFlowModel
+from MetaMindIQTrain.modules.music.achievements import PerformanceTracker
+
+MS = 1_000_000  # Nanoseconds per millisecond
+HANDLING_DELAY = 0.03  # Seconds between an event's arrival and its handling
+
+
+class RecordingSocket:
+    """Stands in for the socket.io client, recording emits."""
+
+    def __init__(self):
+        self.sent = []
+        self.emitted = threading.Event()
+
+    def emit(self, event, data):
+        self.sent.append((event, data))
+        self.emitted.set()
+
+
+class InputClient(BaseClient):
+    """Client whose handlers do nothing."""
+
+    def on_connect(self): pass
+    def on_disconnect(self): pass
+    def on_session_joined(self, data): pass
+    def on_state_update(self, data): pass
+    def on_state_delta(self, data): pass
+    def on_round_completed(self, data): pass
+    def on_input_processed(self, data): pass
+    def on_sequence(self, data): pass
+    def on_session_ended(self, data): pass
+    def on_error(self, data): pass
+    def run(self): pass
+
+
+class TestInputTiming(unittest.TestCase):
+    """Test event stamps and frame-based stimulus onsets."""
+
+    def setUp(self):
+        self.clock = FrameClock()
+
+    def test_stamp_is_kept(self):
+        """Events keep the stamp from their arrival."""
+        event = stamp_event({'type': 'mouse_down'}, 123)
+        stamp_event(event)
+        self.assertEqual(event_timestamp_ns(event), 123)
+
+        import pygame
+        pygame_event = stamp_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(0, 0)), 456)
+        self.assertEqual(event_timestamp_ns(pygame_event), 456)
+
+    def test_dispatching_carries_stamp(self):
+        """The stamp of the event being dispatched is the current input time."""
+        with dispatching({'timestamp_ns': 42}):
+            self.assertEqual(input_timestamp_ns(), 42)
+            self.assertEqual(input_timestamp_ns(7), 7)
+        self.assertGreater(input_timestamp_ns(), 42)
+
+    def test_onset_is_frame_present(self):
+        """Onset is the present of the first frame after the stimulus was created."""
+        self.clock.frame_presented()
+        stimulus = self.clock.stimulus()
+        self.assertFalse(stimulus.presented)
+
+        present_ns = now_ns() + 5 * MS  # Frame pacing before the flip
+        self.clock.frame_presented(present_ns)
+        self.clock.frame_presented(present_ns + 16 * MS)
+        self.assertEqual(stimulus.onset(), present_ns)
+        self.assertEqual(stimulus.frame, 2)
+
+        event = stamp_event({'type': 'mouse_down'}, present_ns + 250 * MS)
+        time.sleep(HANDLING_DELAY)
+        self.assertEqual(stimulus.reaction_time_ns(event_timestamp_ns(event)), 250 * MS)
+
+    def test_frames_built_ahead(self):
+        """A frame built before the stimulus existed does not resolve its onset."""
+        early = self.clock.frame_built()
+        stimulus = self.clock.stimulus()
+        late = self.clock.frame_built()
+
+        self.clock.frame_presented(1000, build=early)
+        self.assertFalse(stimulus.presented)
+        self.clock.frame_presented(2000, build=late)
+        self.assertEqual(stimulus.onset(), 2000)
+
+    def test_not_held_without_frames(self):
+        """Without frames being presented, stimuli are not held and onset at creation."""
+        stimuli = [self.clock.stimulus() for _ in range(input_timing.MAX_PENDING_STIMULI * 2)]
+        self.assertEqual(self.clock.get_stats()['pending_stimuli'], 0)
+        self.assertEqual(stimuli[0].onset(), stimuli[0].created_ns)
+
+    def test_pending_capped(self):
+        """Stimuli waiting on a stalled frame clock are capped, dropping the oldest."""
+        self.clock.frame_presented()
+        stimuli = [self.clock.stimulus() for _ in range(input_timing.MAX_PENDING_STIMULI + 10)]
+        self.assertEqual(self.clock.get_stats()['pending_stimuli'], input_timing.MAX_PENDING_STIMULI)
+
+        self.clock.frame_presented(now_ns())
+        self.assertFalse(stimuli[0].presented)
+        self.assertTrue(stimuli[-1].presented)
+        self.assertEqual(self.clock.get_stats()['pending_stimuli'], 0)
+
+
+class TestClientInputStamps(unittest.TestCase):
+    """Test stamps of inputs sent by BaseClient and rebased by the server."""
+
+    def setUp(self):
+        self.client = InputClient()
+        self.client.session_id = "s1"
+
+    def tearDown(self):
+        self.client.stop_processing()
+
+    def test_input_carries_dispatched_stamp(self):
+        """process_input stamps inputs with the arrival of the event being dispatched."""
+        with dispatching({'timestamp_ns': 42}):
+            self.client.process_input({'type': 'click', 'x': 1, 'y': 2})
+        before = now_ns()
+        self.client.process_input({'type': 'click', 'x': 3, 'y': 4})
+        self.client.process_input({'type': 'click', 'x': 5, 'y': 6, 'timestamp_ns': 7})
+
+        stamps = [data['input']['timestamp_ns'] for _, data in self.client.outbound_queue]
+        self.assertEqual(stamps[0], 42)
+        self.assertGreaterEqual(stamps[1], before)
+        self.assertEqual(stamps[2], 7)
+
+    def test_server_rebases_stamp(self):
+        """The server's stamp is its arrival time less the time the input waited on the client."""
+        self.client.sio = RecordingSocket()
+        self.client.connected = True
+        self.client.outbound_processor_active = True
+        arrival_ns = now_ns()
+        with dispatching({'timestamp_ns': arrival_ns}):
+            self.client.process_input({'type': 'click', 'x': 1, 'y': 2})
+
+        # The input waits on the client before the sender thread picks it up
+        time.sleep(HANDLING_DELAY)
+        threading.Thread(target=self.client._process_outbound_messages, daemon=True).start()
+        self.assertTrue(self.client.sio.emitted.wait(2))
+        event, data = self.client.sio.sent[0]
+        self.assertEqual(event, 'process_input')
+
+        waited_ns = data[SENT_KEY] - arrival_ns
+        self.assertGreaterEqual(waited_ns, HANDLING_DELAY * 1e9)
+        received_ns = 10 ** 12  # Another process's clock
+        self.assertEqual(received_timestamp_ns(data['input'], data[SENT_KEY], received_ns),
+                         received_ns - waited_ns)
+        self.assertIsNone(received_timestamp_ns({'x': 1}, data[SENT_KEY], received_ns))
+        self.assertIsNone(received_timestamp_ns(data['input'], None, received_ns))
+
+
+class TestModelReactionTimes(unittest.TestCase):
+    """Test reaction times measured by the models from event stamps."""
+
+    def setUp(self):
+        self.clock = FrameClock()
+        self.original_clock = input_timing._frame_clock
+        input_timing._frame_clock = self.clock
+        self.clock.frame_presented()
+
+    def tearDown(self):
+        input_timing._frame_clock = self.original_clock
+
+    def test_neural_flow_click(self):
+        """NeuralFlowModel measures from the node's frame to the click's arrival."""
+        model = NeuralFlowModel()
+        model.phase = model.PHASE_ACTIVE
+        model._activate_next_target()
+        node = model.active_nodes[0]
+
+        onset_ns = now_ns()
+        self.clock.frame_presented(onset_ns)
+        click = stamp_event({'type': 'mouse_down', 'pos': node["position"]}, onset_ns + 180 * MS)
+
+        # The click is handled well after it arrived
+        time.sleep(HANDLING_DELAY)
+        with dispatching(click):
+            result = model.process_click(*node["position"])
+
+        self.assertEqual(result["result"], "success")
+        error = abs(model.response_times[-1] - 0.180)
+        self.assertLess(error, 1e-6)
+
+    def test_performance_tracker(self):
+        """PerformanceTracker records reaction times from the question's onset."""
+        tracker = PerformanceTracker()
+        tracker.start_session("music_theory")
+        for reaction_ms in (400, 600):
+            stimulus = self.clock.stimulus()
+            onset_ns = now_ns()
+            self.clock.frame_presented(onset_ns)
+            tracker.record_answer("music_theory", "chord", "major", True, stimulus=stimulus,
+                                  timestamp_ns=onset_ns + reaction_ms * MS)
+        tracker.record_answer("music_theory", "chord", "minor", False)
+
+        self.assertAlmostEqual(tracker.get_average_reaction_time("chord"), 0.5, places=9)
+        self.assertEqual(tracker.to_dict()["element_performance"]["chord:major"]["timed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipelined update/render loop.
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.core.pipeline import FrameRecorder, PipelineTimings, SnapshotBuffer, replay
+from MetaMindIQTrain.core.app import Application
+
+
+class FakeRenderer:
+    """Renderer that records draw calls and quits after a number of frames."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.presented = 0
+        self.calls = []
+        self.events = [{'type': 'mouse_down', 'pos': (5, 5)}]
+
+    def get_size(self):
+        return (320, 240)
+
+    def is_running(self):
+        return self.presented < self.frames
+
+    def process_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def clear(self, color=(0, 0, 0, 255)):
+        self.calls.append(('clear', color))
+
+    def draw_rectangle(self, x, y, width, height, color):
+        self.calls.append(('draw_rectangle', x, y, width, height))
+
+    def draw_text(self, x, y, text, font_size=16, color=(255, 255, 255, 255), align="left"):
+        self.calls.append(('draw_text', text))
+        return (len(text) * 8, font_size)
+
+    def present(self):
+        time.sleep(0.004)
+        self.presented += 1
+
+    def get_last_present_ns(self):
+        return None
+
+
+class SlowModule:
+    """Module whose update and render each take a few milliseconds."""
+
+    def __init__(self):
+        self.clicks = []
+        self.updates = 0
+        self.threads = set()
+
+    def handle_click(self, pos):
+        self.clicks.append(pos)
+
+    def update(self, delta_time):
+        self.threads.add(threading.current_thread().name)
+        self.updates += 1
+        time.sleep(0.004)
+
+    def render(self, renderer):
+        renderer.draw_rectangle(0, 0, 10 * self.updates, 10, (255, 0, 0, 255))
+        renderer.draw_text(0, 20, f"Updates: {self.updates}")
+
+
+class TestSnapshotBuffer(unittest.TestCase):
+    """Test the double buffer between the simulation and render threads."""
+
+    def test_latest_snapshot_wins(self):
+        """The consumer gets the newest snapshot and skipped ones are counted."""
+        buffer = SnapshotBuffer()
+        self.assertEqual(buffer.latest(0, timeout=0), (0, None))
+
+        buffer.publish("a")
+        buffer.publish("b")
+        version, snapshot = buffer.latest(0, timeout=0)
+        self.assertEqual((version, snapshot), (2, "b"))
+        self.assertEqual(buffer.latest(version, timeout=0), (2, None))
+
+        buffer.publish("c")
+        self.assertEqual(buffer.latest(version, timeout=0), (3, "c"))
+        self.assertEqual(buffer.get_stats(), {'version': 3, 'published': 3, 'dropped': 1})
+
+    def test_consumer_waits_for_producer(self):
+        """latest() blocks until a newer snapshot is published."""
+        buffer = SnapshotBuffer()
+        timer = threading.Timer(0.02, buffer.publish, args=("frame",))
+        timer.start()
+        self.assertEqual(buffer.latest(0, timeout=1.0), (1, "frame"))
+        timer.join()
+
+
+class TestFrameRecorder(unittest.TestCase):
+    """Test recording draw calls for replay."""
+
+    def test_record_and_replay(self):
+        """Recorded calls replay in order on the real renderer."""
+        target = FakeRenderer(frames=0)
+        recorder = FrameRecorder(320, 240, target)
+        recorder.clear((1, 2, 3, 255))
+        recorder.draw_rectangle(1, 2, 3, 4, (255, 0, 0, 255))
+        self.assertEqual(recorder.draw_text(0, 0, "Score"), (0, 0))
+        self.assertEqual(recorder.get_size(), (320, 240))
+
+        # Only the target renderer's methods exist on the recorder
+        self.assertFalse(hasattr(recorder, 'screen'))
+
+        commands = recorder.take()
+        self.assertEqual(len(commands), 3)
+        self.assertEqual(recorder.take(), ())
+
+        replay(commands, target)
+        self.assertEqual(target.calls, [('clear', (1, 2, 3, 255)),
+                                        ('draw_rectangle', 1, 2, 3, 4),
+                                        ('draw_text', 'Score')])
+
+
+class TestPipelineTimings(unittest.TestCase):
+    """Test stage timing and overlap accounting."""
+
+    def test_overlap(self):
+        """Stages running on two threads at once are counted as overlap."""
+        timings = PipelineTimings()
+        barrier = threading.Barrier(2)
+
+        def work(thread, stage):
+            barrier.wait()
+            with timings.stage(thread, stage):
+                time.sleep(0.05)
+
+        threads = [threading.Thread(target=work, args=("simulation", "update")),
+                   threading.Thread(target=work, args=("render", "render"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = timings.get_stats()
+        self.assertEqual(stats['stages']['update']['count'], 1)
+        self.assertGreater(stats['overlap'], 0.5)
+        self.assertGreater(stats['speedup'], 1.5)
+
+
+class TestPipelinedApplication(unittest.TestCase):
+    """Test Application.run in pipelined mode."""
+
+    def make_app(self, frames):
+        app = Application()
+        app.renderer = FakeRenderer(frames)
+        app.module = SlowModule()
+        app.module_registry.loaded_modules['slow'] = app.module
+        app.active_module_id = 'slow'
+        return app
+
+    def tearDown(self):
+        self.app.module_registry.loaded_modules.pop('slow', None)
+
+    def test_pipelined_run(self):
+        """The module runs on the simulation thread and its frames are replayed."""
+        self.app = app = self.make_app(frames=20)
+        app.run(pipelined=True)
+
+        self.assertEqual(app.module.threads, {'simulation'})
+        self.assertEqual(app.module.clicks, [(5, 5)])
+        self.assertEqual(app.renderer.presented, 20)
+        self.assertIn(('clear', app.background_color), app.renderer.calls)
+        self.assertTrue(any(call[0] == 'draw_rectangle' for call in app.renderer.calls))
+
+        stats = app.get_pipeline_stats()
+        self.assertGreater(stats['stages']['build']['count'], 0)
+        self.assertGreater(stats['stages']['render']['count'], 0)
+        self.assertEqual(stats['input_latency_ms']['count'], 1)
+        self.assertGreater(stats['overlap'], 0)
+        self.assertGreater(stats['snapshots']['published'], 0)
+
+    def test_serial_run(self):
+        """The serial loop still updates and renders on the calling thread."""
+        self.app = app = self.make_app(frames=3)
+        app.run()
+
+        self.assertEqual(app.module.threads, {threading.current_thread().name})
+        self.assertEqual(app.module.clicks, [(5, 5)])
+        self.assertEqual(app.get_pipeline_stats()['overlap'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
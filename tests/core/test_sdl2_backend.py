@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the texture-based SDL2 render backend on SDL's software renderer.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.core.renderer import Renderer, SDL2Backend
+
+
+class TestSDL2Backend(unittest.TestCase):
+    """Test drawing and texture caching in SDL2Backend."""
+
+    def setUp(self):
+        self.backend = SDL2Backend(software=True)
+        if not self.backend.initialize(200, 100, "test"):
+            self.skipTest("SDL2 renderer unavailable")
+
+    def tearDown(self):
+        self.backend.shutdown()
+
+    def test_rects_and_circles_are_blended(self):
+        """Filled rects blend by alpha and circles come from textures."""
+        self.backend.clear((0, 0, 0, 255))
+        self.backend.draw_rectangle(0, 0, 50, 50, (255, 0, 0, 255))
+        self.backend.draw_rectangle(0, 0, 50, 50, (0, 0, 255, 128))
+        self.backend.draw_circle(150, 50, 20, (0, 255, 0, 255))
+        pixels = self.backend.read_pixels()
+
+        red, green, blue, _ = pixels.get_at((10, 10))
+        self.assertTrue(120 <= red <= 135 and 120 <= blue <= 135 and green == 0)
+        self.assertEqual(tuple(pixels.get_at((150, 50)))[:3], (0, 255, 0))
+        self.assertEqual(tuple(pixels.get_at((125, 50)))[:3], (0, 0, 0))
+
+    def test_textures_are_uploaded_once(self):
+        """Repeated frames reuse text and rounded-rect textures."""
+        for _ in range(5):
+            self.backend.clear()
+            size = self.backend.draw_text(100, 50, "Score: 10", 20, align="center",
+                                          center_vertically=True)
+            self.backend.draw_rounded_rectangle(10, 10, 40, 20, (60, 60, 60, 255), radius=5,
+                                                border_color=(255, 255, 255, 255), border_width=1)
+
+        stats = self.backend.get_render_stats()
+        self.assertEqual(stats["texture_uploads"], 2)
+        self.assertEqual(stats["texture_hits"], 8)
+        self.assertGreater(size[0], 0)
+
+        # Different text is a different texture
+        self.backend.draw_text(0, 0, "Score: 11", 20)
+        self.assertEqual(self.backend.get_render_stats()["texture_uploads"], 3)
+
+    def test_texture_cache_is_bounded(self):
+        """The least recently used textures are evicted."""
+        self.backend.MAX_CACHED_TEXTURES = 4
+        for i in range(10):
+            self.backend.draw_text(0, 0, str(i), 12)
+        stats = self.backend.get_render_stats()
+        self.assertEqual(stats["cached_textures"], 4)
+        self.assertEqual(stats["texture_evictions"], 6)
+
+    def test_renderer_selects_backend(self):
+        """Renderer.initialize accepts the sdl2 backends."""
+        self.backend.shutdown()
+        renderer = Renderer()
+        self.assertTrue(renderer.initialize(64, 64, backend="sdl2_software"))
+        self.assertIsInstance(renderer.backend, SDL2Backend)
+        self.assertEqual(renderer.get_backend_name(), "sdl2_software")
+        renderer.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
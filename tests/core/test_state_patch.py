@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the copy-on-write state patch engine.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.state_patch import (
+    apply_patch, compute_delta, merge_deltas, state_checksum, PatchEngine, SnapshotRing
+)
+
+
+class TestApplyPatch(unittest.TestCase):
+    """Test copy-on-write patch application."""
+    
+    def setUp(self):
+        self.base = {
+            "game": {"score": 1, "level": 2},
+            "ui": {"components": [1, 2, 3]},
+        }
+    
+    def test_untouched_subtrees_are_shared(self):
+        """Only containers on the touched path are copied."""
+        result = apply_patch(self.base, {"game.score": 5})
+        
+        self.assertEqual(result["game"]["score"], 5)
+        self.assertEqual(self.base["game"]["score"], 1)
+        self.assertIs(result["ui"], self.base["ui"])
+        self.assertIsNot(result["game"], self.base["game"])
+    
+    def test_compute_delta_round_trip(self):
+        """Applying a computed delta reproduces the new state."""
+        current = {"game": {"score": 7}, "ui": {"components": [1, 2, 3]}, "phase": "end"}
+        delta = compute_delta(self.base, current)
+        
+        self.assertEqual(delta, {"game.score": 7, "game.level": None, "phase": "end"})
+        self.assertEqual(apply_patch(self.base, delta), current)
+    
+    def test_none_deletes_and_meta_is_skipped(self):
+        """None deletes a key and _meta never enters the state."""
+        result = apply_patch(self.base, {"game.level": None, "_meta": {"version": 3}})
+        
+        self.assertNotIn("level", result["game"])
+        self.assertNotIn("_meta", result)
+
+
+class TestMergeDeltas(unittest.TestCase):
+    """Test merging several deltas into one."""
+    
+    def test_merged_equals_sequential(self):
+        """Applying the merged delta matches applying each delta in order."""
+        base = {"a": {"b": 1, "c": {"d": 2}}, "e": 3}
+        deltas = [
+            {"a.c.d": 4, "e": None},
+            {"a.c": {"x": 1}},
+            {"a.c.y": 2, "e": 7},
+            {"a.b": None},
+        ]
+        
+        sequential = base
+        for delta in deltas:
+            sequential = apply_patch(sequential, delta)
+        
+        self.assertEqual(apply_patch(base, merge_deltas(deltas)), sequential)
+        self.assertEqual(base["a"]["c"], {"d": 2})
+
+
+class TestPatchEngine(unittest.TestCase):
+    """Test batched application of queued updates."""
+    
+    def test_jumps_to_newest_full_state(self):
+        """Updates older than the newest full state are skipped."""
+        engine = PatchEngine({"n": 0})
+        state = engine.apply([
+            ("delta", 1, {"n": 1}),
+            ("full", 2, {"n": 10, "m": 1}),
+            ("delta", 3, {"n": 11}),
+            ("delta", 4, {"m": 2}),
+        ])
+        
+        self.assertEqual(state, {"n": 11, "m": 2})
+        self.assertEqual(engine.version, 4)
+        stats = engine.get_stats()
+        self.assertEqual(stats["updates_skipped"], 1)
+        self.assertEqual(stats["patches_applied"], 1)
+        self.assertEqual(stats["deltas_coalesced"], 1)
+    
+    def test_checksum_mismatch_requests_resync(self):
+        """A delta whose checksum does not match the patched state flags a resync."""
+        engine = PatchEngine({"n": 0, "m": 1})
+        good = state_checksum({"n": 1, "m": 1})
+        engine.apply([("delta", 1, {"n": 1, "_meta": {"version": 1, "checksum": good}})])
+        self.assertFalse(engine.needs_resync)
+        
+        engine.state["m"] = 5  # Drift
+        engine.apply([("delta", 2, {"n": 2, "_meta": {"version": 2, "checksum": good}})])
+        self.assertTrue(engine.needs_resync)
+        self.assertEqual(engine.get_stats()["checksum_mismatches"], 1)
+        
+        engine.apply([("full", 3, {"n": 2, "m": 1})])
+        self.assertFalse(engine.needs_resync)
+
+
+class TestSnapshotRing(unittest.TestCase):
+    """Test the versioned snapshot ring used for resuming clients."""
+    
+    def test_delta_since_recent_version(self):
+        """Recent versions give a delta to the latest; evicted ones do not."""
+        ring = SnapshotRing(capacity=4)
+        for version in range(1, 7):
+            ring.push(version, {"n": version, "fixed": [1, 2]})
+        
+        self.assertEqual((ring.oldest_version, ring.latest_version), (3, 6))
+        self.assertIsNone(ring.delta_since(2))
+        
+        delta = ring.delta_since(4)
+        self.assertEqual(delta, {"n": 6})
+        self.assertEqual(apply_patch(ring.get(4), delta), ring.get(6))
+        self.assertEqual(ring.checksum(6), state_checksum({"fixed": [1, 2], "n": 6, "_meta": {}}))
+        
+        # Versions restarting invalidate the ring
+        ring.push(1, {"n": 0})
+        self.assertEqual(len(ring), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned state store used by delta encoding.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.state_store import StateStore
+from MetaMindIQTrain.core import network_optimizations as net
+
+
+def make_state(score, cells=50):
+    """Build a state with one large, rarely changing subtree."""
+    return {
+        "score": score,
+        "grid": {"cells": [[i, i % 3] for i in range(cells)]},
+        "ui": {"phase": "play"}
+    }
+
+
+class TestStateStore(unittest.TestCase):
+    """Test hashing, sharing and eviction in StateStore."""
+
+    def test_unchanged_values_are_shared_not_rehashed(self):
+        """A second put only hashes and copies the changed key."""
+        store = StateStore()
+        first = store.put("c1", make_state(1))
+        state = make_state(2)
+        second = store.put("c1", state, changed_keys={"score"})
+
+        self.assertIs(second.state["grid"], first.state["grid"])
+        self.assertNotEqual(first.root_hash, second.root_hash)
+        self.assertEqual(store.stats["keys_reused"], 2)
+        self.assertEqual(store.get_version("c1"), 2)
+
+        # The stored state is a copy, not the caller's object
+        state["ui"]["phase"] = "done"
+        self.assertEqual(store.get("c1").state["ui"]["phase"], "play")
+
+        # The root hash depends only on content
+        self.assertEqual(StateStore().put("x", make_state(2)).root_hash, second.root_hash)
+
+    def test_identical_states_share_a_snapshot(self):
+        """Clients of one session with equal states reference one snapshot."""
+        store = StateStore()
+        for i in range(10):
+            store.put(f"c{i}", make_state(5), namespace="s1")
+
+        stats = store.get_stats()
+        self.assertEqual(stats["clients"], 10)
+        self.assertEqual(stats["snapshots"], 1)
+        self.assertEqual(stats["shared_snapshots"], 9)
+
+        for i in range(10):
+            store.discard(f"c{i}")
+        self.assertEqual(store.get_stats()["snapshots"], 0)
+
+    def test_lru_and_ttl_eviction(self):
+        """The store stays bounded by client count and idle time."""
+        store = StateStore(max_clients=3, ttl=None)
+        for i in range(5):
+            store.put(f"c{i}", make_state(i))
+        self.assertEqual(len(store), 3)
+        self.assertNotIn("c0", store)
+        self.assertEqual(store.stats["lru_evictions"], 2)
+
+        store = StateStore(ttl=0.0)
+        store.put("c1", make_state(1))
+        store._clients["c1"] = store._clients["c1"][:3] + (0.0,)
+        self.assertIsNone(store.get("c1"))
+        self.assertEqual(store.stats["ttl_evictions"], 1)
+
+    def test_delta_round_trip_is_copy_on_write(self):
+        """delta_decode shares untouched subtrees with the stored base."""
+        net.clear_state_cache()
+        encoded, metadata = net.delta_encode(make_state(1), "sender")
+        self.assertFalse(metadata["delta"])
+        # The receiver stores the full state it was sent
+        net._state_store.put("receiver", net.delta_decode(encoded, metadata, "receiver"))
+        base = net._state_store.get("receiver").state
+
+        new_state = make_state(2)
+        new_state["ui"].pop("phase")
+        encoded, metadata = net.delta_encode(new_state, "sender")
+        self.assertTrue(metadata["delta"])
+        self.assertEqual(metadata["base_hash"], net._state_store.get("receiver").root_hash)
+
+        decoded = net.delta_decode(encoded, metadata, "receiver")
+        self.assertEqual(decoded, new_state)
+        self.assertIs(decoded["grid"], base["grid"])
+        self.assertEqual(base["ui"], {"phase": "play"})
+        net.clear_state_cache()
+
+    def test_compress_data_shares_session_base(self):
+        """Delta bases stored through compress_data are shared within a session."""
+        net.clear_state_cache()
+        for method in (net.CompressionMethod.DELTA, net.CompressionMethod.HYBRID):
+            for client_id in ("c1", "c2"):
+                net.compress_data(make_state(1), method, client_id=client_id, session_id="s1")
+                net.compress_data(make_state(2), method, client_id=client_id, session_id="s1")
+            self.assertIs(net._state_store.get("c1"), net._state_store.get("c2"))
+
+        net.compress_data(make_state(2), net.CompressionMethod.DELTA, client_id="c3")
+        self.assertIsNot(net._state_store.get("c3"), net._state_store.get("c1"))
+        net.clear_state_cache()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-connection streaming compression codec.
+"""
+
+import json
+import sys
+import unittest
+import zlib
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.stream_codec import StreamCodec, StreamDesyncError
+from MetaMindIQTrain.core.compression_dictionary import CompressionDictionary
+from MetaMindIQTrain.core import network_optimizations as net
+
+
+def make_delta(i):
+    """Build a small delta message like the ones sent every tick."""
+    return json.dumps({"game_state.score": i, "_meta": {"version": i, "is_delta": True}}).encode("utf-8")
+
+
+class TestStreamCodec(unittest.TestCase):
+    """Test streaming compression between two codecs."""
+    
+    def test_round_trip_uses_history(self):
+        """Messages decode in order and later ones benefit from the history."""
+        sender, receiver = StreamCodec(), StreamCodec()
+        sizes = []
+        for i in range(20):
+            sequence = sender.next_sequence
+            compressed = sender.compress(make_delta(i))
+            sizes.append(len(compressed))
+            self.assertEqual(receiver.decompress(compressed, sequence), make_delta(i))
+        
+        self.assertLess(max(sizes[1:]), len(zlib.compress(make_delta(19))))
+        self.assertEqual(sender.get_stats()['messages'], 20)
+    
+    def test_gap_raises_and_reset_recovers(self):
+        """A missed message is detected and a reset starts a clean stream."""
+        sender, receiver = StreamCodec(), StreamCodec()
+        receiver.decompress(sender.compress(make_delta(0)), 0)
+        sender.compress(make_delta(1))  # Lost in transit
+        
+        with self.assertRaises(StreamDesyncError):
+            receiver.decompress(sender.compress(make_delta(2)), 2)
+        
+        sender.reset()
+        self.assertEqual(sender.next_sequence, 0)
+        self.assertEqual(receiver.decompress(sender.compress(make_delta(3)), 0), make_delta(3))
+    
+    def test_dictionary_primes_stream(self):
+        """Both ends prime new streams with the shared dictionary."""
+        dictionary = CompressionDictionary("test", 1, make_delta(1000))
+        sender, receiver = StreamCodec(dictionary=dictionary), StreamCodec(dictionary=dictionary)
+        
+        compressed = sender.compress(make_delta(1))
+        self.assertEqual(receiver.decompress(compressed, 0), make_delta(1))
+        self.assertLess(len(compressed), len(StreamCodec().compress(make_delta(1))))
+
+
+
+class TestStreamCodecCache(unittest.TestCase):
+    """Test the per-client streaming contexts kept by network_optimizations."""
+    
+    def setUp(self):
+        self.max_codecs = net.MAX_STREAM_CODECS
+        net._stream_codecs.clear()
+    
+    def tearDown(self):
+        net.MAX_STREAM_CODECS = self.max_codecs
+        net._stream_codecs.clear()
+    
+    def test_bounded_least_recently_used(self):
+        """The least recently used context is dropped at the limit."""
+        net.MAX_STREAM_CODECS = 2
+        first = net.get_stream_codec("c1")
+        net.get_stream_codec("c2")
+        self.assertIs(net.get_stream_codec("c1"), first)
+        net.get_stream_codec("c3")
+        
+        self.assertEqual(set(net._stream_codecs), {"c1", "c3"})
+    
+    def test_release_client(self):
+        """A released client's stream and delta base are gone."""
+        net.encode_for_network({"score": 1}, codec=net.get_stream_codec("c1"))
+        net.delta_encode({"score": 1}, "c1")
+        self.assertIn("c1", net._state_store)
+        net.release_client("c1")
+        
+        self.assertNotIn("c1", net._stream_codecs)
+        self.assertNotIn("c1", net._state_store)
+
+
+if __name__ == "__main__":
+    unittest.main()
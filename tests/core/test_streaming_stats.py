@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming statistics ring buffer.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from MetaMindIQTrain.core.streaming_stats import StreamingStats
+
+
+class TestStreamingStats(unittest.TestCase):
+    """Tests for StreamingStats."""
+
+    def test_window_matches_recent_samples(self):
+        """Statistics only cover the most recent samples."""
+        stats = StreamingStats(5)
+        samples = [3.0, 1.0, 4.0, 1.5, 5.0, 9.0, 2.0, 6.0]
+        stats.extend(samples)
+
+        window = samples[-5:]
+        self.assertEqual(stats.count, 5)
+        self.assertEqual(stats.total_count, len(samples))
+        self.assertEqual(stats.values(), window)
+        self.assertAlmostEqual(stats.mean, sum(window) / len(window))
+        self.assertEqual(stats.min, min(window))
+        self.assertEqual(stats.max, max(window))
+        self.assertEqual(stats.last, 6.0)
+
+    def test_percentiles(self):
+        """Percentiles interpolate over the window."""
+        stats = StreamingStats(100)
+        stats.extend(range(1, 101))
+
+        self.assertAlmostEqual(stats.percentile(50), 50.5)
+        summary = stats.to_dict()
+        self.assertIn('p95', summary)
+        self.assertAlmostEqual(summary['p99'], 99.01)
+
+    def test_empty_and_reset(self):
+        """Empty windows report zeros."""
+        stats = StreamingStats(3)
+        self.assertEqual(stats.mean, 0.0)
+        self.assertEqual(stats.percentiles((50, 95)), [0.0, 0.0])
+
+        stats.extend([1.0, 2.0])
+        stats.reset()
+        self.assertEqual(stats.count, 0)
+        self.assertEqual(stats.max, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
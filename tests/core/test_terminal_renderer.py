@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the differential terminal renderer output.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.clients.terminal.unified_renderer import TerminalRenderer
+
+
+class RecordingScreen:
+    """Stand-in for a curses window that records addstr calls."""
+    
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.writes = []
+        self.clears = 0
+    
+    def getmaxyx(self):
+        return (self.height, self.width)
+    
+    def addstr(self, y, x, text, attr=0):
+        self.writes.append((y, x, text, attr))
+    
+    def clear(self):
+        self.clears += 1
+    
+    def refresh(self):
+        pass
+
+
+def make_tree(label):
+    """Build a small pixel-space view tree."""
+    return {
+        "type": "container", "id": "root", "x": 0, "y": 0,
+        "width": 400, "height": 200,
+        "properties": {"style": {}},
+        "children": [
+            {"type": "text", "id": "title", "x": 0, "y": 0, "width": 400,
+             "height": 20, "text": label,
+             "properties": {"style": {"color": [255, 0, 0]}}},
+        ],
+    }
+
+
+class TestDifferentialOutput(unittest.TestCase):
+    """Test that only changed cells reach the screen."""
+    
+    def setUp(self):
+        self.screen = RecordingScreen(10, 40)
+        self.renderer = TerminalRenderer(40, 10)
+        self.renderer.screen = self.screen
+    
+    def test_unchanged_tree_is_skipped(self):
+        """A second frame with the same tree writes nothing."""
+        self.assertGreater(self.renderer.render_frame(make_tree("Hello")), 0)
+        self.screen.writes.clear()
+        
+        self.assertEqual(self.renderer.render_frame(make_tree("Hello")), 0)
+        self.assertEqual(self.screen.writes, [])
+        self.assertEqual(self.renderer.frames_skipped, 1)
+    
+    def test_only_changed_run_is_written(self):
+        """Changing one word rewrites only that run plus the stats line."""
+        self.renderer.render_frame(make_tree("Score 10"))
+        self.screen.writes.clear()
+        
+        self.renderer.render_frame(make_tree("Score 20"))
+        content_writes = [w for w in self.screen.writes if w[0] != 9]
+        self.assertEqual(len(content_writes), 1)
+        self.assertEqual(content_writes[0][2], "2")
+        self.assertEqual(self.screen.clears, 0)
+    
+    def test_front_buffer_matches_back_buffer(self):
+        """After a frame the front buffer mirrors what was drawn."""
+        self.renderer.render_frame(make_tree("Mirror"))
+        self.assertEqual(self.renderer.front_buffer, self.renderer.buffer)
+        self.assertEqual(self.renderer.front_attrs, self.renderer.attr_buffer)
+
+
+if __name__ == '__main__':
+    unittest.main()
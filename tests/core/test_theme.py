@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for cached theme style resolution.
+"""
+
+import gc
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.theme import Theme, ThemeProvider
+
+
+class TestThemeStyleCache(unittest.TestCase):
+    """Test Theme.get_style and ThemeProvider.get_style caching."""
+
+    def test_cached_and_resolved(self):
+        """Styles are resolved once and merge variant and state definitions."""
+        theme = Theme("Test")
+        style = theme.get_style("text", "title")
+        self.assertIs(theme.get_style("text", "title"), style)
+        self.assertEqual(style["fontSize"], theme.font_size["xxl"])
+        self.assertNotIn("variant", style)
+        self.assertEqual(dict(theme.get_style("missing")), {})
+
+    def test_read_only_including_nested(self):
+        """Resolved styles and the containers inside them cannot be modified."""
+        theme = Theme("Test")
+        theme.component_styles["box"] = {"padding": {"top": 4, "sides": [1, 2]}}
+        theme.invalidate_styles()
+
+        style = theme.get_style("box")
+        with self.assertRaises(TypeError):
+            style["color"] = (0, 0, 0)
+        with self.assertRaises(TypeError):
+            style["padding"]["top"] = 8
+        self.assertEqual(style["padding"]["sides"], (1, 2))
+        self.assertEqual(theme.component_styles["box"]["padding"]["top"], 4)
+
+    def test_update_invalidates(self):
+        """Theme.update drops resolved styles."""
+        theme = Theme("Test")
+        before = theme.get_style("text")
+        theme.component_styles["text"]["textAlign"] = "center"
+        theme.update(colors={"text_primary": (1, 2, 3)})
+        after = theme.get_style("text")
+        self.assertIsNot(after, before)
+        self.assertEqual(after["textAlign"], "center")
+
+    def test_override_cache_per_theme(self):
+        """Merged overrides are cached and never served for a different theme."""
+        provider = ThemeProvider(Theme("First"))
+        merged = provider.get_style("text", fontSize=99)
+        self.assertIs(provider.get_style("text", fontSize=99), merged)
+        self.assertEqual(merged["fontSize"], 99)
+
+        # A replacement theme may be allocated at the address of the old one
+        provider.theme = None
+        gc.collect()
+        second = Theme("Second")
+        second.component_styles["text"]["textAlign"] = "right"
+        second.invalidate_styles()
+        provider.theme = second
+
+        self.assertEqual(provider.get_style("text", fontSize=99)["textAlign"], "right")
+
+    def test_unhashable_overrides(self):
+        """Overrides that cannot be cache keys are merged without caching."""
+        provider = ThemeProvider(Theme("Test"))
+        style = provider.get_style("text", margins=[1, 2])
+        self.assertEqual(style["margins"], (1, 2))
+        self.assertEqual(len(provider._override_cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
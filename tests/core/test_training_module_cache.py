@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for version-driven state caching in TrainingModule.get_state.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.training_module import TrainingModule
+from MetaMindIQTrain.modules.evolve.quantum_memory.quantum_memory_mvc import QuantumMemory
+
+
+class CountingModule(TrainingModule):
+    """Module counting how often its state sections are rebuilt."""
+
+    CACHE_STATE = True
+
+    def initialize(self):
+        self.ui_builds = 0
+        self.module_builds = 0
+        self.hint = "none"
+        self.track_property('hint', ('module',))
+
+    def handle_click(self, x, y):
+        self.score += 1
+
+    def build_ui(self):
+        self.ui_builds += 1
+        return super().build_ui()
+
+    def get_module_state(self):
+        self.module_builds += 1
+        return {'hint': self.hint}
+
+
+class UncachedModule(CountingModule):
+    """The same module without caching."""
+
+    CACHE_STATE = False
+
+
+class ClockModule(CountingModule):
+    """Module whose state holds a clock reading."""
+
+    CLOCK_SECTIONS = ('module',)
+
+
+class FullStateModule(CountingModule):
+    """Module returning full states instead of deltas."""
+
+    DELTA_STATE = False
+
+
+class TestTrainingModuleCache(unittest.TestCase):
+    """Test dirty tracking and section reuse in get_state."""
+
+    def test_idle_ticks_reuse_every_section(self):
+        """Without tracked changes the previous update is returned as is."""
+        module = CountingModule()
+        first = module.get_state()
+        self.assertFalse(first['_meta']['is_delta'])
+        version = module.get_state_version()
+
+        for _ in range(5):
+            self.assertIs(module.get_state(), first)
+        self.assertEqual((module.ui_builds, module.module_builds), (1, 1))
+        self.assertEqual(module.get_state_version(), version)
+        self.assertEqual(module.state_manager.version, 1)
+
+        # Publish ticks refresh the session time and metrics
+        module.performance.total_frames = module.performance_publish_interval - 1
+        delta = module.get_state()
+        self.assertIn('session.elapsed_time', delta)
+        self.assertIn('performance.total_frames', delta)
+        self.assertEqual(delta['_meta']['version'], 2)
+        self.assertIs(module.get_state(), delta)
+
+        # Assigning an equal value does not dirty the state
+        module.score = 0
+        module.get_state()
+        self.assertEqual(module.ui_builds, 1)
+
+    def test_only_dirty_sections_are_rebuilt(self):
+        """A tracked property rebuilds just the sections it feeds."""
+        module = CountingModule()
+        module.get_state()
+
+        module.hint = "look left"
+        delta = module.get_state()
+        self.assertEqual(delta['hint'], "look left")
+        self.assertEqual((module.ui_builds, module.module_builds), (1, 2))
+
+        module.handle_click(0, 0)
+        delta = module.get_state()
+        self.assertEqual(delta['game.score'], 1)
+        self.assertIn('ui.components', delta)
+        self.assertEqual(module.ui_builds, 2)
+
+        # State manager holds the complete state
+        full = module.get_full_state()
+        self.assertEqual(full['game']['score'], 1)
+        self.assertEqual(full['hint'], "look left")
+
+        module.mark_dirty('ui')
+        module.get_state()
+        self.assertEqual((module.ui_builds, module.module_builds), (3, 3))
+
+    def test_clock_sections_follow_publish_ticks(self):
+        """Clock sections are rebuilt with the metrics, not on every tick."""
+        module = ClockModule()
+        module.get_state()
+        module.get_state()
+        self.assertEqual(module.module_builds, 1)
+
+        module.performance.total_frames = module.performance_publish_interval - 1
+        module.get_state()
+        self.assertEqual(module.module_builds, 2)
+
+    def test_full_state_modules(self):
+        """With DELTA_STATE off every new update is a complete state."""
+        module = FullStateModule()
+        first = module.get_state()
+        self.assertIs(module.get_state(), first)
+
+        module.hint = "look up"
+        state = module.get_state()
+        self.assertFalse(state['_meta']['is_delta'])
+        self.assertEqual(state['hint'], "look up")
+        self.assertEqual(state['session'], first['session'])
+        self.assertIs(state['ui'], first['ui'])
+
+    def test_mvc_module_idle_ticks(self):
+        """An MVC module returns the same full state until its model moves on."""
+        module = QuantumMemory(seed=1)
+        state = module.get_state()
+        module.update(0.01)
+        self.assertIs(module.get_state(), state)
+
+        module.update(module.model.config["preparation_time"])
+        state = module.get_state()
+        self.assertFalse(state['_meta']['is_delta'])
+        self.assertEqual(state['phase'], "memorize")
+
+    def test_uncached_module_rebuilds_every_tick(self):
+        """Modules that do not opt in keep rebuilding and diffing the full state."""
+        module = UncachedModule()
+        for _ in range(3):
+            module.get_state()
+        self.assertEqual((module.ui_builds, module.module_builds), (3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
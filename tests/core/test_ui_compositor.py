@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for compositing UIComponent trees straight into the target surface.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from MetaMindIQTrain.core import ui_component
+from MetaMindIQTrain.core.ui_component import ContainerComponent, UIComponent
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+BLACK = (0, 0, 0)
+
+
+def make_box(id, x, y, width, height, color):
+    """Create a plain filled container."""
+    return ContainerComponent(id=id, x=x, y=y, width=width, height=height,
+                              properties={"style": {"backgroundColor": color}})
+
+
+def previous_render(component, surface):
+    """Render the way UIComponent.render did before compositing in place.
+
+    Each component is drawn on its own SRCALPHA surface and blitted onto its
+    parent's, with children relative to their parent.
+    """
+    component_surface = pygame.Surface((component.width, component.height), pygame.SRCALPHA)
+    component._draw_component(component_surface)
+    for child in component.children:
+        previous_render(child, component_surface)
+    surface.blit(component_surface, (component.x, component.y))
+
+
+class TestUICompositor(unittest.TestCase):
+    """Test offsets, clipping and subtree caching in UIComponent.render."""
+
+    def setUp(self):
+        pygame.init()
+        self.target = pygame.Surface((200, 200))
+
+    def test_nested_children_use_relative_offsets_and_clip(self):
+        """Children are placed relative to their parent and clipped to it."""
+        root = make_box("root", 10, 10, 100, 100, BLUE)
+        panel = root.add_child(make_box("panel", 20, 20, 50, 50, BLUE))
+        panel.add_child(make_box("leaf", 40, 5, 30, 10, RED))
+
+        rects = root.render(self.target)
+
+        self.assertEqual(rects, [pygame.Rect(10, 10, 100, 100)])
+        # leaf at 10 + 20 + 40 = 70, clipped to the panel's right edge at 80
+        self.assertEqual(self.target.get_at((75, 40))[:3], RED)
+        self.assertEqual(self.target.get_at((85, 40))[:3], BLUE)
+        # Drawing does not leave the target's clip rect changed
+        self.assertEqual(self.target.get_clip(), self.target.get_rect())
+
+    def test_partially_offscreen_component_is_drawn(self):
+        """A component crossing the target's edge is drawn where visible."""
+        make_box("edge", 180, 180, 40, 40, RED).render(self.target)
+        self.assertEqual(self.target.get_at((199, 199))[:3], RED)
+        self.assertEqual(self.target.get_at((179, 179))[:3], BLACK)
+
+    def test_only_static_large_subtrees_are_cached(self):
+        """A subtree gets a cached surface once static, and loses it when dirty."""
+        root = make_box("root", 0, 0, 200, 200, BLUE)
+        leaves = [root.add_child(make_box(f"leaf{i}", i * 20, 0, 10, 10, BLUE))
+                  for i in range(ui_component.CACHE_MIN_COMPONENTS)]
+        small = make_box("small", 0, 0, 50, 50, BLUE)
+        small.add_child(make_box("only", 0, 0, 10, 10, RED))
+
+        for _ in range(ui_component.CACHE_STATIC_FRAMES + 1):
+            root.render(self.target)
+            small.render(self.target)
+        self.assertIsNotNone(root.cached_surface)
+        self.assertIsNone(small.cached_surface)
+        self.assertIsNone(leaves[0].cached_surface)
+
+        leaves[3].properties["style"] = {}
+        leaves[3].bg_color = RED
+        leaves[3].mark_dirty()
+        self.assertIsNone(root.cached_surface)
+
+        root.render(self.target)
+        self.assertIsNone(root.cached_surface)
+        self.assertEqual(self.target.get_at((65, 5))[:3], RED)
+
+    def test_force_render_bypasses_cache(self):
+        """force_render redraws a cached subtree from its components."""
+        root = make_box("root", 0, 0, 200, 200, BLUE)
+        leaf = None
+        for i in range(ui_component.CACHE_MIN_COMPONENTS):
+            leaf = root.add_child(make_box(f"leaf{i}", i * 20, 0, 10, 10, BLUE))
+        for _ in range(ui_component.CACHE_STATIC_FRAMES + 1):
+            root.render(self.target)
+        self.assertIsNotNone(root.cached_surface)
+
+        # Changed without mark_dirty: only a forced render picks it up
+        leaf.bg_color = RED
+        root.render(self.target)
+        self.assertEqual(self.target.get_at((145, 5))[:3], BLUE)
+        root.render(self.target, force_render=True)
+        self.assertEqual(self.target.get_at((145, 5))[:3], RED)
+
+    def test_translucent_colors_blend_like_before(self):
+        """Translucent backgrounds blend with what is below, as the previous renderer did."""
+        for color in ((0, 0, 255, 128), (0, 0, 0, 0), (0, 0, 0, 160)):
+            for flags in (0, pygame.SRCALPHA):
+                with self.subTest(color=color, flags=flags):
+                    root = make_box("root", 0, 0, 100, 100, (0, 0, 255, 255))
+                    root.add_child(make_box("overlay", 20, 20, 60, 60, color))
+                    expected = pygame.Surface((100, 100), flags)
+                    expected.fill(RED)
+                    target = expected.copy()
+
+                    make_box("top", 0, 0, 100, 100, color).render(target)
+                    previous_render(make_box("top", 0, 0, 100, 100, color), expected)
+                    root.render(target)
+                    previous_render(root, expected)
+
+                    self.assertEqual(pygame.image.tobytes(target, "RGBA"),
+                                     pygame.image.tobytes(expected, "RGBA"))
+
+        self.assertTrue(make_box("box", 0, 0, 10, 10, (0, 0, 255, 128)).is_translucent())
+        self.assertFalse(make_box("solid", 0, 0, 10, 10, BLUE).is_translucent())
+
+    def test_invisible_component_renders_nothing(self):
+        """Hidden components return no dirty rects."""
+        component = UIComponent(id="hidden", width=10, height=10)
+        component.visible = False
+        self.assertEqual(component.render(self.target), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for room-based session broadcasting.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.server.common import broadcast
+from MetaMindIQTrain.server.common.broadcast import SessionBroadcaster, decode_payload
+from MetaMindIQTrain.server.common.metrics import MetricsCollector
+
+
+class FakeClock:
+    """Stands in for the time module; advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class FakeServer:
+    """Records room membership and emits of a Socket.IO server."""
+
+    def __init__(self):
+        self.rooms = {}
+        self.emitted = []
+
+    def enter_room(self, sid, room):
+        self.rooms.setdefault(room, set()).add(sid)
+
+    def leave_room(self, sid, room):
+        self.rooms.get(room, set()).discard(sid)
+
+    def close_room(self, room):
+        self.rooms.pop(room, None)
+
+    def emit(self, event, data, room=None):
+        self.emitted.append((event, decode_payload(data), room))
+
+    def take(self):
+        """Remove and return the (event, payload, room) emits so far."""
+        emitted, self.emitted = self.emitted, []
+        return emitted
+
+
+class TestSessionBroadcaster(unittest.TestCase):
+    """Test update tiers, the trailing flush and membership changes."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(broadcast, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.sio = FakeServer()
+        self.metrics = MetricsCollector()
+        self.broadcaster = SessionBroadcaster(self.sio, self.metrics)
+        self.broadcaster.join("trainee", "s1")
+        self.broadcaster.join("coach", "s1", 0.5)
+
+    def test_throttled_tier(self):
+        """The observer tier gets at most one update per interval."""
+        self.assertEqual(self.broadcaster.broadcast("s1", "state_update", {"n": 1}), 2)
+        self.clock.now += 0.1
+        self.assertEqual(self.broadcaster.broadcast("s1", "state_update", {"n": 2}), 1)
+        self.assertEqual([room for _, _, room in self.sio.take()], ["s1", "s1@500ms", "s1"])
+
+        self.clock.now += 0.5
+        self.broadcaster.broadcast("s1", "state_update", {"n": 3})
+        self.assertEqual([(payload, room) for _, payload, room in self.sio.take()],
+                         [({"n": 3}, "s1"), ({"n": 3}, "s1@500ms")])
+
+    def test_trailing_flush(self):
+        """A skipped tier is sent the latest skipped payload once its interval elapses."""
+        self.broadcaster.broadcast("s1", "state_update", {"n": 1})
+        for n in (2, 3):
+            self.clock.now += 0.1
+            self.broadcaster.broadcast("s1", "state_update", {"n": n})
+        self.sio.take()
+
+        # Not due yet
+        self.assertEqual(self.broadcaster.flush(), 0)
+        self.assertEqual(self.broadcaster.get_stats()["pending"], 1)
+
+        self.clock.now += 0.5
+        self.assertEqual(self.broadcaster.flush(), 1)
+        self.assertEqual(self.sio.take(), [("state_update", {"n": 3}, "s1@500ms")])
+        self.assertEqual(self.broadcaster.flush(), 0)
+        self.assertEqual(self.broadcaster.get_stats()["pending"], 0)
+
+    def test_forced_broadcast_replaces_pending(self):
+        """A forced broadcast reaches every tier and clears its pending payload."""
+        self.broadcaster.broadcast("s1", "state_update", {"n": 1})
+        self.clock.now += 0.1
+        self.broadcaster.broadcast("s1", "state_update", {"n": 2})
+        self.assertEqual(self.broadcaster.broadcast("s1", "state_update", {"n": 3}, force=True), 2)
+        self.sio.take()
+
+        self.clock.now += 0.5
+        self.assertEqual(self.broadcaster.flush(), 0)
+
+    def test_join_leave_close(self):
+        """Members move between rooms and a closed session forgets them."""
+        self.broadcaster.join("coach", "s1", 1.0)
+        self.assertEqual(self.sio.rooms["s1@500ms"], set())
+        self.assertEqual(self.sio.rooms["s1@1000ms"], {"coach"})
+        self.assertEqual(self.broadcaster.members("s1"), {"trainee", "coach"})
+
+        self.broadcaster.leave("trainee")
+        self.broadcaster.leave("trainee")
+        self.assertEqual(self.broadcaster.members("s1"), {"coach"})
+        self.assertEqual(self.broadcaster.get_stats(), {"sessions": 1, "rooms": 1, "members": 1, "pending": 0})
+
+        self.broadcaster.close("s1")
+        self.assertNotIn("s1@1000ms", self.sio.rooms)
+        self.assertEqual(self.broadcaster.members("s1"), set())
+        self.assertEqual(self.broadcaster.broadcast("s1", "state_update", {}), 0)
+        self.assertEqual(self.broadcaster.get_stats()["members"], 0)
+
+    def test_metrics(self):
+        """Each payload is counted once with its emits and recipients."""
+        self.broadcaster.join("viewer", "s1", 0.5)
+        self.broadcaster.broadcast("s1", "state_update", {"n": 1})
+        self.broadcaster.send("trainee", "session_joined", {"id": "s1"})
+        self.metrics.end_tick()
+
+        totals = self.metrics.broadcast_totals
+        self.assertEqual(totals["broadcasts"], 2)
+        self.assertEqual(totals["emits"], 3)
+        self.assertEqual(totals["recipients"], 4)
+        self.assertEqual(totals["bytes_serialized"],
+                         len(broadcast.encode_payload({"n": 1})) + len(broadcast.encode_payload({"id": "s1"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for passing clicks to training modules.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.modules.evolve.expand_vision.expand_vision_mvc import ExpandVision
+from MetaMindIQTrain.modules.evolve.quantum_memory.quantum_memory_mvc import QuantumMemory
+from MetaMindIQTrain.server.common.module_input import click_module, takes_position
+
+
+class RecordingModule:
+    """Module recording the arguments of its clicks."""
+
+    def __init__(self):
+        self.clicks = []
+
+    def handle_click(self, x, y):
+        self.clicks.append((x, y))
+        return {"handled": True}
+
+
+class RecordingPositionModule(RecordingModule):
+    """Module taking clicks as one position."""
+
+    def handle_click(self, pos):
+        self.clicks.append(pos)
+        return True
+
+
+class TestClickModule(unittest.TestCase):
+    """Test click_module with both handle_click forms."""
+
+    def test_both_forms(self):
+        """Clicks reach x/y and position modules the way they take them."""
+        module = RecordingModule()
+        self.assertEqual(click_module(module, 3, 4), {"handled": True})
+        position_module = RecordingPositionModule()
+        self.assertTrue(click_module(position_module, 3, 4))
+        self.assertEqual(module.clicks, [(3, 4)])
+        self.assertEqual(position_module.clicks, [(3, 4)])
+
+    def test_registry_modules(self):
+        """Evolve modules of either form accept server clicks."""
+        self.assertFalse(takes_position(ExpandVision(seed=1)))
+        self.assertTrue(takes_position(QuantumMemory()))
+        click_module(QuantumMemory(), 400, 300)
+        click_module(ExpandVision(seed=1), 400, 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
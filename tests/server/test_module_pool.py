@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for the pre-built module instance pool.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.modules.evolve.expand_vision.expand_vision_mvc import ExpandVision
+from MetaMindIQTrain.server.common.module_pool import ModulePool, RATE_WINDOW
+
+
+class SlowExpandVision(ExpandVision):
+    """Module whose construction is slower than copying it."""
+
+    def __init__(self, seed=None):
+        time.sleep(0.02)
+        super().__init__(seed=seed)
+
+
+class Plain:
+    """Module without clone support."""
+
+    def get_state(self):
+        return {}
+
+
+FACTORIES = {"slow": SlowExpandVision, "plain": Plain}
+
+
+def factory(module_id, **kwargs):
+    return FACTORIES[module_id](**kwargs) if module_id in FACTORIES else None
+
+
+class TestModulePool(unittest.TestCase):
+    """Test ModulePool sizing, refilling and cloning."""
+
+    def setUp(self):
+        self.pool = ModulePool(max_size=4, lead_time=RATE_WINDOW / 10, factory=factory)
+
+    def tearDown(self):
+        self.pool.stop()
+
+    def test_miss_then_hit(self):
+        """A cold module is built on request; later requests hit the pool."""
+        module = self.pool.acquire("slow", "s1")
+        self.assertEqual(module.session_id, "s1")
+        self.assertEqual(self.pool.refill(), 1)
+
+        pooled = self.pool.acquire("slow", "s2")
+        self.assertEqual(pooled.session_id, "s2")
+        self.assertIsNot(pooled, module)
+
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["acquire_ms"]["count"], 2)
+
+    def test_clones_when_cheaper(self):
+        """Instances are copied from a template once copying is measured faster."""
+        first = self.pool.acquire("slow")
+        second = self.pool.acquire("slow")
+        self.assertEqual(self.pool.constructions, 1)
+        self.assertEqual(self.pool.clones, 2)
+
+        # Clones are independent of each other and of the template
+        second.score = 99
+        self.assertEqual(first.score, 0)
+        self.assertNotEqual(first.session_id, second.session_id)
+        module_stats = self.pool.get_stats()["modules"]["slow"]
+        self.assertTrue(module_stats["cloned"])
+        self.assertLess(module_stats["clone_ms"]["mean"], module_stats["construct_ms"]["mean"])
+
+    def test_modules_without_clone_are_constructed(self):
+        """Modules without clone() never get a template."""
+        for _ in range(3):
+            self.assertIsInstance(self.pool.acquire("plain"), Plain)
+        self.assertEqual((self.pool.constructions, self.pool.clones), (3, 0))
+
+    def test_target_follows_rate(self):
+        """Pools grow with the creation rate up to max_size and drain when unused."""
+        self.assertEqual(self.pool.target_size("plain"), 0)
+        self.pool.acquire("plain")
+        self.assertEqual(self.pool.target_size("plain"), 1)
+        for _ in range(25):
+            self.pool.acquire("plain")
+        self.assertEqual(self.pool.target_size("plain"), 3)
+        for _ in range(25):
+            self.pool.acquire("plain")
+        self.assertEqual(self.pool.target_size("plain"), 4)
+
+        self.pool.refill()
+        self.assertEqual(len(self.pool.entries["plain"].ready), 4)
+        self.assertEqual(self.pool.target_size("plain", time.time() + RATE_WINDOW + 1), 0)
+
+    def test_background_refill(self):
+        """Warm modules are built by the refill thread before any request."""
+        self.pool.warm(["slow"])
+        self.pool.start()
+        deadline = time.time() + 5.0
+        while not self.pool.entries["slow"].ready and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.pool.acquire("slow")
+        self.assertEqual(self.pool.get_stats()["hits"], 1)
+
+    def test_concurrent_acquire(self):
+        """Counts and timings stay consistent when threads create instances at once."""
+        threads = [threading.Thread(target=lambda: [self.pool.acquire("slow") for _ in range(10)])
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = self.pool.get_stats()
+        module_stats = stats["modules"]["slow"]
+        self.assertEqual(stats["misses"], 80)
+        self.assertEqual(stats["acquire_ms"]["count"], 80)
+        self.assertEqual(stats["clones"] + stats["constructions"], 80 + 1)
+        self.assertEqual(module_stats["clone_ms"]["count"], stats["clones"])
+        self.assertEqual(module_stats["construct_ms"]["count"], stats["constructions"])
+
+    def test_unknown_module(self):
+        """Unknown modules are reported as failures."""
+        self.assertIsNone(self.pool.acquire("missing"))
+        self.assertEqual(self.pool.get_stats()["failures"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
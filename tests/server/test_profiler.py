@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the opt-in sampling profiler.
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.modules.evolve.expand_vision.expand_vision_mvc import ExpandVision
+from MetaMindIQTrain.server.common.profiler import SamplingProfiler, module_type
+
+
+class Worker(threading.Thread):
+    """Thread updating a module until stopped, tagged with its session."""
+
+    def __init__(self, profiler, session_id):
+        super().__init__(daemon=True)
+        self.profiler = profiler
+        self.session_id = session_id
+        self.module = ExpandVision(seed=1)
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.is_set():
+            self.profiler.tag(self.session_id)
+            self.module.update()
+            self.module.get_state()
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test SamplingProfiler reports and its opt-in behavior."""
+
+    def test_disabled(self):
+        """A disabled profiler refuses to run and keeps no tags."""
+        profiler = SamplingProfiler()
+        profiler.tag("s1")
+        self.assertEqual(profiler._tags, {})
+        self.assertEqual(profiler.handle_request({"seconds": "1"})[0], 404)
+        with self.assertRaises(RuntimeError):
+            profiler.profile(1)
+
+    def test_profile_by_module_and_session(self):
+        """Samples of a busy module thread are attributed to its type and session."""
+        profiler = SamplingProfiler(enabled=True, interval=0.001)
+        worker = Worker(profiler, "s1")
+        profiler.session_lookup = {"s1": worker.module}.get
+        worker.start()
+        try:
+            status, report = profiler.handle_request({"seconds": "0.3", "top": "5"})
+        finally:
+            worker.done.set()
+            worker.join()
+
+        self.assertEqual(status, 200)
+        self.assertGreater(report["samples"], 0)
+        self.assertIn("expand_vision", report["by_module"])
+        self.assertEqual(report["by_session"][0]["session_id"], "s1")
+        self.assertEqual(report["by_session"][0]["module"], "expand_vision")
+
+        line = report["collapsed"].splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        self.assertTrue(stack.startswith("["))
+        self.assertGreater(int(count), 0)
+        self.assertLessEqual(len(report["allocations"]), 5)
+        self.assertFalse(profiler.active)
+        self.assertEqual(profiler.get_stats()["profiles"], 1)
+
+    def test_one_profile_at_a_time(self):
+        """A second request during a profile is rejected."""
+        profiler = SamplingProfiler(enabled=True)
+        results = []
+        first = threading.Thread(target=lambda: results.append(profiler.handle_request({"seconds": 0.3})))
+        first.start()
+        while not profiler.active:
+            pass
+        status, _ = profiler.handle_request({"seconds": 0.1, "memory": "0"})
+        first.join()
+
+        self.assertEqual(status, 409)
+        self.assertEqual(results[0][0], 200)
+
+    def test_tracing_stopped_on_error(self):
+        """Tracing started by a profile is stopped even if the profile fails."""
+        profiler = SamplingProfiler(enabled=True)
+        with mock.patch.object(SamplingProfiler, "_top_allocations", side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                profiler.profile(0.05)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertFalse(profiler.active)
+
+    def test_module_type(self):
+        """Module types come from the package of the module's class."""
+        self.assertEqual(module_type(ExpandVision(seed=1)), "expand_vision")
+        self.assertIsNone(module_type(None))
+
+    def test_bad_parameters(self):
+        """Non-numeric parameters are rejected."""
+        profiler = SamplingProfiler(enabled=True)
+        self.assertEqual(profiler.handle_request({"seconds": "soon"})[0], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for hibernating idle sessions to disk and rehydrating them.
+"""
+
+import os
+import sys
+import time
+import threading
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.modules.evolve.expand_vision.expand_vision_mvc import ExpandVision
+from MetaMindIQTrain.modules.evolve.quantum_memory.quantum_memory_mvc import QuantumMemory
+from MetaMindIQTrain.server.common.hibernation import SessionHibernator
+from MetaMindIQTrain.server.common.session_manager import SessionManager
+
+
+class Unpicklable:
+    """Module holding a lock, which cannot be written to disk."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_activity = 0.0
+
+    def get_state(self):
+        return {}
+
+    def end(self):
+        pass
+
+
+class TestSessionHibernation(unittest.TestCase):
+    """Test SessionManager with a SessionHibernator."""
+
+    def setUp(self):
+        self.hibernator = SessionHibernator(hibernate_after=60)
+        self.manager = SessionManager(self.hibernator)
+
+    def tearDown(self):
+        self.hibernator.close()
+
+    def create(self, session_id, module_class=ExpandVision):
+        module = module_class()
+        self.assertTrue(self.manager.create_session(session_id, module, "client"))
+        return module
+
+    def test_round_trip(self):
+        """A hibernated module comes back with the same state and cache version."""
+        module = self.create("s1")
+        module.score = 42
+        state = module.get_state()
+        version = self.manager.update_cache("s1", state)
+
+        module.last_activity = time.time() - 120
+        self.assertEqual(self.manager.hibernate_idle_sessions(), 1)
+        self.assertNotIn("s1", self.manager.sessions)
+        self.assertTrue(self.manager.has_session("s1"))
+        self.assertTrue(self.manager.validate_session("s1"))
+        self.assertGreater(self.hibernator.store.bytes_stored, 0)
+
+        restored = self.manager.get_session("s1")
+        self.assertIsNot(restored, module)
+        self.assertIs(type(restored), type(module))
+        self.assertEqual(restored.score, 42)
+        self.assertEqual(restored.get_state()["score"], state["score"])
+        self.assertEqual(self.manager.get_versioned_state("s1")[1], version)
+        self.assertEqual(self.hibernator.store.bytes_stored, 0)
+
+        stats = self.manager.get_hibernation_stats()
+        self.assertEqual((stats["resident_sessions"], stats["hibernated_sessions"]), (1, 0))
+        self.assertEqual(stats["rehydrations"], 1)
+        self.assertEqual(stats["rehydration_ms"]["count"], 1)
+
+    def test_active_sessions_stay_resident(self):
+        """Only sessions idle longer than hibernate_after are hibernated."""
+        self.create("busy")
+        idle = self.create("idle", QuantumMemory)
+        idle.last_activity = time.time() - 120
+
+        self.assertEqual(self.manager.hibernate_idle_sessions(), 1)
+        self.assertEqual(self.manager.get_active_sessions_count(), 2)
+        stats = self.manager.get_hibernation_stats()
+        self.assertEqual((stats["resident_sessions"], stats["hibernated_sessions"]), (1, 1))
+
+    def test_end_hibernated_session(self):
+        """Ending a hibernated session drops its record without restoring it."""
+        self.create("s1")
+        self.assertTrue(self.manager.hibernate_session("s1"))
+        self.assertTrue(self.manager.end_session("s1"))
+        self.assertFalse(self.manager.has_session("s1"))
+        self.assertIsNone(self.manager.get_session("s1"))
+        self.assertEqual(self.hibernator.store.bytes_stored, 0)
+
+    def test_failure_keeps_session_resident(self):
+        """A module that cannot be written stays in memory."""
+        module = Unpicklable()
+        self.manager.create_session("s1", module, "client")
+        self.assertFalse(self.manager.hibernate_session("s1"))
+        self.assertIs(self.manager.get_session("s1"), module)
+        self.assertEqual(self.manager.get_hibernation_stats()["failures"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP session endpoints: conditional GET, long-polling,
+keep-alive, error status codes and concurrent sessions.
+"""
+
+import http.client
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.server.common.session_http import session_state_response
+from MetaMindIQTrain.server.optimized.server import OptimizedServer, OptimizedRequestHandler
+
+
+class QuietHandler(OptimizedRequestHandler):
+    """Request handler without the per-request log line."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Client:
+    """Keep-alive JSON client for the test server."""
+
+    def __init__(self, port):
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+
+    def request(self, method, path, data=None, headers=None, body=None):
+        """Send a request and return (status, headers, decoded body or None)."""
+        if body is None and data is not None:
+            body = json.dumps(data)
+        self.connection.request(method, path, body, {"Content-Type": "application/json", **(headers or {})})
+        response = self.connection.getresponse()
+        payload = response.read()
+        return response.status, response, json.loads(payload) if payload else None
+
+    def close(self):
+        self.connection.close()
+
+
+class TestSessionHttp(unittest.TestCase):
+    """Test the optimized server's HTTP handler over real connections."""
+
+    def setUp(self):
+        self.instance = OptimizedServer(port=0, use_flask=False, use_websocket=False,
+                                        hibernate_after=0, pool_size=0)
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), QuietHandler)
+        self.server.daemon_threads = True
+        self.server.server_instance = self.instance
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.port = self.server.server_address[1]
+        self.client = Client(self.port)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def create(self, client=None):
+        status, _, data = (client or self.client).request("POST", "/api/session/create",
+                                                          {"module_id": "expand_vision"})
+        self.assertEqual(status, 200)
+        return data["session_id"]
+
+    def test_keep_alive(self):
+        """Requests, including errors, share one HTTP/1.1 connection."""
+        session_id = self.create()
+        sock = self.client.connection.sock
+        for path in (f"/api/session/{session_id}", "/api/session/missing", "/api/nothing"):
+            status, response, _ = self.client.request("GET", path)
+            self.assertEqual(response.version, 11)
+            self.assertNotEqual((response.getheader("Connection") or "").lower(), "close")
+        self.client.request("POST", f"/api/session/{session_id}/input", {"x": 1, "y": 2})
+        self.assertIs(self.client.connection.sock, sock)
+
+    def test_profiler_tags_cleared(self):
+        """Handler threads drop their session tag once a request is answered."""
+        session_id = self.create()
+        profiler = self.instance.profiler
+        profiler.active = True  # As during a profiling window
+        try:
+            self.client.request("GET", f"/api/session/{session_id}")
+            self.client.request("POST", f"/api/session/{session_id}/input", {"x": 1, "y": 2})
+            self.client.request("POST", f"/api/session/{session_id}/input", body="{")
+            deadline = time.time() + 2.0
+            while profiler._tags and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(profiler._tags, {})
+        finally:
+            profiler.active = False
+
+    def test_conditional_get(self):
+        """A matching If-None-Match gets 304 until the state changes."""
+        session_id = self.create()
+        status, response, data = self.client.request("GET", f"/api/session/{session_id}")
+        self.assertEqual(status, 200)
+        etag = response.getheader("ETag")
+
+        status, response, data = self.client.request("GET", f"/api/session/{session_id}",
+                                                     headers={"If-None-Match": etag})
+        self.assertEqual(status, 304)
+        self.assertIsNone(data)
+        self.assertEqual(response.getheader("ETag"), etag)
+
+        self.instance.session_manager.update_cache(session_id, {"changed": True})
+        status, response, _ = self.client.request("GET", f"/api/session/{session_id}",
+                                                  headers={"If-None-Match": etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+
+    def test_long_poll(self):
+        """A long-poll returns the next version as soon as it is published, else 304."""
+        session_id = self.create()
+        _, _, data = self.client.request("GET", f"/api/session/{session_id}")
+        version = data["version"]
+
+        status, _, _ = self.client.request("GET", f"/api/session/{session_id}?since={version}&wait=50")
+        self.assertEqual(status, 304)
+
+        results = []
+        poller = Client(self.port)
+        thread = threading.Thread(target=lambda: results.append(
+            poller.request("GET", f"/api/session/{session_id}?since={version}&wait=5000")))
+        thread.start()
+        self.instance.session_manager.wait_for_version(session_id, version, 0.2)
+        self.instance.session_manager.update_cache(session_id, {"changed": True})
+        thread.join(5)
+        poller.close()
+
+        status, _, data = results[0]
+        self.assertEqual(status, 200)
+        self.assertGreater(data["version"], version)
+        self.assertEqual(data["state"], {"changed": True})
+
+    def test_long_poll_not_timed(self):
+        """Long-polls are left out of the response time metric."""
+        session_id = self.create()
+        response_times = self.instance.metrics_collector.response_times
+        _, _, data = self.client.request("GET", f"/api/session/{session_id}")
+        deadline = time.time() + 2.0
+        while response_times.count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        before = response_times.count
+
+        self.client.request("GET", f"/api/session/{session_id}?since={data['version']}&wait=100")
+        self.client.request("GET", f"/api/session/{session_id}")
+        deadline = time.time() + 2.0
+        while response_times.count == before and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(response_times.count, before + 1)
+        self.assertLess(response_times.max, 100)
+
+    def test_state_response(self):
+        """The response shared by the HTTP handler and the Flask route."""
+        session_manager = self.instance.session_manager
+        session_id = self.create()
+
+        status, headers, body = session_state_response(session_manager, session_id, {})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["session_id"], session_id)
+        status, _, body = session_state_response(session_manager, session_id, {}, headers["ETag"])
+        self.assertEqual((status, body), (304, None))
+
+        for params in ({"since": "soon"}, {"since": "1", "wait": "long"}, {"since": None}):
+            self.assertEqual(session_state_response(session_manager, session_id, params)[0], 400)
+
+        session_manager.end_session(session_id)
+        self.assertEqual(session_state_response(session_manager, session_id, {"since": "0"})[0], 404)
+
+    def test_error_status_codes(self):
+        """Bad requests get 400, unknown sessions and endpoints 404; ending is idempotent."""
+        session_id = self.create()
+        cases = [
+            (("POST", "/api/session/create", {}), 400),
+            (("POST", "/api/session/create", {"module_id": "no_such_module"}), 400),
+            (("POST", f"/api/session/{session_id}/input", {"x": 1}), 400),
+            (("GET", f"/api/session/{session_id}?since=soon"), 400),
+            (("POST", "/api/session/missing/input", {"x": 1, "y": 2}), 404),
+            (("GET", "/api/session/missing"), 404),
+            (("GET", "/api/nothing"), 404),
+        ]
+        for args, expected in cases:
+            with self.subTest(request=args[:2]):
+                status, _, data = self.client.request(*args)
+                self.assertEqual(status, expected)
+                self.assertIn("error", data)
+
+        status, _, data = self.client.request("POST", f"/api/session/{session_id}/input", body="{not json")
+        self.assertEqual(status, 400)
+
+        self.assertEqual(self.client.request("POST", f"/api/session/{session_id}/end", {})[0], 200)
+        self.assertEqual(self.client.request("POST", f"/api/session/{session_id}/end", {})[0], 200)
+        self.assertEqual(self.client.request("GET", f"/api/session/{session_id}?since=0&wait=50")[0], 404)
+        self.assertEqual(self.client.request("POST", f"/api/session/{session_id}/input", {"x": 1, "y": 2})[0], 404)
+
+    def test_concurrent_sessions(self):
+        """Clients creating, clicking and ending sessions at once all succeed."""
+        failures = []
+
+        def play(index):
+            client = Client(self.port)
+            try:
+                session_id = self.create(client)
+                for step in range(10):
+                    status, _, data = client.request("POST", f"/api/session/{session_id}/input",
+                                                     {"x": 100 + index * 10 + step, "y": 300})
+                    if status != 200 or data["session_id"] != session_id:
+                        failures.append((index, step, status))
+                if client.request("POST", f"/api/session/{session_id}/end", {})[0] != 200:
+                    failures.append((index, "end"))
+            except Exception as e:
+                failures.append((index, e))
+            finally:
+                client.close()
+
+        threads = [threading.Thread(target=play, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        self.assertEqual(failures, [])
+        self.assertEqual(self.instance.get_active_sessions_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for seeded sessions, session recording and replay.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MetaMindIQTrain.modules.evolve.expand_vision.expand_vision_mvc import ExpandVision
+from MetaMindIQTrain.modules.evolve.quantum_memory.quantum_memory_mvc import QuantumMemory
+from MetaMindIQTrain.server.common.module_pool import ModulePool
+from MetaMindIQTrain.server.common.session_recorder import SessionRecorder, read_session_log
+from MetaMindIQTrain.tests.benchmarks.replay_sessions import Replay
+
+FACTORIES = {"expand_vision": ExpandVision, "quantum_memory": QuantumMemory}
+
+
+def factory(module_id, **kwargs):
+    return FACTORIES[module_id](**kwargs) if module_id in FACTORIES else None
+
+
+class LocalClient:
+    """Replay client calling modules in-process, as the server's handlers do."""
+
+    def __init__(self, pool, recorder=None):
+        self.pool = pool
+        self.recorder = recorder or SessionRecorder()
+        self.sessions = {}
+
+    def create(self, module_id, seed=None, fork=0):
+        session_id = str(uuid.uuid4())
+        module = self.pool.acquire(module_id, session_id, seed, fork)
+        self.sessions[session_id] = module
+        self.recorder.record_create(session_id, module_id, module)
+        return {'session_id': session_id, 'seed': module.seed, 'fork': module.fork}
+
+    def input(self, session_id, x, y):
+        result = self.sessions[session_id].handle_click(x, y)
+        self.recorder.record_input(session_id, x, y, result)
+        return {'session_id': session_id, 'result': result}
+
+    def end(self, session_id):
+        self.recorder.record_end(session_id)
+        return {'session_id': session_id, 'status': 'ended'}
+
+    def close(self):
+        pass
+
+
+class TestSessionReplay(unittest.TestCase):
+    """Test that recorded sessions replay with the same challenges."""
+
+    def setUp(self):
+        self.pool = ModulePool(max_size=4, factory=factory)
+        handle, self.path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(handle)
+
+    def tearDown(self):
+        self.pool.stop()
+        os.remove(self.path)
+
+    def test_same_seed_same_challenges(self):
+        """Modules built with the same seed deal the same challenges."""
+        first, second = QuantumMemory(seed=1234), QuantumMemory(seed=1234)
+        self.assertEqual(first.get_module_state(), second.get_module_state())
+        self.assertEqual(first.rng.random(), second.rng.random())
+
+    def test_clone_reproducible_from_seed_and_fork(self):
+        """A pooled clone is rebuilt by constructing with its seed, then forking."""
+        # The first instance built is kept as the template and cloned
+        clone = self.pool.acquire("quantum_memory")
+        self.assertEqual(self.pool.clones, 1)
+        self.assertEqual(clone.fork, 1)
+
+        rebuilt = self.pool.acquire("quantum_memory", seed=clone.seed, fork=clone.fork)
+        self.assertEqual(rebuilt.get_module_state(), clone.get_module_state())
+        self.assertEqual([rebuilt.rng.random() for _ in range(5)],
+                         [clone.rng.random() for _ in range(5)])
+        self.assertEqual(self.pool.get_stats()["seeded"], 1)
+
+    def test_clones_deal_own_first_challenge(self):
+        """Clones of one template start from different challenges."""
+        template = QuantumMemory(seed=1234)
+        first, second = template.clone(1), template.clone(2)
+        self.assertNotEqual(first.get_state()["quantum_states"], second.get_state()["quantum_states"])
+        self.assertEqual(first.get_state()["quantum_states"], template.clone(1).get_state()["quantum_states"])
+
+    def test_log_round_trip(self):
+        """The reader groups each session's events in order of creation."""
+        recorder = SessionRecorder(self.path)
+        recorder.record("input", "unknown", x=1, y=1)
+        recorder.record_create("a", "expand_vision", ExpandVision(seed=1))
+        recorder.record_create("b", "quantum_memory", QuantumMemory(seed=2))
+        recorder.record_input("b", 10, 20, True)
+        recorder.record_input("a", 30, 40, False)
+        recorder.record_end("a")
+        recorder.close()
+
+        sessions = read_session_log(self.path)
+        self.assertEqual([s["session_id"] for s in sessions], ["a", "b"])
+        self.assertEqual((sessions[0]["seed"], sessions[1]["seed"]), (1, 2))
+        self.assertEqual([e["event"] for e in sessions[0]["events"]], ["input", "end"])
+        self.assertEqual(sessions[1]["events"][0]["result"], True)
+        self.assertEqual(recorder.events, 6)
+
+        with open(self.path, "w") as f:
+            f.write('{"format": "other"}\n')
+        with self.assertRaises(ValueError):
+            read_session_log(self.path)
+
+    def test_replay_matches_recording(self):
+        """Replayed sessions get the recorded results and consume the same draws."""
+        original = LocalClient(self.pool, SessionRecorder(self.path))
+        for module_id in ("expand_vision", "expand_vision", "quantum_memory"):
+            session_id = original.create(module_id)["session_id"]
+            if module_id == "expand_vision":
+                for x, y in ((100, 100), (400, 300), (512, 384)):
+                    original.input(session_id, x, y)
+            original.end(session_id)
+        original.recorder.close()
+
+        replayed = LocalClient(ModulePool(max_size=0, factory=factory))
+        replay = Replay(lambda: replayed, speed=1000.0)
+        replay.run(read_session_log(self.path))
+
+        self.assertEqual((replay.errors, replay.divergences), (0, 0))
+        self.assertEqual(replay.latency["input"].count, 6)
+        self.assertEqual(replay.latency["end"].count, 3)
+        copies = {(m.seed, m.fork): m for m in replayed.sessions.values()}
+        self.assertEqual(len(copies), 3)
+        for module in original.sessions.values():
+            copy = copies[(module.seed, module.fork)]
+            self.assertEqual(copy.rng.getstate(), module.rng.getstate())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Tests for server-side state synchronization.
+"""
+
+import base64
+import json
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.absolute()
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from MetaMindIQTrain.core.client_base import BaseClient
+from MetaMindIQTrain.core.stream_codec import StreamCodec
+from MetaMindIQTrain.server.state_sync import StateSynchronizer, WebSocketStateManager
+
+
+def make_state(score):
+    """Build a small state like the ones sent every tick."""
+    return {"score": score, "grid": [[i, i % 3] for i in range(8)], "phase": "play"}
+
+
+class FakeSocketIO:
+    """Records emits instead of sending them; background tasks are not run."""
+
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data, room=None):
+        self.emitted.append((event, data, room))
+
+    def sleep(self, seconds):
+        pass
+
+    def start_background_task(self, target, *args):
+        pass
+
+    def enter_room(self, sid, room):
+        pass
+
+    def leave_room(self, sid, room):
+        pass
+
+    def close_room(self, room):
+        pass
+
+    def take(self, room):
+        """Remove and return the messages sent to a room."""
+        taken = [(event, data) for event, data, to in self.emitted if to == room]
+        self.emitted = [entry for entry in self.emitted if entry[2] != room]
+        return taken
+
+
+class CounterModule:
+    """Module whose score changes on every update."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.score = 0
+        self.cleaned_up = False
+
+    def get_state(self):
+        return {"score": self.score, "grid": [[i, i % 3] for i in range(40)], "phase": "play"}
+
+    def get_full_state(self):
+        return self.get_state()
+
+    def update(self, dt):
+        self.score += 1
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+
+class SyncClient(BaseClient):
+    """Client that applies every received update right away."""
+
+    def sync(self, messages):
+        for event, data in messages:
+            if event == "state_update":
+                self._on_state_update(data)
+        self._apply_state_updates(list(self.pending_state_updates))
+        self.pending_state_updates.clear()
+        state = dict(self.state)
+        state.pop("_meta", None)
+        return state
+
+    def on_connect(self): pass
+    def on_disconnect(self): pass
+    def on_session_joined(self, data): pass
+    def on_state_update(self, data): pass
+    def on_state_delta(self, data): pass
+    def on_round_completed(self, data): pass
+    def on_input_processed(self, data): pass
+    def on_sequence(self, data): pass
+    def on_session_ended(self, data): pass
+    def on_error(self, data): pass
+    def run(self): pass
+
+
+class TestStreamingNegotiation(unittest.TestCase):
+    """Test that only clients asking for it get a compression stream."""
+
+    def test_off_unless_requested(self):
+        """Clients that did not ask for streaming get standalone messages."""
+        synchronizer = StateSynchronizer()
+        synchronizer.register_client("c1")
+        self.assertIsNone(synchronizer.get_client_codec("c1"))
+
+        data, is_compressed = synchronizer.compress_data(make_state(1), "c1")
+        self.assertFalse(is_compressed)
+        self.assertEqual(json.loads(data), make_state(1))
+
+    def test_requested_stream_decodes(self):
+        """A client that asked for streaming decodes every message in order."""
+        synchronizer = StateSynchronizer()
+        synchronizer.register_client("c1", streaming=True)
+        codec = synchronizer.get_client_codec("c1")
+        receiver = StreamCodec()
+
+        for score in range(5):
+            sequence = codec.next_sequence
+            data, is_compressed = synchronizer.compress_data(make_state(score), "c1")
+            self.assertTrue(is_compressed)
+            decoded = receiver.decompress(base64.b64decode(data), sequence)
+            self.assertEqual(json.loads(decoded), make_state(score))
+        self.assertEqual(synchronizer.stats["streamed_updates"], 5)
+
+    def test_server_can_refuse(self):
+        """Streaming disabled on the server overrides the client's request."""
+        synchronizer = StateSynchronizer(streaming_compression=False)
+        synchronizer.register_client("c1", streaming=True)
+        self.assertIsNone(synchronizer.get_client_codec("c1"))
+
+
+class TestClientDecoding(unittest.TestCase):
+    """Test BaseClient against updates from WebSocketStateManager."""
+
+    def start(self, streaming):
+        """Start a session the way the Socket.IO app does for a client."""
+        self.socketio = FakeSocketIO()
+        self.manager = WebSocketStateManager(self.socketio)
+        self.module = CounterModule("s1")
+        self.client = SyncClient()
+
+        offer = self.client._compression_offer()
+        self.manager.register_client("c1", offer["dictionaries"], streaming=streaming and offer["stream"])
+        sync = self.manager.start_session("c1", self.module, "expand_vision")
+        self.client._on_session_joined({"session_id": "s1", **sync})
+        return sync
+
+    def tick(self):
+        """Update the module and deliver the resulting messages to the client."""
+        self.module.update(0.1)
+        self.manager.send_update("c1")
+        return self.client.sync(self.socketio.take("c1"))
+
+    def test_dictionary_negotiated_and_decoded(self):
+        """The client offers its dictionaries and decodes what the server compresses."""
+        sync = self.start(streaming=False)
+        self.assertEqual(sync["compression_dictionary"]["module_id"], "expand_vision")
+        self.assertFalse(sync["stream"])
+
+        for _ in range(5):
+            self.assertEqual(self.tick(), self.module.get_state())
+        self.assertGreater(self.manager.synchronizer.stats["dictionary_updates"], 0)
+        self.assertEqual(self.client.get_stats()["state_deltas"], 4)
+
+    def test_stream_decoded(self):
+        """A streaming client decodes every update from its stream."""
+        sync = self.start(streaming=True)
+        self.assertTrue(sync["stream"])
+
+        for _ in range(5):
+            self.assertEqual(self.tick(), self.module.get_state())
+        self.assertEqual(self.manager.synchronizer.stats["streamed_updates"], 5)
+
+    def test_missed_stream_message_resyncs(self):
+        """A gap in the stream makes the client ask for a full state, which recovers."""
+        self.start(streaming=True)
+        self.tick()
+        self.module.update(0.1)
+        self.manager.send_update("c1")
+        self.socketio.take("c1")  # Lost
+
+        self.tick()
+        self.assertEqual(self.client.outbound_queue[-1],
+                         ("get_state", {"session_id": "s1", "full_state": True}))
+
+        self.manager.request_full_state("c1")
+        self.assertEqual(self.tick(), self.module.get_state())
+
+    def test_close_session(self):
+        """Closing a session cleans up its module once and stops its updates."""
+        self.start(streaming=False)
+        self.manager.close_session("s1")
+        self.assertTrue(self.module.cleaned_up)
+        self.manager.send_session_update("s1")
+        self.assertEqual(self.socketio.take("c1"), [])
+
+
+class TestSessionClients(unittest.TestCase):
+    """Test sessions followed by several clients and resumed after a disconnect."""
+
+    def setUp(self):
+        self.socketio = FakeSocketIO()
+        self.expired = []
+        self.manager = WebSocketStateManager(self.socketio, on_session_expired=self.expired.append)
+        self.module = CounterModule("s1")
+        self.first = SyncClient()
+        self.manager.register_client("c1")
+        self.first._on_session_joined({"session_id": "s1", **self.manager.start_session("c1", self.module)})
+
+    def join(self, client_id, client, last_version=0):
+        """Join s1 the way the Socket.IO app's join_session handler does."""
+        resumed = self.manager.register_client(client_id, session_id="s1", last_version=last_version)
+        client._on_session_joined({"session_id": "s1", **self.manager.get_client_compression(client_id)})
+        return resumed
+
+    def test_clients_share_version_counter(self):
+        """Each update of a session has one version, whichever client receives it."""
+        second = SyncClient()
+        self.assertFalse(self.join("c2", second))
+
+        for _ in range(3):
+            self.module.update(0.1)
+            self.manager.send_session_update("s1")
+            sent = {room: data["state_version"] for event, data, room in self.socketio.emitted}
+            self.assertEqual(sent["c1"], sent["c2"])
+            self.assertEqual(self.first.sync(self.socketio.take("c1")), self.module.get_state())
+            self.assertEqual(second.sync(self.socketio.take("c2")), self.module.get_state())
+        self.assertEqual(self.first.last_state_version, second.last_state_version)
+
+        # An unchanged state is not sent again
+        self.manager.send_session_update("s1")
+        self.assertEqual(self.socketio.emitted, [])
+
+    def test_resume_with_delta(self):
+        """A client reconnecting with a recent version continues with a delta."""
+        self.manager.send_update("c1")
+        self.first.sync(self.socketio.take("c1"))
+        self.manager.unregister_client("c1")
+        self.assertIn("s1", self.manager.detached_sessions)
+
+        # The session is paused while detached
+        self.manager._update_loop()
+        self.assertEqual(self.module.score, 0)
+        self.module.update(0.1)
+
+        self.assertTrue(self.join("c1b", self.first, self.first.last_state_version))
+        self.assertNotIn("s1", self.manager.detached_sessions)
+        self.manager.send_update("c1b")
+        messages = self.socketio.take("c1b")
+        self.assertTrue(messages[0][1]["is_delta"])
+        self.assertEqual(self.first.sync(messages), self.module.get_state())
+
+    def test_stale_version_gets_full_state(self):
+        """A version no longer kept is answered with a full state."""
+        self.manager.unregister_client("c1")
+        self.assertFalse(self.join("c1b", self.first, last_version=99))
+        self.manager.send_update("c1b")
+        messages = self.socketio.take("c1b")
+        self.assertFalse(messages[0][1]["is_delta"])
+        self.assertEqual(self.first.sync(messages), self.module.get_state())
+
+    def test_observers_get_trainee_message_shape(self):
+        """Observers are sent full states shaped like the trainee's uncompressed updates."""
+        self.manager.synchronizer.compression_threshold = 1 << 20
+        self.assertTrue(self.manager.add_observer("o1", "s1", update_interval=0))
+        self.manager.send_session_update("s1")
+
+        trainee = self.socketio.take("c1")[0][1]
+        encoded = self.socketio.take("s1")[0][1]
+        observed = json.loads(encoded)
+        self.assertEqual(set(observed), set(trainee))
+        self.assertIsInstance(trainee["data"], dict)
+        self.assertEqual(observed["state_version"], trainee["state_version"])
+
+        observer = SyncClient()
+        observer._on_session_joined({"session_id": "s1"})
+        self.assertEqual(observer.sync([("state_update", encoded)]), self.module.get_state())
+        self.assertEqual(observer.last_state_version, trainee["state_version"])
+
+    def test_detached_session_expires(self):
+        """A session nobody resumes is cleaned up by the update loop, which then stops."""
+        self.manager.unregister_client("c1")
+        self.manager._update_loop()
+        self.assertTrue(self.manager.is_running)
+        self.assertEqual(self.expired, [])
+
+        self.manager.resume_grace_period = 0
+        time.sleep(0.01)
+        self.manager._update_loop()
+        self.assertTrue(self.module.cleaned_up)
+        self.assertEqual(self.expired, ["s1"])
+        self.assertFalse(self.manager.is_running)
+        self.assertFalse(self.join("c1b", SyncClient(), last_version=1))
+
+
+if __name__ == "__main__":
+    unittest.main()